@@ -0,0 +1,223 @@
+"""
+Persistent manifest of the built-in top-level commands.
+
+`mcli` is invoked far more often than its command modules change, so importing
+every command module just to render `mcli --help` or to dispatch `mcli run foo`
+is wasted work. The manifest records each command's name, help text, params and
+import path, keyed by the package version and the mtimes of the defining source
+files. `create_app` registers lazy stubs from it; a module is only imported when
+its command is actually dispatched or completed.
+
+The manifest is stored in ~/.mcli/cache/command_manifest.json and is rebuilt
+automatically whenever the key no longer matches.
+"""
+
+import importlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+import click
+
+from mcli.lib.constants.paths import FileNames
+from mcli.lib.logger.logger import get_logger
+from mcli.lib.paths import get_cache_dir
+
+logger = get_logger(__name__)
+
+MANIFEST_FORMAT_VERSION = 1
+
+# Built-in top-level commands as (registered name, "module.attribute") pairs.
+CORE_COMMANDS: list[tuple[str, str]] = [
+    ("list", "mcli.app.list_cmd.list_cmd"),
+    ("search", "mcli.app.search_cmd.search"),
+    ("new", "mcli.app.new_cmd.new"),
+    ("import", "mcli.app.import_cmd.import_cmd"),
+    ("edit", "mcli.app.edit_cmd.edit"),
+    ("mv", "mcli.app.mv_cmd.mv"),
+    ("rm", "mcli.app.delete_cmd.rm"),
+    ("sync", "mcli.app.sync_cmd.sync_group"),
+    ("ci", "mcli.workflow.ci.ci.ci"),
+    ("setup", "mcli.app.setup_cmd.setup"),
+    ("init", "mcli.app.init_cmd.init"),
+    ("context", "mcli.app.context_cmd.context"),
+    ("health", "mcli.self.health_cmd.health"),
+    ("source", "mcli.app.source_sync_cmd.source_group"),
+    ("services", "mcli.app.services_cmd.services"),
+    ("self", "mcli.self.self_cmd.self_app"),
+    ("run", "mcli.workflow.workflow.workflows"),
+]
+
+
+def get_manifest_path() -> Path:
+    """Get the path to the command manifest cache file."""
+    return get_cache_dir() / FileNames.COMMAND_MANIFEST_JSON
+
+
+def _get_package_version() -> str:
+    """Get the installed mcli version, or "unknown" when running from a bare checkout."""
+    try:
+        from importlib.metadata import version
+
+        return version("mcli-framework")
+    except Exception:
+        return "unknown"
+
+
+def _module_source_path(import_path: str) -> Path:
+    """Map a "package.module.attribute" import path to its source file without importing."""
+    module_path = import_path.rsplit(".", 1)[0]
+    src_root = Path(__file__).resolve().parent.parent.parent
+    return src_root.joinpath(*module_path.split(".")).with_suffix(".py")
+
+
+def compute_manifest_key(commands: Optional[list[tuple[str, str]]] = None) -> dict[str, Any]:
+    """
+    Compute the invalidation key for the manifest.
+
+    Args:
+        commands: Command table to key (defaults to CORE_COMMANDS)
+
+    Returns:
+        Dictionary with the format version, package version and source mtimes
+    """
+    commands = commands if commands is not None else CORE_COMMANDS
+    sources: dict[str, int] = {}
+    for _, import_path in commands:
+        source = _module_source_path(import_path)
+        try:
+            sources[import_path] = source.stat().st_mtime_ns
+        except OSError:
+            sources[import_path] = 0
+    return {
+        "format": MANIFEST_FORMAT_VERSION,
+        "version": _get_package_version(),
+        "sources": sources,
+    }
+
+
+def _describe_param(param: click.Parameter) -> dict[str, Any]:
+    """Serialize the parts of a Click parameter needed for help and completion."""
+    return {
+        "name": param.name,
+        "kind": param.param_type_name,
+        "opts": list(param.opts),
+        "secondary_opts": list(param.secondary_opts),
+        "type": param.type.name,
+        "required": param.required,
+        "multiple": param.multiple,
+        "is_flag": bool(getattr(param, "is_flag", False)),
+        "help": getattr(param, "help", None),
+    }
+
+
+def describe_command(name: str, import_path: str, command: click.Command) -> dict[str, Any]:
+    """
+    Build the manifest entry for a loaded Click command.
+
+    Args:
+        name: Name the command is registered under
+        import_path: "module.attribute" path used to load it lazily
+        command: The loaded Click command or group
+
+    Returns:
+        JSON-serializable manifest entry
+    """
+    entry: dict[str, Any] = {
+        "name": name,
+        "import_path": import_path,
+        "is_group": isinstance(command, click.Group),
+        "help": command.help,
+        "short_help": command.get_short_help_str(limit=120),
+        "hidden": command.hidden,
+        "params": [_describe_param(p) for p in command.params],
+    }
+    if isinstance(command, click.Group):
+        entry["subcommands"] = sorted(command.commands)
+    return entry
+
+
+def build_manifest(commands: Optional[list[tuple[str, str]]] = None) -> dict[str, Any]:
+    """
+    Import every command module once and describe its command.
+
+    Commands whose module fails to import are left out, matching the previous
+    eager registration which skipped them.
+
+    Args:
+        commands: Command table to build (defaults to CORE_COMMANDS)
+
+    Returns:
+        Manifest dictionary with "key" and ordered "commands" entries
+    """
+    commands = commands if commands is not None else CORE_COMMANDS
+    entries = []
+    for name, import_path in commands:
+        module_path, attr_name = import_path.rsplit(".", 1)
+        try:
+            module = importlib.import_module(module_path)
+            command = getattr(module, attr_name)
+        except Exception as e:
+            logger.debug(f"Could not load {name} command for manifest: {e}")
+            continue
+        entries.append(describe_command(name, import_path, command))
+
+    return {"key": compute_manifest_key(commands), "commands": entries}
+
+
+def save_manifest(manifest: dict[str, Any], path: Optional[Path] = None) -> bool:
+    """
+    Atomically write the manifest to disk.
+
+    Args:
+        manifest: Manifest data to save
+        path: Destination (defaults to get_manifest_path())
+
+    Returns:
+        True if successful, False otherwise
+    """
+    path = path or get_manifest_path()
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
+        return True
+    except Exception as e:
+        logger.debug(f"Failed to save command manifest: {e}")
+        tmp_path.unlink(missing_ok=True)
+        return False
+
+
+def load_manifest(
+    commands: Optional[list[tuple[str, str]]] = None, path: Optional[Path] = None
+) -> dict[str, Any]:
+    """
+    Load the command manifest, rebuilding it when missing or stale.
+
+    Args:
+        commands: Command table the manifest must describe (defaults to CORE_COMMANDS)
+        path: Manifest location (defaults to get_manifest_path())
+
+    Returns:
+        Manifest dictionary with "key" and ordered "commands" entries
+    """
+    commands = commands if commands is not None else CORE_COMMANDS
+    path = path or get_manifest_path()
+    key = compute_manifest_key(commands)
+
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+        if manifest.get("key") == key:
+            return manifest
+        logger.debug("Command manifest is stale, rebuilding")
+    except FileNotFoundError:
+        logger.debug("No command manifest found, building")
+    except Exception as e:
+        logger.debug(f"Failed to read command manifest, rebuilding: {e}")
+
+    manifest = build_manifest(commands)
+    save_manifest(manifest, path)
+    return manifest
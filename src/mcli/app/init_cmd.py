@@ -200,6 +200,10 @@ Workflows are stored as JSON files with the following structure:
 *.tmp
 *.temp
 
+# mcli workflow index and compiled code (local caches)
+.mcli_index.db*
+.mcli_pycache/
+
 # OS files
 .DS_Store
 Thumbs.db
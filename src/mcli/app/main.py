@@ -6,8 +6,14 @@ from typing import Optional
 import click
 import tomli
 
-from mcli.lib.api.api import register_command_as_api
-from mcli.lib.logger.logger import disable_runtime_tracing, enable_runtime_tracing, get_logger
+from mcli.lib.logger.logger import (
+    disable_runtime_tracing,
+    disable_sampling_profiler,
+    enable_runtime_tracing,
+    enable_sampling_profiler,
+    get_logger,
+)
+from mcli.lib.logger.profiler import DEFAULT_INTERVAL
 
 # Desired command order for help display
 COMMAND_ORDER = [
@@ -52,6 +58,21 @@ class OrderedGroup(click.Group):
 
         return ordered + remaining
 
+    def resolve_command(self, ctx: click.Context, args: list[str]):
+        """Resolve a subcommand, replacing a lazy stub with the real command on dispatch."""
+        cmd_name, cmd, remaining_args = super().resolve_command(ctx, args)
+
+        # Help listings only need the stub's manifest metadata, but dispatch and
+        # argument completion need the real command's params and callbacks.
+        if isinstance(cmd, LazyGroup):
+            cmd = cmd._load_group()
+            self.commands[cmd_name] = cmd
+        elif isinstance(cmd, LazyCommand):
+            cmd = cmd._load_command()
+            self.commands[cmd_name] = cmd
+
+        return cmd_name, cmd, remaining_args
+
 
 # Defer performance optimizations until needed
 _optimization_results = None
@@ -67,11 +88,25 @@ if trace_level:
     try:
         # Convert to integer (1=function calls, 2=line by line, 3=verbose)
         level = int(trace_level)
-        enable_runtime_tracing(level=level)
-        logger.info(f"Runtime tracing enabled with level {level}")
     except ValueError:
         logger.warning(f"Invalid MCLI_TRACE_LEVEL value: {trace_level}. Using default level 1.")
-        enable_runtime_tracing(level=1)
+        level = 1
+    if os.environ.get("MCLI_TRACE_MODE", "").lower() == "sample":
+        profile_interval = os.environ.get("MCLI_PROFILE_INTERVAL")
+        try:
+            interval = float(profile_interval) if profile_interval else DEFAULT_INTERVAL
+        except ValueError:
+            logger.warning(
+                f"Invalid MCLI_PROFILE_INTERVAL value: {profile_interval}. "
+                f"Using default interval {DEFAULT_INTERVAL}."
+            )
+            interval = DEFAULT_INTERVAL
+        # Sampling profiler: level 2+ resolves samples to lines instead of functions
+        enable_sampling_profiler(interval=interval, lines=level >= 2)
+        logger.info(f"Sampling profiler enabled with level {level}")
+    else:
+        enable_runtime_tracing(level=level)
+        logger.info(f"Runtime tracing enabled with level {level}")
 
 # Defer self management commands import
 
@@ -180,7 +215,7 @@ def discover_modules(base_path: Path, config_path: Optional[Path] = None) -> lis
                             continue
 
                         modules.append(module_name)
-                        logger.debug(f"Found module: {module_name}")
+                        logger.debug("Found module: %s", module_name)
 
     logger.info(f"Discovered {len(modules)} modules")
     return modules
@@ -196,11 +231,13 @@ def register_command_as_api_endpoint(command_func, module_name: str, command_nam
         command_name: The command name
     """
     try:
+        # Imported here so that plain CLI startup never pays for FastAPI
+        from mcli.lib.api.api import register_command_as_api
+
         # Create endpoint path based on module and command
         endpoint_path = f"/{module_name.replace('.', '/')}/{command_name}"
 
-        logger.info(f"Registering API endpoint: {endpoint_path} for command {command_name}")
-        logger.info(f"Command function: {command_func.__name__}")
+        logger.debug("Registering API endpoint: %s for command %s", endpoint_path, command_name)
 
         # Register the command as an API endpoint
         register_command_as_api(
@@ -211,7 +248,7 @@ def register_command_as_api_endpoint(command_func, module_name: str, command_nam
             tags=[module_name.split(".")[-1]],  # Use last part of module name as tag
         )
 
-        logger.debug(f"Registered API endpoint: {endpoint_path} for command {command_name}")
+        logger.debug("Registered API endpoint: %s for command %s", endpoint_path, command_name)
 
     except Exception as e:
         logger.warning(f"Failed to register API endpoint for {command_name}: {e}")
@@ -229,30 +266,32 @@ def process_click_commands(obj, module_name: str, parent_name: str = ""):
         module_name: The module name
         parent_name: Parent command name for nesting
     """
-    logger.info(
-        f"Processing Click object: {type(obj).__name__} with name: {getattr(obj, 'name', 'Unknown')}"
+    logger.debug(
+        "Processing Click object: %s with name: %s",
+        type(obj).__name__,
+        getattr(obj, "name", "Unknown"),
     )
 
     if hasattr(obj, "commands"):
         # This is a Click group
-        logger.info(f"This is a Click group with {len(obj.commands)} commands")
+        logger.debug("This is a Click group with %d commands", len(obj.commands))
         for name, command in obj.commands.items():
             full_name = f"{parent_name}/{name}" if parent_name else name
-            logger.info(f"Processing command: {name} -> {full_name}")
+            logger.debug("Processing command: %s -> %s", name, full_name)
 
             # Register the command as an API endpoint
             register_command_as_api_endpoint(command.callback, module_name, full_name)
 
             # Recursively process nested commands
             if hasattr(command, "commands"):
-                logger.info(f"Recursively processing nested commands for {name}")
+                logger.debug("Recursively processing nested commands for %s", name)
                 process_click_commands(command, module_name, full_name)
     else:
         # This is a single command
-        logger.info(f"This is a single command: {getattr(obj, 'name', 'Unknown')}")
+        logger.debug("This is a single command: %s", getattr(obj, "name", "Unknown"))
         if hasattr(obj, "callback") and obj.callback:
             full_name = parent_name if parent_name else obj.name
-            logger.info(f"Registering single command: {full_name}")
+            logger.debug("Registering single command: %s", full_name)
             register_command_as_api_endpoint(obj.callback, module_name, full_name)
 
 
@@ -337,6 +376,17 @@ class LazyGroup(click.Group):
         group = self._load_group()
         return group.invoke(ctx)
 
+    @property
+    def commands(self):
+        """Subcommands of the lazily loaded group."""
+        return self._load_group().commands
+
+    @commands.setter
+    def commands(self, value):
+        # click.Group.__init__ assigns an empty dict; the real subcommands
+        # always live on the loaded group.
+        pass
+
     def get_command(self, ctx, cmd_name):
         """Get a command from the lazily loaded group."""
         group = self._load_group()
@@ -367,227 +417,30 @@ class LazyGroup(click.Group):
 
 
 def _add_lazy_commands(app: click.Group):
-    """Add command groups with lazy loading."""
+    """Register the built-in commands as lazy stubs described by the command manifest."""
     # ============================================================
     # Core top-level commands (simplified CLI structure v8.0.0)
     # ============================================================
-
-    # mcli run - The killer app: run workflow commands
-    # (registered below with workflows group)
-
-    # mcli list - List available commands
-    try:
-        from mcli.app.list_cmd import list_cmd
-
-        app.add_command(list_cmd, name="list")
-        logger.debug("Added list command")
-    except ImportError as e:
-        logger.debug(f"Could not load list command: {e}")
-
-    # mcli search - Search for commands
-    try:
-        from mcli.app.search_cmd import search
-
-        app.add_command(search, name="search")
-        logger.debug("Added search command")
-    except ImportError as e:
-        logger.debug(f"Could not load search command: {e}")
-
-    # mcli new - Create new workflow command
-    try:
-        from mcli.app.new_cmd import new
-
-        app.add_command(new, name="new")
-        logger.debug("Added new command")
-    except ImportError as e:
-        logger.debug(f"Could not load new command: {e}")
-
-    # mcli import - Import external scripts
-    try:
-        from mcli.app.import_cmd import import_cmd
-
-        app.add_command(import_cmd, name="import")
-        logger.debug("Added import command")
-    except ImportError as e:
-        logger.debug(f"Could not load import command: {e}")
-
-    # mcli edit - Edit a command
-    try:
-        from mcli.app.edit_cmd import edit
-
-        app.add_command(edit, name="edit")
-        logger.debug("Added edit command")
-    except ImportError as e:
-        logger.debug(f"Could not load edit command: {e}")
-
-    # mcli mv - Move/rename a command
-    try:
-        from mcli.app.mv_cmd import mv
-
-        app.add_command(mv, name="mv")
-        logger.debug("Added mv command")
-    except ImportError as e:
-        logger.debug(f"Could not load mv command: {e}")
-
-    # mcli rm - Delete a command
-    try:
-        from mcli.app.delete_cmd import rm
-
-        app.add_command(rm, name="rm")
-        logger.debug("Added rm command")
-    except ImportError as e:
-        logger.debug(f"Could not load rm command: {e}")
-
-    # mcli sync - IPFS sync + lockfile management
-    try:
-        from mcli.app.sync_cmd import sync_group
-
-        app.add_command(sync_group, name="sync")
-        logger.debug("Added sync group")
-    except ImportError as e:
-        logger.debug(f"Could not load sync group: {e}")
-
-    # mcli ci - act-first CI gate + hosted-trigger migration
-    try:
-        from mcli.workflow.ci.ci import ci
-
-        app.add_command(ci, name="ci")
-        logger.debug("Added ci group")
-    except ImportError as e:
-        logger.debug(f"Could not load ci group: {e}")
-
-    # mcli setup - Onboarding wizard for new users
-    try:
-        from mcli.app.setup_cmd import setup
-
-        app.add_command(setup, name="setup")
-        logger.debug("Added setup command")
-    except ImportError as e:
-        logger.debug(f"Could not load setup command: {e}")
-
-    # mcli init - Top-level shortcut to initialize workflows directory
-    try:
-        from mcli.app.init_cmd import init
-
-        app.add_command(init, name="init")
-        logger.debug("Added init command")
-    except ImportError as e:
-        logger.debug(f"Could not load init command: {e}")
-
-    # mcli context - Agent documentation (llms.txt convention)
-    try:
-        from mcli.app.context_cmd import context
-
-        app.add_command(context, name="context")
-        logger.debug("Added context command")
-    except ImportError as e:
-        logger.debug(f"Could not load context command: {e}")
-
-    # mcli health - Repository health analysis (promoted from mcli self health)
-    try:
-        from mcli.self.health_cmd import health
-
-        app.add_command(health, name="health")
-        logger.debug("Added health command")
-    except ImportError as e:
-        logger.debug(f"Could not load health command: {e}")
-
-    # mcli source - Python source file sync
-    try:
-        from mcli.app.source_sync_cmd import source_group
-
-        app.add_command(source_group, name="source")
-        logger.debug("Added source sync command")
-    except ImportError as e:
-        logger.debug(f"Could not load source sync command: {e}")
-
-    # mcli services - Service lifecycle management
-    try:
-        from mcli.app.services_cmd import services
-
-        app.add_command(services, name="services")
-        logger.debug("Added services command")
-    except ImportError as e:
-        logger.debug(f"Could not load services command: {e}")
-
-    # mcli self - Self management (version, update, plugin, completion)
-    try:
-        from mcli.self.self_cmd import self_app
-
-        app.add_command(self_app, name="self")
-        logger.debug("Added self management commands")
-    except Exception as e:
-        logger.debug(f"Could not load self commands: {e}")
-
-    # ============================================================
-    # mcli run - The killer app: run workflow commands
-    # ============================================================
-    # Add workflows group directly (not lazy-loaded) to preserve -g/--global option
-    try:
-        from mcli.workflow.workflow import workflows as workflows_group
-
-        # Primary command: mcli run (the only way to run workflows)
-        app.add_command(workflows_group, name="run")
-        logger.debug("Added 'run' command")
-    except ImportError as e:
-        logger.error(f"Could not load run/workflows group: {e}")
-        # Fallback to lazy loading if import fails
-        try:
-            from mcli.app.completion_helpers import create_completion_aware_lazy_group
-
-            workflows_group = create_completion_aware_lazy_group(
-                "run",
-                "mcli.workflow.workflow.workflows",
-                "Run workflow commands",
-            )
-            app.add_command(workflows_group, name="run")
-            logger.debug("Added completion-aware run group (fallback)")
-        except ImportError:
-            workflows_group = LazyGroup(
-                "run",
-                "mcli.workflow.workflow.workflows",
-                help="Run workflow commands",
+    # Names, help text and import paths come from the on-disk manifest (see
+    # mcli.app.command_manifest), so no command module is imported until its
+    # command is dispatched or completed. `mcli run` is a lazy group as well;
+    # its -g/--global option is preserved because OrderedGroup.resolve_command
+    # swaps in the real group before argument parsing.
+    from mcli.app.command_manifest import load_manifest
+
+    manifest = load_manifest()
+    for entry in manifest.get("commands", []):
+        stub_cls = LazyGroup if entry.get("is_group") else LazyCommand
+        app.add_command(
+            stub_cls(
+                entry["name"],
+                entry["import_path"],
+                help=entry.get("help"),
+                short_help=entry.get("short_help"),
+                hidden=entry.get("hidden", False),
             )
-            app.add_command(workflows_group, name="run")
-            logger.debug("Added lazy run group (fallback)")
-
-    # Lazy load other heavy commands that are used less frequently
-    # NOTE: chat and model commands have been removed
-    # - chat: removed from core commands
-    # - model: moved to ~/.mcli/commands workflow
-    # - test: removed from core commands
-    lazy_commands = {}
-
-    for cmd_name, cmd_info in lazy_commands.items():
-        # Skip workflows since we already added it with completion support
-        if cmd_name == "workflows":
-            continue
-
-        if cmd_name in ["model"]:
-            # Use completion-aware LazyGroup for commands that have subcommands
-            try:
-                from mcli.app.completion_helpers import create_completion_aware_lazy_group
-
-                lazy_cmd = create_completion_aware_lazy_group(
-                    cmd_name, cmd_info["import_path"], cmd_info["help"]
-                )
-            except ImportError:
-                # Fallback to standard LazyGroup
-                lazy_cmd = LazyGroup(
-                    name=cmd_name,
-                    import_path=cmd_info["import_path"],
-                    help=cmd_info["help"],
-                )
-        else:
-            # Use LazyCommand for simple commands
-            lazy_cmd = LazyCommand(
-                name=cmd_name,
-                import_path=cmd_info["import_path"],
-                callback=lambda: None,  # Placeholder
-                help=cmd_info["help"],
-            )
-        app.add_command(lazy_cmd)
-        logger.debug(f"Added lazy command: {cmd_name}")
+        )
+        logger.debug(f"Added lazy command: {entry['name']}")
 
     # Note: Native script workflows are now loaded directly by ScopedWorkflowsGroup
     # in workflow.py using ScriptLoader. No sync step needed.
@@ -640,6 +493,7 @@ def main():
         if os.environ.get("MCLI_TRACE_LEVEL"):
             logger.debug("Disabling runtime tracing on exit")
             disable_runtime_tracing()
+            disable_sampling_profiler()
 
 
 if __name__ == "__main__":
@@ -5,6 +5,8 @@ This module provides the `mcli search` command for searching workflow commands.
 """
 
 import json
+from pathlib import Path
+from typing import Optional
 
 import click
 
@@ -12,29 +14,37 @@ from mcli.lib.logger.logger import get_logger
 from mcli.lib.paths import get_custom_commands_dir
 from mcli.lib.script_loader import ScriptLoader
 from mcli.lib.ui.styling import console
-from mcli.lib.workspace_registry import auto_register_current, get_all_workflows
+from mcli.lib.workspace_registry import auto_register_current, get_all_workflow_dirs
 
 logger = get_logger(__name__)
 
 
-def _search_workflows(query: str, workflows: list) -> list:
-    """Search workflows by name, description, or tags."""
-    query_lower = query.lower()
-    matching = []
+def _search_workflows(
+    query: str, workflows_dir: Path, limit: Optional[int] = None, normalize: bool = False
+) -> list:
+    """Search a workflows directory by name, description, tags, group or language.
 
-    for wf in workflows:
-        name = wf.get("name", "").lower()
-        description = wf.get("description", "").lower()
-        tags = [t.lower() for t in wf.get("tags", [])]
-        language = wf.get("language", "").lower()
+    Results come from the directory's persistent search index, ranked best
+    first, and tolerate prefixes, substrings and small typos. BM25 scores
+    depend on the corpus they were computed over, so with ``normalize`` they
+    are divided by the directory's best score to compare across directories.
+    """
+    loader = ScriptLoader(workflows_dir)
+    matching = []
 
-        if (
-            query_lower in name
-            or query_lower in description
-            or any(query_lower in tag for tag in tags)
-            or query_lower in language
-        ):
-            matching.append(wf)
+    results = loader.search(query, limit)
+    top_score = results[0][1].score if normalize and results else 0.0
+    for script_path, hit in results:
+        try:
+            info = loader.get_script_info(script_path)
+        except Exception as e:
+            logger.debug(f"Failed to get info for {script_path}: {e}")
+            continue
+        info["name"] = script_path.stem
+        info["path"] = str(script_path)
+        info["score"] = round(hit.score / top_score if top_score else hit.score, 4)
+        info["matched_fields"] = hit.matched_fields
+        matching.append(info)
 
     return matching
 
@@ -45,11 +55,15 @@ def _search_workflows(query: str, workflows: list) -> list:
 @click.option("--all", "-a", "search_all", is_flag=True, help="Search all registered workspaces")
 @click.option("--global", "-g", "is_global", is_flag=True, help="Search global workflows only")
 @click.option("--builtin", "-b", is_flag=True, help="Also search built-in CLI commands")
-def search(query: str, as_json: bool, search_all: bool, is_global: bool, builtin: bool):
+@click.option(
+    "--limit", "-n", default=50, show_default=True, help="Maximum workflows to show (0 for all)"
+)
+def search(query: str, as_json: bool, search_all: bool, is_global: bool, builtin: bool, limit: int):
     """🔍 Search workflows by name, description, or tags.
 
     By default searches workflows in the current workspace (local if in git repo,
-    or global otherwise).
+    or global otherwise). Results are ranked by relevance and tolerate small
+    typos.
 
     Examples:
         mcli search backup          # Search current workspace workflows
@@ -57,6 +71,7 @@ def search(query: str, as_json: bool, search_all: bool, is_global: bool, builtin
         mcli search test --global   # Search global workflows only
         mcli search model --builtin # Also search built-in commands
         mcli search test --json     # Output results as JSON
+        mcli search deploy -n 10    # Show only the 10 best matches
     """
     try:
         # Auto-register current workspace
@@ -67,31 +82,21 @@ def search(query: str, as_json: bool, search_all: bool, is_global: bool, builtin
         # Search user workflows
         if search_all:
             # Search all registered workspaces
-            all_workflows_by_workspace = get_all_workflows()
-            for workspace_name, workflows in all_workflows_by_workspace.items():
-                matching = _search_workflows(query, workflows)
+            for workspace_name, workflows_dir in get_all_workflow_dirs().items():
+                matching = _search_workflows(query, workflows_dir, limit or None, normalize=True)
                 for wf in matching:
                     wf["workspace"] = workspace_name
                     wf["source"] = "workflow"
                 all_results.extend(matching)
+            # Rank across workspaces, not workspace by workspace
+            all_results.sort(key=lambda wf: wf["score"], reverse=True)
+            if limit:
+                all_results = all_results[:limit]
         else:
             # Search specific scope
             workflows_dir = get_custom_commands_dir(global_mode=is_global)
             if workflows_dir.exists():
-                loader = ScriptLoader(workflows_dir)
-                scripts = loader.discover_scripts()
-
-                workflows = []
-                for script_path in scripts:
-                    try:
-                        info = loader.get_script_info(script_path)
-                        info["name"] = script_path.stem
-                        info["path"] = str(script_path)
-                        workflows.append(info)
-                    except Exception as e:
-                        logger.debug(f"Failed to get info for {script_path}: {e}")
-
-                matching = _search_workflows(query, workflows)
+                matching = _search_workflows(query, workflows_dir, limit or None)
                 for wf in matching:
                     wf["source"] = "workflow"
                     wf["workspace"] = "global" if is_global else "local"
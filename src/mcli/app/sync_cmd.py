@@ -289,6 +289,13 @@ def sync_update(is_global: bool):
     if loader.save_lockfile():
         success(f"Updated lockfile: {loader.lockfile_path}")
         info(f"Tracked {len(scripts)} workflow script(s)")
+        stats = loader.lockfile_stats
+        if stats and stats.analyzed:
+            info(
+                f"Re-hashed {stats.analyzed} changed script(s), "
+                f"{stats.bytes_read / 1_048_576:.1f} MiB in {stats.seconds:.2f}s "
+                f"({stats.throughput / 1_048_576:.1f} MiB/s)"
+            )
         return 0
     else:
         error("Failed to update lockfile.")
@@ -419,18 +426,21 @@ def sync_show(name: Optional[str], is_global: bool):
 @sync_group.command(name="push")
 @click.option("--global", "-g", "global_mode", is_flag=True, help="Push global commands")
 @click.option("--description", "-d", help="Description for this sync")
-def sync_push_command(global_mode: bool, description: str):
+@click.option("--full", is_flag=True, help="Re-upload every script, not only new or changed ones")
+def sync_push_command(global_mode: bool, description: str, full: bool):
     """⬆️ Push workflow state to IPFS.
 
     Uploads your current command lockfile to IPFS and returns an immutable
     CID (Content Identifier) that anyone can use to retrieve the exact same
-    workflow state. If MCLI_SYNC_KEY is set, also publishes to IPNS for
+    workflow state. Only scripts that changed since a previous push are
+    uploaded again. If MCLI_SYNC_KEY is set, also publishes to IPNS for
     automatic resolution by teammates.
 
     Examples:
         mcli sync push
         mcli sync push -d "Production v1.0"
         mcli sync push --global
+        mcli sync push --full
     """
     from mcli.lib.ipfs_sync import IPFSSync
     from mcli.lib.ipfs_utils import ensure_daemon_running
@@ -452,10 +462,16 @@ def sync_push_command(global_mode: bool, description: str):
     info(SyncMessages.UPLOADING_TO_IPFS)
 
     ipfs = IPFSSync()
-    cid = ipfs.push(lockfile_path, description=description or "")
+    cid = ipfs.push(lockfile_path, description=description or "", full=full)
 
     if cid:
         success(SyncMessages.PUSHED_TO_IPFS)
+        counts = ipfs.last_script_counts
+        console.print(
+            SyncMessages.SCRIPTS_PUSHED.format(
+                uploaded=counts["uploaded"], reused=counts["reused"], failed=counts["failed"]
+            )
+        )
         console.print(SyncMessages.CID_LABEL.format(cid=cid))
         console.print(SyncMessages.RETRIEVE_HINT)
         console.print(SyncMessages.RETRIEVE_COMMAND.format(cid=cid))
@@ -487,19 +503,27 @@ def sync_push_command(global_mode: bool, description: str):
     type=click.Path(path_type=Path, file_okay=False),
     help="Reconstruct script files into this directory (per-script CIDs in manifest)",
 )
+@click.option(
+    "--full",
+    is_flag=True,
+    help="With --workflows-dir, rewrite every script, not only missing or changed ones",
+)
 def sync_pull_command(
     cid: Optional[str],
     output: Optional[Path],
     no_verify: bool,
     repo: Optional[str],
     workflows_dir: Optional[Path],
+    full: bool,
 ):
     """⬇️ Pull workflow state from IPFS.
 
     If CID is provided, retrieves that exact version. If CID is omitted and
     MCLI_SYNC_KEY is set, automatically resolves the latest via IPNS. With
     --workflows-dir, also reconstructs each command's script file from its
-    per-script CID embedded in the manifest.
+    per-script CID embedded in the manifest; scripts already up to date are
+    left alone, and manifests and scripts pulled before come from a local
+    store without network access.
 
     Examples:
         mcli sync pull                                 # Auto-resolve via IPNS
@@ -566,15 +590,20 @@ def sync_pull_command(
         # Optional: reconstruct script files from per-script CIDs
         if workflows_dir:
             try:
-                written = ipfs.pull_workflows(cid, workflows_dir, verify=not no_verify)
+                written = ipfs.pull_workflows(cid, workflows_dir, verify=not no_verify, full=full)
             except ValueError as exc:
                 error(f"Hash verification failed: {exc}")
                 return
+            counts = ipfs.last_pull_counts
             if written:
                 success(f"Restored {len(written)} script file(s) to {workflows_dir}")
                 for path in written:
                     console.print(f"  [dim]{path}[/dim]")
-            else:
+            if counts["unchanged"]:
+                console.print(f"[dim]{counts['unchanged']} script file(s) already up to date[/dim]")
+            if counts["failed"]:
+                warning(f"{counts['failed']} script file(s) could not be fetched")
+            if not written and not counts["unchanged"] and not counts["failed"]:
                 console.print(
                     "[dim]No script files restored — manifest predates per-script CIDs.[/dim]"
                 )
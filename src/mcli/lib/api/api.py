@@ -12,7 +12,15 @@ from typing import Any, Callable, Dict, List, Optional, Sequence, Type, Union, c
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field, create_model
+
+from mcli.lib.api.dispatch import (
+    EndpointDispatcher,
+    configure_executors,
+    get_job_store,
+    shutdown_executors,
+)
 
 # Import existing utilities
 from mcli.lib.logger.logger import get_logger
@@ -63,6 +71,7 @@ def get_api_config() -> Dict[str, Any]:
         "port": None,  # Will be set to random port if None
         "use_random_port": True,
         "debug": False,
+        "max_workers": None,  # Size of the shared command pools (None: executor default)
     }
 
     # Try to load from config.toml files
@@ -98,6 +107,8 @@ def get_api_config() -> Dict[str, Any]:
     if os.environ.get("MCLI_API_DEBUG", "false").lower() in ("true", "1", "yes"):
         config["debug"] = True
 
+    configure_executors(config["max_workers"])
+
     # Set random port if needed
     if config["enabled"] and config["use_random_port"] and config["port"] is None:
         config["port"] = find_free_port()
@@ -116,6 +127,9 @@ class ClickToAPIDecorator:
         response_model: Optional[Type[BaseModel]] = None,
         description: Optional[str] = None,
         tags: Optional[Sequence[Union[str, Enum]]] = None,
+        executor: str = "thread",
+        max_workers: Optional[int] = None,
+        as_job: bool = False,
     ):
         """
         Initialize the decorator.
@@ -126,12 +140,18 @@ class ClickToAPIDecorator:
             response_model: Pydantic model for response validation
             description: API endpoint description
             tags: API tags for grouping
+            executor: Pool running synchronous commands ("thread" or "process")
+            max_workers: Give the endpoint a dedicated pool of this size
+            as_job: Answer 202 with a job id and run the command in the background
         """
         self.endpoint_path = endpoint_path
         self.http_method = http_method.upper()
         self.response_model = response_model
         self.description = description
         self.tags: Sequence[Union[str, Enum]] = tags if tags is not None else []
+        self.executor = executor
+        self.max_workers = max_workers
+        self.as_job = as_job
 
     def __call__(self, func: Callable) -> Callable:
         """Apply the decorator to a function."""
@@ -255,7 +275,7 @@ class ClickToAPIDecorator:
 
         # Create dynamic model
         model_name = f"{func.__name__}Request"
-        return cast(Type[BaseModel], type(model_name, (BaseModel,), fields))
+        return cast(Type[BaseModel], create_model(model_name, **fields))
 
     def _create_response_model(self) -> Type[BaseModel]:
         """Create a default response model."""
@@ -279,46 +299,69 @@ class ClickToAPIDecorator:
         description: str,
         tags: Sequence[Union[str, Enum]],
     ) -> None:
-        """Register an endpoint with FastAPI."""
+        """Register an endpoint with FastAPI.
 
-        async def api_endpoint(request: BaseModel) -> BaseModel:
-            """API endpoint wrapper."""
-            try:
-                # Convert request model to kwargs
-                kwargs = request.model_dump()
+        Synchronous functions run on the endpoint's executor so they never
+        block the event loop; coroutine functions are awaited directly.
+        """
+        dispatcher = EndpointDispatcher(func, executor=self.executor, max_workers=self.max_workers)
+
+        if self.as_job:
+            jobs = get_job_store(app)
+
+            async def api_endpoint(request: BaseModel) -> Any:
+                """API endpoint wrapper starting a background job."""
+                job = jobs.submit(path, dispatcher, request.model_dump())
+                status_url = f"/jobs/{job.id}"
+                return JSONResponse(
+                    status_code=202,
+                    content={
+                        "job_id": job.id,
+                        "status": job.status,
+                        "status_url": status_url,
+                        "stream_url": f"{status_url}/stream",
+                    },
+                    headers={"Location": status_url},
+                )
 
-                # Call the original function
-                result = func(**kwargs)
+        else:
 
-                # Return response
-                return response_model(
-                    success=True, result=result, message="Operation completed successfully"
-                )
+            async def api_endpoint(request: BaseModel) -> Any:
+                """API endpoint wrapper."""
+                try:
+                    # Convert request model to kwargs
+                    kwargs = request.model_dump()
 
-            except Exception as e:
-                logger.error(f"API endpoint error: {e}")
-                return response_model(success=False, error=str(e), message="Operation failed")
+                    # Call the original function off the event loop
+                    result = await dispatcher(kwargs)
+
+                    # Return response
+                    return response_model(
+                        success=True, result=result, message="Operation completed successfully"
+                    )
+
+                except Exception as e:
+                    logger.error(f"API endpoint error: {e}")
+                    return response_model(success=False, error=str(e), message="Operation failed")
+
+        # Let FastAPI validate the body against the command's own request model
+        api_endpoint.__annotations__["request"] = request_model
+        route_options: Dict[str, Any] = {"response_model": response_model}
+        if self.as_job:
+            route_options = {"status_code": 202, "response_model": None}
 
         # Convert tags to list for FastAPI
         tags_list: List[Union[str, Enum]] = list(tags)
 
         # Register with FastAPI
         if method == "GET":
-            app.get(path, response_model=response_model, description=description, tags=tags_list)(
-                api_endpoint
-            )
+            app.get(path, description=description, tags=tags_list, **route_options)(api_endpoint)
         elif method == "POST":
-            app.post(path, response_model=response_model, description=description, tags=tags_list)(
-                api_endpoint
-            )
+            app.post(path, description=description, tags=tags_list, **route_options)(api_endpoint)
         elif method == "PUT":
-            app.put(path, response_model=response_model, description=description, tags=tags_list)(
-                api_endpoint
-            )
+            app.put(path, description=description, tags=tags_list, **route_options)(api_endpoint)
         elif method == "DELETE":
-            app.delete(
-                path, response_model=response_model, description=description, tags=tags_list
-            )(api_endpoint)
+            app.delete(path, description=description, tags=tags_list, **route_options)(api_endpoint)
 
     def _get_registered_endpoints(self, app: FastAPI) -> List[Dict[str, str]]:
         """Get list of registered endpoints."""
@@ -342,6 +385,9 @@ def api_endpoint(
     response_model: Optional[Type[BaseModel]] = None,
     description: Optional[str] = None,
     tags: Optional[Sequence[Union[str, Enum]]] = None,
+    executor: str = "thread",
+    max_workers: Optional[int] = None,
+    as_job: bool = False,
 ) -> ClickToAPIDecorator:
     """
     Decorator that makes Click commands also serve as API endpoints.
@@ -352,12 +398,21 @@ def api_endpoint(
         response_model: Pydantic model for response validation
         description: API endpoint description
         tags: API tags for grouping
+        executor: Pool running synchronous commands ("thread" or "process")
+        max_workers: Give the endpoint a dedicated pool of this size
+        as_job: Answer 202 with a job id and run the command in the background
 
     Example:
         @click.command()
         @api_endpoint("/generate", "POST")
         def generate_text(prompt: str, max_length: int = 100):
             return {"text": "Generated text"}
+
+        # Long run: POST /train answers 202, then poll GET /jobs/{job_id}
+        @click.command()
+        @api_endpoint("/train", "POST", executor="process", as_job=True)
+        def train(epochs: int = 10):
+            ...
     """
     return ClickToAPIDecorator(
         endpoint_path=endpoint_path,
@@ -365,6 +420,9 @@ def api_endpoint(
         response_model=response_model,
         description=description,
         tags=tags,
+        executor=executor,
+        max_workers=max_workers,
+        as_job=as_job,
     )
 
 
@@ -511,6 +569,7 @@ def stop_api_server():
         # In a real implementation, you'd want to properly shutdown the server
         # For now, we'll just set the flag
         _api_server_running = False
+        shutdown_executors()
         logger.info("API server stopped")
 
 
@@ -531,6 +590,9 @@ def register_command_as_api(
     response_model: Optional[Type[BaseModel]] = None,
     description: Optional[str] = None,
     tags: Optional[Sequence[Union[str, Enum]]] = None,
+    executor: str = "thread",
+    max_workers: Optional[int] = None,
+    as_job: bool = False,
 ) -> None:
     """
     Register a Click command as an API endpoint.
@@ -542,6 +604,9 @@ def register_command_as_api(
         response_model: Pydantic model for response
         description: API endpoint description
         tags: API tags for grouping
+        executor: Pool running synchronous commands ("thread" or "process")
+        max_workers: Give the endpoint a dedicated pool of this size
+        as_job: Answer 202 with a job id and run the command in the background
     """
     logger.info(
         f"register_command_as_api called for: {command_func.__name__} with path: {endpoint_path}"
@@ -561,6 +626,9 @@ def register_command_as_api(
         response_model=response_model,
         description=description,
         tags=tags,
+        executor=executor,
+        max_workers=max_workers,
+        as_job=as_job,
     )
 
     # Register the endpoint directly with the API app
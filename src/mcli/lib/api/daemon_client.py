@@ -1,16 +1,141 @@
+import os
+import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 from requests.exceptions import ConnectionError, Timeout
 
+from mcli.lib.api.daemon_ipc import (
+    DaemonIPCClient,
+    DaemonIPCConnectionError,
+    DaemonIPCError,
+    DaemonIPCResponseError,
+    is_socket_available,
+)
 from mcli.lib.logger.logger import get_logger
 from mcli.lib.toml.toml import read_from_toml
 
 logger = get_logger(__name__)
 
+CONFIG_PATHS = [
+    Path("config.toml"),  # Current directory
+    Path.home() / ".config" / "mcli" / "config.toml",  # User config
+    Path(__file__).parent.parent.parent.parent.parent / "config.toml",  # Project root
+]
+
+# How often config files are re-stat'ed for changes; within this window the
+# parsed [api_daemon] sections are served from memory.
+CONFIG_RECHECK_INTERVAL = 1.0
+
+_config_lock = threading.Lock()
+_config_signature: Optional[Tuple] = None
+_config_checked_at = float("-inf")
+_config_sections: List[Tuple[Path, Dict[str, Any]]] = []
+_config_generation = 0
+
+
+def _stat_signature() -> Tuple:
+    """Identity of the config files: path, mtime and size of each that exists."""
+    signature = [os.getcwd()]
+    for path in CONFIG_PATHS:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def api_daemon_config_sections() -> Tuple[List[Tuple[Path, Dict[str, Any]]], int]:
+    """The ``[api_daemon]`` sections of the config files, in precedence order.
+
+    Files are re-read only when their mtime or size changes, and checked for
+    changes at most every ``CONFIG_RECHECK_INTERVAL`` seconds. Also returns a
+    generation number that increases whenever the sections are re-read.
+    """
+    global _config_signature, _config_checked_at, _config_sections, _config_generation
+
+    with _config_lock:
+        now = time.monotonic()
+        if now - _config_checked_at < CONFIG_RECHECK_INTERVAL:
+            return _config_sections, _config_generation
+        _config_checked_at = now
+
+        signature = _stat_signature()
+        if signature == _config_signature:
+            return _config_sections, _config_generation
+
+        sections = []
+        for entry in signature[1:]:
+            path = Path(entry[0])
+            try:
+                daemon_config = read_from_toml(str(path), "api_daemon")
+            except Exception as e:
+                logger.debug(f"Could not read daemon config from {path}: {e}")
+                continue
+            if daemon_config:
+                sections.append((path, daemon_config))
+
+        _config_signature = signature
+        _config_sections = sections
+        _config_generation += 1
+        return sections, _config_generation
+
+
+def invalidate_config_cache() -> None:
+    """Force the next config lookup to re-stat the config files."""
+    global _config_checked_at
+    with _config_lock:
+        _config_checked_at = float("-inf")
+
+
+class DaemonUnavailableError(ConnectionError):
+    """The daemon is known to be down; the request was not attempted."""
+
+
+class CircuitBreaker:
+    """Stops calling a daemon that just failed until a health check passes.
+
+    After ``failure_threshold`` consecutive connection failures the breaker
+    opens and requests fail fast. Once ``cooldown`` seconds pass, the next
+    request first probes the daemon's health and only proceeds if it answers.
+    """
+
+    def __init__(self, failure_threshold: int = 1, cooldown: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def needs_probe(self) -> bool:
+        """Whether the breaker is open; raises while the cooldown lasts."""
+        with self._lock:
+            if self.opened_at is None:
+                return False
+            remaining = self.opened_at + self.cooldown - time.monotonic()
+        if remaining > 0:
+            raise DaemonUnavailableError(f"Daemon unavailable, retrying in {remaining:.0f}s")
+        return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
 
 @dataclass
 class DaemonClientConfig:
@@ -21,6 +146,11 @@ class DaemonClientConfig:
     timeout: int = 30
     retry_attempts: int = 3
     retry_delay: float = 1.0
+    # Prefer the daemon's local Unix socket over HTTP when it is listening
+    use_ipc: bool = True
+    socket_path: Optional[str] = None
+    # Seconds to stop calling a daemon after a connection failure
+    breaker_cooldown: float = 30.0
 
 
 class APIDaemonClient:
@@ -35,6 +165,8 @@ class APIDaemonClient:
         else:
             self.base_url = f"http://{self.config.host}:{self.config.port}"
         self.session = requests.Session()
+        self._ipc: Optional[DaemonIPCClient] = None
+        self.breaker = CircuitBreaker(cooldown=self.config.breaker_cooldown)
 
     def execute_shell_command(self, command: str) -> Dict[str, Any]:
         """Execute a raw shell command via the Flask test server."""
@@ -52,29 +184,50 @@ class APIDaemonClient:
         """Load configuration from config files."""
         config = DaemonClientConfig()
 
-        # Try to load from config.toml files
-        config_paths = [
-            Path("config.toml"),  # Current directory
-            Path.home() / ".config" / "mcli" / "config.toml",  # User config
-            Path(__file__).parent.parent.parent.parent.parent / "config.toml",  # Project root
-        ]
-
-        for path in config_paths:
-            if path.exists():
-                try:
-                    daemon_config = read_from_toml(str(path), "api_daemon")
-                    if daemon_config:
-                        if daemon_config.get("host"):
-                            config.host = daemon_config["host"]
-                        if daemon_config.get("port"):
-                            config.port = daemon_config["port"]
-                        logger.debug(f"Loaded daemon client config from {path}")
-                        break
-                except Exception as e:
-                    logger.debug(f"Could not load daemon client config from {path}: {e}")
+        sections, _ = api_daemon_config_sections()
+        if sections:
+            path, daemon_config = sections[0]
+            if daemon_config.get("host"):
+                config.host = daemon_config["host"]
+            if daemon_config.get("port"):
+                config.port = daemon_config["port"]
+            if "use_ipc" in daemon_config:
+                config.use_ipc = bool(daemon_config["use_ipc"])
+            if daemon_config.get("socket_path"):
+                config.socket_path = daemon_config["socket_path"]
+            if daemon_config.get("breaker_cooldown") is not None:
+                config.breaker_cooldown = float(daemon_config["breaker_cooldown"])
+            logger.debug(f"Loaded daemon client config from {path}")
 
         return config
 
+    def _ipc_client(self) -> Optional[DaemonIPCClient]:
+        """The socket client, if IPC is enabled and the daemon's socket exists."""
+        if self.shell_mode or not self.config.use_ipc:
+            return None
+        if self._ipc is None and is_socket_available(self.config.socket_path):
+            self._ipc = DaemonIPCClient(self.config.socket_path, timeout=self.config.timeout)
+        return self._ipc
+
+    def _ipc_request(self, op: str, **params: Any) -> Any:
+        """Send a request over the socket.
+
+        Raises:
+            DaemonIPCConnectionError: IPC is unavailable and nothing was sent; the
+                caller falls back to HTTP.
+            DaemonIPCResponseError: The request was sent but its response was lost.
+            DaemonIPCError: The daemon rejected the request.
+        """
+        client = self._ipc_client()
+        if client is None:
+            raise DaemonIPCConnectionError("Daemon socket not available")
+        try:
+            return client.request(op, **params)
+        except (DaemonIPCConnectionError, DaemonIPCResponseError) as e:
+            logger.debug(f"Daemon socket request failed: {e}")
+            self._ipc = None
+            raise
+
     def _make_request(
         self,
         method: str,
@@ -83,8 +236,15 @@ class APIDaemonClient:
         params: Optional[Dict] = None,
         **kwargs,
     ) -> Dict[str, Any]:
-        """Make HTTP request to daemon with retry logic."""
+        """Make HTTP request to daemon with retry logic.
+
+        Raises:
+            DaemonUnavailableError: The daemon failed recently and has not yet
+                passed a health check; nothing was sent.
+        """
         url = f"{self.base_url}{endpoint}"
+        if self.breaker.needs_probe():
+            self._probe()
         for attempt in range(self.config.retry_attempts):
             try:
                 if method.upper() == "GET":
@@ -96,6 +256,7 @@ class APIDaemonClient:
                         method=method, url=url, json=data, timeout=self.config.timeout, **kwargs
                     )
                 response.raise_for_status()
+                self.breaker.record_success()
                 return response.json()
             except requests.exceptions.RequestException as e:
                 # Only retry on transient errors (connection issues, timeouts, server errors)
@@ -107,6 +268,8 @@ class APIDaemonClient:
                 if not is_transient:
                     raise Exception(f"Failed to connect to API daemon at {url}: {e}")
                 if attempt == self.config.retry_attempts - 1:
+                    if isinstance(e, (ConnectionError, Timeout)):
+                        self.breaker.record_failure()
                     raise Exception(f"Failed to connect to API daemon at {url}: {e}")
                 logger.warning(
                     f"Attempt {attempt + 1} failed, retrying in {self.config.retry_delay}s..."
@@ -114,16 +277,32 @@ class APIDaemonClient:
                 time.sleep(self.config.retry_delay)
         return {}  # Always return a dict
 
+    def _probe(self) -> None:
+        """Health-check a daemon whose breaker is open; any HTTP answer closes it."""
+        try:
+            self.session.get(f"{self.base_url}/health", timeout=min(self.config.timeout, 2))
+        except requests.exceptions.RequestException as e:
+            self.breaker.record_failure()
+            raise DaemonUnavailableError(f"Daemon health check failed: {e}") from e
+        self.breaker.record_success()
+
     def health_check(self) -> Dict[str, Any]:
         """Check daemon health."""
         return self._make_request("GET", "/health")
 
     def status(self) -> Dict[str, Any]:
         """Get daemon status."""
-        return self._make_request("GET", "/status")
+        try:
+            return self._ipc_request("status")
+        except (DaemonIPCConnectionError, DaemonIPCResponseError):
+            return self._make_request("GET", "/status")
 
     def list_commands(self, all: bool = False) -> Dict[str, Any]:
         """List available commands with metadata. If all=True, include inactive."""
+        try:
+            return self._ipc_request("list", all=all)
+        except (DaemonIPCConnectionError, DaemonIPCResponseError):
+            pass
         params = {"all": str(all).lower()} if all else None
         return self._make_request("GET", "/commands", params=params)
 
@@ -142,6 +321,16 @@ class APIDaemonClient:
         if not command_id and not command_name:
             raise ValueError("Either command_id or command_name must be provided")
 
+        try:
+            return self._ipc_request(
+                "execute", command_id=command_id, command_name=command_name, args=args or []
+            )
+        except DaemonIPCConnectionError:
+            pass
+        except DaemonIPCError as e:
+            # Includes a lost response: the command may have run, so never re-send it
+            return {"success": False, "error": str(e)}
+
         data = {
             "args": args or [],
         }
@@ -186,9 +375,25 @@ def execute_shell_command_via_flask(command: str) -> Dict[str, Any]:
     return client.execute_shell_command(command)
 
 
+_shared_client: Optional[APIDaemonClient] = None
+_shared_client_generation = -1
+_shared_client_lock = threading.Lock()
+
+
 def get_daemon_client() -> APIDaemonClient:
-    """Get a configured daemon client."""
-    return APIDaemonClient()
+    """Get the process-wide daemon client.
+
+    The client (and so its keep-alive HTTP session, socket connection and
+    circuit breaker) is shared, and replaced only when the config changes.
+    """
+    global _shared_client, _shared_client_generation
+
+    _, generation = api_daemon_config_sections()
+    with _shared_client_lock:
+        if _shared_client is None or generation != _shared_client_generation:
+            _shared_client = APIDaemonClient()
+            _shared_client_generation = generation
+        return _shared_client
 
 
 def execute_command_via_daemon(
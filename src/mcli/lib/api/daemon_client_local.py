@@ -2,19 +2,45 @@ import json
 import subprocess
 from typing import Any, Dict, List, Optional
 
+from mcli.lib.api.daemon_ipc import (
+    DaemonIPCClient,
+    DaemonIPCConnectionError,
+    DaemonIPCError,
+    DaemonIPCResponseError,
+    is_socket_available,
+)
 from mcli.lib.logger.logger import get_logger
 
 logger = get_logger(__name__)
 
 
 class LocalDaemonClient:
-    """Client for interacting with the MCLI Daemon via CLI subprocess (local IPC)."""
+    """Client for interacting with the MCLI Daemon locally.
 
-    def __init__(self):
+    Talks to a running daemon over its Unix socket, and falls back to running
+    the daemon CLI in a subprocess when no daemon is listening.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None):
         self.daemon_cmd = ["python", "-m", "mcli.workflow.daemon.daemon"]
         # Optionally, you could use the installed CLI: ["mcli-daemon"]
+        self.socket_path = socket_path
+        self._ipc: Optional[DaemonIPCClient] = None
+
+    def _ipc_client(self) -> Optional[DaemonIPCClient]:
+        if self._ipc is None and is_socket_available(self.socket_path):
+            self._ipc = DaemonIPCClient(self.socket_path)
+        return self._ipc
 
     def list_commands(self) -> Dict[str, Any]:
+        client = self._ipc_client()
+        if client is not None:
+            try:
+                return {"commands": client.list_commands()}
+            except (DaemonIPCConnectionError, DaemonIPCResponseError) as e:
+                logger.debug(f"[LocalDaemonClient] socket unavailable, using subprocess: {e}")
+                self._ipc = None
+
         logger.info("[LocalDaemonClient] Invoking 'list-commands' via subprocess")
         result = subprocess.run(
             self.daemon_cmd + ["list-commands", "--json"], capture_output=True, text=True
@@ -27,6 +53,20 @@ class LocalDaemonClient:
     def execute_command(
         self, command_name: str, args: Optional[List[str]] = None
     ) -> Dict[str, Any]:
+        client = self._ipc_client()
+        if client is not None:
+            try:
+                return client.execute_command(command_name=command_name, args=args)
+            except DaemonIPCConnectionError as e:
+                logger.debug(f"[LocalDaemonClient] socket unavailable, using subprocess: {e}")
+                self._ipc = None
+            except DaemonIPCResponseError as e:
+                # The command may have run, so never re-run it in a subprocess
+                self._ipc = None
+                return {"success": False, "error": str(e)}
+            except DaemonIPCError as e:
+                return {"success": False, "error": str(e)}
+
         logger.info(f"[LocalDaemonClient] Invoking 'execute' for {command_name} via subprocess")
         cmd = self.daemon_cmd + ["execute", command_name] + (args or []) + ["--json"]
         result = subprocess.run(cmd, capture_output=True, text=True)
@@ -1,16 +1,38 @@
 import functools
 import inspect
 import os
-from pathlib import Path
+import threading
+from collections import Counter
 from typing import Any, Callable, Dict, List, Optional
 
 from mcli.lib.logger.logger import get_logger
-from mcli.lib.toml.toml import read_from_toml
 
-from .daemon_client import get_daemon_client
+from .daemon_client import api_daemon_config_sections, get_daemon_client
 
 logger = get_logger(__name__)
 
+# How decorated commands ran: "routed" via the daemon, "local" because routing
+# is off, or "fallback" when routing was attempted but the daemon failed.
+_routing_stats: Counter = Counter()
+_routing_stats_lock = threading.Lock()
+
+
+def _count(outcome: str) -> None:
+    with _routing_stats_lock:
+        _routing_stats[outcome] += 1
+
+
+def get_routing_stats() -> Dict[str, int]:
+    """Counts of routed, local and fallback executions of decorated commands."""
+    with _routing_stats_lock:
+        return {key: _routing_stats[key] for key in ("routed", "local", "fallback")}
+
+
+def reset_routing_stats() -> None:
+    """Reset the routing counters."""
+    with _routing_stats_lock:
+        _routing_stats.clear()
+
 
 def daemon_command(
     command_name: Optional[str] = None,
@@ -36,6 +58,7 @@ def daemon_command(
         def wrapper(*args, **kwargs):
             # Check if daemon routing is enabled
             if not auto_route or not _is_daemon_routing_enabled():
+                _count("local")
                 return func(*args, **kwargs)
 
             try:
@@ -52,6 +75,7 @@ def daemon_command(
 
                 if result.get("success"):
                     logger.info(f"Command '{cmd_name}' executed successfully via daemon")
+                    _count("routed")
                     return result.get("result")
                 else:
                     logger.warning(
@@ -59,6 +83,7 @@ def daemon_command(
                     )
                     if fallback_to_local:
                         logger.info(f"Falling back to local execution for '{cmd_name}'")
+                        _count("fallback")
                         return func(*args, **kwargs)
                     else:
                         raise Exception(f"Daemon execution failed: {result.get('error')}")
@@ -67,6 +92,7 @@ def daemon_command(
                 logger.warning(f"Failed to execute '{cmd_name}' via daemon: {e}")
                 if fallback_to_local:
                     logger.info(f"Falling back to local execution for '{cmd_name}'")
+                    _count("fallback")
                     return func(*args, **kwargs)
                 else:
                     raise
@@ -77,28 +103,18 @@ def daemon_command(
 
 
 def _is_daemon_routing_enabled() -> bool:
-    """Check if daemon routing is enabled in configuration."""
+    """Check if daemon routing is enabled in configuration.
+
+    Config files are parsed once and re-read only when they change (see
+    ``api_daemon_config_sections``), so this is cheap to call per invocation.
+    """
     # Check environment variable
     if os.environ.get("MCLI_DAEMON_ROUTING", "false").lower() in ("true", "1", "yes"):
         return True
 
     # Check config files
-    config_paths = [
-        Path("config.toml"),  # Current directory
-        Path.home() / ".config" / "mcli" / "config.toml",  # User config
-        Path(__file__).parent.parent.parent.parent.parent / "config.toml",  # Project root
-    ]
-
-    for path in config_paths:
-        if path.exists():
-            try:
-                daemon_config = read_from_toml(str(path), "api_daemon")
-                if daemon_config and daemon_config.get("enabled", False):
-                    return True
-            except Exception as e:
-                logger.debug(f"Could not read daemon config from {path}: {e}")
-
-    return False
+    sections, _ = api_daemon_config_sections()
+    return any(daemon_config.get("enabled", False) for _, daemon_config in sections)
 
 
 def _convert_to_command_args(args: tuple, kwargs: dict, func: Callable) -> List[str]:
@@ -0,0 +1,271 @@
+"""
+Local IPC protocol and client for the mcli daemon.
+
+The daemon listens on a Unix domain socket next to its HTTP API:
+
+- every message is a JSON object framed by a 4-byte big-endian length
+- a request is ``{"id": n, "op": ..., "params": {...}}``; ``id`` is chosen by
+  the client and echoed on every response frame
+- responses are events ``{"id": n, "event": ..., "data": ...}``; each
+  request gets exactly one, ``result``, ``error`` or ``cancelled``
+- requests are pipelined: a client may send many before reading, and
+  responses arrive as requests complete, not in request order
+- a failure to connect or send raises ``DaemonIPCConnectionError`` and the
+  request never reached the daemon, so callers may retry it elsewhere. Once
+  a request is sent, a timeout or broken connection raises
+  ``DaemonIPCResponseError``: the command may still run, so it must not be
+  re-sent
+
+Operations: ``ping``, ``limits``, ``status``, ``list`` (``all``), ``execute``
+(``command_name`` or ``command_id``, ``args``) and ``cancel`` (``target``).
+``limits`` reports the daemon's execution timeout and per-connection
+concurrency, from which clients derive how long to wait for a response.
+
+This module only uses the standard library so clients can import it without
+pulling in the daemon.
+
+Example:
+    >>> with DaemonIPCClient() as client:
+    ...     ids = [client.submit("execute", command_name="hello") for _ in range(3)]
+    ...     results = [client.result(i) for i in ids]
+"""
+
+import json
+import socket
+import struct
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Union
+
+DEFAULT_SOCKET_PATH = Path.home() / ".local" / "mcli" / "daemon" / "daemon.sock"
+
+# Frames larger than this are rejected rather than buffered
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+# Limits assumed for a daemon that does not answer ``limits``; they mirror the
+# daemon's defaults (worker_pool.DEFAULT_TIMEOUT and ipc_server.DEFAULT_MAX_*)
+FALLBACK_LIMITS = {"execution_timeout": 30.0, "max_inflight": 8, "max_pending": 64}
+
+FINAL_EVENTS = frozenset({"result", "error", "cancelled"})
+
+_HEADER = struct.Struct(">I")
+HEADER_SIZE = _HEADER.size
+
+
+class DaemonIPCError(Exception):
+    """The daemon reported an error for a request."""
+
+
+class DaemonIPCConnectionError(DaemonIPCError):
+    """The daemon could not be reached; the request was not sent."""
+
+
+class DaemonIPCResponseError(DaemonIPCError):
+    """A request was sent but its response was lost; it may still be running."""
+
+
+def encode_frame(message: Dict[str, Any]) -> bytes:
+    """Serialize a message into a length-prefixed frame."""
+    body = json.dumps(message, default=str).encode("utf-8")
+    if len(body) > MAX_FRAME_SIZE:
+        raise DaemonIPCError(f"Message of {len(body)} bytes exceeds {MAX_FRAME_SIZE}")
+    return _HEADER.pack(len(body)) + body
+
+
+def decode_length(header: bytes) -> int:
+    """Body length announced by a frame header, validated against MAX_FRAME_SIZE."""
+    (size,) = _HEADER.unpack(header)
+    if size > MAX_FRAME_SIZE:
+        raise DaemonIPCError(f"Frame of {size} bytes exceeds {MAX_FRAME_SIZE}")
+    return size
+
+
+def response_timeout_for(limits: Dict[str, Any]) -> float:
+    """Longest a response can legitimately take under the daemon's ``limits``.
+
+    A request may wait for every other pending request on its connection to
+    run, ``max_inflight`` at a time, before running for up to the execution
+    timeout itself.
+    """
+    execution_timeout = float(limits["execution_timeout"])
+    max_inflight = max(int(limits["max_inflight"]), 1)
+    waves = -(-int(limits["max_pending"]) // max_inflight)
+    return execution_timeout * (1 + waves)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Daemon closed the connection")
+        data += chunk
+    return bytes(data)
+
+
+def is_socket_available(socket_path: Union[str, Path, None] = None) -> bool:
+    """Whether a daemon socket exists at ``socket_path`` (it may still be stale)."""
+    path = Path(socket_path or DEFAULT_SOCKET_PATH)
+    return hasattr(socket, "AF_UNIX") and path.is_socket()
+
+
+class DaemonIPCClient:
+    """Blocking client for the daemon's Unix socket.
+
+    One client holds one connection and may be shared between threads;
+    responses read on behalf of other requests are buffered until asked for.
+    ``timeout`` bounds connecting and ``response_timeout`` every later socket
+    operation, including each wait for a response. By default the response
+    timeout is derived from the limits the daemon reports on connect.
+    """
+
+    def __init__(
+        self,
+        socket_path: Union[str, Path, None] = None,
+        timeout: Optional[float] = 30,
+        response_timeout: Optional[float] = None,
+    ):
+        self.socket_path = Path(socket_path or DEFAULT_SOCKET_PATH)
+        self.timeout = timeout
+        self.response_timeout = response_timeout
+        self._sock: Optional[socket.socket] = None
+        self._next_id = 0
+        self._pending: Dict[int, Deque[Dict[str, Any]]] = {}
+        self._send_lock = threading.Lock()
+        self._recv_lock = threading.Lock()
+
+    def __enter__(self) -> "DaemonIPCClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _connect(self) -> socket.socket:
+        if self._sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(str(self.socket_path))
+                response_timeout = self.response_timeout
+                if response_timeout is None:
+                    response_timeout = response_timeout_for(self._query_limits(sock))
+            except (OSError, ValueError, DaemonIPCError) as e:
+                sock.close()
+                raise DaemonIPCConnectionError(
+                    f"Cannot connect to daemon at {self.socket_path}: {e}"
+                ) from e
+            sock.settimeout(response_timeout)
+            self._sock = sock
+        return self._sock
+
+    @staticmethod
+    def _query_limits(sock: socket.socket) -> Dict[str, Any]:
+        """Ask a freshly connected daemon for its limits (request id 0)."""
+        sock.sendall(encode_frame({"id": 0, "op": "limits", "params": {}}))
+        reply = json.loads(_recv_exact(sock, decode_length(_recv_exact(sock, HEADER_SIZE))))
+        limits = reply.get("data") if reply.get("event") == "result" else None
+        if not isinstance(limits, dict):
+            # A daemon predating ``limits`` answers "Unknown operation"
+            return FALLBACK_LIMITS
+        return {**FALLBACK_LIMITS, **limits}
+
+    def close(self) -> None:
+        """Close the connection; unread responses are discarded."""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        self._pending.clear()
+
+    def submit(self, op: str, **params: Any) -> int:
+        """Send a request without waiting for it and return its id."""
+        with self._send_lock:
+            sock = self._connect()
+            self._next_id += 1
+            request_id = self._next_id
+            self._pending[request_id] = deque()
+            try:
+                sock.sendall(encode_frame({"id": request_id, "op": op, "params": params}))
+            except OSError as e:
+                self.close()
+                raise DaemonIPCConnectionError(f"Lost connection to daemon: {e}") from e
+        return request_id
+
+    def events(self, request_id: int) -> Iterator[Dict[str, Any]]:
+        """Yield the events of a request until (and including) its final one."""
+        while True:
+            event = self._next_event(request_id)
+            yield event
+            if event["event"] in FINAL_EVENTS:
+                self._pending.pop(request_id, None)
+                return
+
+    def result(self, request_id: int) -> Any:
+        """Wait for a request's final event and return its data.
+
+        Raises:
+            DaemonIPCError: The request failed or was cancelled.
+        """
+        for event in self.events(request_id):
+            if event["event"] == "result":
+                return event.get("data")
+            if event["event"] in FINAL_EVENTS:
+                raise DaemonIPCError(event.get("data") or event["event"])
+        raise DaemonIPCError(f"No response for request {request_id}")  # pragma: no cover
+
+    def request(self, op: str, **params: Any) -> Any:
+        """Send a request and wait for its result."""
+        return self.result(self.submit(op, **params))
+
+    def cancel(self, request_id: int) -> bool:
+        """Ask the daemon to cancel a pending request; True if it was still running."""
+        return bool(self.request("cancel", target=request_id).get("cancelled"))
+
+    def _next_event(self, request_id: int) -> Dict[str, Any]:
+        if request_id not in self._pending:
+            raise DaemonIPCError(f"Unknown request id {request_id}")
+        with self._recv_lock:
+            queue = self._pending[request_id]
+            while not queue:
+                event = self._read_frame()
+                buffered = self._pending.get(event.get("id"))
+                if buffered is not None:
+                    buffered.append(event)
+            return queue.popleft()
+
+    def _read_frame(self) -> Dict[str, Any]:
+        body = self._read_exact(decode_length(self._read_exact(HEADER_SIZE)))
+        return json.loads(body)
+
+    def _read_exact(self, size: int) -> bytes:
+        sock = self._sock
+        if sock is None:
+            raise DaemonIPCResponseError("Connection to daemon closed before the response")
+        try:
+            return _recv_exact(sock, size)
+        except OSError as e:
+            self.close()
+            raise DaemonIPCResponseError(f"No response from daemon: {e}") from e
+
+    # Convenience wrappers mirroring APIDaemonClient
+
+    def status(self) -> Dict[str, Any]:
+        """Get daemon status."""
+        return self.request("status")
+
+    def list_commands(self, all: bool = False) -> List[Dict[str, Any]]:
+        """List stored commands, optionally including inactive ones."""
+        return self.request("list", all=all)
+
+    def execute_command(
+        self,
+        command_id: Optional[str] = None,
+        command_name: Optional[str] = None,
+        args: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Execute a stored command and return the executor's result."""
+        if not command_id and not command_name:
+            raise ValueError("Either command_id or command_name must be provided")
+        return self.request(
+            "execute", command_id=command_id, command_name=command_name, args=args or []
+        )
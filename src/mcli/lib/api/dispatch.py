@@ -0,0 +1,343 @@
+"""
+Off-loop execution of commands served by the FastAPI layer.
+
+Endpoints registered by ``ClickToAPIDecorator`` dispatch through an
+``EndpointDispatcher``, which keeps slow commands off uvicorn's event loop:
+
+- coroutine functions are awaited on the loop; synchronous functions run on a
+  bounded executor and the loop only awaits their future
+- the executor is chosen per endpoint: ``"thread"`` (the default) or
+  ``"process"`` for CPU-bound commands that would otherwise hold the GIL.
+  Endpoints share one pool per kind unless they ask for ``max_workers`` of
+  their own, which isolates them from the rest
+- process workers resolve the command by module and qualified name instead of
+  pickling it, because the module attribute is usually a Click command or a
+  wrapper rather than the function itself; the function must therefore be
+  defined at module level
+
+Long-running commands can be registered as jobs. A request then answers
+``202 Accepted`` with a job id at once, the command runs in the background,
+and clients follow it through routes added by ``add_job_routes``:
+
+- ``GET /jobs/{id}`` returns the job; ``?wait=seconds`` long-polls until it
+  finishes
+- ``GET /jobs/{id}/stream`` streams each state change as a line of JSON
+  (``application/x-ndjson``) until the job finishes
+- ``DELETE /jobs/{id}`` cancels it. A job still queued for a worker never
+  runs; a thread that already started cannot be interrupted and its result is
+  discarded
+
+Finished jobs are kept for polling up to ``max_finished`` per store, oldest
+evicted first.
+
+Example:
+    >>> dispatcher = EndpointDispatcher(render_report, executor="process")
+    >>> result = await dispatcher({"month": "2024-01"})
+"""
+
+import asyncio
+import contextvars
+import functools
+import importlib
+import inspect
+import json
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+
+from mcli.lib.logger.logger import get_logger
+
+logger = get_logger(__name__)
+
+EXECUTOR_KINDS = ("thread", "process")
+
+# Size of the shared pools, mirroring ThreadPoolExecutor's own default for
+# threads; processes are CPU-bound so one per core is enough.
+DEFAULT_THREAD_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+DEFAULT_PROCESS_WORKERS = os.cpu_count() or 1
+
+# Finished jobs retained for polling, per store
+DEFAULT_MAX_FINISHED_JOBS = 1000
+
+# Upper bound on ``GET /jobs/{id}?wait=``, so a poll cannot pin a connection
+MAX_POLL_WAIT = 60.0
+
+JOB_STATES = ("pending", "running", "succeeded", "failed", "cancelled")
+FINAL_JOB_STATES = frozenset({"succeeded", "failed", "cancelled"})
+
+_executors: Dict[Tuple[str, Optional[int]], Executor] = {}
+_executors_lock = threading.Lock()
+_shared_workers: Dict[str, Optional[int]] = {"thread": None, "process": None}
+
+
+def configure_executors(max_workers: Optional[int] = None) -> None:
+    """Size the shared pools; takes effect for pools not yet created."""
+    _shared_workers["thread"] = max_workers
+    _shared_workers["process"] = max_workers
+
+
+def get_executor(kind: str = "thread", max_workers: Optional[int] = None) -> Executor:
+    """Return the pool for ``kind``: the shared one, or a dedicated one of ``max_workers``."""
+    if kind not in EXECUTOR_KINDS:
+        raise ValueError(f"Unknown executor {kind!r}; expected one of {EXECUTOR_KINDS}")
+    key = (kind, max_workers)
+    with _executors_lock:
+        executor = _executors.get(key)
+        if executor is None:
+            if kind == "thread":
+                executor = ThreadPoolExecutor(
+                    max_workers=max_workers or _shared_workers["thread"] or DEFAULT_THREAD_WORKERS,
+                    thread_name_prefix="mcli-api",
+                )
+            else:
+                # Forking a process that runs uvicorn's threads is unsafe
+                executor = ProcessPoolExecutor(
+                    max_workers=max_workers
+                    or _shared_workers["process"]
+                    or DEFAULT_PROCESS_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            _executors[key] = executor
+        return executor
+
+
+def shutdown_executors(wait: bool = False) -> None:
+    """Shut down every pool; later dispatches create fresh ones."""
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def _unwrap(target: Any) -> Any:
+    """The plain function behind a Click command or API wrapper."""
+    while True:
+        if hasattr(target, "_original_func"):
+            target = target._original_func
+        elif not inspect.isroutine(target) and callable(getattr(target, "callback", None)):
+            target = target.callback
+        else:
+            return target
+
+
+def _call_by_reference(module_name: str, qualname: str, kwargs: Dict[str, Any]) -> Any:
+    """Resolve a module-level command in a worker process and call it."""
+    target: Any = importlib.import_module(module_name)
+    for part in qualname.split("."):
+        target = getattr(target, part)
+    # Module attributes are often the Click command or the API wrapper
+    result = _unwrap(target)(**kwargs)
+    if inspect.isawaitable(result):
+        result = asyncio.run(result)
+    return result
+
+
+class EndpointDispatcher:
+    """Runs one endpoint's function without blocking the event loop."""
+
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        executor: str = "thread",
+        max_workers: Optional[int] = None,
+    ):
+        if executor not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown executor {executor!r}; expected one of {EXECUTOR_KINDS}")
+        self.func = func
+        self.executor = executor
+        self.max_workers = max_workers
+        self.is_async = inspect.iscoroutinefunction(func)
+        if executor == "process" and not self.is_async:
+            # A Click command has no __qualname__ and reports click.core as its module
+            target = _unwrap(func)
+            module = getattr(target, "__module__", None)
+            qualname = getattr(target, "__qualname__", "")
+            if not module or not qualname or "<locals>" in qualname or "<lambda>" in qualname:
+                raise ValueError(
+                    f"{qualname or func!r} must be defined at module level to run in a process"
+                )
+            self._reference = (module, qualname)
+
+    async def __call__(self, kwargs: Dict[str, Any]) -> Any:
+        if self.is_async:
+            return await self.func(**kwargs)
+
+        pool = get_executor(self.executor, self.max_workers)
+        if self.executor == "process":
+            call = functools.partial(_call_by_reference, *self._reference, kwargs)
+        else:
+            # Keep context variables (request-scoped state) visible to the command
+            call = functools.partial(contextvars.copy_context().run, self.func, **kwargs)
+        result = await asyncio.get_running_loop().run_in_executor(pool, call)
+        if inspect.isawaitable(result):
+            # A synchronous wrapper around a coroutine function
+            result = await result
+        return result
+
+
+@dataclass
+class Job:
+    """A command run in the background on behalf of a ``202 Accepted`` request."""
+
+    id: str
+    endpoint: str
+    status: str = "pending"
+    result: Any = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    _task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINAL_JOB_STATES
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "endpoint": self.endpoint,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+    def _set_status(self, status: str, **changes: Any) -> None:
+        if self.done:
+            return
+        self.status = status
+        for name, value in changes.items():
+            setattr(self, name, value)
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def wait_for_change(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the job changes state; False if ``timeout`` passed first."""
+        if self.done:
+            return False
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def wait(self, timeout: Optional[float] = None) -> None:
+        """Wait until the job finishes or ``timeout`` passes."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.done:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return
+            await self.wait_for_change(remaining)
+
+
+class JobStore:
+    """Background jobs of one app, keyed by id.
+
+    Jobs are created and updated on the event loop serving the app.
+    """
+
+    def __init__(self, max_finished: int = DEFAULT_MAX_FINISHED_JOBS):
+        self.max_finished = max_finished
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def submit(self, endpoint: str, dispatcher: EndpointDispatcher, kwargs: Dict[str, Any]) -> Job:
+        """Start running ``dispatcher(kwargs)`` in the background and return its job."""
+        self._evict()
+        job = Job(id=uuid.uuid4().hex, endpoint=endpoint)
+        self._jobs[job.id] = job
+        job._task = asyncio.get_running_loop().create_task(self._run(job, dispatcher, kwargs))
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job; False if it does not exist or already finished."""
+        job = self._jobs.get(job_id)
+        if job is None or job.done:
+            return False
+        if job._task is not None:
+            job._task.cancel()
+        job._set_status("cancelled", finished_at=time.time())
+        return True
+
+    async def _run(self, job: Job, dispatcher: EndpointDispatcher, kwargs: Dict[str, Any]) -> None:
+        job._set_status("running", started_at=time.time())
+        try:
+            result = await dispatcher(kwargs)
+        except asyncio.CancelledError:
+            job._set_status("cancelled", finished_at=time.time())
+            return
+        except Exception as e:
+            logger.error(f"API job {job.id} ({job.endpoint}) failed: {e}")
+            job._set_status("failed", error=str(e), finished_at=time.time())
+            return
+        job._set_status("succeeded", result=result, finished_at=time.time())
+
+    def _evict(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[: max(len(finished) - self.max_finished, 0)]:
+            del self._jobs[job_id]
+
+
+def get_job_store(app: FastAPI) -> JobStore:
+    """The app's job store, adding the job routes on first use."""
+    store = getattr(app.state, "mcli_jobs", None)
+    if store is None:
+        store = JobStore()
+        app.state.mcli_jobs = store
+        add_job_routes(app, store)
+    return store
+
+
+def add_job_routes(app: FastAPI, store: JobStore) -> None:
+    """Add the routes clients use to follow jobs."""
+
+    def lookup(job_id: str) -> Job:
+        job = store.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+        return job
+
+    @app.get("/jobs/{job_id}", tags=["jobs"])
+    async def get_job(job_id: str, wait: float = 0) -> Dict[str, Any]:
+        job = lookup(job_id)
+        if wait > 0:
+            await job.wait(min(wait, MAX_POLL_WAIT))
+        return job.to_dict()
+
+    @app.get("/jobs/{job_id}/stream", tags=["jobs"])
+    async def stream_job(job_id: str) -> StreamingResponse:
+        job = lookup(job_id)
+
+        async def events() -> AsyncIterator[str]:
+            while True:
+                yield json.dumps(job.to_dict(), default=str) + "\n"
+                if job.done:
+                    return
+                await job.wait_for_change()
+
+        return StreamingResponse(events(), media_type="application/x-ndjson")
+
+    @app.delete("/jobs/{job_id}", tags=["jobs"])
+    async def cancel_job(job_id: str) -> Dict[str, Any]:
+        job = lookup(job_id)
+        return {"job_id": job.id, "cancelled": store.cancel(job_id)}
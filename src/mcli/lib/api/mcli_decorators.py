@@ -81,6 +81,8 @@ def command(
     api_method: str = "POST",
     api_description: Optional[str] = None,
     api_tags: Optional[list[str]] = None,
+    api_executor: str = "thread",
+    api_as_job: bool = False,
     background: bool = False,
     background_timeout: Optional[int] = None,
     **kwargs,
@@ -109,6 +111,8 @@ def command(
         api_method: HTTP method for API endpoint
         api_description: API documentation description
         api_tags: OpenAPI tags for API endpoint
+        api_executor: Pool running the command for API requests ("thread" or "process")
+        api_as_job: API requests answer 202 with a job id to poll
         background: Enable background processing
         background_timeout: Background processing timeout
 
@@ -170,6 +174,8 @@ def command(
                 http_method=api_method,
                 description=api_description or help or f"API endpoint for {func.__name__}",
                 tags=api_tags or ["mcli"],
+                executor=api_executor,
+                as_job=api_as_job,
             )(click_command)
 
         # Apply background processing if enabled
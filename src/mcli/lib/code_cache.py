@@ -0,0 +1,152 @@
+"""
+Compiled-code cache for in-process Python workflows.
+
+Workflow scripts live outside any package, so Python's own ``__pycache__``
+machinery never applies to them and every ``mcli run`` re-parses and
+re-compiles the source. This cache stores the marshal'd code object for each
+script, keyed by the script's content hash and the interpreter's bytecode
+magic number, together with the name of the module attribute that holds the
+script's Click command, so later runs skip parsing, compilation and the
+attribute scan entirely.
+
+Entries live in a hidden directory beside the lockfile and are written
+atomically; any unreadable or mismatching entry is treated as a miss.
+"""
+
+import glob
+import hashlib
+import importlib.util
+import json
+import marshal
+import os
+import re
+import sys
+from pathlib import Path
+from types import CodeType
+from typing import Any, Optional
+
+from mcli.lib.logger.logger import get_logger
+
+logger = get_logger(__name__)
+
+CODE_CACHE_SUFFIX = ".mcode"
+
+
+class CodeCache:
+    """
+    Content-hash-keyed store of compiled workflow code objects.
+
+    Each entry is ``MAGIC_NUMBER | header length | JSON header | marshal(code)``.
+    The header records the source hash and the Click command signature
+    (module attribute and command name) found when the script was first loaded.
+    """
+
+    def __init__(self, cache_dir: Path):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cache entries (created on first write)
+        """
+        self.cache_dir = Path(cache_dir)
+        self._tag = sys.implementation.cache_tag or "python"
+
+    def _entry_prefix(self, relative_path: str) -> str:
+        """Stable, filesystem-safe prefix identifying a script."""
+        # Hash the full path so distinct scripts never share a prefix
+        path_hash = hashlib.sha256(relative_path.encode("utf-8")).hexdigest()[:16]
+        return f"{Path(relative_path).name}-{path_hash}"
+
+    def _entry_path(self, relative_path: str, content_hash: str) -> Path:
+        digest = content_hash.split(":", 1)[-1][:32]
+        name = f"{self._entry_prefix(relative_path)}-{digest}.{self._tag}{CODE_CACHE_SUFFIX}"
+        return self.cache_dir / name
+
+    def get(
+        self, relative_path: str, content_hash: str
+    ) -> Optional[tuple[CodeType, dict[str, Any]]]:
+        """
+        Look up the compiled code for a script version.
+
+        Args:
+            relative_path: Script path relative to the workflows directory
+            content_hash: "sha256:<hex>" hash of the script source
+
+        Returns:
+            Tuple of (code object, header) or None on a miss
+        """
+        if not content_hash:
+            return None
+        entry_path = self._entry_path(relative_path, content_hash)
+        try:
+            data = entry_path.read_bytes()
+        except OSError:
+            return None
+
+        magic = importlib.util.MAGIC_NUMBER
+        try:
+            if data[: len(magic)] != magic:
+                return None
+            offset = len(magic)
+            header_len = int.from_bytes(data[offset : offset + 4], "little")
+            offset += 4
+            header = json.loads(data[offset : offset + header_len])
+            if header.get("content_hash") != content_hash:
+                return None
+            code = marshal.loads(data[offset + header_len :])
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable code cache entry {entry_path.name}: {e}")
+            return None
+
+        if not isinstance(code, CodeType):
+            return None
+        return code, header
+
+    def put(
+        self,
+        relative_path: str,
+        content_hash: str,
+        code: CodeType,
+        signature: Optional[dict[str, Any]] = None,
+    ) -> None:
+        """
+        Store compiled code for a script version, replacing its older entries.
+
+        Honors ``sys.dont_write_bytecode`` (PYTHONDONTWRITEBYTECODE) like Python's
+        own bytecode cache.
+
+        Args:
+            relative_path: Script path relative to the workflows directory
+            content_hash: "sha256:<hex>" hash of the compiled source
+            code: Compiled module code object
+            signature: Click command signature discovered when the module ran
+        """
+        if sys.dont_write_bytecode or not content_hash:
+            return
+
+        header = json.dumps({"content_hash": content_hash, "signature": signature or {}})
+        header_bytes = header.encode("utf-8")
+        payload = (
+            importlib.util.MAGIC_NUMBER
+            + len(header_bytes).to_bytes(4, "little")
+            + header_bytes
+            + marshal.dumps(code)
+        )
+
+        entry_path = self._entry_path(relative_path, content_hash)
+        tmp_path = entry_path.with_name(f"{entry_path.name}.{os.getpid()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Drop entries compiled from previous versions of this script
+            prefix = self._entry_prefix(relative_path)
+            own_entry = re.compile(
+                rf"{re.escape(prefix)}-[0-9a-f]{{32}}\.{re.escape(self._tag + CODE_CACHE_SUFFIX)}"
+            )
+            for stale in self.cache_dir.glob(f"{glob.escape(prefix)}-*"):
+                if stale != entry_path and own_entry.fullmatch(stale.name):
+                    stale.unlink(missing_ok=True)
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, entry_path)
+        except OSError as e:
+            logger.debug(f"Could not write code cache entry for {relative_path}: {e}")
+            tmp_path.unlink(missing_ok=True)
@@ -29,6 +29,7 @@ from .defaults import (
     IpfsDefaults,
     Languages,
     LogLevels,
+    SchedulerDefaults,
     ServiceDefaults,
     Shells,
     Timeouts,
@@ -114,6 +115,7 @@ __all__ = [
     "ServiceDefaults",
     "IpfsDefaults",
     "ImportDefaults",
+    "SchedulerDefaults",
     # Commands
     "CommandKeys",
     "CommandGroups",
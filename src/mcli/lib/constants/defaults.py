@@ -154,6 +154,36 @@ class IpfsDefaults:
     DAEMON_STARTUP_TIMEOUT = 15
     DAEMON_POLL_INTERVAL_MS = 500
 
+    # Concurrent script uploads during `mcli sync push` and fetches during `mcli sync pull`
+    UPLOAD_WORKERS = 8
+    DOWNLOAD_WORKERS = 8
+
+
+class SchedulerDefaults:
+    """Cron scheduler default values."""
+
+    # Longest the scheduler loop sleeps without re-checking the clock, so a
+    # wall-clock jump (suspend, NTP step) delays jobs by at most this long
+    MAX_SLEEP_SECONDS = 60
+    # Changed job state is written to jobs.json at most this often
+    SAVE_INTERVAL_SECONDS = 5
+    # Pause after an unexpected error in the scheduler loop
+    ERROR_BACKOFF_SECONDS = 60
+    # Jobs that may run at once; later ones queue
+    MAX_WORKERS = 16
+    # Idle pool workers exit after this long and are respawned on demand
+    WORKER_IDLE_SECONDS = 30
+    # Recent queue-wait samples kept for scheduler stats
+    WAIT_SAMPLES = 1000
+    # Job history retention in the SQLite store: newest runs kept, and max age
+    HISTORY_MAX_RECORDS = 100_000
+    HISTORY_RETENTION_DAYS = 90
+    # Buffered history records are inserted at most this many seconds later
+    HISTORY_FLUSH_INTERVAL = 1.0
+    # Records whose insert failed are retried; past this many pending, the
+    # oldest are dropped
+    HISTORY_MAX_PENDING = 10_000
+
 
 class ImportDefaults:
     """Import command default values."""
@@ -10,6 +10,9 @@ class EnvVars:
 
     # MCLI-specific configuration
     MCLI_TRACE_LEVEL = "MCLI_TRACE_LEVEL"
+    MCLI_TRACE_MODE = "MCLI_TRACE_MODE"  # "settrace" (default) or "sample"
+    MCLI_PROFILE_INTERVAL = "MCLI_PROFILE_INTERVAL"  # Seconds between samples
+    MCLI_RUN_EVENTS = "MCLI_RUN_EVENTS"  # "0" stops recording runs in the event log
     MCLI_CONFIG = "MCLI_CONFIG"
     MCLI_HOME = "MCLI_HOME"
     MCLI_DEBUG = "MCLI_DEBUG"
@@ -901,6 +901,10 @@ class SyncMessages:
     # IPFS sync
     UPLOADING_TO_IPFS = "Uploading command state to IPFS..."
     PUSHED_TO_IPFS = "Pushed to IPFS!"
+    SCRIPTS_PUSHED = (
+        "[dim]Scripts: {uploaded} uploaded, {reused} unchanged since last push"
+        ", {failed} failed[/dim]"
+    )
     FAILED_PUSH_IPFS = "Failed to push to IPFS"
     RETRIEVING_FROM_IPFS = "Retrieving from IPFS: {cid}"
     RETRIEVED_FROM_IPFS = "Retrieved from IPFS"
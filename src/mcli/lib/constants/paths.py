@@ -42,6 +42,9 @@ class DirNames:
     SERVICES_PIDS = "pids"
     SERVICES_LOGS = "logs"
     SERVICES_STATE = "state"
+    IPFS_BLOBS = "ipfs_blobs"  # Content-addressed scripts and manifests from `sync pull`
+    # Compiled workflow code cache, kept hidden inside the workflows directory
+    WORKFLOW_CODE_CACHE = ".mcli_pycache"
 
 
 class FileNames:
@@ -55,6 +58,9 @@ class FileNames:
     # straggler is never parsed as a command.
     WORKFLOWS_LOCK_JSON = "workflows.lock.json"
     SYNC_CACHE_JSON = ".sync_cache.json"
+    # Hidden so it is never discovered as a workflow script
+    WORKFLOW_INDEX_DB = ".mcli_index.db"
+    WORKFLOW_SEARCH_DB = ".mcli_search.db"
     LSH_ENV = "lsh.env"
     README_MD = "README.md"
     ENV = ".env"
@@ -66,7 +72,11 @@ class FileNames:
     PYPROJECT_TOML = "pyproject.toml"
     REQUIREMENTS_TXT = "requirements.txt"
     IPFS_SYNC_HISTORY_JSON = "ipfs_sync_history.json"
+    IPFS_CID_STORE_JSON = "ipfs_cid_store.json"
+    # Requirement sets known to be satisfied per interpreter (in the cache dir)
+    DEPS_SATISFIED_JSON = "deps_satisfied.json"
     COMMANDS_JSON = "commands.json"
+    COMMAND_MANIFEST_JSON = "command_manifest.json"
 
 
 class PathPatterns:
@@ -0,0 +1,162 @@
+"""Local stores that let IPFS sync skip work it has already done.
+
+``CidStore`` maps script content hashes to the IPFS CIDs they were added as.
+A script whose bytes did not change always gets the same CID, so
+``mcli sync push`` records ``content_hash -> CID`` here and only uploads
+scripts whose hash has no entry yet.
+
+Entries are kept per IPFS node (the daemon's peer ID): a CID recorded on one
+node is not necessarily pinned, or even present, on another, so switching
+repos or machines starts with an empty map.
+
+File: ``$MCLI_DATA/ipfs_cid_store.json``. JSON shape:
+``{"version": 1, "nodes": {"<peer id>": {"sha256:<hex>": "<cid>"}}}``.
+
+``BlobStore`` keeps the bytes of every script ``mcli sync pull`` fetched,
+addressed by their SHA-256, plus every manifest by CID. Both are immutable
+(a CID or a hash always names the same bytes), so pulling a manifest seen
+before, e.g. rolling back to a previous CID, needs no network at all, and a
+script fetched for one manifest is never fetched again for another.
+
+Directory: ``$MCLI_DATA/ipfs_blobs/``, with ``<hex[:2]>/<hex>`` blobs and
+``manifests/<cid>.json``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from mcli.lib.logger.logger import get_logger
+
+logger = get_logger(__name__)
+
+_VERSION = 1
+
+_CID = re.compile(r"^[A-Za-z0-9]+$")
+
+
+class CidStore:
+    """Read/write the content hash to CID map on disk."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._nodes: Optional[Dict[str, Dict[str, str]]] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        if self._nodes is None:
+            nodes: Dict[str, Dict[str, str]] = {}
+            try:
+                data = json.loads(self.path.read_text())
+                if data.get("version") == _VERSION and isinstance(data.get("nodes"), dict):
+                    nodes = data["nodes"]
+            except FileNotFoundError:
+                pass
+            except (json.JSONDecodeError, OSError, AttributeError) as e:
+                logger.warning(f"Ignoring unreadable IPFS CID store {self.path}: {e}")
+            self._nodes = nodes
+        return self._nodes
+
+    def get(self, node: str, content_hash: str) -> Optional[str]:
+        """CID that ``content_hash`` was added as on ``node``, if recorded."""
+        with self._lock:
+            cid = self._load().get(node, {}).get(content_hash)
+        return cid if isinstance(cid, str) else None
+
+    def put(self, node: str, content_hash: str, cid: str) -> None:
+        with self._lock:
+            entries = self._load().setdefault(node, {})
+            if entries.get(content_hash) != cid:
+                entries[content_hash] = cid
+                self._dirty = True
+
+    def save(self) -> None:
+        """Write the map if it changed, replacing the file atomically."""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                data = json.dumps({"version": _VERSION, "nodes": self._nodes})
+                _atomic_write(self.path, data.encode())
+                self._dirty = False
+            except OSError as e:
+                logger.warning(f"Failed to save IPFS CID store: {e}")
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+class BlobStore:
+    """Content-addressed local copies of fetched scripts and manifests."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _blob_path(self, content_hash: str) -> Path:
+        digest = content_hash.split(":", 1)[-1].lower()
+        if not re.fullmatch(r"[0-9a-f]{64}", digest):
+            raise ValueError(f"not a sha256 content hash: {content_hash}")
+        return self.root / digest[:2] / digest
+
+    def get(self, content_hash: str) -> Optional[bytes]:
+        """Bytes with ``content_hash`` ("sha256:<hex>"), if stored and intact."""
+        try:
+            path = self._blob_path(content_hash)
+            data = path.read_bytes()
+        except (ValueError, OSError):
+            return None
+        if hashlib.sha256(data).hexdigest() != path.name:
+            logger.warning(f"Dropping corrupt blob {path}")
+            path.unlink(missing_ok=True)
+            return None
+        return data
+
+    def put(self, data: bytes) -> str:
+        """Store ``data`` and return its content hash."""
+        content_hash = f"sha256:{hashlib.sha256(data).hexdigest()}"
+        path = self._blob_path(content_hash)
+        if not path.exists():
+            try:
+                _atomic_write(path, data)
+            except OSError as e:
+                logger.warning(f"Failed to store blob {path}: {e}")
+        return content_hash
+
+    def get_manifest(self, cid: str) -> Optional[dict]:
+        if not _CID.match(cid):
+            return None
+        try:
+            data = json.loads((self.root / "manifests" / f"{cid}.json").read_text())
+        except (OSError, json.JSONDecodeError):
+            return None
+        return data if isinstance(data, dict) else None
+
+    def put_manifest(self, cid: str, manifest: dict) -> None:
+        if not _CID.match(cid):
+            return
+        try:
+            _atomic_write(
+                self.root / "manifests" / f"{cid}.json",
+                json.dumps(manifest, sort_keys=True).encode(),
+            )
+        except OSError as e:
+            logger.warning(f"Failed to store manifest {cid}: {e}")
+
+    def drop_manifest(self, cid: str) -> None:
+        if _CID.match(cid):
+            (self.root / "manifests" / f"{cid}.json").unlink(missing_ok=True)
@@ -22,18 +22,30 @@ Features:
 - Decentralized (no single point of failure)
 - Privacy-preserving (optional encryption)
 - Verifiable (CID proves content authenticity)
+
+Script bodies are pushed incrementally: each push hashes the scripts on
+disk, reuses the CIDs recorded for unchanged hashes in the local
+``CidStore``, and adds only new or changed scripts, a few at a time over a
+pooled HTTP session. Pulls skip scripts whose local copy already has the
+manifest's content hash, fetch the rest concurrently, and keep every fetched
+script and manifest in a local ``BlobStore`` so they are never fetched twice.
 """
 
 import hashlib
 import json
+import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path, PurePosixPath
 from typing import Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
-from mcli.lib.constants import FileNames, SyncMessages
+from mcli.lib.constants import DirNames, FileNames, IpfsDefaults, SyncMessages
+from mcli.lib.ipfs_cid_store import BlobStore, CidStore
 from mcli.lib.ipns_manager import (
     derive_key_info,
     ensure_key_imported,
@@ -76,9 +88,25 @@ class IPFSSync:
         self.data_dir = get_data_dir()
         self.sync_history_path = self.data_dir / FileNames.IPFS_SYNC_HISTORY_JSON
         self.sync_history = self._load_sync_history()
+        self.cid_store = CidStore(self.data_dir / FileNames.IPFS_CID_STORE_JSON)
+        self.blob_store = BlobStore(self.data_dir / DirNames.IPFS_BLOBS)
         self._local_ipfs_available: Optional[bool] = None
+        # Peer ID of the local daemon; scopes the CID store
+        self._local_node_id: Optional[str] = None
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
         # Set by push() to the IPNS name if (and only if) publish succeeded.
         self.last_ipns_name: Optional[str] = None
+        # Set by push(): scripts uploaded, reused from the CID store, and failed
+        self.last_script_counts: dict[str, int] = {"uploaded": 0, "reused": 0, "failed": 0}
+        # Set by pull_workflows(): scripts written, already up to date, fetched
+        # over the network, and failed
+        self.last_pull_counts: dict[str, int] = {
+            "written": 0,
+            "unchanged": 0,
+            "fetched": 0,
+            "failed": 0,
+        }
 
     def _load_sync_history(self) -> list[dict]:
         """Load sync history from local storage."""
@@ -164,11 +192,27 @@ class IPFSSync:
             self._local_ipfs_available = response.status_code == 200
             if self._local_ipfs_available:
                 logger.info(SyncMessages.LOCAL_IPFS_DAEMON_DETECTED)
+                try:
+                    node_id = response.json().get("ID")
+                except ValueError:
+                    node_id = None
+                self._local_node_id = node_id if isinstance(node_id, str) else None
             return self._local_ipfs_available
         except Exception:
             self._local_ipfs_available = False
             return False
 
+    def _http(self) -> requests.Session:
+        """Session shared by per-script transfers, pooling connections per host."""
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                size = max(IpfsDefaults.UPLOAD_WORKERS, IpfsDefaults.DOWNLOAD_WORKERS)
+                session.mount("http://", HTTPAdapter(pool_maxsize=size))
+                session.mount("https://", HTTPAdapter(pool_maxsize=size))
+                self._session = session
+            return self._session
+
     def upload_to_ipfs(self, data: dict, max_retries: int = 3) -> Optional[str]:
         """
         Upload data to IPFS and return CID.
@@ -286,9 +330,9 @@ class IPFSSync:
     def add_file_to_ipfs(self, file_path: Path, max_retries: int = 3) -> Optional[str]:
         """Add a single file to the local IPFS daemon and return its CID.
 
-        Used by push() to upload each workflow script body alongside the
-        manifest, so consumers can reconstruct the full workflows directory
-        on pull.
+        Used by push() to upload each new or changed workflow script body
+        alongside the manifest, so consumers can reconstruct the full
+        workflows directory on pull. Safe to call from several threads.
         """
         if not self._check_local_ipfs():
             logger.error("Cannot add file to IPFS: local daemon unavailable")
@@ -302,10 +346,10 @@ class IPFSSync:
         def attempt_upload():
             with open(path, "rb") as fh:
                 files = {"file": (path.name, fh.read())}
-            response = requests.post(self.LOCAL_IPFS_API, files=files, timeout=30)
+            response = self._http().post(self.LOCAL_IPFS_API, files=files, timeout=30)
             if response.status_code == 200:
                 cid = response.json().get("Hash")
-                logger.info(f"Added {path.name} to IPFS: {cid}")
+                logger.debug(f"Added {path.name} to IPFS: {cid}")
                 return (True, cid)
             logger.warning(f"IPFS add failed for {path.name}: {response.status_code}")
             return (False, None)
@@ -316,12 +360,12 @@ class IPFSSync:
         """Fetch raw bytes for a CID via the local daemon, falling back to gateways.
 
         Used by pull_workflows() to reconstruct script files referenced by
-        per-script CIDs in the manifest.
+        per-script CIDs in the manifest. Safe to call from several threads.
         """
         # Local daemon first
         if self._check_local_ipfs():
             try:
-                response = requests.post(
+                response = self._http().post(
                     self.LOCAL_IPFS_CAT,
                     params={"arg": cid},
                     timeout=timeout,
@@ -336,7 +380,7 @@ class IPFSSync:
         for gateway_template in [self.RETRIEVE_GATEWAY] + self.ALT_GATEWAYS:
             url = gateway_template.format(cid=cid)
             try:
-                response = requests.get(url, timeout=timeout)
+                response = self._http().get(url, timeout=timeout)
                 if response.status_code == 200:
                     return response.content
                 logger.warning(
@@ -346,16 +390,24 @@ class IPFSSync:
                 logger.warning(f"Gateway {gateway_template} error for {cid}: {e}")
         return None
 
-    def _embed_script_cids(self, command_data: dict, workflows_dir: Path) -> dict:
+    def _embed_script_cids(
+        self, command_data: dict, workflows_dir: Path, full: bool = False
+    ) -> dict:
         """Augment a lockfile dict in-memory with per-script IPFS CIDs.
 
-        Reads each command's ``file`` from ``workflows_dir``, adds it to IPFS,
-        and stores the resulting CID as ``script_cid`` on the entry. Bumps
-        the manifest version to "2.1" to signal that script bodies are
+        Hashes each command's ``file`` in ``workflows_dir`` and stores its CID
+        as ``script_cid`` on the entry. Scripts whose hash is in the CID store
+        for the local node reuse the recorded CID; the rest (all of them with
+        ``full``) are added to IPFS, ``IpfsDefaults.UPLOAD_WORKERS`` at a time.
+        Bumps the manifest version to "2.1" to signal that script bodies are
         retrievable.
         """
         commands = command_data.get("commands", {})
-        any_uploaded = False
+        self._check_local_ipfs()
+        node = self._local_node_id
+        counts = {"uploaded": 0, "reused": 0, "failed": 0}
+
+        pending: list[tuple[str, dict, Path, str]] = []
         for name, entry in commands.items():
             script_filename = entry.get("file")
             if not script_filename:
@@ -364,22 +416,48 @@ class IPFSSync:
             if not script_path.is_file():
                 logger.warning(f"Skipping '{name}' — script file missing: {script_path}")
                 continue
-            cid = self.add_file_to_ipfs(script_path)
+            content_hash = "sha256:" + hashlib.sha256(script_path.read_bytes()).hexdigest()
+            cid = self.cid_store.get(node, content_hash) if node and not full else None
             if cid:
                 entry["script_cid"] = cid
-                any_uploaded = True
-
-        if any_uploaded:
+                counts["reused"] += 1
+            else:
+                pending.append((name, entry, script_path, content_hash))
+
+        if pending:
+            workers = min(IpfsDefaults.UPLOAD_WORKERS, len(pending))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ipfs-add") as pool:
+                cids = pool.map(self.add_file_to_ipfs, [path for _, _, path, _ in pending])
+                for (name, entry, _, content_hash), cid in zip(pending, cids):
+                    if not cid:
+                        logger.error(f"Failed to add script for '{name}' to IPFS")
+                        counts["failed"] += 1
+                        continue
+                    entry["script_cid"] = cid
+                    counts["uploaded"] += 1
+                    if node:
+                        self.cid_store.put(node, content_hash, cid)
+            self.cid_store.save()
+
+        logger.info(
+            f"Script bodies: {counts['uploaded']} uploaded, {counts['reused']} unchanged, "
+            f"{counts['failed']} failed"
+        )
+        self.last_script_counts = counts
+        if counts["uploaded"] or counts["reused"]:
             command_data["version"] = "2.1"
         return command_data
 
-    def push(self, command_lock_path: Path, description: str = "") -> Optional[str]:
+    def push(
+        self, command_lock_path: Path, description: str = "", full: bool = False
+    ) -> Optional[str]:
         """
         Push command state to IPFS.
 
         Args:
             command_lock_path: Path to command lockfile
             description: Optional description for this sync
+            full: Re-add every script instead of reusing CIDs of unchanged ones
 
         Returns:
             CID if successful, None otherwise
@@ -393,7 +471,7 @@ class IPFSSync:
             # the full workflows directory on pull. Operates on the in-memory
             # copy so the on-disk lockfile stays untouched.
             workflows_dir = Path(command_lock_path).parent
-            command_data = self._embed_script_cids(command_data, workflows_dir)
+            command_data = self._embed_script_cids(command_data, workflows_dir, full=full)
 
             # Add sync metadata
             sync_data = {
@@ -455,40 +533,55 @@ class IPFSSync:
             cid: Content identifier
             verify: Whether to verify hash
 
+        Manifests are immutable, so one pulled before is served from the
+        local blob store without touching the network. Only manifests that
+        passed verification are stored; a cached one that fails it is dropped
+        and fetched again.
+
         Returns:
             Command data if successful, None otherwise
         """
-        data = self.retrieve_from_ipfs(cid)
+        data = self.blob_store.get_manifest(cid)
+        if data is not None:
+            if not verify or self._verify_manifest(data):
+                return data.get("commands", {})
+            logger.warning(f"Dropping cached manifest {cid} that failed verification")
+            self.blob_store.drop_manifest(cid)
 
+        data = self.retrieve_from_ipfs(cid)
         if not data:
             return None
-
-        # Verify hash if requested
-        if verify and "hash" in data:
-            # Recompute hash
-            data_copy = data.copy()
-            original_hash = data_copy.pop("hash")
-
-            json_str = json.dumps(data_copy, sort_keys=True)
-            computed_hash = self._compute_hash(json_str)
-
-            if computed_hash != original_hash:
-                logger.error(SyncMessages.HASH_VERIFICATION_FAILED)
-                return None
-
+        if verify and not self._verify_manifest(data):
+            logger.error(SyncMessages.HASH_VERIFICATION_FAILED)
+            return None
+        self.blob_store.put_manifest(cid, data)
         return data.get("commands", {})
 
+    def _verify_manifest(self, data: dict) -> bool:
+        """Whether a manifest matches its recorded hash (if it records one)."""
+        if "hash" not in data:
+            return True
+        data_copy = data.copy()
+        original_hash = data_copy.pop("hash")
+        json_str = json.dumps(data_copy, sort_keys=True)
+        return self._compute_hash(json_str) == original_hash
+
     def pull_workflows(
         self,
         cid: str,
         workflows_dir: Path,
         verify: bool = True,
+        full: bool = False,
     ) -> list[Path]:
         """Pull a manifest and reconstruct the workflow script files on disk.
 
-        Walks each command entry in the retrieved manifest, fetches its
-        ``script_cid`` (if present) from IPFS, verifies the recorded
-        ``content_hash``, and writes the file to ``workflows_dir``.
+        Scripts whose file in ``workflows_dir`` already has the manifest's
+        ``content_hash`` are left alone (unless ``full``); local hashes come
+        from the workflows directory's index, so unchanged files are not even
+        re-read. The remaining scripts come from the local blob store, or are
+        fetched by their ``script_cid``, ``IpfsDefaults.DOWNLOAD_WORKERS`` at
+        a time. Every body is verified against the recorded ``content_hash``
+        before anything is written, and files are replaced atomically.
 
         Returns the list of files written. If the manifest predates per-script
         CIDs (lockfile schema < 2.1), the manifest is still pulled but no
@@ -496,8 +589,10 @@ class IPFSSync:
 
         Raises:
             ValueError: when a fetched script's SHA-256 does not match the
-                ``content_hash`` recorded in the lockfile.
+                ``content_hash`` recorded in the lockfile, or a script path
+                would leave ``workflows_dir``.
         """
+        self.last_pull_counts = counts = {"written": 0, "unchanged": 0, "fetched": 0, "failed": 0}
         manifest = self.pull(cid, verify=verify)
         if not manifest:
             return []
@@ -517,47 +612,118 @@ class IPFSSync:
 
         workflows_dir = Path(workflows_dir)
         workflows_dir.mkdir(parents=True, exist_ok=True)
+        base = workflows_dir.resolve()
 
-        written: list[Path] = []
+        # Resolve every target before fetching anything.
+        # (name, target, script_cid, expected "sha256:<hex>" or "")
+        planned: list[tuple[str, Path, str, str]] = []
         for name, entry in commands.items():
             script_filename = entry.get("file")
             script_cid = entry.get("script_cid")
             if not script_filename or not script_cid:
                 logger.warning(f"Skipping '{name}': manifest predates per-script CID sync")
                 continue
-
-            payload = self.fetch_file_from_ipfs(script_cid)
+            expected = entry.get("content_hash") or ""
+            if expected and ":" not in expected:
+                expected = f"sha256:{expected}"
+            planned.append((name, self._safe_target(base, script_filename), script_cid, expected))
+
+        if not full:
+            before = len(planned)
+            planned = self._drop_unchanged(workflows_dir, planned)
+            counts["unchanged"] = before - len(planned)
+
+        payloads: dict[str, bytes] = {}
+        missing: list[str] = []
+        for _, _, script_cid, expected in planned:
+            if script_cid in payloads or script_cid in missing:
+                continue
+            stored = self.blob_store.get(expected) if expected else None
+            if stored is not None:
+                payloads[script_cid] = stored
+            else:
+                missing.append(script_cid)
+
+        if missing:
+            workers = min(IpfsDefaults.DOWNLOAD_WORKERS, len(missing))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ipfs-cat") as pool:
+                for script_cid, payload in zip(
+                    missing, pool.map(self.fetch_file_from_ipfs, missing)
+                ):
+                    if payload is not None:
+                        payloads[script_cid] = payload
+                        counts["fetched"] += 1
+
+        ready: list[tuple[Path, bytes]] = []
+        for name, target, script_cid, expected in planned:
+            payload = payloads.get(script_cid)
             if payload is None:
                 logger.error(f"Failed to fetch script for '{name}' (cid={script_cid})")
+                counts["failed"] += 1
                 continue
-
-            expected_hash = entry.get("content_hash")
-            if expected_hash:
-                expected_value = expected_hash.split(":", 1)[-1]
+            if expected:
+                expected_value = expected.split(":", 1)[-1]
                 actual = hashlib.sha256(payload).hexdigest()
                 if actual != expected_value:
                     raise ValueError(
                         f"hash mismatch for '{name}': expected {expected_value}, got {actual}"
                     )
+            ready.append((target, payload))
 
-            # SECURITY: `script_filename` comes from a remote, untrusted manifest.
-            # Contain it inside workflows_dir so a crafted manifest cannot write
-            # outside the directory via '..' segments or an absolute path.
-            rel = PurePosixPath(script_filename)
-            if rel.is_absolute() or any(part == ".." for part in rel.parts):
-                raise ValueError(f"unsafe script path in manifest: {script_filename}")
-            base = Path(workflows_dir).resolve()
-            target = (base / Path(*rel.parts)).resolve()
-            if base != target and base not in target.parents:
-                raise ValueError(f"script path escapes workflows dir: {script_filename}")
-
+        written: list[Path] = []
+        for target, payload in ready:
+            self.blob_store.put(payload)
             # Recreate group subdirectories (e.g. "demo/hello.py") on pull.
             target.parent.mkdir(parents=True, exist_ok=True)
-            target.write_bytes(payload)
+            tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+            tmp.write_bytes(payload)
+            os.replace(tmp, target)
             written.append(target)
-
+        counts["written"] = len(written)
         return written
 
+    @staticmethod
+    def _safe_target(base: Path, script_filename: str) -> Path:
+        """Resolve a manifest ``file`` inside ``base`` (the resolved workflows dir)."""
+        # SECURITY: `script_filename` comes from a remote, untrusted manifest.
+        # Contain it inside workflows_dir so a crafted manifest cannot write
+        # outside the directory via '..' segments or an absolute path.
+        rel = PurePosixPath(script_filename)
+        if rel.is_absolute() or any(part == ".." for part in rel.parts):
+            raise ValueError(f"unsafe script path in manifest: {script_filename}")
+        target = (base / Path(*rel.parts)).resolve()
+        if base != target and base not in target.parents:
+            raise ValueError(f"script path escapes workflows dir: {script_filename}")
+        return target
+
+    @staticmethod
+    def _drop_unchanged(
+        workflows_dir: Path, planned: list[tuple[str, Path, str, str]]
+    ) -> list[tuple[str, Path, str, str]]:
+        """Planned scripts whose local file does not already have the expected hash."""
+        existing = [target for _, target, _, expected in planned if expected and target.is_file()]
+        if not existing:
+            return planned
+        from mcli.lib.script_loader import ScriptLoader
+
+        try:
+            local = ScriptLoader(workflows_dir).index.get_many(existing)
+        except Exception as e:
+            logger.debug(f"Workflow index unavailable, comparing hashes directly: {e}")
+            local = None
+        remaining = []
+        for item in planned:
+            _, target, _, expected = item
+            if target.is_file() and expected:
+                if local is not None and target in local:
+                    current = local[target].content_hash
+                else:
+                    current = f"sha256:{hashlib.sha256(target.read_bytes()).hexdigest()}"
+                if current == expected:
+                    continue
+            remaining.append(item)
+        return remaining
+
     def resolve_latest_cid(
         self,
         scope: str = "global",
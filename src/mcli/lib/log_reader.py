@@ -0,0 +1,205 @@
+"""
+Bounded-memory reading of large log files.
+
+Backs ``mcli self logs tail``, ``logs grep`` and ``ServiceManager.get_logs``,
+reading files incrementally so memory use does not grow with the log size:
+
+- ``tail_lines`` seeks to the end of the file and reads fixed-size blocks
+  backwards until it has seen enough newlines, so the cost depends on the
+  number of lines asked for, not the size of the file
+- ``grep_file`` streams the file line by line against one compiled regular
+  expression. Context before a match comes from a ring buffer of the last
+  ``context`` lines, and matches wait only until their trailing context has
+  been read, so memory is bounded by the context and the matches themselves
+- ``grep_files`` searches several files (e.g. consecutive dated logs),
+  spreading them over worker processes once they are large enough for the
+  regex scan to be CPU-bound
+
+Lines are decoded as UTF-8, replacing undecodable bytes, so a truncated or
+binary write never aborts a search.
+
+Example:
+    >>> tail_lines(logs_dir / "mcli_20250101.log", 20)
+    ['INFO: ...', ...]
+    >>> for match in grep_file(log_file, "connection failed", context=2):
+    ...     print(match.format())
+"""
+
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Deque, Iterable, Iterator, List, Optional, Pattern, Sequence, Union
+
+# Bytes read per backwards step when tailing
+BLOCK_SIZE = 64 * 1024
+
+# Below this combined size, files are searched in-process: starting worker
+# processes costs more than the scan itself.
+PARALLEL_GREP_MIN_BYTES = 32 * 1024 * 1024
+
+
+def tail_lines(path: Union[str, Path], count: int, block_size: int = BLOCK_SIZE) -> List[str]:
+    """Return the last ``count`` lines of a file, without line terminators."""
+    if count <= 0:
+        return []
+    blocks: List[bytes] = []
+    newlines = 0
+    with open(path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        # One newline more than requested guarantees the first kept line is whole
+        while position > 0 and newlines <= count:
+            size = min(block_size, position)
+            position -= size
+            f.seek(position)
+            block = f.read(size)
+            blocks.append(block)
+            newlines += block.count(b"\n")
+
+    data = b"".join(reversed(blocks))
+    if data.endswith(b"\n"):
+        data = data[:-1]
+    if not data:
+        return []
+    return [line.rstrip(b"\r").decode("utf-8", "replace") for line in data.split(b"\n")[-count:]]
+
+
+def compile_pattern(pattern: str, ignore_case: bool = True, regex: bool = False) -> Pattern[str]:
+    """Compile a search pattern, treated as a literal string unless ``regex``.
+
+    Raises:
+        re.error: ``pattern`` is not a valid regular expression.
+    """
+    return re.compile(pattern if regex else re.escape(pattern), re.IGNORECASE if ignore_case else 0)
+
+
+@dataclass
+class LogMatch:
+    """A matching line with its surrounding context."""
+
+    path: Path
+    line_number: int
+    line: str
+    before: List[str] = field(default_factory=list)
+    after: List[str] = field(default_factory=list)
+
+    def format(self) -> str:
+        """Render as the match line marked ``>>>`` between its context lines."""
+        lines = [f"    {line}" for line in self.before]
+        lines.append(f">>> {self.line}")
+        lines.extend(f"    {line}" for line in self.after)
+        return "\n".join(lines) + "\n"
+
+
+def grep_file(
+    path: Union[str, Path],
+    pattern: Union[str, Pattern[str]],
+    context: int = 0,
+    ignore_case: bool = True,
+    regex: bool = False,
+) -> Iterator[LogMatch]:
+    """Yield the lines of a file matching ``pattern``, in file order.
+
+    Each match carries up to ``context`` lines before and after it, even when
+    matches are close enough for their context to overlap.
+    """
+    path = Path(path)
+    search = (
+        pattern if isinstance(pattern, re.Pattern) else compile_pattern(pattern, ignore_case, regex)
+    ).search
+    context = max(context, 0)
+    before: Deque[str] = deque(maxlen=context)
+    waiting: Deque[LogMatch] = deque()  # matches still collecting trailing context
+
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.rstrip("\r\n")
+            for match in waiting:
+                match.after.append(line)
+            while waiting and len(waiting[0].after) >= context:
+                yield waiting.popleft()
+
+            if search(line):
+                match = LogMatch(path, line_number, line, list(before))
+                if context:
+                    waiting.append(match)
+                else:
+                    yield match
+            before.append(line)
+
+    yield from waiting
+
+
+@dataclass
+class GrepResult:
+    """Matches found in one file, or why it could not be searched.
+
+    ``matches`` is a list when the file was searched in a worker process and
+    otherwise a lazy iterator that reads the file as it is consumed; ``error``
+    is only final once ``matches`` has been exhausted.
+    """
+
+    path: Path
+    matches: Iterable[LogMatch] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def _grep_to_result(
+    path: Path, pattern: str, context: int, ignore_case: bool, regex: bool
+) -> GrepResult:
+    try:
+        return GrepResult(path, list(grep_file(path, pattern, context, ignore_case, regex)))
+    except OSError as e:
+        return GrepResult(path, error=str(e))
+
+
+def _stream_to_result(
+    path: Path, pattern: str, context: int, ignore_case: bool, regex: bool
+) -> GrepResult:
+    result = GrepResult(path)
+
+    def matches() -> Iterator[LogMatch]:
+        try:
+            yield from grep_file(path, pattern, context, ignore_case, regex)
+        except OSError as e:
+            result.error = str(e)
+
+    result.matches = matches()
+    return result
+
+
+def _pooled_results(files: List[Path], args: tuple, workers: int) -> Iterator[GrepResult]:
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_grep_to_result, p, *args) for p in files]
+        for future in futures:
+            yield future.result()
+
+
+def grep_files(
+    paths: Sequence[Union[str, Path]],
+    pattern: str,
+    context: int = 0,
+    ignore_case: bool = True,
+    regex: bool = False,
+    max_workers: Optional[int] = None,
+) -> Iterator[GrepResult]:
+    """Search several files, yielding one result per file in input order.
+
+    Files searched in-process stream their matches, so memory stays bounded
+    however many lines match; only results from worker processes are
+    collected in full.
+
+    Raises:
+        re.error: ``regex`` is set and ``pattern`` is not a valid regular expression.
+    """
+    compile_pattern(pattern, ignore_case, regex)  # fail before starting any worker
+    files = [Path(p) for p in paths]
+    total_size = sum(p.stat().st_size for p in files if p.exists())
+    workers = min(len(files), max_workers or os.cpu_count() or 1)
+    args = (pattern, context, ignore_case, regex)
+
+    if workers <= 1 or total_size < PARALLEL_GREP_MIN_BYTES:
+        return (_stream_to_result(p, *args) for p in files)
+    return _pooled_results(files, args, workers)
@@ -40,9 +40,12 @@ from .correlation import (
 )
 from .logger import (
     disable_runtime_tracing,
+    disable_sampling_profiler,
     disable_system_tracing,
     enable_runtime_tracing,
+    enable_sampling_profiler,
     enable_system_tracing,
+    flush_logs,
     get_logger,
     get_system_trace_logger,
     register_process,
@@ -60,10 +63,13 @@ from .structured import (
 __all__ = [
     # Basic logger
     "get_logger",
+    "flush_logs",
     # Trace loggers
     "get_system_trace_logger",
     "enable_runtime_tracing",
     "disable_runtime_tracing",
+    "enable_sampling_profiler",
+    "disable_sampling_profiler",
     "enable_system_tracing",
     "disable_system_tracing",
     "register_process",
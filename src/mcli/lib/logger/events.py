@@ -0,0 +1,447 @@
+"""
+Append-only, indexed log of command runs.
+
+Every workflow and scheduled job run appends one binary record to
+``<logs>/events/runs_YYYYMMDD.bin``, so questions like "which workflows got
+slower this week" are answered from compact indexes rather than text logs:
+
+- a record is a length-prefixed frame (``<II``: payload length, CRC32)
+  holding the start timestamp, duration, exit status, and the source,
+  command name and correlation id (``mcli.lib.logger.correlation``) as
+  length-prefixed UTF-8 strings
+- each frame is written with a single ``O_APPEND`` write, so concurrent mcli
+  processes can share a segment without locking
+- next to each segment, ``runs_YYYYMMDD.idx`` holds one fixed 32-byte entry
+  per record: timestamp, offset, CRC32 of the command name, duration and exit
+  status. Time and command filters, counts and p50/p95 durations are computed
+  from the index alone; the segment is only read to recover command names
+  (once per distinct command) and for ``query`` results
+- daily segments are chosen by file name, so a query over a week opens at
+  most eight pairs of files however long the history is
+
+A record whose index entry was lost (a crash between the two writes) is
+picked up again by ``rebuild_index``, which also runs when an index is
+missing. A torn frame at the end of a segment is ignored by readers.
+
+Set ``MCLI_RUN_EVENTS=0`` to stop recording.
+
+Example:
+    >>> with track_run("backup", source="workflow"):
+    ...     run_backup()
+    >>> log = RunEventLog()
+    >>> for stats in log.stats(since=datetime.now() - timedelta(days=7)):
+    ...     print(stats.command, stats.p50, stats.p95)
+"""
+
+import os
+import struct
+import time
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import click
+
+from mcli.lib.constants.env import EnvVars
+
+from .correlation import correlation_context, get_correlation_id
+
+# Frame header: payload length, CRC32 of the payload
+_FRAME = struct.Struct("<II")
+
+# Payload header: timestamp, duration, exit status, then the byte lengths of
+# the source, command and correlation id strings that follow it
+_PAYLOAD = struct.Struct("<ddiHHH")
+
+# Index entry: timestamp, frame offset, CRC32 of the command, duration, exit status
+_INDEX_ENTRY = struct.Struct("<dQIdi")
+
+# Frames larger than this are treated as corruption when reading
+MAX_RECORD_BYTES = 64 * 1024
+
+SEGMENT_PREFIX = "runs_"
+
+_MAX_FIELD = 0xFFFF
+
+
+@dataclass
+class RunEvent:
+    """One recorded run of a command."""
+
+    timestamp: float
+    command: str
+    duration: float
+    exit_status: int
+    source: str = "workflow"
+    correlation_id: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.exit_status == 0
+
+    @property
+    def started_at(self) -> datetime:
+        return datetime.fromtimestamp(self.timestamp)
+
+
+@dataclass
+class CommandStats:
+    """Run count, failures and duration percentiles of one command."""
+
+    command: str
+    count: int
+    failures: int
+    total: float
+    p50: float
+    p95: float
+    max: float
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+def _field(value: str) -> bytes:
+    return value.encode("utf-8", "replace")[:_MAX_FIELD]
+
+
+def command_hash(command: str) -> int:
+    """Key of ``command`` in segment indexes."""
+    return zlib.crc32(_field(command))
+
+
+def encode_event(event: RunEvent) -> bytes:
+    """Serialize ``event`` as one length-prefixed frame."""
+    source, command, cid = _field(event.source), _field(event.command), _field(event.correlation_id)
+    payload = (
+        _PAYLOAD.pack(
+            event.timestamp,
+            event.duration,
+            event.exit_status,
+            len(source),
+            len(command),
+            len(cid),
+        )
+        + source
+        + command
+        + cid
+    )
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def decode_event(payload: bytes) -> RunEvent:
+    """Inverse of ``encode_event`` for a frame's payload."""
+    timestamp, duration, exit_status, *lengths = _PAYLOAD.unpack_from(payload)
+    fields = []
+    position = _PAYLOAD.size
+    for length in lengths:
+        fields.append(payload[position : position + length].decode("utf-8", "replace"))
+        position += length
+    source, command, cid = fields
+    return RunEvent(timestamp, command, duration, exit_status, source, cid)
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not ordered:
+        return 0.0
+    rank = max(int(-(-q * len(ordered) // 100)), 1)
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class RunEventLog:
+    """Daily segments of run events with a per-segment index."""
+
+    def __init__(self, directory: Optional[Union[str, Path]] = None):
+        if directory is None:
+            from mcli.lib.paths import get_logs_dir
+
+            directory = get_logs_dir() / "events"
+        self.directory = Path(directory)
+
+    def segment_for(self, when: datetime) -> Path:
+        return self.directory / f"{SEGMENT_PREFIX}{when.strftime('%Y%m%d')}.bin"
+
+    @staticmethod
+    def index_for(segment: Path) -> Path:
+        return segment.with_suffix(".idx")
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, event: RunEvent) -> None:
+        """Append ``event`` to the segment of its start day and index it."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        segment = self.segment_for(datetime.fromtimestamp(event.timestamp))
+        frame = encode_event(event)
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+        fd = os.open(segment, flags, 0o644)
+        try:
+            os.write(fd, frame)
+            # With O_APPEND our offset is the end of our own write, whatever
+            # other processes appended concurrently
+            offset = os.lseek(fd, 0, os.SEEK_CUR) - len(frame)
+        finally:
+            os.close(fd)
+
+        entry = _INDEX_ENTRY.pack(
+            event.timestamp, offset, command_hash(event.command), event.duration, event.exit_status
+        )
+        fd = os.open(self.index_for(segment), flags, 0o644)
+        try:
+            os.write(fd, entry)
+        finally:
+            os.close(fd)
+
+    def rebuild_index(self, segment: Path) -> int:
+        """Rewrite the index of ``segment`` from its records; returns the record count."""
+        entries = [
+            _INDEX_ENTRY.pack(
+                event.timestamp,
+                offset,
+                command_hash(event.command),
+                event.duration,
+                event.exit_status,
+            )
+            for offset, event in self._scan(segment)
+        ]
+        index = self.index_for(segment)
+        tmp = index.with_suffix(".idx.tmp")
+        tmp.write_bytes(b"".join(entries))
+        os.replace(tmp, index)
+        return len(entries)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def segments(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> List[Path]:
+        """Segments that can hold events between ``since`` and ``until``, oldest first."""
+        if not self.directory.is_dir():
+            return []
+        first = since.strftime("%Y%m%d") if since else ""
+        last = until.strftime("%Y%m%d") if until else "99999999"
+        found = []
+        for path in self.directory.glob(f"{SEGMENT_PREFIX}*.bin"):
+            day = path.stem[len(SEGMENT_PREFIX) :]
+            if first <= day <= last:
+                found.append(path)
+        return sorted(found)
+
+    def _entries(
+        self,
+        segment: Path,
+        since: Optional[float],
+        until: Optional[float],
+        command: Optional[str],
+    ) -> Iterator[Tuple[float, int, int, float, int]]:
+        index = self.index_for(segment)
+        if not index.exists():
+            self.rebuild_index(segment)
+        data = index.read_bytes()
+        # Ignore a torn entry at the end
+        data = data[: len(data) - len(data) % _INDEX_ENTRY.size]
+        key = command_hash(command) if command is not None else None
+        for entry in _INDEX_ENTRY.iter_unpack(data):
+            if since is not None and entry[0] < since:
+                continue
+            if until is not None and entry[0] >= until:
+                continue
+            if key is not None and entry[2] != key:
+                continue
+            yield entry
+
+    def _scan(self, segment: Path) -> Iterator[Tuple[int, RunEvent]]:
+        """Every intact record of ``segment`` with its offset."""
+        with open(segment, "rb") as f:
+            offset = 0
+            while True:
+                event = self._read_at(f, offset)
+                if event is None:
+                    return
+                yield offset, event
+                offset = f.tell()
+
+    @staticmethod
+    def _read_at(f, offset: int) -> Optional[RunEvent]:
+        f.seek(offset)
+        header = f.read(_FRAME.size)
+        if len(header) < _FRAME.size:
+            return None
+        length, checksum = _FRAME.unpack(header)
+        if length > MAX_RECORD_BYTES:
+            return None
+        payload = f.read(length)
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            return None
+        return decode_event(payload)
+
+    def query(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        command: Optional[str] = None,
+        failed_only: bool = False,
+    ) -> Iterator[RunEvent]:
+        """Events in ``[since, until)``, optionally for one command, oldest segment first."""
+        start = since.timestamp() if since else None
+        end = until.timestamp() if until else None
+        for segment in self.segments(since, until):
+            entries = [
+                entry
+                for entry in self._entries(segment, start, end, command)
+                if not failed_only or entry[4] != 0
+            ]
+            if not entries:
+                continue
+            with open(segment, "rb") as f:
+                for entry in sorted(entries):
+                    event = self._read_at(f, entry[1])
+                    if event is not None and (command is None or event.command == command):
+                        yield event
+
+    def stats(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        command: Optional[str] = None,
+    ) -> List[CommandStats]:
+        """Per-command counts and duration percentiles, slowest p95 first.
+
+        Computed from the indexes; each segment is read once per distinct
+        command, to recover its name.
+        """
+        start = since.timestamp() if since else None
+        end = until.timestamp() if until else None
+        durations: Dict[int, List[float]] = {}
+        failures: Dict[int, int] = {}
+        names: Dict[int, str] = {}
+        for segment in self.segments(since, until):
+            unnamed: Dict[int, int] = {}
+            for _, offset, hashed, duration, exit_status in self._entries(
+                segment, start, end, command
+            ):
+                durations.setdefault(hashed, []).append(duration)
+                failures[hashed] = failures.get(hashed, 0) + (exit_status != 0)
+                if hashed not in names:
+                    unnamed.setdefault(hashed, offset)
+            if unnamed:
+                with open(segment, "rb") as f:
+                    for hashed, offset in unnamed.items():
+                        event = self._read_at(f, offset)
+                        if event is not None:
+                            names[hashed] = event.command
+
+        results = []
+        for hashed, values in durations.items():
+            values.sort()
+            results.append(
+                CommandStats(
+                    command=names.get(hashed, command or f"<unknown {hashed:08x}>"),
+                    count=len(values),
+                    failures=failures[hashed],
+                    total=sum(values),
+                    p50=_percentile(values, 50),
+                    p95=_percentile(values, 95),
+                    max=values[-1],
+                )
+            )
+        results.sort(key=lambda s: s.p95, reverse=True)
+        return results
+
+
+def run_events_enabled() -> bool:
+    return os.environ.get(EnvVars.MCLI_RUN_EVENTS, "1").strip().lower() not in (
+        "0",
+        "false",
+        "no",
+        "off",
+    )
+
+
+_default_log: Optional[RunEventLog] = None
+
+
+def get_run_event_log() -> RunEventLog:
+    """The process-wide log under the mcli logs directory."""
+    global _default_log
+    if _default_log is None:
+        _default_log = RunEventLog()
+    return _default_log
+
+
+def record_run(
+    command: str,
+    duration: float,
+    exit_status: int,
+    source: str = "workflow",
+    started: Optional[float] = None,
+    correlation_id: Optional[str] = None,
+) -> None:
+    """Append a run to the event log. Never raises: recording must not fail a run."""
+    if not run_events_enabled():
+        return
+    event = RunEvent(
+        timestamp=started if started is not None else time.time() - duration,
+        command=command,
+        duration=duration,
+        exit_status=exit_status,
+        source=source,
+        correlation_id=correlation_id or get_correlation_id() or "",
+    )
+    try:
+        get_run_event_log().append(event)
+    except Exception:
+        from .logger import get_logger
+
+        get_logger(__name__).debug("Could not record run of %s", command, exc_info=True)
+
+
+def exit_status_of(exc: Optional[BaseException]) -> int:
+    """Process exit status a run ending with ``exc`` (None: success) stands for."""
+    if exc is None:
+        return 0
+    if isinstance(exc, SystemExit):
+        if exc.code is None:
+            return 0
+        return exc.code if isinstance(exc.code, int) else 1
+    if isinstance(exc, (click.ClickException, click.exceptions.Exit)):
+        # Exit (ctx.exit) is a RuntimeError, not a ClickException
+        return exc.exit_code
+    if isinstance(exc, KeyboardInterrupt):
+        return 130
+    return 1
+
+
+@contextmanager
+def track_run(command: str, source: str = "workflow") -> Iterator[str]:
+    """Time the block and record it as a run of ``command``.
+
+    Runs inside a correlation context (reusing the current id, if any) and
+    yields the correlation id. Exceptions propagate; their exit status is
+    recorded first.
+    """
+    started = time.time()
+    clock = time.perf_counter()
+    with correlation_context(get_correlation_id()) as cid:
+        error: Optional[BaseException] = None
+        try:
+            yield cid
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            record_run(
+                command,
+                time.perf_counter() - clock,
+                exit_status_of(error),
+                source=source,
+                started=started,
+                correlation_id=cid,
+            )
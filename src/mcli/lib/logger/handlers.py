@@ -0,0 +1,207 @@
+"""
+Asynchronous, batched file handlers for ``McliLogger``.
+
+``McliLogger`` writes its log files through an ``AsyncLogWriter``, which keeps
+formatting and disk I/O off the calling thread:
+
+- loggers get a ``QueueHandler`` that only enqueues the record; formatting
+  happens later on a single background writer thread, so a call that passes
+  the logger's level costs one queue put
+- the writer hands records to ``BufferedRotatingFileHandler``s, which
+  accumulate formatted text and write it in one call when ``flush_bytes`` are
+  buffered, when a record at ``flush_level`` (ERROR) or above arrives, every
+  ``flush_interval`` seconds and at exit
+- files rotate by size (``max_bytes``, keeping ``backup_count`` old files),
+  checked once per batch, so a file can exceed ``max_bytes`` by one batch
+
+Records are formatted on the writer thread, so mutable objects passed as
+``%``-style arguments are rendered as they are when written, not when logged.
+A forked child starts its own writer on first use; records queued but not yet
+written when the parent forked belong to the parent.
+
+Example:
+    >>> writer = AsyncLogWriter()
+    >>> target = BufferedRotatingFileHandler(log_dir / "mcli.log")
+    >>> logger.addHandler(writer.handler_for(target))
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, RotatingFileHandler
+from pathlib import Path
+from typing import List, Optional, Tuple, Union, cast
+
+# Buffered text that triggers a write, in characters
+FLUSH_BYTES = 64 * 1024
+
+# Longest a record waits in a buffer before being written
+FLUSH_INTERVAL = 0.5
+
+# Size-based rotation of each log file
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+
+_STOP = object()
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """Size-rotated file handler that writes formatted records in batches."""
+
+    def __init__(
+        self,
+        filename: Union[str, Path],
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backup_count: int = DEFAULT_BACKUP_COUNT,
+        flush_bytes: int = FLUSH_BYTES,
+        flush_level: int = logging.ERROR,
+        encoding: Optional[str] = "utf-8",
+    ):
+        super().__init__(
+            filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding, delay=True
+        )
+        self.flush_bytes = flush_bytes
+        self.flush_level = flush_level
+        self._buffer: List[str] = []
+        self._buffered = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            text = self.format(record) + self.terminator
+        except Exception:
+            self.handleError(record)
+            return
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if self._buffered >= self.flush_bytes or record.levelno >= self.flush_level:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write everything buffered, rotating first if it would overflow the file."""
+        with self.lock:
+            if not self._buffer:
+                return
+            data = "".join(self._buffer)
+            self._buffer.clear()
+            self._buffered = 0
+            try:
+                if self.stream is None:
+                    self.stream = self._open()
+                position = self.stream.tell()
+                if self.maxBytes > 0 and position > 0 and position + len(data) >= self.maxBytes:
+                    self.doRollover()
+                    if self.stream is None:
+                        self.stream = self._open()
+                self.stream.write(data)
+                self.stream.flush()
+            except Exception:
+                self.handleError(logging.makeLogRecord({"msg": "log flush failed"}))
+
+    def close(self) -> None:
+        self.flush()
+        super().close()
+
+
+class _QueueForwarder(QueueHandler):
+    """Enqueues records, unformatted, for the writer thread to pass to ``target``."""
+
+    def __init__(self, writer: "AsyncLogWriter", target: logging.Handler):
+        super().__init__(writer.queue)
+        self.writer = writer
+        self.target = target
+        self.setLevel(target.level)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self.writer.put(record, self.target)
+
+
+class AsyncLogWriter:
+    """Background thread passing queued records to their target handlers."""
+
+    def __init__(self, flush_interval: float = FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
+        self.queue: "queue.SimpleQueue[object]" = queue.SimpleQueue()
+        self._targets: List[logging.Handler] = []
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork_in_child)
+        atexit.register(self.stop)
+
+    def handler_for(self, target: logging.Handler) -> logging.Handler:
+        """A handler for loggers that writes to ``target`` via this writer."""
+        self._targets.append(target)
+        return _QueueForwarder(self, target)
+
+    def put(self, record: logging.LogRecord, target: logging.Handler) -> None:
+        if self._thread is None:
+            self._start()
+        self.queue.put((record, target))
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="mcli-log-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        buffered = False
+        while True:
+            try:
+                # Only wake up for the flush interval while something is buffered
+                item = self.queue.get(timeout=self.flush_interval if buffered else None)
+            except queue.Empty:
+                self.flush()
+                buffered = False
+                continue
+            if item is _STOP:
+                self.flush()
+                return
+            if isinstance(item, threading.Event):
+                self.flush()
+                buffered = False
+                item.set()
+                continue
+            record, target = cast(Tuple[logging.LogRecord, logging.Handler], item)
+            target.handle(record)
+            buffered = True
+
+    def flush(self) -> None:
+        """Write whatever the target handlers have buffered."""
+        for target in list(self._targets):
+            target.flush()
+
+    def drain(self, timeout: float = 5.0) -> bool:
+        """Wait until every record queued so far is written; False on timeout."""
+        if self._thread is None:
+            self.flush()
+            return True
+        written = threading.Event()
+        self.queue.put(written)
+        return written.wait(timeout)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Write out queued records and stop the thread; it restarts on the next record."""
+        with self._start_lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self.queue.put(_STOP)
+            thread.join(timeout)
+        self.flush()
+
+    def _after_fork_in_child(self) -> None:
+        self.queue = queue.SimpleQueue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        for target in self._targets:
+            if isinstance(target, BufferedRotatingFileHandler):
+                # The parent still owns what it had buffered
+                target._buffer.clear()
+                target._buffered = 0
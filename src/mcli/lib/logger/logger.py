@@ -1,5 +1,7 @@
 import inspect
+import linecache
 import logging
+import logging.handlers
 import os
 import subprocess
 import sys
@@ -12,6 +14,14 @@ from typing import Any, Callable, Dict, List, Optional, Set
 
 import psutil
 
+from mcli.lib.logger.handlers import (
+    DEFAULT_BACKUP_COUNT,
+    DEFAULT_MAX_BYTES,
+    AsyncLogWriter,
+    BufferedRotatingFileHandler,
+)
+from mcli.lib.logger.profiler import DEFAULT_INTERVAL, SamplingProfiler
+
 # Type alias for trace functions
 TraceFunction = Callable[[FrameType, str, Any], "Optional[TraceFunction]"]
 
@@ -30,6 +40,8 @@ class McliLogger:
     _excluded_modules: set[str] = set()
     _trace_level: int = 0  # 0=off, 1=function calls, 2=line by line, 3=verbose
     _system_trace_level: int = 0  # 0=off, 1=basic, 2=detailed
+    _writer: Optional[AsyncLogWriter] = None  # Shared by all file handlers in async mode
+    _profiler: Optional[SamplingProfiler] = None
 
     @classmethod
     def get_logger(cls, name: str = "mcli.out") -> logging.Logger:
@@ -185,14 +197,60 @@ class McliLogger:
         """Disable Python interpreter runtime tracing."""
         cls.enable_runtime_tracing(level=0)
 
+    @classmethod
+    def enable_sampling_profiler(
+        cls, interval: float = DEFAULT_INTERVAL, lines: bool = False
+    ) -> None:
+        """
+        Start sampling the stacks of all threads, a low-overhead alternative to runtime tracing.
+
+        Args:
+            interval: Seconds between samples
+            lines: Label frames with line numbers and report the hottest source lines
+        """
+        if cls._instance is None:
+            cls._instance = cls("mcli.out")
+
+        if cls._profiler is None or not cls._profiler.running:
+            cls._profiler = SamplingProfiler(interval=interval, lines=lines).start()
+            cls._instance.trace_logger.info(
+                f"Sampling profiler enabled (interval={interval * 1000:.1f}ms, lines={lines})"
+            )
+
+    @classmethod
+    def disable_sampling_profiler(cls) -> Optional[str]:
+        """
+        Stop the sampling profiler and write its results.
+
+        The collapsed stacks go to ``mcli_profile_<timestamp>_<pid>.folded`` in
+        the logs directory and the per-function summary to the trace log.
+
+        Returns:
+            Path of the collapsed-stack file, or None if the profiler was not running
+        """
+        profiler, cls._profiler = cls._profiler, None
+        if profiler is None or cls._instance is None:
+            return None
+        profiler.stop()
+
+        from mcli.lib.paths import get_logs_dir
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = profiler.write_collapsed(
+            get_logs_dir() / f"mcli_profile_{timestamp}_{os.getpid()}.folded"
+        )
+        cls._instance.trace_logger.info(f"Sampling profile written to {path}\n{profiler.summary()}")
+        return str(path)
+
     def __init__(self, name: str = "mcli.out") -> None:
         self.name = name
         self.logger = logging.getLogger(name)
         self.trace_logger = logging.getLogger(f"{name}.trace")
         self.system_trace_logger = logging.getLogger(f"{name}.system")
 
-        # Set to DEBUG to capture all levels in the log file
-        self.logger.setLevel(logging.DEBUG)
+        # DEBUG by default so the log file captures all levels. A higher
+        # MCLI_LOG_LEVEL makes disabled calls return before creating a record.
+        self.logger.setLevel(_env_log_level())
         self.trace_logger.setLevel(logging.DEBUG)
         self.system_trace_logger.setLevel(logging.DEBUG)
 
@@ -223,25 +281,22 @@ class McliLogger:
             system_trace_log_file = log_dir / f"mcli_system_{timestamp}.log"
 
             # Configure regular file handler
-            file_handler = logging.FileHandler(log_file)
-            file_handler.setLevel(logging.DEBUG)  # Capture all levels in the file
+            file_handler = self._file_handler(log_file)
             file_formatter = logging.Formatter("%(asctime)s [%(levelname)s] [%(name)s] %(message)s")
             file_handler.setFormatter(file_formatter)
-            self.logger.addHandler(file_handler)
+            self.logger.addHandler(self._attach(file_handler))
 
             # Configure trace file handler
-            trace_handler = logging.FileHandler(trace_log_file)
-            trace_handler.setLevel(logging.DEBUG)
+            trace_handler = self._file_handler(trace_log_file)
             trace_formatter = logging.Formatter("%(asctime)s [TRACE] %(message)s")
             trace_handler.setFormatter(trace_formatter)
-            self.trace_logger.addHandler(trace_handler)
+            self.trace_logger.addHandler(self._attach(trace_handler))
 
             # Configure system trace file handler
-            system_trace_handler = logging.FileHandler(system_trace_log_file)
-            system_trace_handler.setLevel(logging.DEBUG)
+            system_trace_handler = self._file_handler(system_trace_log_file)
             system_trace_formatter = logging.Formatter("%(asctime)s [SYSTEM] %(message)s")
             system_trace_handler.setFormatter(system_trace_formatter)
-            self.system_trace_logger.addHandler(system_trace_handler)
+            self.system_trace_logger.addHandler(self._attach(system_trace_handler))
 
             # Log the path to help with debugging
             self.logger.debug(f"Logging to: {log_file}")
@@ -261,6 +316,36 @@ class McliLogger:
             self.system_trace_logger.addHandler(fallback_handler)
             self.logger.error(f"Failed to set up file logging: {e}. Using stderr fallback.")
 
+    @staticmethod
+    def _file_handler(path: Any) -> logging.Handler:
+        """Size-rotated handler for one log file; batched unless MCLI_LOG_ASYNC is off."""
+        max_bytes = int(os.environ.get("MCLI_LOG_MAX_BYTES", DEFAULT_MAX_BYTES))
+        if _async_logging_enabled():
+            handler: logging.Handler = BufferedRotatingFileHandler(
+                path, max_bytes=max_bytes, backup_count=DEFAULT_BACKUP_COUNT
+            )
+        else:
+            handler = logging.handlers.RotatingFileHandler(
+                path, maxBytes=max_bytes, backupCount=DEFAULT_BACKUP_COUNT, encoding="utf-8"
+            )
+        handler.setLevel(logging.DEBUG)  # Capture all levels in the file
+        return handler
+
+    @classmethod
+    def _attach(cls, handler: logging.Handler) -> logging.Handler:
+        """The handler loggers should use to reach ``handler``."""
+        if not _async_logging_enabled():
+            return handler
+        if cls._writer is None:
+            cls._writer = AsyncLogWriter()
+        return cls._writer.handler_for(handler)
+
+    @classmethod
+    def flush(cls) -> None:
+        """Write out every record logged so far."""
+        if cls._writer is not None:
+            cls._writer.drain()
+
     def _should_trace(self, filename: str) -> bool:
         """Determine if a file should be traced based on exclusion rules."""
         # Skip files in standard library
@@ -473,18 +558,11 @@ class McliLogger:
             elif event == "line" and self._trace_level >= 2:
                 # For line-by-line tracing (high volume)
                 if self._trace_level >= 3:
-                    # Include source line in verbose mode
-                    try:
-                        with open(filename) as f:
-                            lines = f.readlines()
-                            source = (
-                                lines[lineno - 1].strip()
-                                if lineno <= len(lines)
-                                else "<source not available>"
-                            )
-                        self.trace_logger.debug(f"LINE {filename}:{lineno} -> {source}")
-                    except Exception:
-                        self.trace_logger.debug(f"LINE {filename}:{lineno}")
+                    # Include source line in verbose mode; linecache reads each file once
+                    source = linecache.getline(filename, lineno).strip()
+                    self.trace_logger.debug(
+                        f"LINE {filename}:{lineno} -> {source or '<source not available>'}"
+                    )
                 else:
                     self.trace_logger.debug(f"LINE {filename}:{lineno}")
 
@@ -519,6 +597,20 @@ class McliLogger:
         return self._trace_callback if self._trace_level > 0 else None
 
 
+def _async_logging_enabled() -> bool:
+    """Whether log files are written by the background writer (MCLI_LOG_ASYNC, default on)."""
+    return os.environ.get("MCLI_LOG_ASYNC", "1").lower() not in ("0", "false", "no", "off")
+
+
+def _env_log_level() -> int:
+    """Level of the main logger from MCLI_LOG_LEVEL (a name or number), DEBUG by default."""
+    value = os.environ.get("MCLI_LOG_LEVEL", "").strip().upper()
+    if value.isdigit():
+        return int(value)
+    level = logging.getLevelName(value) if value else logging.DEBUG
+    return level if isinstance(level, int) else logging.DEBUG
+
+
 # Singleton instance accessor function
 def get_logger(name: str = "mcli.out") -> logging.Logger:
     """
@@ -559,6 +651,27 @@ def disable_runtime_tracing() -> None:
     McliLogger.disable_runtime_tracing()
 
 
+def enable_sampling_profiler(interval: float = DEFAULT_INTERVAL, lines: bool = False) -> None:
+    """
+    Start the low-overhead sampling profiler.
+
+    Args:
+        interval: Seconds between stack samples
+        lines: Label frames with line numbers and report the hottest source lines
+    """
+    McliLogger.enable_sampling_profiler(interval, lines)
+
+
+def disable_sampling_profiler() -> Optional[str]:
+    """
+    Stop the sampling profiler, writing collapsed stacks to the logs directory.
+
+    Returns:
+        Path of the collapsed-stack file, or None if the profiler was not running
+    """
+    return McliLogger.disable_sampling_profiler()
+
+
 def enable_system_tracing(level: int = 1, interval: int = 5) -> None:
     """
     Enable OS-level system tracing for process monitoring.
@@ -601,6 +714,11 @@ def register_subprocess(proc: subprocess.Popen) -> int:
     return McliLogger.register_subprocess(proc)
 
 
+def flush_logs() -> None:
+    """Write out every record logged so far, e.g. before reading the log files."""
+    McliLogger.flush()
+
+
 def unregister_process(pid: int) -> None:
     """
     Remove a process from monitoring.
@@ -0,0 +1,241 @@
+"""
+Sampling profiler for mcli runtime tracing.
+
+``SamplingProfiler`` backs ``MCLI_TRACE_MODE=sample``. It installs no trace
+hooks and instead looks at the interpreter from a background thread:
+
+- every ``interval`` seconds it takes ``sys._current_frames()`` and walks each
+  thread's stack, so the cost is per sample, not per call or line
+- stacks are aggregated into counts as they are taken; nothing is logged
+  while the profile runs
+- where the platform exposes per-thread CPU clocks, the CPU time a thread
+  used since the previous sample is attributed to its current stack, giving
+  CPU totals next to wall-clock ones
+- unless ``idle=True``, samples of background threads that used no CPU since
+  the previous sample (blocked on a queue, a lock or I/O) are dropped, so
+  parked worker threads do not drown out the main thread. The main thread is
+  always sampled, since its waiting is part of the command's wall time
+- with ``lines=True`` frames are labelled with their line number and the
+  summary shows the source of the hottest lines, looked up through
+  ``linecache`` so each file is read once
+
+The result can be written in the collapsed-stack format read by flamegraph
+tools (``flamegraph.pl``, speedscope, inferno), one
+``thread;outer;...;inner count`` line per distinct stack, and summarized as
+per-function self/total wall and CPU time.
+
+Example:
+    >>> profiler = SamplingProfiler(interval=0.005).start()
+    >>> run_command()
+    >>> profiler.stop()
+    >>> profiler.write_collapsed(logs_dir / "mcli_profile.folded")
+    >>> print(profiler.summary(limit=10))
+"""
+
+import linecache
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Dict, List, Optional, Tuple, Union
+
+DEFAULT_INTERVAL = 0.005
+
+# Frames deeper than this are cut from the root end of the stack
+DEFAULT_MAX_DEPTH = 128
+
+# Thread names are refreshed every this many samples
+_THREAD_NAME_REFRESH = 200
+
+_HAS_THREAD_CPU_CLOCKS = hasattr(time, "pthread_getcpuclockid")
+
+
+@dataclass
+class FunctionStats:
+    """Samples and CPU time attributed to one function."""
+
+    name: str
+    self_samples: int = 0
+    total_samples: int = 0
+    self_cpu: float = 0.0
+    total_cpu: float = 0.0
+
+
+class SamplingProfiler:
+    """Periodically samples the stacks of every thread in the process."""
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_INTERVAL,
+        lines: bool = False,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        idle: bool = False,
+    ):
+        self.interval = max(interval, 0.0005)
+        self.lines = lines
+        self.idle = idle
+        self.max_depth = max_depth
+        self.stacks: Counter = Counter()
+        self.functions: Dict[str, FunctionStats] = {}
+        self.samples = 0
+        self.elapsed = 0.0
+        self.cpu_available = _HAS_THREAD_CPU_CLOCKS
+        self._labels: Dict[Tuple[CodeType, int], Tuple[str, str]] = {}
+        self._cpu_clocks: Dict[int, Tuple[int, float]] = {}
+        self._thread_names: Dict[int, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "SamplingProfiler":
+        if not self.running:
+            self._stop.clear()
+            self._started_at = time.perf_counter()
+            self._thread = threading.Thread(
+                target=self._run, name="mcli-sampling-profiler", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self.elapsed += time.perf_counter() - self._started_at
+        return self
+
+    @property
+    def seconds_per_sample(self) -> float:
+        """Wall time each sample stands for."""
+        return self.elapsed / self.samples if self.samples else self.interval
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        next_sample = time.perf_counter()
+        while True:
+            next_sample += self.interval
+            if self._stop.wait(max(next_sample - time.perf_counter(), 0)):
+                return
+            self._sample(own)
+
+    def _sample(self, own: int) -> None:
+        if self.samples % _THREAD_NAME_REFRESH == 0:
+            self._thread_names = {t.ident: t.name for t in threading.enumerate() if t.ident}
+        self.samples += 1
+        main = threading.main_thread().ident
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            cpu = self._cpu_delta(ident)
+            if cpu == 0.0 and not self.idle and self.cpu_available and ident != main:
+                continue
+            stack: List[str] = []
+            functions: List[str] = []
+            current: Optional[FrameType] = frame
+            while current is not None and len(stack) < self.max_depth:
+                label, function = self._label(current)
+                stack.append(label)
+                functions.append(function)
+                current = current.f_back
+            stack.append(self._thread_names.get(ident, f"thread-{ident}"))
+            self.stacks[tuple(reversed(stack))] += 1
+            self._count(functions, cpu)
+
+    def _label(self, frame: FrameType) -> Tuple[str, str]:
+        """Stack label and function name of a frame, cached per code object (and line)."""
+        code = frame.f_code
+        key = (code, frame.f_lineno if self.lines else 0)
+        labels = self._labels.get(key)
+        if labels is None:
+            module = frame.f_globals.get("__name__", "?")
+            function = f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+            label = f"{function}:{frame.f_lineno}" if self.lines else function
+            labels = self._labels[key] = (label, function)
+        return labels
+
+    def _count(self, functions: List[str], cpu: float) -> None:
+        leaf = functions[0] if functions else None
+        for name in set(functions):
+            stats = self.functions.get(name)
+            if stats is None:
+                stats = self.functions[name] = FunctionStats(name)
+            stats.total_samples += 1
+            stats.total_cpu += cpu
+            if name == leaf:
+                stats.self_samples += 1
+                stats.self_cpu += cpu
+
+    def _cpu_delta(self, ident: int) -> float:
+        """CPU seconds the thread used since its previous sample (0 if unknown)."""
+        if not self.cpu_available:
+            return 0.0
+        try:
+            clock = self._cpu_clocks.get(ident, (None, 0.0))[0]
+            if clock is None:
+                clock = time.pthread_getcpuclockid(ident)
+                now = time.clock_gettime(clock)
+                self._cpu_clocks[ident] = (clock, now)
+                return 0.0
+            now = time.clock_gettime(clock)
+        except (OSError, OverflowError):
+            return 0.0
+        previous = self._cpu_clocks[ident][1]
+        self._cpu_clocks[ident] = (clock, now)
+        return max(now - previous, 0.0)
+
+    def collapsed(self) -> List[str]:
+        """The profile as collapsed-stack lines, most frequent first."""
+        return [f"{';'.join(stack)} {count}" for stack, count in self.stacks.most_common()]
+
+    def write_collapsed(self, path: Union[str, Path]) -> Path:
+        """Write the collapsed stacks for flamegraph tools and return the path."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("\n".join(self.collapsed()) + "\n", encoding="utf-8")
+        return path
+
+    def summary(self, limit: int = 25) -> str:
+        """Table of the functions with the most self time."""
+        per_sample = self.seconds_per_sample
+        cpu = "cpu" if self.cpu_available else "cpu (n/a)"
+        rows = [
+            f"{self.samples} samples over {self.elapsed:.2f}s "
+            f"({per_sample * 1000:.1f} ms/sample)",
+            f"{'self wall':>10} {'total wall':>11} {'self ' + cpu:>13} {'total cpu':>10}  function",
+        ]
+        ranked = sorted(
+            self.functions.values(), key=lambda s: (s.self_samples, s.total_samples), reverse=True
+        )
+        for stats in ranked[:limit]:
+            rows.append(
+                f"{stats.self_samples * per_sample:>9.3f}s {stats.total_samples * per_sample:>10.3f}s"
+                f" {stats.self_cpu:>12.3f}s {stats.total_cpu:>9.3f}s  {stats.name}"
+            )
+        if self.lines:
+            rows.extend(self._hot_lines(limit))
+        return "\n".join(rows)
+
+    def _hot_lines(self, limit: int) -> List[str]:
+        filenames = {label: code.co_filename for (code, _), (label, _) in self._labels.items()}
+        leaves: Counter = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack[-1]] += count
+        rows = ["hot lines:"]
+        for label, count in leaves.most_common(limit):
+            filename = filenames.get(label)
+            lineno = label.rsplit(":", 1)[-1]
+            source = (
+                linecache.getline(filename, int(lineno)).strip()
+                if filename and lineno.isdigit()
+                else ""
+            )
+            rows.append(f"{count * self.seconds_per_sample:>9.3f}s  {label}  {source}")
+        return rows
@@ -6,6 +6,7 @@ import os
 from typing import Any, Dict, List, Optional
 
 from mcli.lib.logger.logger import get_logger
+from mcli.lib.search_index import SearchIndex
 
 logger = get_logger(__name__)
 
@@ -319,52 +320,49 @@ class PythonFileWatcher:
 
 
 class PythonCommandMatcher:
-    """Fallback Python command matcher."""
+    """Fallback Python command matcher backed by an in-memory search index."""
 
     def __init__(self, fuzzy_threshold: float = 0.3) -> None:
         self.fuzzy_threshold = fuzzy_threshold
         self.commands: List[Dict[str, Any]] = []
+        self._index: Optional[SearchIndex] = None
 
     def add_commands(self, commands: List[Dict[str, Any]]) -> None:
         self.commands.extend(commands)
+        self._index = None  # Re-indexed lazily on the next search
+
+    def _search_index(self) -> SearchIndex:
+        if self._index is None:
+            self._index = SearchIndex()
+            self._index.refresh(
+                {str(i): "" for i in range(len(self.commands))},
+                lambda key: self.commands[int(key)],
+            )
+        return self._index
 
     def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
-        results: List[Dict[str, Any]] = []
-        query_lower = query.lower()
-
-        for cmd in self.commands:
-            score = 0.0
-            matched_fields: List[str] = []
-
-            # Exact name match
-            if cmd["name"].lower() == query_lower:
-                score = 1.0
-                matched_fields.append("name")
-            # Prefix match
-            elif cmd["name"].lower().startswith(query_lower):
-                score = 0.9
-                matched_fields.append("name")
-            # Contains match
-            elif query_lower in cmd["name"].lower():
-                score = 0.7
-                matched_fields.append("name")
-            # Description match
-            elif query_lower in cmd.get("description", "").lower():
-                score = 0.5
-                matched_fields.append("description")
-
-            if score >= self.fuzzy_threshold:
-                results.append(
-                    {
-                        "command": cmd,
-                        "score": score,
-                        "match_type": "python_fallback",
-                        "matched_fields": matched_fields,
-                    }
-                )
+        hits = self._search_index().search(query)
+        if not hits:
+            return []
 
-        results.sort(key=lambda x: float(x["score"]), reverse=True)
-        return results[:limit]
+        # Scores are relative to the best match so the threshold is corpus-independent
+        best = hits[0].score
+        results: List[Dict[str, Any]] = []
+        for hit in hits:
+            score = hit.score / best
+            if score < self.fuzzy_threshold:
+                break
+            results.append(
+                {
+                    "command": self.commands[int(hit.key)],
+                    "score": score,
+                    "match_type": "python_fallback",
+                    "matched_fields": hit.matched_fields,
+                }
+            )
+            if len(results) >= limit:
+                break
+        return results
 
 
 # Auto-check Rust extensions on module import
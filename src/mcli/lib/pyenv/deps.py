@@ -4,27 +4,90 @@ This module provides functionality for checking and installing Python
 dependencies required by workflow scripts.
 """
 
+import hashlib
+import json
+import os
 import re
 import subprocess
+import sys
+import threading
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
-from mcli.lib.constants import VenvMessages
+from mcli.lib.constants import FileNames, VenvMessages
 from mcli.lib.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Satisfied (interpreter, requirements) entries kept in the cache file
+SATISFACTION_CACHE_SIZE = 256
+
+_DIST_SUFFIXES = (".dist-info", ".egg-info")
+
+
+class SatisfactionCache:
+    """Site-packages fingerprints that requirement sets were found satisfied with.
+
+    Entries map a requirement-set key to a fingerprint of the interpreter's
+    site-packages (directory mtimes and the list of installed distributions).
+    While the fingerprint is unchanged, the same check can be answered without
+    reading any package metadata.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, str]:
+        try:
+            data = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable dependency cache {self.path}: {e}")
+            return {}
+        entries = data.get("entries") if isinstance(data, dict) else None
+        return entries if isinstance(entries, dict) else {}
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._load().get(key)
+
+    def put(self, key: str, fingerprint: str) -> None:
+        with self._lock:
+            entries = self._load()
+            entries.pop(key, None)
+            entries[key] = fingerprint
+            while len(entries) > SATISFACTION_CACHE_SIZE:
+                entries.pop(next(iter(entries)))
+            tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp.write_text(json.dumps({"version": 1, "entries": entries}))
+                os.replace(tmp, self.path)
+            except OSError as e:
+                logger.debug(f"Failed to write dependency cache {self.path}: {e}")
+                tmp.unlink(missing_ok=True)
+
+
+def _default_cache() -> SatisfactionCache:
+    from mcli.lib.paths import get_cache_dir
+
+    return SatisfactionCache(get_cache_dir() / FileNames.DEPS_SATISFIED_JSON)
+
 
 class DependencyChecker:
     """Checks and installs Python dependencies."""
 
-    def __init__(self, python_executable: Path) -> None:
+    def __init__(self, python_executable: Path, cache: Optional[SatisfactionCache] = None) -> None:
         """Initialize the dependency checker.
 
         Args:
             python_executable: Path to the Python executable to use.
+            cache: Satisfaction cache; defaults to one in the mcli cache directory.
         """
         self.python_executable = python_executable
+        self._cache = cache
 
     def parse_requires(self, requires: List[str]) -> List[str]:
         """Parse @requires list into normalized package specifications.
@@ -49,12 +112,22 @@ class DependencyChecker:
     def check_installed(self, packages: List[str]) -> Tuple[List[str], List[str]]:
         """Check which packages are installed.
 
+        A requirement set found satisfied is recorded in ``self.cache`` with the
+        current site-packages fingerprint, and later checks are answered from
+        it until the fingerprint changes.
+
         Args:
             packages: List of package specifications to check.
 
         Returns:
             Tuple of (installed, missing) package lists.
         """
+        site_dirs = self.site_packages_dirs()
+        fingerprint = self._fingerprint(site_dirs) if site_dirs else None
+        key = self._cache_key(packages)
+        if fingerprint is not None and self.cache.get(key) == fingerprint:
+            return list(packages), []
+
         installed_packages = self.get_installed_packages()
         installed = []
         missing = []
@@ -73,8 +146,110 @@ class DependencyChecker:
             else:
                 missing.append(pkg)
 
+        if not missing and fingerprint is not None:
+            self.cache.put(key, fingerprint)
         return installed, missing
 
+    @property
+    def cache(self) -> SatisfactionCache:
+        if self._cache is None:
+            self._cache = _default_cache()
+        return self._cache
+
+    def _cache_key(self, packages: List[str]) -> str:
+        """Interpreter path plus the normalized, order-independent requirement set."""
+        requirements = sorted(
+            {
+                self._normalize_package_name(self._extract_package_name(p))
+                + re.sub(r"\s+", "", p[len(self._extract_package_name(p)) :])
+                for p in packages
+            }
+        )
+        interpreter = os.path.abspath(self.python_executable)
+        return hashlib.sha256("\n".join([interpreter, *requirements]).encode()).hexdigest()
+
+    def _fingerprint(self, site_dirs: List[Path]) -> Optional[str]:
+        """Hash of each site-packages directory's mtime and installed distributions."""
+        digest = hashlib.sha256()
+        try:
+            for site_dir in site_dirs:
+                with os.scandir(site_dir) as entries:
+                    dists = sorted(e.name for e in entries if e.name.endswith(_DIST_SUFFIXES))
+                digest.update(f"{site_dir}\0{os.stat(site_dir).st_mtime_ns}\0".encode())
+                digest.update("\0".join(dists).encode())
+        except OSError:
+            return None
+        return digest.hexdigest()
+
+    def site_packages_dirs(self) -> Optional[List[Path]]:
+        """The interpreter's site-packages directories, if known without running it.
+
+        Known for mcli's own interpreter (from ``sys.path``) and for venvs that
+        do not include system site-packages. Returns None otherwise, or when no
+        such directory is found.
+        """
+        exe = Path(os.path.abspath(self.python_executable))
+        if exe == Path(os.path.abspath(sys.executable)):
+            # Empty under ``python -S``, a zipapp or a PYTHONPATH install; ask uv instead
+            return [
+                Path(p)
+                for p in sys.path
+                if p.endswith(("site-packages", "dist-packages")) and os.path.isdir(p)
+            ] or None
+
+        venv_root = exe.parent.parent
+        try:
+            config = (venv_root / "pyvenv.cfg").read_text()
+        except OSError:
+            return None
+        if re.search(r"^\s*include-system-site-packages\s*=\s*true", config, re.I | re.M):
+            return None
+        site_dirs = sorted(venv_root.glob("lib/python*/site-packages"))
+        site_dirs += [p for p in [venv_root / "Lib" / "site-packages"] if p.is_dir()]
+        return site_dirs or None
+
+    def _read_installed_metadata(self, site_dirs: List[Path]) -> Dict[str, str]:
+        """Installed distributions from ``*.dist-info`` / ``*.egg-info`` entries."""
+        packages: Dict[str, str] = {}
+        for site_dir in site_dirs:
+            try:
+                entries = sorted(os.scandir(site_dir), key=lambda e: e.name)
+            except OSError:
+                continue
+            for entry in entries:
+                if not entry.name.endswith(_DIST_SUFFIXES):
+                    continue
+                name, version = self._dist_name_version(Path(entry.path))
+                if name and version:
+                    # Earlier directories shadow later ones, as on sys.path
+                    packages.setdefault(self._normalize_package_name(name), version)
+        return packages
+
+    @staticmethod
+    def _dist_name_version(dist_path: Path) -> Tuple[Optional[str], Optional[str]]:
+        """Name and version from a dist-info/egg-info METADATA or PKG-INFO header."""
+        if dist_path.suffix == ".dist-info":
+            metadata = dist_path / "METADATA"
+        elif dist_path.is_dir():
+            metadata = dist_path / "PKG-INFO"
+        else:
+            metadata = dist_path  # single-file .egg-info
+        name = version = None
+        try:
+            with open(metadata, encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    if not line.strip():
+                        break  # end of headers
+                    if line.startswith("Name:"):
+                        name = line[5:].strip()
+                    elif line.startswith("Version:"):
+                        version = line[8:].strip()
+                    if name and version:
+                        break
+        except OSError:
+            pass
+        return name, version
+
     def merge_base_runtime(self, packages: List[str], base: List[str]) -> List[str]:
         """Append base runtime packages that are not already declared.
 
@@ -137,9 +312,16 @@ class DependencyChecker:
     def get_installed_packages(self) -> Dict[str, str]:
         """Get dictionary of installed packages and their versions.
 
+        Reads package metadata directly when the interpreter's site-packages
+        directories are known, and asks ``uv pip list`` otherwise.
+
         Returns:
             Dict mapping normalized package names to versions.
         """
+        site_dirs = self.site_packages_dirs()
+        if site_dirs is not None:
+            return self._read_installed_metadata(site_dirs)
+
         try:
             result = subprocess.run(
                 ["uv", "pip", "list", "--format=freeze", "--python", str(self.python_executable)],
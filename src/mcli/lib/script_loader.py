@@ -11,9 +11,11 @@ Example:
     >>> loader.register_all_commands(app)  # Register with Click group
 """
 
+import codecs
 import fcntl
 import hashlib
 import importlib.util
+import itertools
 import json
 import os
 import re
@@ -22,19 +24,26 @@ import stat
 import subprocess
 import sys
 import tempfile
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import IO, Any, Iterable, Iterator, Optional
 
 import click
 
-from mcli.lib.constants import FileNames
+from mcli.lib.code_cache import CodeCache
+from mcli.lib.constants import DirNames, FileNames
 from mcli.lib.logger.logger import get_logger, register_subprocess
 from mcli.lib.pyenv import PyEnvManager
+from mcli.lib.search_index import SearchHit, SearchIndex
+from mcli.lib.workflow_index import IndexedScript, RefreshStats, ScriptAnalysis, WorkflowIndex
 
 logger = get_logger(__name__)
 
 
+# Scripts are hashed in chunks of this size instead of being read into memory whole
+HASH_CHUNK_SIZE = 1024 * 1024
+
 # Supported script extensions and their language mappings
 SUPPORTED_EXTENSIONS: dict[str, str] = {
     ".py": "python",
@@ -146,11 +155,34 @@ class ScriptLoader:
         # otherwise `sync update` writes a lockfile `sync push` cannot find.
         self.lockfile_path = self.workflows_dir / FileNames.COMMANDS_LOCK_JSON
         self.loaded_commands: dict[str, click.Command] = {}
+        self._index: Optional[WorkflowIndex] = None
+        self._search_index: Optional[SearchIndex] = None
+        # Compiled code for in-process Python workflows, kept beside the lockfile
+        self.code_cache = CodeCache(self.workflows_dir / DirNames.WORKFLOW_CODE_CACHE)
+        # Hashing/analysis work done by the last generate_lockfile() call
+        self.lockfile_stats: Optional[RefreshStats] = None
+
+    @property
+    def index(self) -> WorkflowIndex:
+        """Persistent stat-invalidated index of the workflows directory (opened lazily)."""
+        if self._index is None:
+            self._index = WorkflowIndex(self.workflows_dir, analyze=self.analyze_script)
+        return self._index
+
+    @property
+    def search_index(self) -> SearchIndex:
+        """Persistent inverted index over script names and metadata (opened lazily)."""
+        if self._search_index is None:
+            self._search_index = SearchIndex(self.workflows_dir / FileNames.WORKFLOW_SEARCH_DB)
+        return self._search_index
 
     def discover_scripts(self) -> list[Path]:
         """
         Find all supported script files in the workflows directory.
 
+        Directory listings come from the workflow index, so only directories
+        that changed since the last call are re-listed.
+
         Returns:
             List of paths to script files, sorted by name
         """
@@ -162,24 +194,12 @@ class ScriptLoader:
 
         include_test = os.environ.get("MCLI_INCLUDE_TEST_COMMANDS", "false").lower() == "true"
 
-        for script_path in self.workflows_dir.rglob("*"):
-            # Skip directories
-            if script_path.is_dir():
-                continue
-
+        # The index never lists hidden files or descends into hidden directories
+        for script_path in self.index.list_files():
             # Skip files with unsupported extensions
             if script_path.suffix not in SUPPORTED_EXTENSIONS:
                 continue
 
-            # Skip hidden files and directories (only check path relative to workflows_dir)
-            try:
-                relative_path = script_path.relative_to(self.workflows_dir)
-                if any(part.startswith(".") for part in relative_path.parts):
-                    continue
-            except ValueError:
-                # Not relative to workflows_dir, skip
-                continue
-
             # Skip test scripts unless explicitly included
             if not include_test and script_path.stem.startswith(("test_", "test-")):
                 logger.debug(f"Skipping test script: {script_path.name}")
@@ -200,6 +220,88 @@ class ScriptLoader:
         """
         return [p for p in self.discover_scripts() if p.stem == stem]
 
+    def resolve_command_name(self, cmd_name: str) -> list[Path]:
+        """Map a ``mcli run`` command name to the script(s) it refers to.
+
+        Honors the ``name:lang`` suffix convention (see parse_command_name).
+        Languages come from the workflow index, so no script is re-read.
+
+        Args:
+            cmd_name: Requested command name, optionally language-suffixed
+
+        Returns:
+            Matching script paths; more than one means the bare name is ambiguous
+        """
+        base_name, lang_filter = parse_command_name(cmd_name)
+        matches = self.find_scripts_by_stem(base_name)
+        if lang_filter:
+            indexed = self.index.get_many(matches)
+            matches = [p for p in matches if indexed[p].language == lang_filter]
+        return matches
+
+    def command_catalog(self) -> dict[str, IndexedScript]:
+        """Map every ``mcli run`` command name to its script from index metadata alone.
+
+        Names are the bare stem when unique and ``stem:lang`` (e.g. ``backup:py``)
+        when several scripts share a stem. Nothing is imported or executed, so
+        this is cheap enough for help output and shell completion.
+
+        Returns:
+            Dictionary of command name to IndexedScript, sorted by name
+        """
+        scripts = self.discover_scripts()
+        stem_counts = Counter(p.stem for p in scripts)
+        indexed = self.index.get_many(scripts)
+
+        catalog: dict[str, IndexedScript] = {}
+        for script_path in scripts:
+            entry = indexed[script_path]
+            name = script_path.stem
+            if stem_counts[name] > 1:
+                suffix = LANGUAGE_TO_SUFFIX.get(entry.language, script_path.suffix.lstrip("."))
+                name = f"{name}:{suffix}"
+            catalog.setdefault(name, entry)
+
+        return dict(sorted(catalog.items()))
+
+    def search(self, query: str, limit: Optional[int] = None) -> list[tuple[Path, SearchHit]]:
+        """
+        Rank scripts against a free-text query using the persistent search index.
+
+        Names, descriptions, tags, groups (metadata and subdirectories) and
+        languages are searched with typo tolerance. Only scripts whose content
+        hash changed since the last search are re-tokenized.
+
+        Args:
+            query: Free-text query
+            limit: Maximum number of results (None for all)
+
+        Returns:
+            List of (script path, hit) pairs, best match first
+        """
+        scripts = self.discover_scripts()
+        indexed = self.index.get_many(scripts)
+        by_key = {str(p): indexed[p] for p in scripts}
+
+        def fields_for(key: str) -> dict[str, Any]:
+            entry = by_key[key]
+            metadata = entry.metadata
+            groups = list(entry.path.relative_to(self.workflows_dir).parent.parts)
+            if metadata.get("group") and metadata["group"] != DEFAULT_METADATA["group"]:
+                groups.append(metadata["group"])
+            return {
+                "name": entry.path.stem,
+                "description": metadata.get("description", ""),
+                "tags": metadata.get("tags", []),
+                "group": groups,
+                "language": entry.language,
+            }
+
+        self.search_index.refresh(
+            {key: entry.content_hash for key, entry in by_key.items()}, fields_for
+        )
+        return [(by_key[hit.key].path, hit) for hit in self.search_index.search(query, limit)]
+
     def detect_language(self, script_path: Path) -> str:
         """
         Detect script language from shebang or extension.
@@ -218,22 +320,29 @@ class ScriptLoader:
         if script_path.suffix == ".ipynb":
             return "ipynb"
 
+        first_line = ""
         try:
             # Check shebang first (more reliable)
             with open(script_path, encoding="utf-8", errors="ignore") as f:
-                first_line = f.readline().strip()
-                if first_line.startswith("#!"):
-                    for lang, pattern in SHEBANG_PATTERNS.items():
-                        if pattern.search(first_line):
-                            logger.debug(f"Detected {lang} from shebang: {first_line}")
-                            return lang
+                first_line = f.readline()
         except Exception as e:
             logger.warning(f"Failed to read shebang from {script_path}: {e}")
 
+        return self._language_from_first_line(script_path, first_line)
+
+    def _language_from_first_line(self, script_path: Path, first_line: str) -> str:
+        """Detect language from an already-read first line, falling back to the extension."""
+        first_line = first_line.strip()
+        if first_line.startswith("#!"):
+            for lang, pattern in SHEBANG_PATTERNS.items():
+                if pattern.search(first_line):
+                    logger.debug("Detected %s from shebang: %s", lang, first_line)
+                    return lang
+
         # Fallback to extension
         language = SUPPORTED_EXTENSIONS.get(script_path.suffix, "unknown")
         if language != "unknown":
-            logger.debug(f"Detected {language} from extension: {script_path.suffix}")
+            logger.debug("Detected %s from extension: %s", language, script_path.suffix)
         else:
             logger.warning(f"Unknown language for {script_path}")
 
@@ -259,37 +368,43 @@ class ScriptLoader:
         Returns:
             Dictionary of extracted metadata with defaults
         """
-        metadata = DEFAULT_METADATA.copy()
-        metadata["requires"] = []  # Ensure fresh list
-        metadata["tags"] = []  # Ensure fresh list
-
         # Handle notebooks separately
         if language == "ipynb":
             return self._extract_notebook_metadata(script_path)
 
-        comment_prefix = COMMENT_PREFIX.get(language, "#")
-        metadata_pattern = re.compile(rf"^{re.escape(comment_prefix)}\s*@(\w+):\s*(.+)$")
-
         try:
             with open(script_path, encoding="utf-8", errors="ignore") as f:
-                for line in f:
-                    line = line.strip()
-                    match = metadata_pattern.match(line)
-                    if match:
-                        key, value = match.groups()
-                        key = key.strip().lower()
-                        value = value.strip()
-
-                        if key in ["requires", "tags"]:
-                            # Handle comma-separated lists
-                            metadata[key] = [v.strip() for v in value.split(",") if v.strip()]
-                        else:
-                            metadata[key] = value
-
-                        logger.debug(f"Extracted metadata: {key} = {value}")
-
+                return self._parse_metadata(script_path, language, f)
         except Exception as e:
             logger.warning(f"Failed to extract metadata from {script_path}: {e}")
+            return self._parse_metadata(script_path, language, [])
+
+    def _parse_metadata(
+        self, script_path: Path, language: str, lines: Iterable[str]
+    ) -> dict[str, Any]:
+        """Parse @-prefixed comment metadata from already-read source lines."""
+        metadata = DEFAULT_METADATA.copy()
+        metadata["requires"] = []  # Ensure fresh list
+        metadata["tags"] = []  # Ensure fresh list
+
+        comment_prefix = COMMENT_PREFIX.get(language, "#")
+        metadata_pattern = re.compile(rf"^{re.escape(comment_prefix)}\s*@(\w+):\s*(.+)$")
+
+        for line in lines:
+            line = line.strip()
+            match = metadata_pattern.match(line)
+            if match:
+                key, value = match.groups()
+                key = key.strip().lower()
+                value = value.strip()
+
+                if key in ["requires", "tags"]:
+                    # Handle comma-separated lists
+                    metadata[key] = [v.strip() for v in value.split(",") if v.strip()]
+                else:
+                    metadata[key] = value
+
+                logger.debug(f"Extracted metadata: {key} = {value}")
 
         # Set default description if not provided
         if not metadata.get("description"):
@@ -309,14 +424,22 @@ class ScriptLoader:
         Returns:
             Dictionary of extracted metadata
         """
+        try:
+            with open(notebook_path, encoding="utf-8") as f:
+                notebook = json.load(f)
+        except Exception as e:
+            logger.warning(f"Failed to extract notebook metadata from {notebook_path}: {e}")
+            notebook = {}
+
+        return self._parse_notebook_metadata(notebook_path, notebook)
+
+    def _parse_notebook_metadata(self, notebook_path: Path, notebook: Any) -> dict[str, Any]:
+        """Extract metadata from an already-parsed notebook document."""
         metadata = DEFAULT_METADATA.copy()
         metadata["requires"] = []
         metadata["tags"] = []
 
         try:
-            with open(notebook_path, encoding="utf-8") as f:
-                notebook = json.load(f)
-
             # Check for mcli metadata section
             mcli_metadata = notebook.get("metadata", {}).get("mcli", {})
             if mcli_metadata:
@@ -361,13 +484,89 @@ class ScriptLoader:
             Hexadecimal hash string prefixed with "sha256:"
         """
         try:
+            hasher = hashlib.sha256()
             with open(script_path, "rb") as f:
-                hash_value = hashlib.sha256(f.read()).hexdigest()
-                return f"sha256:{hash_value}"
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                    hasher.update(chunk)
+            return f"sha256:{hasher.hexdigest()}"
         except Exception as e:
             logger.error(f"Failed to calculate hash for {script_path}: {e}")
             return ""
 
+    @staticmethod
+    def _hashed_lines(f: IO[bytes], hasher: Any) -> Iterator[str]:
+        """Yield decoded lines from a binary file while feeding every chunk to ``hasher``."""
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        pending = ""
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+            lines = (pending + decoder.decode(chunk)).splitlines(keepends=True)
+            # The last line may continue in the next chunk
+            pending = lines.pop() if lines else ""
+            yield from lines
+        pending += decoder.decode(b"", final=True)
+        if pending:
+            yield pending
+
+    def analyze_script(self, script_path: Path) -> ScriptAnalysis:
+        """
+        Read a script once and derive its language, metadata and content hash.
+
+        Source files are streamed in chunks, so the hash, shebang and metadata
+        come from a single pass without holding the file in memory. Notebooks
+        must be parsed as a whole document and are read in one go.
+
+        This is the workflow index's analysis callback, so it only runs for
+        scripts that are new or whose stat changed (possibly on several
+        threads at once).
+
+        Args:
+            script_path: Path to the script file
+
+        Returns:
+            Tuple of (language, metadata, content_hash)
+        """
+        hasher = hashlib.sha256()
+        try:
+            with open(script_path, "rb") as f:
+                if script_path.suffix == ".ipynb":
+                    content = f.read()
+                    hasher.update(content)
+                else:
+                    lines = self._hashed_lines(f, hasher)
+                    first_line = next(lines, "")
+                    language = self._language_from_first_line(script_path, first_line)
+                    metadata = self._parse_metadata(
+                        script_path, language, itertools.chain([first_line], lines)
+                    )
+                    for _ in lines:
+                        pass  # Hash whatever the metadata parser did not consume
+                    return language, metadata, f"sha256:{hasher.hexdigest()}"
+        except Exception as e:
+            logger.error(f"Failed to read {script_path}: {e}")
+            language = SUPPORTED_EXTENSIONS.get(script_path.suffix, "unknown")
+            return language, self._parse_metadata(script_path, language, []), ""
+
+        try:
+            notebook = json.loads(content.decode("utf-8", errors="ignore"))
+        except Exception as e:
+            logger.warning(f"Failed to extract notebook metadata from {script_path}: {e}")
+            notebook = {}
+        metadata = self._parse_notebook_metadata(script_path, notebook)
+        return "ipynb", metadata, f"sha256:{hasher.hexdigest()}"
+
+    def get_indexed_script(self, script_path: Path) -> IndexedScript:
+        """
+        Get the cached analysis of a script, re-reading it only if it changed on disk.
+
+        Args:
+            script_path: Path to the script file
+
+        Returns:
+            IndexedScript with language, metadata and content hash
+        """
+        return self.index.get(script_path)
+
     def get_script_info(self, script_path: Path) -> dict[str, Any]:
         """
         Get complete information about a script.
@@ -378,9 +577,10 @@ class ScriptLoader:
         Returns:
             Dictionary containing script metadata, language, hash, etc.
         """
-        language = self.detect_language(script_path)
-        metadata = self.extract_metadata(script_path, language)
-        content_hash = self.calculate_hash(script_path)
+        entry = self.get_indexed_script(script_path)
+        language = entry.language
+        metadata = entry.metadata
+        content_hash = entry.content_hash
 
         try:
             mtime = datetime.fromtimestamp(script_path.stat().st_mtime).isoformat() + "Z"
@@ -404,8 +604,8 @@ class ScriptLoader:
             "group": metadata.get("group", "workflows"),
             "description": metadata.get("description", ""),
             "author": metadata.get("author", ""),
-            "requires": metadata.get("requires", []),
-            "tags": metadata.get("tags", []),
+            "requires": list(metadata.get("requires", [])),
+            "tags": list(metadata.get("tags", [])),
             "shell": metadata.get("shell", "bash") if language == "shell" else None,
             "last_modified": mtime,
         }
@@ -458,25 +658,44 @@ class ScriptLoader:
                 logger.error(f"Failed to create spec for {script_path}")
                 return None
 
+            relative_path: Optional[str]
+            try:
+                relative_path = script_path.relative_to(self.workflows_dir).as_posix()
+            except ValueError:
+                relative_path = None
+
+            # Reuse compiled code for this exact content when available
+            cached = None
+            if relative_path:
+                content_hash = self.get_indexed_script(script_path).content_hash
+                cached = self.code_cache.get(relative_path, content_hash)
+
+            if cached:
+                code, header = cached
+                signature = header.get("signature", {})
+                logger.debug(f"Using cached bytecode for: {name}")
+            else:
+                source = script_path.read_bytes()
+                content_hash = f"sha256:{hashlib.sha256(source).hexdigest()}"
+                code = compile(source, str(script_path), "exec", dont_inherit=True)
+                signature = {}
+
             module = importlib.util.module_from_spec(spec)
             sys.modules[module_name] = module
-            spec.loader.exec_module(module)
-
-            # Look for a command or command group in the module
-            # Prioritize Groups over Commands
-            command_obj = None
-            found_commands: list[click.Command] = []
-
-            for attr_name in dir(module):
-                attr = getattr(module, attr_name)
-                if isinstance(attr, click.Group):
-                    command_obj = attr
-                    break
-                elif isinstance(attr, click.Command):
-                    found_commands.append(attr)
-
-            if not command_obj and found_commands:
-                command_obj = found_commands[0]
+            exec(code, module.__dict__)
+
+            command_attr = signature.get("attr")
+            command_obj = getattr(module, command_attr, None) if command_attr else None
+            if not isinstance(command_obj, click.Command):
+                command_attr, command_obj = self._find_click_command(module)
+
+            if relative_path and not cached and command_obj:
+                self.code_cache.put(
+                    relative_path,
+                    content_hash,
+                    code,
+                    {"attr": command_attr, "name": command_obj.name},
+                )
 
             if command_obj:
                 logger.debug(f"Loaded Python command: {name}")
@@ -489,6 +708,24 @@ class ScriptLoader:
             logger.error(f"Failed to load Python command {name}: {e}")
             return None
 
+    @staticmethod
+    def _find_click_command(module: Any) -> tuple[Optional[str], Optional[click.Command]]:
+        """Find a script module's Click command, preferring Groups over Commands.
+
+        Returns:
+            Tuple of (attribute name, command), or (None, None) if there is none
+        """
+        first_command: tuple[Optional[str], Optional[click.Command]] = (None, None)
+
+        for attr_name in dir(module):
+            attr = getattr(module, attr_name)
+            if isinstance(attr, click.Group):
+                return attr_name, attr
+            elif isinstance(attr, click.Command) and first_command[1] is None:
+                first_command = (attr_name, attr)
+
+        return first_command
+
     def _load_python_with_deps(self, script_path: Path, metadata: dict[str, Any]) -> click.Command:
         """
         Create Click wrapper for Python script with dependencies.
@@ -800,8 +1037,9 @@ class ScriptLoader:
         Returns:
             Click command or None if loading failed
         """
-        language = self.detect_language(script_path)
-        metadata = self.extract_metadata(script_path, language)
+        entry = self.get_indexed_script(script_path)
+        language = entry.language
+        metadata = entry.metadata
 
         if language == "python":
             return self.load_python_command(script_path, metadata)
@@ -836,7 +1074,7 @@ class ScriptLoader:
                     target_group.add_command(command, name=name)
                     self.loaded_commands[name] = command
                     registered += 1
-                    logger.debug(f"Registered script command: {name}")
+                    logger.debug("Registered script command: %s", name)
             except Exception as e:
                 logger.error(f"Failed to register {script_path}: {e}")
 
@@ -860,6 +1098,16 @@ class ScriptLoader:
             "commands": {},
         }
 
+        # Refresh every changed script in one (parallel) batch so unchanged ones
+        # are never re-read
+        self.index.get_many(scripts)
+        stats = self.lockfile_stats = self.index.last_refresh
+        if stats.analyzed:
+            logger.debug(
+                f"Analyzed {stats.analyzed}/{stats.scripts} script(s), "
+                f"{stats.bytes_read / 1_048_576:.1f} MiB in {stats.seconds:.2f}s "
+                f"({stats.throughput / 1_048_576:.1f} MiB/s)"
+            )
         keys = self._assign_command_keys(scripts)
         for script_path in scripts:
             info = self.get_script_info(script_path)
@@ -884,15 +1132,15 @@ class ScriptLoader:
           named/typed scripts in different directories are each preserved
           (deterministic, derived from the relative parent path).
         """
-        from collections import Counter
-
         stem_counts = Counter(p.stem for p in scripts)
+        colliding = [p for p in scripts if stem_counts[p.stem] > 1]
+        indexed = self.index.get_many(colliding)
 
         # First pass: bare stem when unique, else stem:lang.
         provisional: dict[Path, str] = {}
         for p in scripts:
             if stem_counts[p.stem] > 1:
-                suffix = LANGUAGE_TO_SUFFIX.get(self.detect_language(p), "x")
+                suffix = LANGUAGE_TO_SUFFIX.get(indexed[p].language, "x")
                 provisional[p] = f"{p.stem}:{suffix}"
             else:
                 provisional[p] = p.stem
@@ -1016,14 +1264,16 @@ class ScriptLoader:
                 result["valid"] = False
 
         # Check hash and version for existing scripts
+        indexed = self.index.get_many(
+            p for name, p in current_scripts.items() if name in locked_commands
+        )
         for name, script_path in current_scripts.items():
             if name not in locked_commands:
                 continue
 
             locked = locked_commands[name]
-            current_hash = self.calculate_hash(script_path)
-            language = self.detect_language(script_path)
-            current_metadata = self.extract_metadata(script_path, language)
+            current_hash = indexed[script_path].content_hash
+            current_metadata = indexed[script_path].metadata
 
             if current_hash != locked.get("content_hash"):
                 result["hash_mismatch"].append(name)
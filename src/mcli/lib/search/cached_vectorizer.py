@@ -5,7 +5,9 @@ Cached TF-IDF Vectorizer with Redis support for high-performance text similarity
 import hashlib
 import json
 import pickle
-from typing import Any, Optional
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import Any, Iterable, Optional
 
 import numpy as np
 
@@ -23,6 +25,9 @@ from mcli.lib.pickles.pickles import safe_loads
 
 logger = get_logger(__name__)
 
+# Number of results kept in the in-process cache tier in front of Redis
+DEFAULT_LOCAL_CACHE_SIZE = 1024
+
 
 class CachedTfIdfVectorizer:
     """
@@ -36,16 +41,32 @@ class CachedTfIdfVectorizer:
         cache_ttl: int = 3600,
         cache_prefix: str = "tfidf",
         use_rust: bool = True,
+        local_cache_size: int = DEFAULT_LOCAL_CACHE_SIZE,
     ):
         self.redis_url = redis_url
         self.cache_ttl = cache_ttl
         self.cache_prefix = cache_prefix
         self.use_rust = use_rust
+        self.local_cache_size = local_cache_size
 
         self.redis_client: Optional[Any] = None  # redis.Redis when available
         self.vectorizer = None
         self.is_fitted = False
 
+        # Current corpus, per-document digests and the fingerprint derived from
+        # them; cache keys use the fingerprint instead of hashing the corpus
+        self._corpus: list[str] = []
+        self._corpus_digests: list[bytes] = []
+        self.corpus_fingerprint: Optional[str] = None
+
+        # Fitted, L2-normalized document matrix (sparse CSR) and the corpus
+        # fingerprint it encodes
+        self._doc_matrix: Optional[Any] = None
+        self._doc_matrix_fingerprint: Optional[str] = None
+
+        # In-process LRU tier in front of Redis
+        self._local_cache: OrderedDict[str, Any] = OrderedDict()
+
         # Cache stats
         self.cache_hits = 0
         self.cache_misses = 0
@@ -107,10 +128,12 @@ class CachedTfIdfVectorizer:
     async def fit_transform(self, documents: list[str]) -> np.ndarray:
         """Fit the vectorizer and transform documents with caching"""
         # Generate cache key for the document set
-        cache_key = self._generate_cache_key(documents, "fit_transform")
+        fingerprint = self._fingerprint(documents)
+        cache_key = self._generate_cache_key_from_dict({"corpus": fingerprint}, "fit_transform")
 
-        # Try to get from cache
-        cached_result = await self._get_from_cache(cache_key)
+        # Try to get from cache (Redis only: a local hit would skip refitting
+        # a vectorizer that has since been fitted on another corpus)
+        cached_result = await self._get_from_cache(cache_key, local=False)
         if cached_result is not None:
             self.cache_hits += 1
             vectors, feature_names = cached_result
@@ -124,8 +147,10 @@ class CachedTfIdfVectorizer:
             self.vectorizer, "get_feature_names_out"
         ):
             # sklearn implementation
-            vectors = self.vectorizer.fit_transform(documents).toarray()
+            matrix = self.vectorizer.fit_transform(documents)
+            vectors = matrix.toarray()
             feature_names = self.vectorizer.get_feature_names_out().tolist()
+            self._set_document_matrix(documents, matrix)
         else:
             # Rust implementation
             result = self.vectorizer.fit_transform(documents)
@@ -145,7 +170,7 @@ class CachedTfIdfVectorizer:
         self.is_fitted = True
 
         # Cache the result
-        await self._cache_result(cache_key, (vectors, feature_names))
+        await self._cache_result(cache_key, (vectors, feature_names), local=False)
 
         return vectors
 
@@ -189,8 +214,7 @@ class CachedTfIdfVectorizer:
     ) -> list[tuple[int, float]]:
         """Perform similarity search with caching"""
         # Generate cache key for similarity search
-        search_data = {"query": query, "documents": documents, "top_k": top_k}
-        cache_key = self._generate_cache_key_from_dict(search_data, "similarity")
+        cache_key = self._similarity_cache_key(self._fingerprint(documents), query, top_k)
 
         # Try to get from cache
         cached_result = await self._get_from_cache(cache_key)
@@ -203,25 +227,13 @@ class CachedTfIdfVectorizer:
         # Compute similarity
         if hasattr(self.vectorizer, "similarity"):
             # Rust implementation with built-in similarity
-            similarities = self.vectorizer.similarity(query, documents)
+            similarities = np.asarray(self.vectorizer.similarity(query, documents), dtype=float)
+            results = self._top_k(similarities, top_k)
         else:
-            # sklearn implementation - need to compute manually
+            # sklearn implementation - one sparse product against the fitted matrix
             if not self.is_fitted:
                 await self.fit_transform(documents)
-
-            query_vector = await self.transform([query])
-            doc_vectors = await self.transform(documents)
-
-            # Compute cosine similarity
-            similarities = []
-            for doc_vector in doc_vectors:
-                similarity = self._cosine_similarity(query_vector[0], doc_vector)
-                similarities.append(similarity)
-
-        # Get top-k results
-        indexed_similarities = [(i, sim) for i, sim in enumerate(similarities)]
-        indexed_similarities.sort(key=lambda x: x[1], reverse=True)
-        results = indexed_similarities[:top_k]
+            results = self._rank(self._similarities([query], documents), top_k)[0]
 
         # Cache the result
         await self._cache_result(cache_key, results)
@@ -233,14 +245,13 @@ class CachedTfIdfVectorizer:
     ) -> list[list[tuple[int, float]]]:
         """Perform batch similarity search for multiple queries"""
         # Try to use cached individual results first
+        fingerprint = self._fingerprint(documents)
         results = []
         uncached_queries = []
         uncached_indices = []
 
         for i, query in enumerate(queries):
-            cache_key = self._generate_cache_key_from_dict(
-                {"query": query, "documents": documents, "top_k": top_k}, "similarity"
-            )
+            cache_key = self._similarity_cache_key(fingerprint, query, top_k)
 
             cached_result = await self._get_from_cache(cache_key)
             if cached_result is not None:
@@ -255,46 +266,109 @@ class CachedTfIdfVectorizer:
         # Process uncached queries in batch
         if uncached_queries:
             if hasattr(self.vectorizer, "similarity"):
-                # Rust implementation might support batch processing
-                for j, query in enumerate(uncached_queries):
-                    similarities = self.vectorizer.similarity(query, documents)
-                    indexed_similarities = [(i, sim) for i, sim in enumerate(similarities)]
-                    indexed_similarities.sort(key=lambda x: x[1], reverse=True)
-                    query_results = indexed_similarities[:top_k]
-
-                    # Update results and cache
-                    results[uncached_indices[j]] = query_results
-                    cache_key = self._generate_cache_key_from_dict(
-                        {"query": query, "documents": documents, "top_k": top_k}, "similarity"
+                # Rust implementation scores one query at a time
+                batch_results = [
+                    self._top_k(
+                        np.asarray(self.vectorizer.similarity(query, documents), dtype=float),
+                        top_k,
                     )
-                    await self._cache_result(cache_key, query_results)
+                    for query in uncached_queries
+                ]
             else:
-                # sklearn implementation
+                # sklearn implementation - all queries in a single sparse product
                 if not self.is_fitted:
                     await self.fit_transform(documents)
+                batch_results = self._rank(self._similarities(uncached_queries, documents), top_k)
 
-                query_vectors = await self.transform(uncached_queries)
-                doc_vectors = await self.transform(documents)
+            # Update results and cache
+            for j, query_results in enumerate(batch_results):
+                results[uncached_indices[j]] = query_results
+                cache_key = self._similarity_cache_key(fingerprint, uncached_queries[j], top_k)
+                await self._cache_result(cache_key, query_results)
 
-                for j, query_vector in enumerate(query_vectors):
-                    similarities = []
-                    for doc_vector in doc_vectors:
-                        similarity = self._cosine_similarity(query_vector, doc_vector)
-                        similarities.append(similarity)
+        return results
 
-                    indexed_similarities = [(i, sim) for i, sim in enumerate(similarities)]
-                    indexed_similarities.sort(key=lambda x: x[1], reverse=True)
-                    query_results = indexed_similarities[:top_k]
+    @property
+    def corpus(self) -> list[str]:
+        """The documents the current corpus fingerprint was computed for."""
+        return list(self._corpus)
+
+    def _fingerprint(self, documents: list[str]) -> str:
+        """Return the corpus fingerprint for ``documents``.
+
+        Searching the same corpus again costs one list comparison; a changed
+        corpus only hashes the documents that are new to it.
+        """
+        if self.corpus_fingerprint is None or documents != self._corpus:
+            known = dict(zip(self._corpus, self._corpus_digests))
+            self._set_corpus(
+                list(documents), [known.get(doc) or self._digest(doc) for doc in documents]
+            )
+        assert self.corpus_fingerprint is not None
+        return self.corpus_fingerprint
+
+    @staticmethod
+    def _digest(document: str) -> bytes:
+        return hashlib.sha256(document.encode("utf-8")).digest()[:16]
+
+    def _set_corpus(self, documents: list[str], digests: list[bytes]) -> None:
+        self._corpus = documents
+        self._corpus_digests = digests
+        # Order matters: search results are document indices
+        self.corpus_fingerprint = hashlib.sha256(b"".join(digests)).hexdigest()[:16]
+
+    def add_documents(self, documents: list[str]) -> str:
+        """
+        Append documents to the corpus without refitting the vectorizer.
+
+        The new documents are transformed with the fitted vocabulary and
+        appended to the document matrix; only they are hashed.
+
+        Returns:
+            The new corpus fingerprint
+        """
+        if self._doc_matrix is not None and self._doc_matrix_fingerprint == self.corpus_fingerprint:
+            from scipy.sparse import vstack
+            from sklearn.preprocessing import normalize
+
+            added = normalize(self.vectorizer.transform(documents), norm="l2", copy=False)
+            self._doc_matrix = vstack([self._doc_matrix, added], format="csr")
+        else:
+            self._doc_matrix = None
 
-                    # Update results and cache
-                    results[uncached_indices[j]] = query_results
-                    cache_key = self._generate_cache_key_from_dict(
-                        {"query": uncached_queries[j], "documents": documents, "top_k": top_k},
-                        "similarity",
-                    )
-                    await self._cache_result(cache_key, query_results)
+        self._set_corpus(
+            self._corpus + list(documents),
+            self._corpus_digests + [self._digest(doc) for doc in documents],
+        )
+        if self._doc_matrix is not None:
+            self._doc_matrix_fingerprint = self.corpus_fingerprint
+        return self.corpus_fingerprint  # type: ignore[return-value]
+
+    def remove_documents(self, indices: Iterable[int]) -> str:
+        """
+        Remove documents from the corpus by index without refitting the vectorizer.
+
+        Returns:
+            The new corpus fingerprint
+        """
+        drop = set(indices)
+        keep = [i for i in range(len(self._corpus)) if i not in drop]
+
+        if self._doc_matrix is not None and self._doc_matrix_fingerprint == self.corpus_fingerprint:
+            self._doc_matrix = self._doc_matrix[keep]
+        else:
+            self._doc_matrix = None
 
-        return results
+        self._set_corpus([self._corpus[i] for i in keep], [self._corpus_digests[i] for i in keep])
+        if self._doc_matrix is not None:
+            self._doc_matrix_fingerprint = self.corpus_fingerprint
+        return self.corpus_fingerprint  # type: ignore[return-value]
+
+    def _similarity_cache_key(self, fingerprint: str, query: str, top_k: int) -> str:
+        """Cache key of a similarity query against a fingerprinted corpus."""
+        return self._generate_cache_key_from_dict(
+            {"corpus": fingerprint, "query": query, "top_k": top_k}, "similarity"
+        )
 
     def _generate_cache_key(self, documents: list[str], operation: str) -> str:
         """Generate a cache key for a list of documents and operation"""
@@ -308,8 +382,21 @@ class CachedTfIdfVectorizer:
         hash_obj = hashlib.sha256(content.encode("utf-8"))
         return f"{self.cache_prefix}:{hash_obj.hexdigest()[:16]}"
 
-    async def _get_from_cache(self, cache_key: str) -> Optional[Any]:
-        """Get result from Redis cache"""
+    def _remember(self, cache_key: str, result: Any) -> None:
+        """Store a result in the in-process LRU tier."""
+        if self.local_cache_size <= 0:
+            return
+        self._local_cache[cache_key] = result
+        self._local_cache.move_to_end(cache_key)
+        while len(self._local_cache) > self.local_cache_size:
+            self._local_cache.popitem(last=False)
+
+    async def _get_from_cache(self, cache_key: str, local: bool = True) -> Optional[Any]:
+        """Get result from the in-process cache, falling back to Redis"""
+        if local and cache_key in self._local_cache:
+            self._local_cache.move_to_end(cache_key)
+            return self._local_cache[cache_key]
+
         if not self.redis_client:
             return None
 
@@ -318,14 +405,20 @@ class CachedTfIdfVectorizer:
             if cached_data:
                 # Cache is shared/untrusted; restrict deserialization to a safe
                 # allowlist to prevent pickle-RCE from a poisoned entry (#170).
-                return safe_loads(cached_data)
+                result = safe_loads(cached_data)
+                if local:
+                    self._remember(cache_key, result)
+                return result
         except Exception as e:
             logger.warning(f"Failed to get from cache: {e}")
 
         return None
 
-    async def _cache_result(self, cache_key: str, result: Any):
-        """Cache result in Redis"""
+    async def _cache_result(self, cache_key: str, result: Any, local: bool = True):
+        """Cache result in process and in Redis"""
+        if local:
+            self._remember(cache_key, result)
+
         if not self.redis_client:
             return
 
@@ -346,8 +439,64 @@ class CachedTfIdfVectorizer:
 
         return dot_product / (norm1 * norm2)
 
+    def _set_document_matrix(self, documents: list[str], matrix: Any) -> None:
+        """Keep an L2-normalized CSR copy of a fitted corpus for similarity queries."""
+        from sklearn.preprocessing import normalize
+
+        self._doc_matrix = normalize(matrix.tocsr(), norm="l2", copy=False)
+        self._doc_matrix_fingerprint = self._fingerprint(documents)
+
+    def _similarities(self, queries: list[str], documents: list[str]) -> np.ndarray:
+        """Cosine similarities of every query against every document.
+
+        The document matrix is only re-transformed when the corpus changes, and
+        the whole query batch is scored with one sparse matrix product.
+
+        Returns:
+            Dense array of shape (len(queries), len(documents))
+        """
+        from sklearn.preprocessing import normalize
+
+        if self._doc_matrix is None or self._doc_matrix_fingerprint != self._fingerprint(documents):
+            self._set_document_matrix(documents, self.vectorizer.transform(documents))
+
+        query_matrix = normalize(self.vectorizer.transform(queries), norm="l2", copy=False)
+        return (query_matrix @ self._doc_matrix.T).toarray()
+
+    @staticmethod
+    def _top_k(similarities: np.ndarray, top_k: int) -> list[tuple[int, float]]:
+        """Indices and scores of the ``top_k`` largest similarities, best first."""
+        n = similarities.shape[0]
+        if top_k <= 0 or n == 0:
+            return []
+        if top_k < n:
+            partitioned = np.argpartition(-similarities, top_k - 1)[:top_k]
+            # argpartition breaks ties at the cut-off arbitrarily; keep the
+            # earliest documents instead, as a full stable sort would
+            threshold = similarities[partitioned].min()
+            above = np.flatnonzero(similarities > threshold)
+            ties = np.flatnonzero(similarities == threshold)[: top_k - len(above)]
+            candidates = np.concatenate([above, ties])
+        else:
+            candidates = np.arange(n)
+        # Stable sort on the (small) candidate set keeps ties in document order
+        order = candidates[np.argsort(-similarities[candidates], kind="stable")]
+        return [(int(i), float(similarities[i])) for i in order]
+
+    def _rank(self, similarities: np.ndarray, top_k: int) -> list[list[tuple[int, float]]]:
+        """Apply ``_top_k`` to each row of a (queries x documents) similarity matrix."""
+        return [self._top_k(row, top_k) for row in similarities]
+
     async def clear_cache(self, pattern: Optional[str] = None):
         """Clear cache entries"""
+        if pattern:
+            for key in [
+                k for k in self._local_cache if fnmatchcase(k, f"{self.cache_prefix}:{pattern}")
+            ]:
+                del self._local_cache[key]
+        else:
+            self._local_cache.clear()
+
         if not self.redis_client:
             return
 
@@ -373,6 +522,7 @@ class CachedTfIdfVectorizer:
                 if (self.cache_hits + self.cache_misses) > 0
                 else 0.0
             ),
+            "local_cached_entries": len(self._local_cache),
             "redis_connected": self.redis_client is not None,
             "vectorizer_type": (
                 "rust" if self.use_rust and "mcli_rust" in str(type(self.vectorizer)) else "sklearn"
@@ -0,0 +1,505 @@
+"""
+Persistent inverted index for searching workflow commands.
+
+Backs `mcli search` with ranked, typo-tolerant lookups over the name,
+description and tags of every command. The index keeps, per workflows
+directory:
+
+- a postings list mapping each token to the documents (commands) containing
+  it, with a field-weighted term frequency and the fields it occurred in
+- a trigram table over the token vocabulary, used to expand query tokens to
+  vocabulary terms that contain them (substring matches) or are within a small
+  edit distance of them (typo tolerance)
+
+Results are ranked with BM25. Documents are identified by a caller-chosen key
+and fingerprint, so refreshing the index only re-tokenizes documents whose
+fingerprint changed.
+
+The index lives in a hidden SQLite file beside the workflow index. Like the
+workflow index it is purely a cache: if it cannot be opened or written, an
+in-memory database is rebuilt and results are identical.
+
+Example:
+    >>> index = SearchIndex(workflows_dir / FileNames.WORKFLOW_SEARCH_DB)
+    >>> index.refresh({"backup.py": "sha256:..."}, lambda key: {"name": "backup"})
+    >>> [hit.key for hit in index.search("bakup")]
+    ['backup.py']
+"""
+
+import heapq
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Mapping, Optional
+
+from mcli.lib.logger.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Bump whenever tokenization, field weights or the schema change; a mismatching
+# index is dropped and rebuilt.
+SEARCH_SCHEMA_VERSION = "1"
+
+# Term-frequency weight of a token depending on the field it occurs in
+FIELD_WEIGHTS: dict[str, float] = {
+    "name": 3.0,
+    "tags": 2.0,
+    "group": 1.5,
+    "description": 1.0,
+    "language": 0.5,
+}
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# How much a query token matching a vocabulary term counts, by kind of match
+EXACT_WEIGHT = 1.0
+PREFIX_WEIGHT = 0.8
+SUBSTRING_WEIGHT = 0.6
+FUZZY_WEIGHT = 0.5
+
+# Query tokens shorter than this are only matched exactly or as a prefix
+MIN_FUZZY_LENGTH = 3
+
+# Score multiplier when the whole query equals a document's name
+EXACT_NAME_BOOST = 2.0
+
+# Most host parameters bound in one statement; longer IN (...) lists are split.
+# SQLite builds before 3.32 allow only 999.
+MAX_SQL_VARIABLES = 900
+
+_CAMEL_RE = re.compile(r"([a-z0-9])([A-Z])")
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _chunks(items: list, size: Optional[int] = None) -> list[list]:
+    """Split ``items`` into lists short enough to bind in one statement."""
+    size = size or MAX_SQL_VARIABLES
+    return [items[start : start + size] for start in range(0, len(items), size)]
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase alphanumeric tokens, breaking camelCase words."""
+    return _TOKEN_RE.findall(_CAMEL_RE.sub(r"\1 \2", text).lower())
+
+
+def trigrams(term: str) -> set[str]:
+    """Trigrams of a term padded with ``$`` so short terms still have several."""
+    padded = f"${term}$"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def max_typos(term: str) -> int:
+    """Number of edits tolerated when fuzzily matching a query token."""
+    if len(term) < MIN_FUZZY_LENGTH:
+        return 0
+    return 1 if len(term) <= 5 else 2
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance between ``a`` and ``b``, or ``limit + 1`` if it exceeds ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+@dataclass
+class SearchHit:
+    """A document matching a query."""
+
+    key: str
+    score: float
+    matched_fields: list[str] = field(default_factory=list)
+
+
+class SearchIndex:
+    """
+    BM25-ranked token index with prefix, substring and typo-tolerant matching.
+
+    Documents are dictionaries of field name (see ``FIELD_WEIGHTS``) to text or
+    a list of strings. Every query token must match a document for it to be
+    returned; each query token is expanded to the vocabulary terms it matches
+    exactly, as a prefix, as a substring or within ``max_typos`` edits,
+    weighted in that order.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Initialize the index.
+
+        Args:
+            db_path: Index database location (None keeps the index in memory)
+        """
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._docs: dict[str, tuple[int, str]] = {}
+        self._stats: tuple[int, float] = (0, 0.0)
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open (or create) the index database and load document fingerprints."""
+        if self._conn is not None:
+            return self._conn
+
+        conn = None
+        if self.db_path is not None and self.db_path.parent.is_dir():
+            try:
+                conn = sqlite3.connect(str(self.db_path), timeout=5, check_same_thread=False)
+                # Like the workflow index: never create or remove files once the
+                # journal exists, so searching does not bump the directory mtime.
+                conn.execute("PRAGMA journal_mode=PERSIST")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                self._init_schema(conn)
+            except sqlite3.Error as e:
+                logger.debug(f"Search index unavailable at {self.db_path}, using memory: {e}")
+                conn = None
+
+        if conn is None:
+            conn = sqlite3.connect(":memory:", check_same_thread=False)
+            self._init_schema(conn)
+
+        self._conn = conn
+        self._load(conn)
+        return conn
+
+    def _init_schema(self, conn: sqlite3.Connection) -> None:
+        """Create tables, dropping an index written by an incompatible version."""
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if row and row[0] == SEARCH_SCHEMA_VERSION:
+            return
+        if row:
+            logger.debug(f"Rebuilding search index (schema {row[0]} -> {SEARCH_SCHEMA_VERSION})")
+            conn.execute("DROP TABLE IF EXISTS docs")
+            conn.execute("DROP TABLE IF EXISTS postings")
+            conn.execute("DROP TABLE IF EXISTS grams")
+
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS docs (
+                id INTEGER PRIMARY KEY,
+                key TEXT NOT NULL UNIQUE,
+                fingerprint TEXT NOT NULL,
+                name TEXT NOT NULL,
+                length REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                doc INTEGER NOT NULL,
+                tf REAL NOT NULL,
+                length REAL NOT NULL,
+                fields TEXT NOT NULL,
+                PRIMARY KEY (term, doc)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS docs_name ON docs (name);
+            CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc);
+            CREATE TABLE IF NOT EXISTS grams (
+                gram TEXT NOT NULL,
+                term TEXT NOT NULL,
+                PRIMARY KEY (gram, term)
+            ) WITHOUT ROWID;
+            """
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+            (SEARCH_SCHEMA_VERSION,),
+        )
+        conn.commit()
+
+    def _load(self, conn: sqlite3.Connection) -> None:
+        """Read document fingerprints and corpus statistics into memory."""
+        self._docs = {
+            key: (doc_id, fingerprint)
+            for doc_id, key, fingerprint in conn.execute("SELECT id, key, fingerprint FROM docs")
+        }
+        count, avg_length = conn.execute("SELECT COUNT(*), AVG(length) FROM docs").fetchone()
+        self._stats = (count, avg_length or 0.0)
+
+    def _use_memory(self) -> None:
+        """Abandon an unwritable database file for an empty in-memory index."""
+        if self._conn is not None:
+            self._conn.close()
+        self.db_path = None
+        self._conn = None
+        self._connect()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._connect()
+            return len(self._docs)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def refresh(
+        self,
+        fingerprints: Mapping[str, str],
+        fields_for: Callable[[str], Mapping[str, Any]],
+    ) -> int:
+        """
+        Bring the index in line with the given set of documents.
+
+        Documents whose fingerprint is unchanged are left alone, new or changed
+        ones are re-tokenized via ``fields_for`` and missing ones are removed.
+
+        Args:
+            fingerprints: Document key to fingerprint (e.g. content hash)
+            fields_for: Callback returning the searchable fields of a document
+
+        Returns:
+            Number of documents added, updated or removed
+        """
+        with self._lock:
+            self._connect()
+            stale = [key for key in self._docs if key not in fingerprints]
+            changed = [
+                key
+                for key, fingerprint in fingerprints.items()
+                if self._docs.get(key, (0, None))[1] != fingerprint
+            ]
+            if not stale and not changed:
+                return 0
+
+            documents = {key: fields_for(key) for key in changed}
+            try:
+                self._apply(stale, changed, fingerprints, documents)
+            except sqlite3.Error as e:
+                logger.debug(f"Failed to update search index, rebuilding in memory: {e}")
+                self._use_memory()
+                for key in fingerprints:
+                    if key not in documents:
+                        documents[key] = fields_for(key)
+                self._apply([], list(fingerprints), fingerprints, documents)
+            return len(stale) + len(changed)
+
+    def _apply(
+        self,
+        stale: list[str],
+        changed: list[str],
+        fingerprints: Mapping[str, str],
+        documents: Mapping[str, Mapping[str, Any]],
+    ) -> None:
+        """Remove and (re-)insert documents in a single transaction."""
+        conn = self._connect()
+        with conn:
+            removed = [self._docs[key][0] for key in stale + changed if key in self._docs]
+            conn.executemany("DELETE FROM postings WHERE doc = ?", [(d,) for d in removed])
+            conn.executemany("DELETE FROM docs WHERE id = ?", [(d,) for d in removed])
+
+            postings: list[tuple] = []
+            terms: set[str] = set()
+            for key in changed:
+                fields = documents[key]
+                weights: dict[str, float] = {}
+                occurrences: dict[str, list[str]] = {}
+                for field_name, weight in FIELD_WEIGHTS.items():
+                    value = fields.get(field_name) or ""
+                    if not isinstance(value, str):
+                        value = " ".join(str(v) for v in value)
+                    for token in tokenize(value):
+                        weights[token] = weights.get(token, 0.0) + weight
+                        seen = occurrences.setdefault(token, [])
+                        if field_name not in seen:
+                            seen.append(field_name)
+
+                # Names are stored tokenized so a whole-query name match is one lookup
+                name = " ".join(tokenize(str(fields.get("name") or "")))
+                length = sum(weights.values())
+                cursor = conn.execute(
+                    "INSERT INTO docs (key, fingerprint, name, length) VALUES (?, ?, ?, ?)",
+                    (key, fingerprints[key], name, length),
+                )
+                doc_id = cursor.lastrowid
+                postings.extend(
+                    (term, doc_id, tf, length, ",".join(occurrences[term]))
+                    for term, tf in weights.items()
+                )
+                terms.update(weights)
+
+            conn.executemany(
+                "INSERT INTO postings (term, doc, tf, length, fields) VALUES (?, ?, ?, ?, ?)",
+                postings,
+            )
+            # Grams of terms that disappear are left behind; they only ever
+            # expand to terms with no postings, which match nothing.
+            conn.executemany(
+                "INSERT OR IGNORE INTO grams (gram, term) VALUES (?, ?)",
+                [(gram, term) for term in terms for gram in trigrams(term)],
+            )
+        self._load(conn)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _expand(self, conn: sqlite3.Connection, token: str) -> dict[str, float]:
+        """Map a query token to the vocabulary terms it matches and their weights."""
+        expansions: dict[str, float] = {}
+
+        # Exact and prefix matches come straight from the postings key order
+        for (term,) in conn.execute(
+            "SELECT DISTINCT term FROM postings WHERE term >= ? AND term < ?",
+            (token, token + "\uffff"),
+        ):
+            expansions[term] = EXACT_WEIGHT if term == token else PREFIX_WEIGHT
+
+        typos = max_typos(token)
+        if not typos:
+            return expansions
+
+        # Any term containing the token shares at least one of its trigrams
+        grams = trigrams(token)
+        shared_grams: Counter = Counter()
+        for chunk in _chunks(list(grams)):
+            placeholders = ",".join("?" * len(chunk))
+            shared_grams.update(
+                dict(
+                    conn.execute(
+                        f"SELECT term, COUNT(*) FROM grams WHERE gram IN ({placeholders}) "
+                        "GROUP BY term",
+                        chunk,
+                    )
+                )
+            )
+        for term, shared in shared_grams.items():
+            if term in expansions:
+                continue
+            if token in term:
+                expansions[term] = SUBSTRING_WEIGHT
+                continue
+            # Each edit destroys at most three of the query's trigrams
+            if shared < len(grams) - 3 * typos:
+                continue
+            distance = edit_distance(token, term, typos)
+            if distance <= typos:
+                expansions[term] = FUZZY_WEIGHT * (1 - distance / (len(token) + 1))
+
+        return expansions
+
+    def search(self, query: str, limit: Optional[int] = None) -> list[SearchHit]:
+        """
+        Find documents matching every token of ``query``, best first.
+
+        Args:
+            query: Free-text query
+            limit: Maximum number of hits to return (None for all)
+
+        Returns:
+            List of SearchHit sorted by descending score, then key
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+
+        with self._lock:
+            conn = self._connect()
+            count, avg_length = self._stats
+            if not count:
+                return []
+
+            # BM25 with the (k1 + 1) factor folded into each term's weight
+            base = BM25_K1 * (1 - BM25_B)
+            scale = BM25_K1 * BM25_B / (avg_length or 1.0)
+            scores: Optional[dict[int, float]] = None
+            matched_terms: list[str] = []
+            for token in tokens:
+                expansions = self._expand(conn, token)
+                if not expansions:
+                    return []
+                matched_terms.extend(expansions)
+                rows = []
+                for chunk in _chunks(list(expansions)):
+                    placeholders = ",".join("?" * len(chunk))
+                    rows += conn.execute(
+                        f"SELECT term, doc, tf, length FROM postings WHERE term IN ({placeholders})",
+                        chunk,
+                    ).fetchall()
+
+                doc_freq = Counter(row[0] for row in rows)
+                weights = {
+                    term: expansions[term]
+                    * (BM25_K1 + 1)
+                    * math.log(1 + (count - df + 0.5) / (df + 0.5))
+                    for term, df in doc_freq.items()
+                }
+
+                token_scores: dict[int, float] = {}
+                for term, doc, tf, length in rows:
+                    score = weights[term] * tf / (tf + base + scale * length)
+                    if score > token_scores.get(doc, 0.0):
+                        token_scores[doc] = score
+
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {
+                        doc: total + token_scores[doc]
+                        for doc, total in scores.items()
+                        if doc in token_scores
+                    }
+                if not scores:
+                    return []
+
+            assert scores is not None
+            for (doc_id,) in conn.execute(
+                "SELECT id FROM docs WHERE name = ?", (" ".join(tokens),)
+            ):
+                if doc_id in scores:
+                    scores[doc_id] *= EXACT_NAME_BOOST
+
+            if limit is None:
+                selected = list(scores)
+            else:
+                selected = heapq.nlargest(limit, scores, key=scores.__getitem__)
+            keys = []
+            for chunk in _chunks(selected):
+                doc_marks = ",".join("?" * len(chunk))
+                keys += conn.execute(
+                    f"SELECT id, key FROM docs WHERE id IN ({doc_marks})", chunk
+                ).fetchall()
+
+            # Which fields matched is only worked out for the hits returned
+            occurred: dict[int, set[str]] = {doc_id: set() for doc_id in selected}
+            half = max(MAX_SQL_VARIABLES // 2, 1)
+            for docs in _chunks(selected, half):
+                doc_marks = ",".join("?" * len(docs))
+                for terms in _chunks(matched_terms, half):
+                    term_marks = ",".join("?" * len(terms))
+                    for doc_id, field_names in conn.execute(
+                        f"SELECT doc, fields FROM postings "
+                        f"WHERE doc IN ({doc_marks}) AND term IN ({term_marks})",
+                        [*docs, *terms],
+                    ):
+                        occurred[doc_id].update(field_names.split(","))
+
+        hits = []
+        for doc_id, key in keys:
+            matched = [f for f in FIELD_WEIGHTS if f in occurred[doc_id]]
+            hits.append(SearchHit(key=key, score=scores[doc_id], matched_fields=matched))
+        hits.sort(key=lambda hit: (-hit.score, hit.key))
+        return hits
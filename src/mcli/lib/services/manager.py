@@ -14,6 +14,7 @@ from typing import Any, Dict, List, Optional
 import psutil
 
 from mcli.lib.constants import DateFormats, ServiceDefaults
+from mcli.lib.log_reader import tail_lines
 from mcli.lib.logger.logger import get_logger
 from mcli.lib.paths import get_services_logs_dir, get_services_pids_dir
 from mcli.lib.services.config import ServiceConfig
@@ -265,17 +266,17 @@ class ServiceManager:
 
         stdout_path = self._stdout_log(name)
         if stdout_path.exists():
-            content = stdout_path.read_text()
             if lines:
-                content = "\n".join(content.splitlines()[-lines:])
-            logs["stdout"] = content
+                logs["stdout"] = "\n".join(tail_lines(stdout_path, lines))
+            else:
+                logs["stdout"] = stdout_path.read_text()
 
         stderr_path = self._stderr_log(name)
         if stderr_path.exists():
-            content = stderr_path.read_text()
             if lines:
-                content = "\n".join(content.splitlines()[-lines:])
-            logs["stderr"] = content
+                logs["stderr"] = "\n".join(tail_lines(stderr_path, lines))
+            else:
+                logs["stderr"] = stderr_path.read_text()
 
         return logs
 
@@ -0,0 +1,446 @@
+"""
+Persistent, stat-invalidated index of a workflows directory.
+
+Records what script discovery learns about a workflows directory so that
+`mcli run`, `mcli list` and `mcli sync update` only revisit what changed. The
+index records, per workflows directory:
+
+- each directory's entries, keyed by the directory's mtime, so unchanged
+  directories are never re-listed
+- each script's size, mtime_ns, language, parsed metadata and content hash,
+  so a script is only re-read when its stat changes
+
+The index lives in a hidden SQLite file inside the workflows directory (hidden
+entries are never treated as workflows). It is purely a cache: if it cannot be
+opened or written, an in-memory database is used and results are identical.
+
+Example:
+    >>> index = WorkflowIndex(Path("~/.mcli/workflows"), analyze=loader.analyze_script)
+    >>> for path in index.list_files():
+    ...     entry = index.get(path)
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+from mcli.lib.constants import FileNames
+from mcli.lib.logger.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Bump whenever the schema or the meaning of cached values (e.g. metadata
+# parsing rules) changes; a mismatching index is dropped and rebuilt.
+INDEX_SCHEMA_VERSION = "1"
+
+# Filesystems with coarse timestamps can modify a file twice within one mtime
+# tick. Anything modified this recently is recorded as untrusted so it is
+# re-read next time instead of being served from a possibly stale entry.
+RACY_WINDOW_NS = 2_000_000_000
+
+# Refreshed script entries are buffered and written in one transaction once
+# this many are pending (and at interpreter exit), so callers that look scripts
+# up one at a time do not pay a commit per file.
+WRITE_BATCH_SIZE = 500
+
+# Batches with at least this many new or changed scripts are analyzed on a
+# thread pool. Hashing releases the GIL, so large scripts and notebooks hash in
+# parallel; smaller batches are not worth the pool start-up cost.
+PARALLEL_ANALYZE_MIN = 8
+ANALYZE_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+# (language, metadata, content_hash) for a script, computed from one read
+ScriptAnalysis = tuple[str, dict[str, Any], str]
+
+_open_indexes: "weakref.WeakSet[WorkflowIndex]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_indexes() -> None:
+    for index in list(_open_indexes):
+        index.flush()
+
+
+@dataclass
+class IndexedScript:
+    """Cached analysis of a single script file."""
+
+    path: Path
+    size: int
+    mtime_ns: int
+    language: str
+    metadata: dict[str, Any]
+    content_hash: str
+
+
+@dataclass
+class RefreshStats:
+    """Work done by the most recent ``get_many`` call."""
+
+    scripts: int = 0
+    analyzed: int = 0
+    bytes_read: int = 0
+    seconds: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Bytes analyzed per second (0 if nothing was analyzed)."""
+        return self.bytes_read / self.seconds if self.seconds > 0 else 0.0
+
+
+class WorkflowIndex:
+    """
+    Incremental index of the scripts under a workflows directory.
+
+    Directory listings are cached by directory mtime and script analyses by
+    (size, mtime_ns). The expensive per-file work is delegated to ``analyze``,
+    which is only called for new or changed files.
+    """
+
+    def __init__(
+        self,
+        workflows_dir: Path,
+        analyze: Callable[[Path], ScriptAnalysis],
+        db_path: Optional[Path] = None,
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            workflows_dir: Root directory of the workflows tree
+            analyze: Callback returning (language, metadata, content_hash) for a file
+            db_path: Index database location (defaults to a hidden file in workflows_dir)
+        """
+        self.workflows_dir = Path(workflows_dir)
+        self._root_prefix = str(self.workflows_dir) + os.sep
+        self.analyze = analyze
+        self.db_path = db_path or self.workflows_dir / FileNames.WORKFLOW_INDEX_DB
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._dirs: dict[str, tuple[int, list[str], list[str]]] = {}
+        self._scripts: dict[str, IndexedScript] = {}
+        self._pending: list[tuple] = []
+        self.last_refresh = RefreshStats()
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open (or create) the index database and load it into memory."""
+        if self._conn is not None:
+            return self._conn
+
+        conn = None
+        if self.workflows_dir.is_dir():
+            try:
+                conn = sqlite3.connect(str(self.db_path), timeout=5, check_same_thread=False)
+                # A persistent rollback journal (rather than WAL or the default
+                # delete mode) never creates or removes files once it exists, so
+                # using the index does not bump the workflows directory's mtime
+                # and invalidate the directory listing it just cached.
+                conn.execute("PRAGMA journal_mode=PERSIST")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                self._init_schema(conn)
+            except sqlite3.Error as e:
+                logger.debug(f"Workflow index unavailable at {self.db_path}, using memory: {e}")
+                conn = None
+
+        if conn is None:
+            conn = sqlite3.connect(":memory:", check_same_thread=False)
+            self._init_schema(conn)
+
+        self._conn = conn
+        self._load(conn)
+        _open_indexes.add(self)
+        return conn
+
+    def _init_schema(self, conn: sqlite3.Connection) -> None:
+        """Create tables, dropping an index written by an incompatible version."""
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if row and row[0] == INDEX_SCHEMA_VERSION:
+            # Up to date: do not write, so a read-only session leaves no trace on disk
+            return
+        if row:
+            logger.debug(f"Rebuilding workflow index (schema {row[0]} -> {INDEX_SCHEMA_VERSION})")
+            conn.execute("DROP TABLE IF EXISTS dirs")
+            conn.execute("DROP TABLE IF EXISTS scripts")
+
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS dirs (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                files TEXT NOT NULL,
+                subdirs TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS scripts (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                language TEXT NOT NULL,
+                metadata TEXT NOT NULL,
+                content_hash TEXT NOT NULL
+            );
+            """
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+            (INDEX_SCHEMA_VERSION,),
+        )
+        conn.commit()
+
+    def _load(self, conn: sqlite3.Connection) -> None:
+        """Read the whole index into memory; it is small relative to the scripts it covers."""
+        for path, mtime_ns, files, subdirs in conn.execute(
+            "SELECT path, mtime_ns, files, subdirs FROM dirs"
+        ):
+            self._dirs[path] = (mtime_ns, json.loads(files), json.loads(subdirs))
+
+        for path, size, mtime_ns, language, metadata, content_hash in conn.execute(
+            "SELECT path, size, mtime_ns, language, metadata, content_hash FROM scripts"
+        ):
+            self._scripts[path] = IndexedScript(
+                path=self.workflows_dir / path,
+                size=size,
+                mtime_ns=mtime_ns,
+                language=language,
+                metadata=json.loads(metadata),
+                content_hash=content_hash,
+            )
+
+    def _write(self, sql: str, rows: list[tuple]) -> None:
+        """Persist rows, ignoring failures: the in-memory state is authoritative."""
+        if not rows:
+            return
+        try:
+            conn = self._connect()
+            conn.executemany(sql, rows)
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.debug(f"Failed to update workflow index: {e}")
+
+    def flush(self) -> None:
+        """Write any buffered script entries to disk."""
+        with self._lock:
+            rows, self._pending = self._pending, []
+            self._write(
+                "INSERT OR REPLACE INTO scripts "
+                "(path, size, mtime_ns, language, metadata, content_hash) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def close(self) -> None:
+        """Flush buffered entries and close the underlying database connection."""
+        with self._lock:
+            self.flush()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _trusted_mtime(mtime_ns: int) -> int:
+        """Return mtime_ns, or -1 if it is too recent to safely cache against."""
+        return -1 if time.time_ns() - mtime_ns < RACY_WINDOW_NS else mtime_ns
+
+    def _relative(self, path: Path) -> str:
+        """Index key for a path: POSIX path relative to the workflows directory."""
+        # String slicing avoids pathlib's parsing overhead on the per-file hot path
+        raw = str(path)
+        if raw.startswith(self._root_prefix):
+            return raw[len(self._root_prefix) :].replace(os.sep, "/")
+        return path.relative_to(self.workflows_dir).as_posix()
+
+    def list_files(self) -> list[Path]:
+        """
+        List every non-hidden file under the workflows directory.
+
+        Only directories whose mtime changed since the last call are re-listed.
+        Symlinked directories are not followed (matching ``Path.rglob``).
+
+        Returns:
+            Unsorted list of file paths
+        """
+        with self._lock:
+            conn = self._connect()
+            files: list[Path] = []
+            visited: set[str] = set()
+            dir_rows: list[tuple] = []
+            stack = [""]
+
+            while stack:
+                rel = stack.pop()
+                directory = self.workflows_dir / rel if rel else self.workflows_dir
+                try:
+                    mtime_ns = os.stat(directory).st_mtime_ns
+                except OSError:
+                    continue
+                visited.add(rel)
+
+                cached = self._dirs.get(rel)
+                if cached and cached[0] == mtime_ns:
+                    names, subdirs = cached[1], cached[2]
+                else:
+                    names, subdirs = [], []
+                    try:
+                        with os.scandir(directory) as it:
+                            for entry in it:
+                                if entry.name.startswith("."):
+                                    continue
+                                if entry.is_dir(follow_symlinks=False):
+                                    subdirs.append(entry.name)
+                                elif entry.is_file():
+                                    names.append(entry.name)
+                    except OSError as e:
+                        logger.debug(f"Failed to list {directory}: {e}")
+                        continue
+                    trusted = self._trusted_mtime(mtime_ns)
+                    self._dirs[rel] = (trusted, names, subdirs)
+                    dir_rows.append((rel, trusted, json.dumps(names), json.dumps(subdirs)))
+
+                files.extend(directory / name for name in names)
+                stack.extend(f"{rel}/{d}" if rel else d for d in subdirs)
+
+            if dir_rows:
+                self._write(
+                    "INSERT OR REPLACE INTO dirs (path, mtime_ns, files, subdirs) "
+                    "VALUES (?, ?, ?, ?)",
+                    dir_rows,
+                )
+                self._prune(conn, visited, {self._relative(p) for p in files})
+
+            return files
+
+    def _prune(self, conn: sqlite3.Connection, visited: set[str], present: set[str]) -> None:
+        """Forget directories and scripts that no longer exist."""
+        gone_dirs = [d for d in self._dirs if d not in visited]
+        gone_scripts = [s for s in self._scripts if s not in present]
+        for d in gone_dirs:
+            del self._dirs[d]
+        for s in gone_scripts:
+            del self._scripts[s]
+        self._write("DELETE FROM dirs WHERE path = ?", [(d,) for d in gone_dirs])
+        self._write("DELETE FROM scripts WHERE path = ?", [(s,) for s in gone_scripts])
+
+    def _lookup(self, path: Path) -> tuple[Optional[IndexedScript], Optional[os.stat_result]]:
+        """Return the cached entry if still valid, plus the file's current stat."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None, None
+        try:
+            cached = self._scripts.get(self._relative(path))
+        except ValueError:
+            cached = None
+        if cached and cached.size == st.st_size and cached.mtime_ns == st.st_mtime_ns:
+            return cached, st
+        return None, st
+
+    def _analyze(self, path: Path, st: Optional[os.stat_result]) -> IndexedScript:
+        """Run the analysis callback for a new or changed file."""
+        language, metadata, content_hash = self.analyze(path)
+        return IndexedScript(
+            path=path,
+            size=st.st_size if st else -1,
+            mtime_ns=self._trusted_mtime(st.st_mtime_ns) if st else -1,
+            language=language,
+            metadata=metadata,
+            content_hash=content_hash,
+        )
+
+    def _store(self, entries: list[IndexedScript]) -> None:
+        """Cache refreshed entries in memory and buffer them for writing."""
+        for entry in entries:
+            try:
+                rel = self._relative(entry.path)
+            except ValueError:
+                continue
+            if entry.mtime_ns < 0:
+                # Unstat-able or racily modified: serve it, but never cache it.
+                continue
+            self._scripts[rel] = entry
+            self._pending.append(
+                (
+                    rel,
+                    entry.size,
+                    entry.mtime_ns,
+                    entry.language,
+                    json.dumps(entry.metadata),
+                    entry.content_hash,
+                )
+            )
+        if len(self._pending) >= WRITE_BATCH_SIZE:
+            self.flush()
+
+    def get(self, path: Path) -> IndexedScript:
+        """
+        Get the analysis of a script, re-reading it only if its stat changed.
+
+        Args:
+            path: Path to the script file
+
+        Returns:
+            IndexedScript for the file
+        """
+        return self.get_many([path])[path]
+
+    def get_many(self, paths: Iterable[Path]) -> dict[Path, IndexedScript]:
+        """
+        Get analyses for several scripts, persisting all refreshed entries together.
+
+        New or changed scripts are analyzed concurrently when there are enough
+        of them; the work done is recorded in ``last_refresh``.
+
+        Args:
+            paths: Paths to script files
+
+        Returns:
+            Mapping of each path to its IndexedScript
+        """
+        with self._lock:
+            self._connect()
+            started = time.perf_counter()
+            result: dict[Path, IndexedScript] = {}
+            misses: list[tuple[Path, Optional[os.stat_result]]] = []
+            for path in paths:
+                cached, st = self._lookup(path)
+                result[path] = cached
+                if cached is None:
+                    misses.append((path, st))
+
+            if len(misses) >= PARALLEL_ANALYZE_MIN:
+                with ThreadPoolExecutor(
+                    max_workers=min(ANALYZE_WORKERS, len(misses)),
+                    thread_name_prefix="mcli-index",
+                ) as pool:
+                    refreshed = list(pool.map(lambda miss: self._analyze(*miss), misses))
+            else:
+                refreshed = [self._analyze(path, st) for path, st in misses]
+
+            for entry in refreshed:
+                result[entry.path] = entry
+            self._store(refreshed)
+            if len(refreshed) > 1:
+                self.flush()
+
+            self.last_refresh = RefreshStats(
+                scripts=len(result),
+                analyzed=len(refreshed),
+                bytes_read=sum(st.st_size for _, st in misses if st is not None),
+                seconds=time.perf_counter() - started,
+            )
+            return result
@@ -12,6 +12,9 @@ location, and how to report it. The full traceback stays one env var away
 
 Click usage errors, ``Abort`` and ``SystemExit`` are deliberately *not*
 swallowed — those are normal control flow, not script crashes.
+
+Every invocation is also timed and appended, with its exit status, to the
+run-event log (``mcli.lib.logger.events``) that ``mcli self logs runs`` queries.
 """
 
 from __future__ import annotations
@@ -27,6 +30,7 @@ from rich.console import Console
 from mcli.lib.constants.defaults import URLs
 from mcli.lib.constants.env import EnvVars
 from mcli.lib.constants.messages import ErrorMessages, InfoMessages
+from mcli.lib.logger.events import track_run
 
 # Module-level so tests can redirect it to a buffer.
 _console = Console(stderr=True)
@@ -87,14 +91,17 @@ def wrap_command_invoke(command: click.BaseCommand, script_path: str | Path):
     path = Path(script_path)
     original_invoke = command.invoke
 
+    name = command.name or path.stem
+
     def safe_invoke(ctx):
-        try:
-            return original_invoke(ctx)
-        except (click.ClickException, click.Abort, SystemExit, KeyboardInterrupt):
-            raise
-        except Exception as exc:  # noqa: BLE001 - intentional catch-all for user scripts
-            render_script_error(command.name or path.stem, path, exc)
-            raise SystemExit(1) from exc
+        with track_run(name, source="workflow"):
+            try:
+                return original_invoke(ctx)
+            except (click.ClickException, click.Abort, SystemExit, KeyboardInterrupt):
+                raise
+            except Exception as exc:  # noqa: BLE001 - intentional catch-all for user scripts
+                render_script_error(name, path, exc)
+                raise SystemExit(1) from exc
 
     command.invoke = safe_invoke  # type: ignore[method-assign]
     return command
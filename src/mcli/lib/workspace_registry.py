@@ -208,34 +208,21 @@ def list_registered_workspaces() -> List[Dict[str, Any]]:
     return workspaces
 
 
-def get_all_workflows() -> Dict[str, List[Dict[str, Any]]]:
+def get_all_workflow_dirs() -> Dict[str, Path]:
     """
-    Get all workflows from all registered workspaces.
+    Get the workflows directory of every registered workspace.
 
     Returns:
-        Dictionary mapping workspace name to list of workflow info
+        Dictionary mapping workspace name to its existing workflows directory,
+        global workflows first
     """
     registry = load_registry()
-    all_workflows: Dict[str, List[Dict[str, Any]]] = {}
+    workflow_dirs: Dict[str, Path] = {}
 
     # Always include global workflows
     global_workflows_dir = get_mcli_home() / "workflows"
     if global_workflows_dir.exists():
-        loader = ScriptLoader(global_workflows_dir)
-        scripts = loader.discover_scripts()
-
-        workflows = []
-        for script_path in scripts:
-            try:
-                info = loader.get_script_info(script_path)
-                info["name"] = script_path.stem
-                info["path"] = str(script_path)
-                workflows.append(info)
-            except Exception as e:
-                logger.debug(f"Failed to get info for {script_path}: {e}")
-
-        if workflows:
-            all_workflows["global (~/.mcli/workflows)"] = workflows
+        workflow_dirs["global (~/.mcli/workflows)"] = global_workflows_dir
 
     # Get workflows from registered workspaces
     for _workspace_id, workspace_data in registry.get("workspaces", {}).items():
@@ -250,6 +237,21 @@ def get_all_workflows() -> Dict[str, List[Dict[str, Any]]]:
         if not workflows_dir.exists():
             continue
 
+        workflow_dirs[f"{workspace_name} ({workspace_path})"] = workflows_dir
+
+    return workflow_dirs
+
+
+def get_all_workflows() -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Get all workflows from all registered workspaces.
+
+    Returns:
+        Dictionary mapping workspace name to list of workflow info
+    """
+    all_workflows: Dict[str, List[Dict[str, Any]]] = {}
+
+    for workspace_name, workflows_dir in get_all_workflow_dirs().items():
         loader = ScriptLoader(workflows_dir)
         scripts = loader.discover_scripts()
 
@@ -264,7 +266,7 @@ def get_all_workflows() -> Dict[str, List[Dict[str, Any]]]:
                 logger.debug(f"Failed to get info for {script_path}: {e}")
 
         if workflows:
-            all_workflows[f"{workspace_name} ({workspace_path})"] = workflows
+            all_workflows[workspace_name] = workflows
 
     return all_workflows
 
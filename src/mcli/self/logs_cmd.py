@@ -2,16 +2,21 @@
 Log streaming and management commands
 """
 
+import re
 import subprocess
 import time
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
 import click
 from rich.console import Console
+from rich.table import Table
 from rich.text import Text
 
+from mcli.lib.log_reader import grep_files, tail_lines
+from mcli.lib.logger.events import RunEventLog
 from mcli.lib.paths import get_logs_dir
 
 console = Console()
@@ -171,17 +176,14 @@ def tail_logs(log_type: str, lines: int, date: Optional[str], follow: bool):
                 console.print("\n👋 Log following stopped", style="cyan")
         else:
             # Standard mode: just show last N lines
-            # Read last N lines
-            with open(log_file) as f:
-                all_lines = f.readlines()
-                tail_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
+            last_lines = tail_lines(log_file, lines)
 
             # Display with formatting
             console.print(
-                f"\n📋 **Last {len(tail_lines)} lines from {log_file.name}**\n", style="cyan"
+                f"\n📋 **Last {len(last_lines)} lines from {log_file.name}**\n", style="cyan"
             )
 
-            for line in tail_lines:
+            for line in last_lines:
                 formatted_line = _format_log_line(line.rstrip())
                 console.print(formatted_line)
 
@@ -202,40 +204,64 @@ def tail_logs(log_type: str, lines: int, date: Optional[str], follow: bool):
 @click.option(
     "--context", "-C", type=int, default=3, help="Lines of context around matches (default: 3)"
 )
-def grep_logs(pattern: str, type: str, date: Optional[str], context: int):
+@click.option(
+    "--days",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Also search the N-1 days before --date (default: 1)",
+)
+@click.option(
+    "--regex", "-E", is_flag=True, help="Treat PATTERN as a regular expression (case-insensitive)"
+)
+def grep_logs(pattern: str, type: str, date: Optional[str], context: int, days: int, regex: bool):
     """Search for patterns in log files."""
     logs_dir = get_logs_dir()
 
     # Use provided date or default to today
     log_date = date or datetime.now().strftime("%Y%m%d")
-
-    # Get log files to search
-    log_files = {
-        "main": logs_dir / f"mcli_{log_date}.log",
-        "trace": logs_dir / f"mcli_trace_{log_date}.log",
-        "system": logs_dir / f"mcli_system_{log_date}.log",
-    }
-
-    files_to_search = []
-    if type == "all":
-        files_to_search = [f for f in log_files.values() if f.exists()]
-    else:
-        if log_files[type].exists():
-            files_to_search = [log_files[type]]
+    try:
+        first = datetime.strptime(log_date, "%Y%m%d")
+    except ValueError:
+        console.print(f"❌ Invalid date: {log_date} (expected YYYYMMDD)", style="red")
+        return
+    log_dates = [log_date]
+    if days > 1:
+        log_dates = [(first - timedelta(days=i)).strftime("%Y%m%d") for i in range(days)]
+
+    # Get log files to search, newest first
+    prefixes = {"main": "mcli_", "trace": "mcli_trace_", "system": "mcli_system_"}
+    types = list(prefixes) if type == "all" else [type]
+    files_to_search = [
+        logs_dir / f"{prefixes[t]}{d}.log"
+        for d in log_dates
+        for t in types
+        if (logs_dir / f"{prefixes[t]}{d}.log").exists()
+    ]
 
     if not files_to_search:
         console.print(f"❌ No log files found for {log_date}", style="red")
         return
 
-    # Search each file
+    try:
+        results = grep_files(files_to_search, pattern, context, regex=regex)
+    except re.error as e:
+        console.print(f"❌ Invalid regular expression: {e}", style="red")
+        return
+
+    # Report each file, printing matches as they are found
     total_matches = 0
-    for log_file in files_to_search:
-        matches = _search_log_file(log_file, pattern, context)
-        if matches:
-            console.print(f"\n📁 **{log_file.name}** ({len(matches)} matches)", style="cyan")
-            for match in matches:
-                console.print(match)
-            total_matches += len(matches)
+    for result in results:
+        file_matches = 0
+        for match in result.matches:
+            if file_matches == 0:
+                console.print(f"\n📁 **{result.path.name}**", style="cyan")
+            console.print(match.format())
+            file_matches += 1
+        if result.error:
+            console.print(f"❌ Error searching {result.path.name}: {result.error}", style="red")
+        elif file_matches:
+            console.print(f"   {file_matches} matches in {result.path.name}", style="cyan")
+        total_matches += file_matches
 
     if total_matches == 0:
         console.print(f"❌ No matches found for pattern: {pattern}", style="yellow")
@@ -243,6 +269,108 @@ def grep_logs(pattern: str, type: str, date: Optional[str], context: int):
         console.print(f"\n✅ Found {total_matches} total matches", style="green")
 
 
+@logs_group.command(name="runs")
+@click.option("--command", "-c", "command_name", help="Only runs of this command")
+@click.option(
+    "--days",
+    type=click.IntRange(min=1),
+    default=7,
+    help="Look at the last N days (default: 7)",
+)
+@click.option("--failed", is_flag=True, help="Only runs that exited with a non-zero status")
+@click.option("--stats", is_flag=True, help="Show per-command counts and p50/p95 durations")
+@click.option(
+    "--compare",
+    is_flag=True,
+    help="Compare per-command durations with the N days before (implies --stats)",
+)
+@click.option("--limit", "-n", type=int, default=20, help="Rows to show (default: 20)")
+def show_runs(
+    command_name: Optional[str], days: int, failed: bool, stats: bool, compare: bool, limit: int
+):
+    """Query the run-event log of workflow and scheduled job runs.
+
+    Lists the most recent runs, or with --stats aggregates durations per
+    command. --compare answers "which workflows got slower": commands are
+    ranked by the change of their p50 duration against the previous period.
+    """
+    log = RunEventLog()
+    until = datetime.now()
+    since = until - timedelta(days=days)
+
+    if compare:
+        previous = {
+            s.command: s for s in log.stats(since - timedelta(days=days), since, command_name)
+        }
+        rows = []
+        for current in log.stats(since, until, command_name):
+            before = previous.get(current.command)
+            change = (current.p50 - before.p50) / before.p50 if before and before.p50 else None
+            rows.append((current, before, change))
+        if not rows:
+            console.print(f"❌ No runs recorded in the last {days} day(s)", style="yellow")
+            return
+        rows.sort(key=lambda row: (row[2] is not None, row[2] or 0.0), reverse=True)
+
+        table = Table(title=f"Last {days} day(s) vs the {days} before", header_style="bold")
+        for column in ("Command", "Runs", "p50 before", "p50 now", "Change", "p95 now"):
+            table.add_column(column, justify="left" if column == "Command" else "right")
+        for current, before, change in rows[:limit]:
+            if change is None:
+                delta = Text("new", style="dim")
+            else:
+                delta = Text(f"{change:+.0%}", style="red" if change > 0 else "green")
+            table.add_row(
+                current.command,
+                str(current.count),
+                _format_duration(before.p50) if before else "-",
+                _format_duration(current.p50),
+                delta,
+                _format_duration(current.p95),
+            )
+        console.print(table)
+        return
+
+    if stats:
+        results = log.stats(since, until, command_name)
+        if not results:
+            console.print(f"❌ No runs recorded in the last {days} day(s)", style="yellow")
+            return
+        table = Table(title=f"Runs in the last {days} day(s)", header_style="bold")
+        for column in ("Command", "Runs", "Failed", "p50", "p95", "Max", "Total"):
+            table.add_column(column, justify="left" if column == "Command" else "right")
+        for result in results[:limit]:
+            table.add_row(
+                result.command,
+                str(result.count),
+                str(result.failures) if result.failures else "",
+                _format_duration(result.p50),
+                _format_duration(result.p95),
+                _format_duration(result.max),
+                _format_duration(result.total),
+            )
+        console.print(table)
+        return
+
+    recent = deque(log.query(since, until, command_name, failed_only=failed), maxlen=limit)
+    if not recent:
+        console.print(f"❌ No runs recorded in the last {days} day(s)", style="yellow")
+        return
+    table = Table(header_style="bold")
+    for column in ("Started", "Command", "Source", "Duration", "Exit", "Correlation ID"):
+        table.add_column(column, justify="right" if column in ("Duration", "Exit") else "left")
+    for event in reversed(recent):
+        table.add_row(
+            event.started_at.strftime("%Y-%m-%d %H:%M:%S"),
+            event.command,
+            event.source,
+            _format_duration(event.duration),
+            Text(str(event.exit_status), style="green" if event.ok else "red"),
+            event.correlation_id,
+        )
+    console.print(table)
+
+
 @logs_group.command(name="clear")
 @click.option("--older-than", type=int, help="Clear logs older than N days")
 @click.option("--confirm", "-y", is_flag=True, help="Skip confirmation prompt")
@@ -319,11 +447,7 @@ def _stream_single_file(log_file: Path, lines: int, follow: bool):
             process.terminate()
     else:
         # Just show last N lines
-        with open(log_file) as f:
-            all_lines = f.readlines()
-            tail_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
-
-        for line in tail_lines:
+        for line in tail_lines(log_file, lines):
             formatted_line = _format_log_line(line.rstrip())
             console.print(formatted_line)
 
@@ -342,9 +466,7 @@ def _stream_multiple_files(log_files: list, lines: int, follow: bool):
             for log_file in log_files:
                 if log_file.exists():
                     # Show recent lines from each file
-                    with open(log_file) as f:
-                        all_lines = f.readlines()
-                        recent_lines = all_lines[-5:] if len(all_lines) > 5 else all_lines
+                    recent_lines = tail_lines(log_file, 5)
 
                     if recent_lines:
                         console.print(f"\n--- {log_file.name} ---", style="blue")
@@ -405,34 +527,6 @@ def _list_available_logs(logs_dir: Path, date_filter: Optional[str] = None):
         )
 
 
-def _search_log_file(log_file: Path, pattern: str, context: int) -> list:
-    """Search for pattern in log file with context."""
-    matches = []
-
-    try:
-        with open(log_file) as f:
-            lines = f.readlines()
-
-        for i, line in enumerate(lines):
-            if pattern.lower() in line.lower():
-                # Get context lines
-                start = max(0, i - context)
-                end = min(len(lines), i + context + 1)
-
-                context_lines = []
-                for j in range(start, end):
-                    prefix = ">>> " if j == i else "    "
-                    _style = "bright_yellow" if j == i else "dim"  # noqa: F841
-                    context_lines.append(f"{prefix}{lines[j].rstrip()}")
-
-                matches.append("\n".join(context_lines) + "\n")
-
-    except Exception as e:
-        console.print(f"❌ Error searching {log_file.name}: {e}", style="red")
-
-    return matches
-
-
 def _format_file_size(size_bytes: int) -> str:
     """Format file size in human readable format."""
     size: float = float(size_bytes)
@@ -443,6 +537,19 @@ def _format_file_size(size_bytes: int) -> str:
     return f"{size:.1f} TB"
 
 
+def _format_duration(seconds: float) -> str:
+    """Format a run duration in human readable form."""
+    if seconds < 1:
+        return f"{seconds * 1000:.0f}ms"
+    if seconds < 60:
+        return f"{seconds:.2f}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes:.0f}m{seconds:02.0f}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:.0f}h{minutes:02.0f}m"
+
+
 # Register with main CLI
 def register_logs_commands(cli):
     """Register logs commands with the main CLI."""
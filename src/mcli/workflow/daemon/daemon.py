@@ -1,16 +1,22 @@
+import asyncio
+import atexit
 import json
 import os
+import re
 import signal
 import sqlite3
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 import uuid
+import weakref
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 import click
 import psutil
@@ -30,24 +36,29 @@ except ImportError:
     Observer = None
 
 # Import existing utilities
+from mcli.lib.api.daemon_ipc import DEFAULT_SOCKET_PATH
 from mcli.lib.logger.logger import get_logger
 from mcli.lib.pyenv import PyEnvManager
 from mcli.lib.toml.toml import read_from_toml
+from mcli.workflow.daemon.ipc_server import (
+    DEFAULT_MAX_INFLIGHT,
+    DEFAULT_MAX_PENDING,
+    DEFAULT_WORKER_THREADS,
+    DaemonIPCServer,
+)
+from mcli.workflow.daemon.similarity_index import SimilarityIndex, term_counts
+from mcli.workflow.daemon.worker_pool import (
+    DEFAULT_MAX_JOBS,
+    DEFAULT_MAX_MEMORY_MB,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_TIMEOUT,
+    WORKER_POOLS_SUPPORTED,
+    WorkerPool,
+)
 
 logger = get_logger(__name__)
 
 
-# Stub CommandDatabase for backward compatibility
-# Commands are now managed via JSON files in ~/.mcli/commands/
-class CommandDatabase:
-    """Stub database for backward compatibility.
-    Commands are now stored as JSON files and loaded via the custom commands system.
-    """
-
-    def __init__(self, db_path: Optional[str] = None):
-        logger.debug("CommandDatabase stub initialized - commands now managed via JSON files")
-
-
 @dataclass
 class Command:
     """Represents a stored command."""
@@ -65,6 +76,22 @@ class Command:
     last_executed: Optional[datetime] = None
     is_active: bool = True
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary of the command for listings (everything but its code)."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "language": self.language,
+            "group": self.group,
+            "tags": self.tags,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "execution_count": self.execution_count,
+            "last_executed": self.last_executed.isoformat() if self.last_executed else None,
+            "is_active": self.is_active,
+        }
+
 
 class CommandFileWatcher(FileSystemEventHandler):
     """Watches a directory for command file changes and updates the registry."""
@@ -139,27 +166,153 @@ def start_command_file_watcher(db, watch_dir: str = None):
     watcher = CommandFileWatcher(db, watch_dir)
     logger.info(f"Started command file watcher on {watch_dir}")
     return watcher
-    """Manages command storage and retrieval"""
 
-    def __init__(self, db_path: Optional[str] = None):
+
+# Columns selected for Command rows, in _row_to_command order
+_COMMAND_COLUMNS = (
+    "id, name, description, code, language, group_name, tags, "
+    "created_at, updated_at, execution_count, last_executed, is_active"
+)
+
+# Statements are kept as constants so each pooled connection's statement cache
+# (sqlite3's ``cached_statements``) reuses the prepared form across calls.
+_INSERT_COMMAND_SQL = f"INSERT INTO commands ({_COMMAND_COLUMNS}) VALUES ({', '.join('?' * 12)})"
+_SELECT_COMMAND_SQL = f"SELECT {_COMMAND_COLUMNS} FROM commands WHERE id = ?"
+_SELECT_BY_NAME_SQL = (
+    f"SELECT {_COMMAND_COLUMNS} FROM commands WHERE name = ? AND is_active = 1 LIMIT 1"
+)
+_SELECT_ALL_SQL = f"SELECT {_COMMAND_COLUMNS} FROM commands ORDER BY name"
+_SELECT_ACTIVE_SQL = f"SELECT {_COMMAND_COLUMNS} FROM commands WHERE is_active = 1 ORDER BY name"
+_SEARCH_FTS_SQL = (
+    f"SELECT {', '.join('c.' + col.strip() for col in _COMMAND_COLUMNS.split(','))} "
+    "FROM commands_fts JOIN commands c ON c.rowid = commands_fts.rowid "
+    "WHERE commands_fts MATCH ? AND c.is_active = 1 "
+    "ORDER BY commands_fts.rank, c.name LIMIT ?"
+)
+_SEARCH_LIKE_SQL = (
+    f"SELECT {_COMMAND_COLUMNS} FROM commands WHERE is_active = 1 "
+    "AND (name LIKE ? OR description LIKE ? OR tags LIKE ? OR language LIKE ?) "
+    "ORDER BY name LIMIT ?"
+)
+_UPDATE_COMMAND_SQL = (
+    "UPDATE commands SET name = ?, description = ?, code = ?, language = ?, "
+    "group_name = ?, tags = ?, updated_at = ?, is_active = ? WHERE id = ?"
+)
+_DELETE_COMMAND_SQL = "UPDATE commands SET is_active = 0 WHERE id = ?"
+_INSERT_EXECUTION_SQL = (
+    "INSERT INTO executions "
+    "(id, command_id, executed_at, status, output, error, execution_time_ms) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_SELECT_COMMANDS_BY_ID_SQL = (
+    f"SELECT {_COMMAND_COLUMNS} FROM commands WHERE id IN (SELECT value FROM json_each(?))"
+)
+_SELECT_TERMS_SQL = "SELECT command_id, term, tf FROM command_terms"
+_INSERT_TERM_SQL = "INSERT INTO command_terms (command_id, term, tf) VALUES (?, ?, ?)"
+_DELETE_TERMS_SQL = "DELETE FROM command_terms WHERE command_id = ?"
+_UPDATE_STATS_SQL = (
+    "UPDATE commands SET execution_count = execution_count + ?, last_executed = ? WHERE id = ?"
+)
+
+# Buffered execution records are written in one transaction once this many are
+# pending, or at the latest this many seconds after the first one was buffered.
+EXECUTION_BATCH_SIZE = 100
+EXECUTION_FLUSH_INTERVAL = 1.0
+# Records whose write failed are retried; past this many pending, the oldest
+# are dropped
+MAX_PENDING_EXECUTIONS = 10 * EXECUTION_BATCH_SIZE
+
+_FTS_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_open_databases: "weakref.WeakSet[CommandDatabase]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_databases() -> None:
+    for db in list(_open_databases):
+        db.flush_executions()
+
+
+class CommandDatabase:
+    """Manages command storage and retrieval.
+
+    Connections are pooled and reused (WAL journal, ``synchronous=NORMAL``), so
+    a call costs a statement rather than a connect plus an fsync. Execution
+    records are buffered and written in batches, ``search_commands`` uses an
+    FTS5 index kept in sync by triggers, and ``find_similar_commands`` uses a
+    persisted document-term matrix patched by every write.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, pool_size: int = 4):
         if db_path is None:
             db_path = Path.home() / ".local" / "mcli" / "daemon" / "commands.db"
 
         self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self.init_database()
-
-        # Initialize vectorizer for similarity search (lazy import)
-        from sklearn.feature_extraction.text import TfidfVectorizer
-
-        self.vectorizer = TfidfVectorizer(
-            max_features=1000, stop_words="english", ngram_range=(1, 2)
+        self.pool_size = pool_size
+        self._connection_pool: List[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+        self._initialized = False
+        self.has_fts = False
+
+        self._pending_executions: List[tuple] = []
+        self._executions_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+
+        # Similarity index, loaded from command_terms on first use and then
+        # patched in place by every write. The lock orders loading against
+        # patching, so a write committed during the load is not lost
+        self._similarity_index: Optional[SimilarityIndex] = None
+        self._similarity_lock = threading.Lock()
+        _open_databases.add(self)
+
+    # ------------------------------------------------------------------
+    # Connections
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection with the daemon's pragmas applied."""
+        conn = sqlite3.connect(
+            self.db_path, timeout=10, check_same_thread=False, cached_statements=256
         )
-        self._update_embeddings()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA cache_size=10000")
+        conn.execute("PRAGMA temp_store=memory")
+        return conn
+
+    @contextmanager
+    def _get_connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled connection, creating the schema on first use."""
+        with self._pool_lock:
+            if not self._initialized:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                conn = self._connect()
+                self.init_database(conn)
+                self._initialized = True
+            elif self._connection_pool:
+                conn = self._connection_pool.pop()
+            else:
+                conn = self._connect()
 
-    def init_database(self):
+        try:
+            yield conn
+        finally:
+            with self._pool_lock:
+                if len(self._connection_pool) < self.pool_size:
+                    self._connection_pool.append(conn)
+                else:
+                    conn.close()
+
+    def close(self) -> None:
+        """Flush buffered executions and close all pooled connections."""
+        self.flush_executions()
+        with self._pool_lock:
+            for conn in self._connection_pool:
+                conn.close()
+            self._connection_pool.clear()
+
+    def init_database(self, conn: sqlite3.Connection):
         """Initialize SQLite database."""
-        conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
         # Commands table
@@ -211,242 +364,262 @@ def start_command_file_watcher(db, watch_dir: str = None):
             )
         """
         )
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_commands_name ON commands(name)")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_executions_command_id ON executions(command_id)"
+        )
 
+        self.has_fts = self._init_fts(cursor)
+        self._init_command_terms(cursor)
         conn.commit()
-        conn.close()
 
-    def _update_embeddings(self):
-        """Update TF-IDF embeddings for similarity search."""
-        commands = self.get_all_commands()
-        if not commands:
+    def _init_command_terms(self, cursor: sqlite3.Cursor) -> None:
+        """Create the persisted document-term matrix used by find_similar_commands."""
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'command_terms'"
+        ).fetchone()
+        if exists:
             return
 
-        # Combine name, description, and tags for embedding
-        texts = []
-        for cmd in commands:
-            text_parts = [cmd.name, cmd.description or ""]
-            text_parts.extend(cmd.tags or [])
-            texts.append(" ".join(text_parts))
+        cursor.execute(
+            """
+            CREATE TABLE command_terms (
+                command_id TEXT NOT NULL,
+                term TEXT NOT NULL,
+                tf INTEGER NOT NULL,
+                PRIMARY KEY (command_id, term)
+            ) WITHOUT ROWID
+        """
+        )
+        # Tokenize commands stored before the table existed
+        for row in cursor.execute(_SELECT_ACTIVE_SQL).fetchall():
+            command = self._row_to_command(row)
+            cursor.executemany(
+                _INSERT_TERM_SQL,
+                [(command.id, term, tf) for term, tf in self._command_terms(command).items()],
+            )
 
-        if texts:
-            self.vectorizer.fit(texts)
-
-    def add_command(self, command: Command) -> str:
-        """Add a new command to the database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def _init_fts(self, cursor: sqlite3.Cursor) -> bool:
+        """Create the FTS5 index over commands; False if SQLite lacks FTS5."""
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'commands_fts'"
+        ).fetchone()
+        if exists:
+            return True
 
         try:
             cursor.execute(
                 """
-                INSERT INTO commands 
-                (id, name, description, code, language, group_name, tags, 
-                 created_at, updated_at, execution_count, last_executed, is_active)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    command.id,
-                    command.name,
-                    command.description,
-                    command.code,
-                    command.language,
-                    command.group,
-                    json.dumps(command.tags),
-                    command.created_at.isoformat(),
-                    command.updated_at.isoformat(),
-                    command.execution_count,
-                    command.last_executed.isoformat() if command.last_executed else None,
-                    command.is_active,
-                ),
+                CREATE VIRTUAL TABLE commands_fts USING fts5(
+                    name, description, tags, language,
+                    content='commands', content_rowid='rowid'
+                )
+            """
             )
+        except sqlite3.OperationalError as e:
+            logger.debug(f"FTS5 unavailable, command search falls back to LIKE: {e}")
+            return False
+
+        # External-content triggers; only searchable columns re-index on update,
+        # so execution-count updates never touch the index.
+        cursor.executescript(
+            """
+            CREATE TRIGGER commands_fts_insert AFTER INSERT ON commands BEGIN
+                INSERT INTO commands_fts(rowid, name, description, tags, language)
+                VALUES (new.rowid, new.name, new.description, new.tags, new.language);
+            END;
+            CREATE TRIGGER commands_fts_delete AFTER DELETE ON commands BEGIN
+                INSERT INTO commands_fts(commands_fts, rowid, name, description, tags, language)
+                VALUES ('delete', old.rowid, old.name, old.description, old.tags, old.language);
+            END;
+            CREATE TRIGGER commands_fts_update
+            AFTER UPDATE OF name, description, tags, language ON commands BEGIN
+                INSERT INTO commands_fts(commands_fts, rowid, name, description, tags, language)
+                VALUES ('delete', old.rowid, old.name, old.description, old.tags, old.language);
+                INSERT INTO commands_fts(rowid, name, description, tags, language)
+                VALUES (new.rowid, new.name, new.description, new.tags, new.language);
+            END;
+            """
+        )
+        # Index commands stored before the FTS table existed
+        cursor.execute("INSERT INTO commands_fts(commands_fts) VALUES ('rebuild')")
+        return True
+
+    # ------------------------------------------------------------------
+    # Commands
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _command_terms(command: Command) -> Dict[str, int]:
+        """Term counts of the text similarity search compares against."""
+        return term_counts(command.name, command.description or "", *(command.tags or []))
+
+    def _store_terms(self, conn: sqlite3.Connection, command: Command) -> Dict[str, int]:
+        """Replace a command's row of the document-term matrix; empty if inactive."""
+        terms = self._command_terms(command) if command.is_active else {}
+        conn.execute(_DELETE_TERMS_SQL, (command.id,))
+        conn.executemany(_INSERT_TERM_SQL, [(command.id, t, tf) for t, tf in terms.items()])
+        return terms
+
+    def _index_terms(self, command_id: str, terms: Dict[str, int]) -> None:
+        """Patch the in-memory similarity index if it has been loaded."""
+        with self._similarity_lock:
+            index = self._similarity_index
+            if index is None:
+                return
+            if terms:
+                index.add(command_id, terms)
+            else:
+                index.remove(command_id)
+
+    def _loaded_similarity_index(self) -> SimilarityIndex:
+        """The similarity index, loading it from command_terms on first use."""
+        with self._similarity_lock:
+            if self._similarity_index is None:
+                index = SimilarityIndex()
+                with self._get_connection() as conn:
+                    index.add_many(conn.execute(_SELECT_TERMS_SQL))
+                self._similarity_index = index
+            return self._similarity_index
 
-            conn.commit()
-            self._update_embeddings()
-            return command.id
+    def add_command(self, command: Command) -> str:
+        """Add a new command to the database."""
+        now = datetime.now()
+        with self._get_connection() as conn:
+            try:
+                conn.execute(
+                    _INSERT_COMMAND_SQL,
+                    (
+                        command.id,
+                        command.name,
+                        command.description,
+                        command.code,
+                        command.language,
+                        command.group,
+                        json.dumps(command.tags),
+                        (command.created_at or now).isoformat(),
+                        (command.updated_at or now).isoformat(),
+                        command.execution_count,
+                        command.last_executed.isoformat() if command.last_executed else None,
+                        command.is_active,
+                    ),
+                )
+                terms = self._store_terms(conn, command)
+                conn.commit()
+            except Exception as e:
+                logger.error(f"Error adding command: {e}")
+                conn.rollback()
+                raise
 
-        except Exception as e:
-            logger.error(f"Error adding command: {e}")
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+        self._index_terms(command.id, terms)
+        return command.id
 
     def get_command(self, command_id: str) -> Optional[Command]:
         """Get a command by ID."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute(
-                """
-                SELECT id, name, description, code, language, group_name, tags,
-                       created_at, updated_at, execution_count, last_executed, is_active
-                FROM commands WHERE id = ?
-            """,
-                (command_id,),
-            )
-
-            row = cursor.fetchone()
-            if row:
-                return self._row_to_command(row)
-            return None
-
-        finally:
-            conn.close()
+        self.flush_executions()
+        with self._get_connection() as conn:
+            row = conn.execute(_SELECT_COMMAND_SQL, (command_id,)).fetchone()
+        return self._row_to_command(row) if row else None
+
+    def get_command_by_name(self, name: str) -> Optional[Command]:
+        """Get an active command by name."""
+        self.flush_executions()
+        with self._get_connection() as conn:
+            row = conn.execute(_SELECT_BY_NAME_SQL, (name,)).fetchone()
+        return self._row_to_command(row) if row else None
 
     def get_all_commands(self, include_inactive: bool = False) -> List[Command]:
         """Get all commands, optionally including inactive ones."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        try:
-            if include_inactive:
-                cursor.execute(
-                    """
-                    SELECT id, name, description, code, language, group_name, tags,
-                           created_at, updated_at, execution_count, last_executed, is_active
-                    FROM commands
-                    ORDER BY name
-                """
-                )
-            else:
-                cursor.execute(
-                    """
-                    SELECT id, name, description, code, language, group_name, tags,
-                           created_at, updated_at, execution_count, last_executed, is_active
-                    FROM commands WHERE is_active = 1
-                    ORDER BY name
-                """
-                )
-            return [self._row_to_command(row) for row in cursor.fetchall()]
-        finally:
-            conn.close()
+        self.flush_executions()
+        with self._get_connection() as conn:
+            rows = conn.execute(_SELECT_ALL_SQL if include_inactive else _SELECT_ACTIVE_SQL)
+            return [self._row_to_command(row) for row in rows.fetchall()]
 
     def search_commands(self, query: str, limit: int = 10) -> List[Command]:
-        """Search commands by name, description, or tags."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        """Search commands by name, description, tags or language.
 
-        try:
-            # Simple text search
-            search_term = f"%{query}%"
-            cursor.execute(
-                """
-                SELECT id, name, description, code, language, group_name, tags,
-                       created_at, updated_at, execution_count, last_executed, is_active
-                FROM commands 
-                WHERE is_active = 1 
-                AND (name LIKE ? OR description LIKE ? OR tags LIKE ?)
-                ORDER BY name
-                LIMIT ?
-            """,
-                (search_term, search_term, search_term, limit),
-            )
-
-            return [self._row_to_command(row) for row in cursor.fetchall()]
-
-        finally:
-            conn.close()
+        Each word of the query must prefix-match a word of the command, and
+        results are ranked by FTS5's BM25. Without FTS5 a substring search is
+        used instead.
+        """
+        self.flush_executions()
+        tokens = _FTS_TOKEN_RE.findall(query)
+        with self._get_connection() as conn:
+            if self.has_fts and tokens:
+                match = " ".join('"' + token.replace('"', '""') + '"*' for token in tokens)
+                rows = conn.execute(_SEARCH_FTS_SQL, (match, limit))
+            else:
+                search_term = f"%{query}%"
+                rows = conn.execute(_SEARCH_LIKE_SQL, (search_term,) * 4 + (limit,))
+            return [self._row_to_command(row) for row in rows.fetchall()]
 
     def find_similar_commands(self, query: str, limit: int = 5) -> List[tuple]:
-        """Find similar commands using cosine similarity."""
-        commands = self.get_all_commands()
-        if not commands:
-            return []
+        """Find similar commands using cosine similarity.
 
-        # Prepare query text
-        query_text = query.lower()
-
-        # Get command texts for comparison
-        command_texts = []
-        for cmd in commands:
-            text_parts = [cmd.name, cmd.description or ""]
-            text_parts.extend(cmd.tags or [])
-            command_texts.append(" ".join(text_parts).lower())
-
-        if not command_texts:
+        Returns ``(command, similarity)`` pairs, best first, for commands
+        sharing at least one term with the query. Only the query is tokenized;
+        command terms come from the incrementally maintained index.
+        """
+        ranked = self._loaded_similarity_index().query(query, limit)
+        if not ranked:
             return []
 
-        # Calculate similarities
-        try:
-            # Transform query and commands
-            query_vector = self.vectorizer.transform([query_text])
-            command_vectors = self.vectorizer.transform(command_texts)
-
-            # Calculate cosine similarities (lazy import)
-            from sklearn.metrics.pairwise import cosine_similarity
-
-            similarities = cosine_similarity(query_vector, command_vectors).flatten()
-
-            # Sort by similarity
-            command_similarities = list(zip(commands, similarities))
-            command_similarities.sort(key=lambda x: x[1], reverse=True)
-
-            return command_similarities[:limit]
-
-        except Exception as e:
-            logger.error(f"Error calculating similarities: {e}")
-            return []
+        self.flush_executions()
+        with self._get_connection() as conn:
+            rows = conn.execute(_SELECT_COMMANDS_BY_ID_SQL, (json.dumps([i for i, _ in ranked]),))
+            commands = {row[0]: self._row_to_command(row) for row in rows.fetchall()}
+        return [(commands[i], score) for i, score in ranked if i in commands]
 
     def update_command(self, command: Command) -> bool:
         """Update an existing command."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute(
-                """
-                UPDATE commands 
-                SET name = ?, description = ?, code = ?, language = ?, 
-                    group_name = ?, tags = ?, updated_at = ?, is_active = ?
-                WHERE id = ?
-            """,
-                (
-                    command.name,
-                    command.description,
-                    command.code,
-                    command.language,
-                    command.group,
-                    json.dumps(command.tags),
-                    datetime.now().isoformat(),
-                    command.is_active,
-                    command.id,
-                ),
-            )
-
-            conn.commit()
-            self._update_embeddings()
-            return cursor.rowcount > 0
+        with self._get_connection() as conn:
+            try:
+                cursor = conn.execute(
+                    _UPDATE_COMMAND_SQL,
+                    (
+                        command.name,
+                        command.description,
+                        command.code,
+                        command.language,
+                        command.group,
+                        json.dumps(command.tags),
+                        datetime.now().isoformat(),
+                        command.is_active,
+                        command.id,
+                    ),
+                )
+                if cursor.rowcount == 0:
+                    # Release the write transaction before the connection is pooled
+                    conn.rollback()
+                    return False
+                terms = self._store_terms(conn, command)
+                conn.commit()
+            except Exception as e:
+                logger.error(f"Error updating command: {e}")
+                conn.rollback()
+                return False
 
-        except Exception as e:
-            logger.error(f"Error updating command: {e}")
-            conn.rollback()
-            return False
-        finally:
-            conn.close()
+        self._index_terms(command.id, terms)
+        return True
 
     def delete_command(self, command_id: str) -> bool:
         """Delete a command (soft delete)."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute(
-                """
-                UPDATE commands SET is_active = 0 WHERE id = ?
-            """,
-                (command_id,),
-            )
+        with self._get_connection() as conn:
+            try:
+                cursor = conn.execute(_DELETE_COMMAND_SQL, (command_id,))
+                conn.execute(_DELETE_TERMS_SQL, (command_id,))
+                conn.commit()
+            except Exception as e:
+                logger.error(f"Error deleting command: {e}")
+                conn.rollback()
+                return False
 
-            conn.commit()
-            self._update_embeddings()
-            return cursor.rowcount > 0
+        self._index_terms(command_id, {})
+        return cursor.rowcount > 0
 
-        except Exception as e:
-            logger.error(f"Error deleting command: {e}")
-            conn.rollback()
-            return False
-        finally:
-            conn.close()
+    # ------------------------------------------------------------------
+    # Execution history
+    # ------------------------------------------------------------------
 
     def record_execution(
         self,
@@ -456,48 +629,78 @@ def start_command_file_watcher(db, watch_dir: str = None):
         error: str = None,
         execution_time_ms: int = None,
     ):
-        """Record command execution."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        """Record command execution.
 
-        try:
-            # Record execution
-            execution_id = str(uuid.uuid4())
-            cursor.execute(
-                """
-                INSERT INTO executions 
-                (id, command_id, executed_at, status, output, error, execution_time_ms)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    execution_id,
-                    command_id,
-                    datetime.now().isoformat(),
-                    status,
-                    output,
-                    error,
-                    execution_time_ms,
-                ),
-            )
-
-            # Update command stats
-            cursor.execute(
-                """
-                UPDATE commands 
-                SET execution_count = execution_count + 1, 
-                    last_executed = ?
-                WHERE id = ?
-            """,
-                (datetime.now().isoformat(), command_id),
-            )
+        The record is buffered and written with others in one transaction, at
+        most ``EXECUTION_FLUSH_INTERVAL`` seconds later. Reads through this
+        database flush first, so they always see it.
+        """
+        record = (
+            str(uuid.uuid4()),
+            command_id,
+            datetime.now().isoformat(),
+            status,
+            output,
+            error,
+            execution_time_ms,
+        )
+        with self._executions_lock:
+            self._pending_executions.append(record)
+            pending = len(self._pending_executions)
+            self._schedule_flush()
+
+        # Counted in batches so that records re-queued after a failed write do
+        # not force a synchronous flush on every call
+        if pending % EXECUTION_BATCH_SIZE == 0:
+            self.flush_executions()
+
+    def _schedule_flush(self) -> None:
+        """Flush within ``EXECUTION_FLUSH_INTERVAL`` (caller holds the lock)."""
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(EXECUTION_FLUSH_INTERVAL, self.flush_executions)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush_executions(self) -> None:
+        """Write buffered execution records and command stats in one transaction."""
+        with self._executions_lock:
+            records, self._pending_executions = self._pending_executions, []
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        if not records:
+            return
 
-            conn.commit()
+        # One stats update per command: count and latest execution time
+        stats: Dict[str, List[Any]] = {}
+        for record in records:
+            entry = stats.setdefault(record[1], [0, record[2]])
+            entry[0] += 1
+            entry[1] = max(entry[1], record[2])
 
-        except Exception as e:
-            logger.error(f"Error recording execution: {e}")
-            conn.rollback()
-        finally:
-            conn.close()
+        with self._get_connection() as conn:
+            try:
+                conn.executemany(_INSERT_EXECUTION_SQL, records)
+                conn.executemany(
+                    _UPDATE_STATS_SQL,
+                    [(count, last, command_id) for command_id, (count, last) in stats.items()],
+                )
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                self._requeue_executions(records, e)
+
+    def _requeue_executions(self, records: List[tuple], error: Exception) -> None:
+        """Put back records whose write failed, ahead of newer ones, for a retry."""
+        with self._executions_lock:
+            pending = records + self._pending_executions
+            dropped = max(len(pending) - MAX_PENDING_EXECUTIONS, 0)
+            self._pending_executions = pending[dropped:]
+            self._schedule_flush()
+        if dropped:
+            logger.error(f"Error recording executions, dropped {dropped} records: {error}")
+        else:
+            logger.warning(f"Error recording {len(records)} executions, will retry: {error}")
 
     def _row_to_command(self, row) -> Command:
         """Convert database row to Command object."""
@@ -518,11 +721,31 @@ def start_command_file_watcher(db, watch_dir: str = None):
 
 
 class CommandExecutor:
-    """Handles safe execution of commands in different languages."""
+    """Handles safe execution of commands in different languages.
+
+    Python commands run in a pool of warm worker interpreters per resolved
+    Python executable (see ``worker_pool``); set ``python_workers=0`` to spawn
+    a fresh interpreter per command instead. Other languages always run as a
+    separate process.
+    """
 
-    def __init__(self, temp_dir: Optional[str] = None):
+    def __init__(
+        self,
+        temp_dir: Optional[str] = None,
+        python_workers: int = DEFAULT_POOL_SIZE,
+        worker_max_jobs: int = DEFAULT_MAX_JOBS,
+        worker_max_memory_mb: int = DEFAULT_MAX_MEMORY_MB,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
         self.temp_dir = Path(temp_dir) if temp_dir else Path(tempfile.gettempdir()) / "mcli_daemon"
         self.temp_dir.mkdir(parents=True, exist_ok=True)
+        self.timeout = timeout
+
+        self.python_workers = python_workers if WORKER_POOLS_SUPPORTED else 0
+        self.worker_max_jobs = worker_max_jobs
+        self.worker_max_memory_mb = worker_max_memory_mb
+        self._worker_pools: Dict[str, WorkerPool] = {}
+        self._worker_pools_lock = threading.Lock()
 
         # Language-specific execution environments
         self.language_handlers = {
@@ -565,12 +788,50 @@ class CommandExecutor:
                 "status": "failed",
             }
 
+    def _worker_pool(self, python_exe: str) -> WorkerPool:
+        """Get the worker pool for a Python executable, starting it on first use."""
+        with self._worker_pools_lock:
+            pool = self._worker_pools.get(python_exe)
+            if pool is None:
+                pool = WorkerPool(
+                    python_exe,
+                    size=self.python_workers,
+                    max_jobs=self.worker_max_jobs,
+                    max_memory_mb=self.worker_max_memory_mb,
+                    timeout=self.timeout,
+                )
+                self._worker_pools[python_exe] = pool
+        pool.warm()
+        return pool
+
+    def warm(self):
+        """Start the Python workers for the current environment ahead of the first command."""
+        if self.python_workers > 0:
+            self._worker_pool(str(PyEnvManager().get_python_executable()))
+
+    def close(self):
+        """Stop all Python worker interpreters."""
+        with self._worker_pools_lock:
+            pools, self._worker_pools = list(self._worker_pools.values()), {}
+        for pool in pools:
+            pool.close()
+
     def _execute_python(self, command: Command, args: List[str]) -> Dict[str, str]:
         """Execute Python code safely.
 
         Uses the resolved Python executable from PyEnvManager, which prefers
         local venvs over global to allow access to workspace-specific packages.
         """
+        # Get the appropriate Python executable
+        env_manager = PyEnvManager()
+        python_exe = str(env_manager.get_python_executable())
+
+        if self.python_workers > 0:
+            result = self._worker_pool(python_exe).execute(
+                command.code, args, cwd=self.temp_dir, filename=f"{command.id}.py"
+            )
+            return {"output": result.output, "error": result.error}
+
         # Create temporary file
         script_file = self.temp_dir / f"{command.id}_{int(time.time())}.py"
 
@@ -579,16 +840,12 @@ class CommandExecutor:
             with open(script_file, "w") as f:
                 f.write(command.code)
 
-            # Get the appropriate Python executable
-            env_manager = PyEnvManager()
-            python_exe = str(env_manager.get_python_executable())
-
             # Execute with subprocess
             result = subprocess.run(
                 [python_exe, str(script_file)] + args,
                 capture_output=True,
                 text=True,
-                timeout=30,  # 30 second timeout
+                timeout=self.timeout,
                 cwd=self.temp_dir,
             )
 
@@ -611,7 +868,7 @@ class CommandExecutor:
                 ["node", str(script_file)] + args,
                 capture_output=True,
                 text=True,
-                timeout=30,
+                timeout=self.timeout,
                 cwd=self.temp_dir,
             )
 
@@ -633,7 +890,7 @@ class CommandExecutor:
                 ["lua", str(script_file)] + args,
                 capture_output=True,
                 text=True,
-                timeout=30,
+                timeout=self.timeout,
                 cwd=self.temp_dir,
             )
 
@@ -659,7 +916,7 @@ class CommandExecutor:
                 [str(script_file)] + args,
                 capture_output=True,
                 text=True,
-                timeout=30,
+                timeout=self.timeout,
                 cwd=self.temp_dir,
             )
 
@@ -695,15 +952,24 @@ class DaemonService:
                 paths_config = read_from_toml(config_path, "paths")
                 if paths_config:
                     self.config["paths"] = paths_config
+                daemon_config = read_from_toml(config_path, "daemon")
+                if daemon_config:
+                    self.config["daemon"] = daemon_config
                 logger.info(f"Loaded config from {config_path}")
             except Exception as e:
                 logger.warning(f"Could not load config from {config_path}: {e}")
 
         self.db = CommandDatabase()
-        self.executor = CommandExecutor()
+        daemon_config = self.config.get("daemon", {})
+        self.executor = CommandExecutor(
+            python_workers=daemon_config.get("python_workers", DEFAULT_POOL_SIZE),
+            worker_max_jobs=daemon_config.get("worker_max_jobs", DEFAULT_MAX_JOBS),
+            worker_max_memory_mb=daemon_config.get("worker_max_memory_mb", DEFAULT_MAX_MEMORY_MB),
+            timeout=daemon_config.get("execution_timeout", DEFAULT_TIMEOUT),
+        )
         self.running = False
         self.pid_file = Path.home() / ".local" / "mcli" / "daemon" / "daemon.pid"
-        self.socket_file = Path.home() / ".local" / "mcli" / "daemon" / "daemon.sock"
+        self.socket_file = Path(daemon_config.get("socket_path", DEFAULT_SOCKET_PATH))
 
         # Ensure daemon directory exists
         self.pid_file.parent.mkdir(parents=True, exist_ok=True)
@@ -734,6 +1000,9 @@ class DaemonService:
 
         logger.info(f"Daemon started with PID {os.getpid()}")
 
+        # Start Python workers so the first command doesn't pay for startup
+        self.executor.warm()
+
         # Set up signal handlers
         signal.signal(signal.SIGTERM, self._signal_handler)
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -752,6 +1021,7 @@ class DaemonService:
             return
 
         self.running = False
+        self.executor.close()
 
         # Remove PID file
         if self.pid_file.exists():
@@ -766,19 +1036,25 @@ class DaemonService:
         sys.exit(0)
 
     def _main_loop(self):
-        """Main daemon loop."""
+        """Main daemon loop: serve client requests on the Unix socket until stopped."""
         logger.info("Daemon main loop started")
-
-        while self.running:
-            try:
-                # Check for commands to execute
-                # This is a simple implementation - in a real system you'd use
-                # a message queue or socket communication
-                time.sleep(1)
-
-            except Exception as e:
-                logger.error(f"Error in main loop: {e}")
-                time.sleep(5)
+        asyncio.run(self._serve())
+
+    async def _serve(self):
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, stop.set)
+
+        daemon_config = self.config.get("daemon", {})
+        server = DaemonIPCServer(
+            self,
+            self.socket_file,
+            max_inflight=daemon_config.get("max_inflight", DEFAULT_MAX_INFLIGHT),
+            max_pending=daemon_config.get("max_pending", DEFAULT_MAX_PENDING),
+            worker_threads=daemon_config.get("ipc_threads", DEFAULT_WORKER_THREADS),
+        )
+        await server.serve_until(stop)
 
     def status(self) -> Dict[str, Any]:
         """Get daemon status."""
@@ -865,23 +1141,7 @@ def list_commands(as_json, show_all):
 
     service = DaemonService()
     commands = service.db.get_all_commands(include_inactive=show_all)
-    result = []
-    for cmd in commands:
-        result.append(
-            {
-                "id": cmd.id,
-                "name": cmd.name,
-                "description": cmd.description,
-                "language": cmd.language,
-                "group": cmd.group,
-                "tags": cmd.tags,
-                "created_at": cmd.created_at.isoformat() if cmd.created_at else None,
-                "updated_at": cmd.updated_at.isoformat() if cmd.updated_at else None,
-                "execution_count": cmd.execution_count,
-                "last_executed": cmd.last_executed.isoformat() if cmd.last_executed else None,
-                "is_active": cmd.is_active,
-            }
-        )
+    result = [cmd.to_dict() for cmd in commands]
     if as_json:
         import json
 
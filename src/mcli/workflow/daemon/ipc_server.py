@@ -0,0 +1,217 @@
+"""
+Unix socket front-end for the daemon, speaking the protocol in
+``mcli.lib.api.daemon_ipc``.
+
+``DaemonIPCServer`` serves a ``DaemonService`` with asyncio:
+
+- each connection reads requests as they arrive and runs them concurrently,
+  so clients can pipeline; responses are written as requests finish
+- at most ``max_inflight`` requests per connection run at once, and at most
+  ``max_pending`` are read but unfinished. Past that the connection stops
+  reading, so a fast client is held back by the socket buffer instead of
+  queueing unbounded work, and writes wait for the client to drain its side
+- blocking work (database access and command execution) runs on a bounded
+  thread pool, keeping the event loop free to dispatch
+- ``limits`` reports these bounds and the execution timeout so clients can
+  wait long enough for a queued request
+
+Cancelling a request answers ``cancelled`` at once. A request still waiting
+for a slot never runs; a command that already started keeps running on its
+thread (the executor has no way to interrupt it) and its result is discarded.
+"""
+
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from mcli.lib.api.daemon_ipc import (
+    DEFAULT_SOCKET_PATH,
+    HEADER_SIZE,
+    DaemonIPCError,
+    decode_length,
+    encode_frame,
+)
+from mcli.lib.logger.logger import get_logger
+from mcli.workflow.daemon.worker_pool import DEFAULT_TIMEOUT
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_INFLIGHT = 8
+DEFAULT_MAX_PENDING = 64
+DEFAULT_WORKER_THREADS = 8
+
+
+class DaemonIPCServer:
+    """Serves a ``DaemonService`` over a Unix domain socket."""
+
+    def __init__(
+        self,
+        service: Any,
+        socket_path: Union[str, Path, None] = None,
+        max_inflight: int = DEFAULT_MAX_INFLIGHT,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        worker_threads: int = DEFAULT_WORKER_THREADS,
+    ):
+        self.service = service
+        self.socket_path = Path(socket_path or DEFAULT_SOCKET_PATH)
+        self.max_inflight = max_inflight
+        self.max_pending = max(max_pending, max_inflight)
+        self.worker_threads = worker_threads
+        self._threads = ThreadPoolExecutor(
+            max_workers=worker_threads, thread_name_prefix="mcli-daemon-ipc"
+        )
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """Bind the socket, replacing a stale one left by a previous daemon."""
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.is_socket():
+            self.socket_path.unlink()
+        self._server = await asyncio.start_unix_server(
+            self._handle_connection, path=str(self.socket_path)
+        )
+        os.chmod(self.socket_path, 0o600)
+        logger.info(f"Daemon listening on {self.socket_path}")
+
+    async def close(self) -> None:
+        """Stop accepting connections and remove the socket."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self.socket_path.is_socket():
+            self.socket_path.unlink()
+        self._threads.shutdown(wait=False, cancel_futures=True)
+
+    async def serve_until(self, stop: asyncio.Event) -> None:
+        """Serve until ``stop`` is set."""
+        await self.start()
+        try:
+            await stop.wait()
+        finally:
+            await self.close()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        running = asyncio.Semaphore(self.max_inflight)
+        pending = asyncio.Semaphore(self.max_pending)
+        tasks: Dict[Any, asyncio.Task] = {}
+        write_lock = asyncio.Lock()
+
+        async def send(request_id: Any, event: str, data: Any = None) -> None:
+            async with write_lock:
+                writer.write(encode_frame({"id": request_id, "event": event, "data": data}))
+                await writer.drain()
+
+        try:
+            while True:
+                try:
+                    size = decode_length(await reader.readexactly(HEADER_SIZE))
+                    request = await self._read_request(reader, size)
+                except (asyncio.IncompleteReadError, ConnectionError, DaemonIPCError):
+                    break
+
+                request_id = request.get("id")
+                if request.get("op") == "cancel":
+                    target = tasks.get((request.get("params") or {}).get("target"))
+                    if target is not None:
+                        target.cancel()
+                    await send(request_id, "result", {"cancelled": target is not None})
+                    continue
+
+                # Backpressure: don't read further while max_pending are unfinished
+                await pending.acquire()
+                task = asyncio.create_task(self._run(request, send, running))
+                tasks[request_id] = task
+
+                def finished(_task, request_id=request_id):
+                    tasks.pop(request_id, None)
+                    pending.release()
+
+                task.add_done_callback(finished)
+        finally:
+            for task in list(tasks.values()):
+                task.cancel()
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader, size: int) -> Dict[str, Any]:
+        try:
+            request = json.loads(await reader.readexactly(size))
+        except ValueError as e:
+            raise DaemonIPCError(f"Malformed request: {e}") from e
+        if not isinstance(request, dict):
+            raise DaemonIPCError("Malformed request: expected an object")
+        return request
+
+    async def _run(self, request: Dict[str, Any], send, running: asyncio.Semaphore) -> None:
+        request_id = request.get("id")
+        params = request.get("params") or {}
+        try:
+            handler = getattr(self, f"_op_{request.get('op')}", None)
+            if handler is None:
+                raise DaemonIPCError(f"Unknown operation: {request.get('op')}")
+            async with running:
+                result = await asyncio.get_running_loop().run_in_executor(
+                    self._threads, handler, params
+                )
+        except asyncio.CancelledError:
+            await self._send_quietly(send, request_id, "cancelled")
+            return
+        except Exception as e:
+            await self._send_quietly(send, request_id, "error", str(e))
+            return
+        await self._send_quietly(send, request_id, "result", result)
+
+    @staticmethod
+    async def _send_quietly(send, request_id: Any, event: str, data: Any = None) -> None:
+        try:
+            await send(request_id, event, data)
+        except (ConnectionError, RuntimeError) as e:
+            logger.debug(f"Dropped response to request {request_id}: {e}")
+
+    # Operations, run on the thread pool
+
+    def _op_ping(self, params: Dict[str, Any]) -> str:
+        return "pong"
+
+    def _op_limits(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "execution_timeout": getattr(self.service.executor, "timeout", DEFAULT_TIMEOUT),
+            # Requests of one connection also share the thread pool
+            "max_inflight": min(self.max_inflight, self.worker_threads),
+            "max_pending": self.max_pending,
+        }
+
+    def _op_status(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return self.service.status()
+
+    def _op_list(self, params: Dict[str, Any]) -> list:
+        commands = self.service.db.get_all_commands(include_inactive=bool(params.get("all")))
+        return [cmd.to_dict() for cmd in commands]
+
+    def _op_execute(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        db = self.service.db
+        if params.get("command_id"):
+            command = db.get_command(params["command_id"])
+        elif params.get("command_name"):
+            command = db.get_command_by_name(params["command_name"])
+        else:
+            raise DaemonIPCError("Either command_id or command_name must be provided")
+        if command is None:
+            name = params.get("command_id") or params.get("command_name")
+            raise DaemonIPCError(f"Command '{name}' not found.")
+
+        result = self.service.executor.execute_command(command, list(params.get("args") or []))
+        db.record_execution(
+            command.id,
+            result["status"],
+            output=result.get("output"),
+            error=result.get("error"),
+            execution_time_ms=result.get("execution_time_ms"),
+        )
+        return result
@@ -11,6 +11,7 @@ from typing import Any, Dict, List, Optional
 
 import psutil
 
+from mcli.lib.log_reader import tail_lines
 from mcli.lib.logger.logger import get_logger
 
 logger = get_logger(__name__)
@@ -168,18 +169,16 @@ class ProcessContainer:
 
         try:
             if self.stdout_file and self.stdout_file.exists():
-                with open(self.stdout_file, "r") as f:
-                    content = f.read()
-                    if lines:
-                        content = "\n".join(content.split("\n")[-lines:])
-                    logs["stdout"] = content
+                if lines:
+                    logs["stdout"] = "\n".join(tail_lines(self.stdout_file, lines))
+                else:
+                    logs["stdout"] = self.stdout_file.read_text()
 
             if self.stderr_file and self.stderr_file.exists():
-                with open(self.stderr_file, "r") as f:
-                    content = f.read()
-                    if lines:
-                        content = "\n".join(content.split("\n")[-lines:])
-                    logs["stderr"] = content
+                if lines:
+                    logs["stderr"] = "\n".join(tail_lines(self.stderr_file, lines))
+                else:
+                    logs["stderr"] = self.stderr_file.read_text()
 
         except Exception as e:
             logger.error(f"Failed to read logs for process {self.info.id}: {e}")
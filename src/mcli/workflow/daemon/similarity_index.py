@@ -0,0 +1,128 @@
+"""
+Incremental similarity index for daemon commands.
+
+Backs ``CommandDatabase.find_similar_commands`` with a sparse document-term
+matrix that is updated one command at a time:
+
+- each command's term counts (unigrams and adjacent bigrams) are persisted by
+  the database in a ``command_terms`` table, so loading the index never
+  re-tokenizes commands
+- in memory, the matrix is held as postings (term -> {command id: weight}),
+  patched in place when a command is added, updated or deleted
+- a query is tokenized once and scored with one sparse dot product over the
+  postings of its own terms
+
+Weighting follows the SMART ``lnc.ltc`` scheme: documents use log term
+frequency with cosine normalization, queries additionally carry idf. Document
+weights therefore never depend on the rest of the corpus, which is what lets
+the matrix be updated one row at a time, while idf is computed at query time
+from the current document frequencies.
+
+Example:
+    >>> index = SimilarityIndex()
+    >>> index.add("1", term_counts("backup database", "snapshot"))
+    >>> index.query("database backup")
+    [('1', 0.45...)]
+"""
+
+import heapq
+import math
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+from mcli.lib.search_index import tokenize
+
+
+def term_counts(*texts: str) -> Counter:
+    """Count the unigrams and adjacent-token bigrams of ``texts``."""
+    counts: Counter = Counter()
+    for text in texts:
+        tokens = tokenize(text or "")
+        counts.update(tokens)
+        counts.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return counts
+
+
+def _document_weights(counts: Mapping[str, int]) -> Dict[str, float]:
+    """Cosine-normalized log term frequencies (``lnc``)."""
+    weights = {term: 1.0 + math.log(tf) for term, tf in counts.items() if tf > 0}
+    norm = math.sqrt(sum(w * w for w in weights.values()))
+    return {term: w / norm for term, w in weights.items()} if norm else {}
+
+
+class SimilarityIndex:
+    """In-memory sparse document-term matrix supporting per-row updates."""
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._doc_terms: Dict[str, Tuple[str, ...]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_terms
+
+    def add(self, doc_id: str, counts: Mapping[str, int]) -> None:
+        """Add a document, replacing any previous version of it."""
+        weights = _document_weights(counts)
+        with self._lock:
+            self._remove(doc_id)
+            for term, weight in weights.items():
+                self._postings.setdefault(term, {})[doc_id] = weight
+            self._doc_terms[doc_id] = tuple(weights)
+
+    def add_many(self, rows: Iterable[Tuple[str, str, int]]) -> None:
+        """Load ``(doc_id, term, tf)`` rows, as stored in ``command_terms``."""
+        documents: Dict[str, Dict[str, int]] = {}
+        for doc_id, term, tf in rows:
+            documents.setdefault(doc_id, {})[term] = tf
+        for doc_id, counts in documents.items():
+            self.add(doc_id, counts)
+
+    def remove(self, doc_id: str) -> None:
+        """Remove a document if it is indexed."""
+        with self._lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id: str) -> None:
+        for term in self._doc_terms.pop(doc_id, ()):
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+
+    def query(self, text: str, limit: int = 5) -> List[Tuple[str, float]]:
+        """Return up to ``limit`` ``(doc_id, cosine similarity)`` pairs, best first.
+
+        Only documents sharing at least one term with the query are returned.
+        """
+        counts = term_counts(text)
+        with self._lock:
+            n_docs = len(self._doc_terms)
+            weights: Dict[str, float] = {}
+            for term, tf in counts.items():
+                postings = self._postings.get(term)
+                if postings:
+                    # Smoothed idf, as in scikit-learn's TfidfVectorizer
+                    idf = math.log((1 + n_docs) / (1 + len(postings))) + 1.0
+                    weights[term] = (1.0 + math.log(tf)) * idf
+            # Query terms missing from every document still count toward its norm
+            unmatched = sum(
+                ((1.0 + math.log(tf)) * (math.log(1 + n_docs) + 1.0)) ** 2
+                for term, tf in counts.items()
+                if term not in weights
+            )
+            norm = math.sqrt(sum(w * w for w in weights.values()) + unmatched)
+            if not weights:
+                return []
+
+            scores: Dict[str, float] = {}
+            for term, weight in weights.items():
+                for doc_id, doc_weight in self._postings[term].items():
+                    scores[doc_id] = scores.get(doc_id, 0.0) + weight * doc_weight
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [(doc_id, score / norm) for doc_id, score in best]
@@ -0,0 +1,337 @@
+"""
+Pre-started Python worker interpreters for the daemon's CommandExecutor.
+
+A ``WorkerPool`` keeps a few long-lived interpreters per Python executable
+(i.e. per venv) and runs the daemon's Python commands in them, so short
+commands do not pay for interpreter startup. Workers receive jobs over their
+stdin pipe:
+
+- messages are JSON, framed with a 4-byte big-endian length prefix
+- each job runs with fresh globals, its own ``sys.argv`` and working
+  directory, and file descriptors 1 and 2 redirected to temp files, so output
+  written by C extensions and child processes is captured too
+- a worker is recycled after ``max_jobs`` jobs or once its peak RSS exceeds
+  ``max_memory_mb``, and killed (then replaced) when a job overruns its
+  timeout or the worker dies
+
+Modules imported by a job stay imported in that worker, which is what makes
+repeated commands cheap; recycling bounds how long such state lives. Workers
+exit on their own when the pipe to the daemon closes. Pools need POSIX pipes
+and ``select``; elsewhere callers run commands as separate processes.
+
+Example:
+    >>> pool = WorkerPool(sys.executable, size=2)
+    >>> pool.execute("print('hi')", cwd=tmp_dir).output
+    'hi\\n'
+    >>> pool.close()
+"""
+
+import json
+import os
+import selectors
+import struct
+import subprocess  # nosec B404
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from mcli.lib.logger.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Worker pools rely on select() over pipes
+WORKER_POOLS_SUPPORTED = os.name == "posix"
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_MAX_JOBS = 100
+DEFAULT_MAX_MEMORY_MB = 512
+DEFAULT_TIMEOUT = 30.0
+
+_HEADER = struct.Struct(">I")
+
+# Runs inside the worker interpreter, which may be any venv's Python and so
+# cannot import mcli: it only uses the standard library.
+_WORKER_SOURCE = r"""
+import json, os, struct, sys, tempfile, traceback
+try:
+    import resource
+except ImportError:
+    resource = None
+
+HEADER = struct.Struct(">I")
+channel_in = os.fdopen(os.dup(0), "rb", buffering=0)
+channel_out = os.fdopen(os.dup(1), "wb", buffering=0)
+devnull = os.open(os.devnull, os.O_RDWR)
+for fd in (0, 1, 2):
+    os.dup2(devnull, fd)
+
+
+def read_exact(size):
+    data = b""
+    while len(data) < size:
+        chunk = channel_in.read(size - len(data))
+        if not chunk:
+            os._exit(0)
+        data += chunk
+    return data
+
+
+def send(message):
+    body = json.dumps(message).encode()
+    channel_out.write(HEADER.pack(len(body)) + body)
+
+
+def peak_rss_kb():
+    if resource is None:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def run(job):
+    exit_code = 0
+    saved_argv, saved_path0, saved_cwd = sys.argv, sys.path[0], os.getcwd()
+    try:
+        os.chdir(job["cwd"])
+        sys.argv = [job["filename"]] + job["args"]
+        sys.path[0] = job["cwd"]
+        code = compile(job["code"], job["filename"], "exec")
+        exec(code, {"__name__": "__main__", "__file__": job["filename"]})
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            exit_code = e.code or 0
+        else:
+            print(e.code, file=sys.stderr)
+            exit_code = 1
+    except BaseException:
+        traceback.print_exc()
+        exit_code = 1
+    finally:
+        sys.argv, sys.path[0] = saved_argv, saved_path0
+        os.chdir(saved_cwd)
+    return exit_code
+
+
+send({"ready": True})
+while True:
+    job = json.loads(read_exact(HEADER.unpack(read_exact(HEADER.size))[0]))
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        os.dup2(out.fileno(), 1)
+        os.dup2(err.fileno(), 2)
+        try:
+            exit_code = run(job)
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(devnull, 1)
+            os.dup2(devnull, 2)
+        out.seek(0)
+        err.seek(0)
+        send(
+            {
+                "output": out.read().decode("utf-8", "replace"),
+                "error": err.read().decode("utf-8", "replace"),
+                "exit_code": exit_code,
+                "rss_kb": peak_rss_kb(),
+            }
+        )
+"""
+
+
+class WorkerError(RuntimeError):
+    """A worker interpreter died or broke the protocol."""
+
+
+@dataclass
+class WorkerResult:
+    """Outcome of one job run by a worker."""
+
+    output: str
+    error: str
+    exit_code: int
+
+
+class _Worker:
+    """One long-lived interpreter talking the framed protocol over its pipes."""
+
+    def __init__(self, python_exe: str):
+        self.process = subprocess.Popen(  # nosec B603
+            [python_exe, "-c", _WORKER_SOURCE],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=0,
+        )
+        self.jobs = 0
+        self.rss_kb = 0
+        self._ready = False
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def run(self, job: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Send a job and wait for its reply, raising TimeoutExpired on overrun."""
+        deadline = time.monotonic() + timeout
+        if not self._ready:
+            # The handshake confirms the interpreter started; startup of a
+            # cold worker counts toward the first job's timeout.
+            self._receive(deadline, job)
+            self._ready = True
+
+        body = json.dumps(job).encode()
+        try:
+            self.process.stdin.write(_HEADER.pack(len(body)) + body)
+        except (BrokenPipeError, OSError) as e:
+            raise WorkerError(f"Worker exited before accepting the job: {e}") from e
+
+        reply = self._receive(deadline, job)
+        self.jobs += 1
+        self.rss_kb = reply.get("rss_kb", 0)
+        return reply
+
+    def _receive(self, deadline: float, job: Dict[str, Any]) -> Dict[str, Any]:
+        header = self._read(_HEADER.size, deadline, job)
+        return json.loads(self._read(_HEADER.unpack(header)[0], deadline, job))
+
+    def _read(self, size: int, deadline: float, job: Dict[str, Any]) -> bytes:
+        fd = self.process.stdout.fileno()
+        data = b""
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            while len(data) < size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not selector.select(remaining):
+                    raise subprocess.TimeoutExpired(job["filename"], job["timeout"])
+                chunk = os.read(fd, size - len(data))
+                if not chunk:
+                    raise WorkerError(f"Worker exited with code {self.process.wait()}")
+                data += chunk
+        return data
+
+    def kill(self) -> None:
+        if self.alive:
+            self.process.kill()
+        self.process.wait()
+        for pipe in (self.process.stdin, self.process.stdout):
+            pipe.close()
+
+
+class WorkerPool:
+    """Pool of warm worker interpreters for one Python executable.
+
+    At most ``size`` workers exist at once; when all are busy, callers wait
+    for one to finish rather than start a cold interpreter.
+    """
+
+    def __init__(
+        self,
+        python_exe: Union[str, Path],
+        size: int = DEFAULT_POOL_SIZE,
+        max_jobs: int = DEFAULT_MAX_JOBS,
+        max_memory_mb: int = DEFAULT_MAX_MEMORY_MB,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        self.python_exe = str(python_exe)
+        self.size = max(size, 1)
+        self.max_jobs = max_jobs
+        self.max_memory_mb = max_memory_mb
+        self.timeout = timeout
+        self._idle: List[_Worker] = []
+        self._workers = 0  # idle and busy
+        self._available = threading.Condition()
+        self._closed = False
+
+    def warm(self) -> None:
+        """Start workers until the pool holds ``size`` of them."""
+        with self._available:
+            while not self._closed and self._workers < self.size:
+                self._idle.append(_Worker(self.python_exe))
+                self._workers += 1
+                self._available.notify()
+
+    def execute(
+        self,
+        code: str,
+        args: Optional[List[str]] = None,
+        cwd: Union[str, Path, None] = None,
+        filename: str = "<command>",
+        timeout: Optional[float] = None,
+    ) -> WorkerResult:
+        """Run Python source in a warm worker as if it were ``python filename args``.
+
+        Raises:
+            subprocess.TimeoutExpired: The job overran its timeout; the worker
+                is killed.
+            WorkerError: The worker died while running the job.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        job = {
+            "code": code,
+            "args": list(args or []),
+            "cwd": str(cwd or Path.cwd()),
+            "filename": filename,
+            "timeout": timeout,
+        }
+        worker = self._acquire()
+        try:
+            reply = worker.run(job, timeout)
+        except BaseException:
+            self._discard(worker)
+            raise
+
+        self._release(worker)
+        return WorkerResult(reply["output"], reply["error"], reply["exit_code"])
+
+    def _acquire(self) -> _Worker:
+        with self._available:
+            while True:
+                if self._closed:
+                    raise WorkerError("Worker pool is closed")
+                while self._idle:
+                    worker = self._idle.pop()
+                    if worker.alive:
+                        return worker
+                    worker.kill()
+                    self._workers -= 1
+                if self._workers < self.size:
+                    self._workers += 1
+                    return _Worker(self.python_exe)
+                self._available.wait()
+
+    def _release(self, worker: _Worker) -> None:
+        recycle = (
+            worker.jobs >= self.max_jobs
+            or worker.rss_kb > self.max_memory_mb * 1024
+            or not worker.alive
+        )
+        if recycle:
+            logger.debug(f"Recycling worker after {worker.jobs} jobs ({worker.rss_kb} KB)")
+            self._discard(worker)
+            return
+        with self._available:
+            if not self._closed:
+                self._idle.append(worker)
+                self._available.notify()
+                return
+            self._workers -= 1
+        worker.kill()
+
+    def _discard(self, worker: _Worker) -> None:
+        """Kill a busy worker and start its replacement."""
+        worker.kill()
+        with self._available:
+            self._workers -= 1
+        self.warm()
+
+    def close(self) -> None:
+        """Stop all idle workers; busy workers are stopped when they finish."""
+        with self._available:
+            self._closed = True
+            workers, self._idle = self._idle, []
+            self._workers -= len(workers)
+            self._available.notify_all()
+        for worker in workers:
+            worker.kill()
@@ -9,10 +9,11 @@ A robust cron-like job scheduling system with the following features:
 - Desktop file cleanup and management
 """
 
-from .cron_parser import CronExpression
+from .cron_parser import CronExpression, parse_cron
 from .job import JobStatus, ScheduledJob
 from .monitor import JobMonitor
 from .persistence import JobStorage
+from .pool import JobPool
 from .scheduler import JobScheduler
 
 __all__ = [
@@ -20,6 +21,8 @@ __all__ = [
     "ScheduledJob",
     "JobStatus",
     "CronExpression",
+    "parse_cron",
     "JobStorage",
     "JobMonitor",
+    "JobPool",
 ]
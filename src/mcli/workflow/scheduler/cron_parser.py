@@ -5,15 +5,47 @@ Supports standard cron expressions with some extensions:
 - Standard: minute hour day month weekday
 - Extensions: @yearly, @monthly, @weekly, @daily, @hourly
 - Special: @reboot (run at scheduler start)
+
+Next run times are computed field by field: the next allowed month, then day,
+hour and minute are found in the sorted allowed values, so a sparse schedule
+like ``0 3 29 2 *`` costs a handful of steps instead of a minute-by-minute
+scan. ``parse_cron`` caches parsed expressions per string, since the
+scheduler looks every job's expression up on every tick.
 """
 
+import calendar
+from bisect import bisect_left
 from datetime import datetime, timedelta
-from typing import List, Optional, Set
+from functools import lru_cache
+from typing import List, Optional, Set, Tuple
 
 from mcli.lib.logger.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Every calendar date recurs on every weekday within one 400-year Gregorian
+# cycle, so a feasible expression always fires within this many years
+MAX_SEARCH_YEARS = 400
+
+# Distinct expressions kept by parse_cron
+PARSE_CACHE_SIZE = 1024
+
+# Longest each month can be (February in leap years)
+_MONTH_MAX_DAYS = {
+    1: 31,
+    2: 29,
+    3: 31,
+    4: 30,
+    5: 31,
+    6: 30,
+    7: 31,
+    8: 31,
+    9: 30,
+    10: 31,
+    11: 30,
+    12: 31,
+}
+
 
 class CronParseError(Exception):
     """Exception raised when cron expression cannot be parsed."""
@@ -42,6 +74,9 @@ class CronExpression:
         if not self.is_reboot:
             self.fields = self._parse_expression()
             self._validate_fields()
+            minutes, hours, days, months, weekdays = (sorted(f) for f in self.fields)
+            self._minutes, self._hours, self._days, self._months = minutes, hours, days, months
+            self._weekdays = set(weekdays)
 
     def _normalize_expression(self, expression: str) -> str:
         """Convert shortcuts to standard cron format."""
@@ -131,22 +166,95 @@ class CronExpression:
             from_time = datetime.now()
 
         # Start from the next minute to avoid immediate execution
-        next_time = from_time.replace(second=0, microsecond=0) + timedelta(minutes=1)
-
-        # Search for the next valid time (with safety limit)
-        max_iterations = 366 * 24 * 60  # One year worth of minutes
-        iterations = 0
-
-        while iterations < max_iterations:
-            if self._matches_time(next_time):
-                return next_time
+        next_time = self._next_match(
+            from_time.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        )
+        if next_time is None:
+            logger.warning(f"Could not find next run time for cron expression: {self.expression}")
+        return next_time
+
+    def get_next_run_times(
+        self, count: int, from_time: Optional[datetime] = None
+    ) -> List[datetime]:
+        """The next ``count`` run times after ``from_time`` (default: now), in order."""
+        times: List[datetime] = []
+        if self.is_reboot:
+            return times
+        current = (from_time or datetime.now()).replace(second=0, microsecond=0)
+        while len(times) < count:
+            next_time = self._next_match(current + timedelta(minutes=1))
+            if next_time is None:
+                break
+            times.append(next_time)
+            current = next_time
+        return times
 
-            next_time += timedelta(minutes=1)
-            iterations += 1
+    @staticmethod
+    def _first_at_or_after(values: List[int], value: int) -> Optional[int]:
+        index = bisect_left(values, value)
+        return values[index] if index < len(values) else None
+
+    def _time_at_or_after(self, hour: int, minute: int) -> Optional[Tuple[int, int]]:
+        """Earliest allowed (hour, minute) on a day at or after ``hour:minute``."""
+        next_hour = self._first_at_or_after(self._hours, hour)
+        if next_hour == hour:
+            next_minute = self._first_at_or_after(self._minutes, minute)
+            if next_minute is not None:
+                return hour, next_minute
+            next_hour = self._first_at_or_after(self._hours, hour + 1)
+        if next_hour is None:
+            return None
+        return next_hour, self._minutes[0]
+
+    def _feasible(self) -> bool:
+        """Whether some allowed day exists in some allowed month."""
+        return any(self._days[0] <= _MONTH_MAX_DAYS[month] for month in self._months)
+
+    def _next_match(self, start: datetime) -> Optional[datetime]:
+        """Earliest matching minute at or after ``start`` (which has no seconds)."""
+        if not self._feasible():
+            return None
+        year, month, day, hour, minute = (
+            start.year,
+            start.month,
+            start.day,
+            start.hour,
+            start.minute,
+        )
+        while year <= start.year + MAX_SEARCH_YEARS:
+            next_month = self._first_at_or_after(self._months, month)
+            if next_month is None:
+                year, month, day, hour, minute = year + 1, self._months[0], 1, 0, 0
+                continue
+            if next_month != month:
+                month, day, hour, minute = next_month, 1, 0, 0
+
+            last_day = calendar.monthrange(year, month)[1]
+            for candidate in self._days[bisect_left(self._days, day) :]:
+                if candidate > last_day:
+                    break
+                if (
+                    self._cron_weekday(calendar.weekday(year, month, candidate))
+                    not in self._weekdays
+                ):
+                    continue
+                if candidate == day:
+                    at = self._time_at_or_after(hour, minute)
+                else:
+                    at = (self._hours[0], self._minutes[0])
+                if at is not None:
+                    return datetime(year, month, candidate, *at)
 
-        logger.warning(f"Could not find next run time for cron expression: {self.expression}")
+            month, day, hour, minute = month + 1, 1, 0, 0
+            if month > 12:
+                year, month = year + 1, 1
         return None
 
+    @staticmethod
+    def _cron_weekday(python_weekday: int) -> int:
+        """Convert Python's weekday (0=Monday) to cron's (0=Sunday)."""
+        return (python_weekday + 1) % 7
+
     def _matches_time(self, dt: datetime) -> bool:
         """Check if datetime matches this cron expression."""
         if self.is_reboot:
@@ -159,7 +267,7 @@ class CronExpression:
             and dt.hour in hour
             and dt.day in day
             and dt.month in month
-            and dt.weekday() + 1 % 7 in weekday  # Convert Python weekday to cron weekday
+            and self._cron_weekday(dt.weekday()) in weekday
         )
 
     def matches_now(self) -> bool:
@@ -203,10 +311,23 @@ class CronExpression:
         return f"CronExpression('{self.original_expression}')"
 
 
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_cron(expression: str) -> CronExpression:
+    """Parse ``expression``, reusing the result for repeated strings.
+
+    CronExpression objects are not modified after parsing, so one instance
+    can be shared by every job with the same schedule.
+
+    Raises:
+        CronParseError: ``expression`` is not a valid cron expression.
+    """
+    return CronExpression(expression)
+
+
 def validate_cron_expression(expression: str) -> bool:
     """Validate a cron expression without creating a full object."""
     try:
-        cron = CronExpression(expression)
+        cron = parse_cron(expression)
         return cron.is_valid()
     except Exception:
         return False
@@ -215,21 +336,7 @@ def validate_cron_expression(expression: str) -> bool:
 def get_next_run_times(expression: str, count: int = 5) -> List[datetime]:
     """Get the next N run times for a cron expression."""
     try:
-        cron = CronExpression(expression)
-        if cron.is_reboot:
-            return []
-
-        times = []
-        current_time = datetime.now()
-
-        for _ in range(count):
-            next_time = cron.get_next_run_time(current_time)
-            if next_time is None:
-                break
-            times.append(next_time)
-            current_time = next_time
-
-        return times
+        return parse_cron(expression).get_next_run_times(count)
     except Exception as e:
         logger.error(f"Error getting next run times: {e}")
         return []
@@ -0,0 +1,340 @@
+"""
+Job execution history stores for the MCLI scheduler
+
+JobStorage records finished runs and answers history queries through a
+HistoryStore backend:
+
+- SqliteHistoryStore (default): an append-only table in job_history.db in
+  WAL mode, indexed by (job_id, executed_at) and by executed_at. Records are
+  buffered and inserted in one transaction at most
+  ``SchedulerDefaults.HISTORY_FLUSH_INTERVAL`` seconds later (reads flush
+  first), and retention by count or age is an indexed delete. An existing
+  job_history.json is imported on first use and renamed to
+  job_history.json.migrated.
+- JsonHistoryStore: a single job_history.json file, capped at 1000 records.
+
+Example:
+    store = SqliteHistoryStore(Path("~/.mcli/scheduler/job_history.db"))
+    store.append({"job_id": job.id, "executed_at": now.isoformat(), "status": "completed"})
+    recent = store.query(job_id=job.id, limit=5)
+"""
+
+import atexit
+import json
+import sqlite3
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from mcli.lib.constants import SchedulerDefaults
+from mcli.lib.logger.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Records kept by the JSON store, as before
+JSON_MAX_RECORDS = 1000
+
+# Count/age retention runs after this many inserts rather than on every flush
+RETENTION_CHECK_EVERY = 1000
+
+_open_stores: "weakref.WeakSet[SqliteHistoryStore]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_stores() -> None:
+    for store in list(_open_stores):
+        try:
+            store.flush()
+        except Exception:
+            pass
+
+
+class HistoryStore(ABC):
+    """Interface for job execution history backends."""
+
+    path: Path
+
+    @abstractmethod
+    def append(self, record: Dict[str, Any]) -> None:
+        """Add one execution record (must have ``job_id`` and ``executed_at``)."""
+
+    @abstractmethod
+    def query(self, job_id: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Most recent records first, optionally for one job."""
+
+    @abstractmethod
+    def delete_before(self, cutoff: datetime) -> int:
+        """Delete records executed before ``cutoff``; returns how many."""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Number of stored records."""
+
+    @abstractmethod
+    def flush(self) -> None:
+        """Write any buffered records."""
+
+    def size_bytes(self) -> int:
+        return self.path.stat().st_size if self.path.exists() else 0
+
+
+class JsonHistoryStore(HistoryStore):
+    """History kept as one JSON document, rewritten on every change."""
+
+    def __init__(self, path: Path, max_records: int = JSON_MAX_RECORDS):
+        self.path = Path(path)
+        self.max_records = max_records
+        self.lock = threading.Lock()
+        if not self.path.exists():
+            self._write([])
+
+    def _read(self) -> List[Dict[str, Any]]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f).get("history", [])
+        except FileNotFoundError:
+            return []
+        except (OSError, json.JSONDecodeError, AttributeError) as e:
+            logger.error(f"Error reading {self.path}: {e}")
+            return []
+
+    def _write(self, history: List[Dict[str, Any]]) -> None:
+        data = {"history": history, "version": "1.0", "updated_at": datetime.now().isoformat()}
+        temp_file = self.path.with_suffix(".tmp")
+        try:
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            temp_file.replace(self.path)
+        except Exception as e:
+            logger.error(f"Error writing {self.path}: {e}")
+            temp_file.unlink(missing_ok=True)
+
+    def append(self, record: Dict[str, Any]) -> None:
+        with self.lock:
+            history = self._read()
+            history.append(record)
+            self._write(history[-self.max_records :])
+
+    def query(self, job_id: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        history = self._read()
+        if job_id:
+            history = [record for record in history if record.get("job_id") == job_id]
+        history.sort(key=lambda x: x.get("executed_at", ""), reverse=True)
+        return history[:limit]
+
+    def delete_before(self, cutoff: datetime) -> int:
+        cutoff_str = cutoff.isoformat()
+        with self.lock:
+            history = self._read()
+            kept = [record for record in history if record.get("executed_at", "") > cutoff_str]
+            if len(kept) < len(history):
+                self._write(kept)
+            return len(history) - len(kept)
+
+    def count(self) -> int:
+        return len(self._read())
+
+    def flush(self) -> None:
+        # Every change is written immediately; nothing is buffered
+        pass
+
+
+class SqliteHistoryStore(HistoryStore):
+    """Append-only, indexed history table with batched inserts."""
+
+    def __init__(
+        self,
+        path: Path,
+        legacy_json: Optional[Path] = None,
+        max_records: Optional[int] = SchedulerDefaults.HISTORY_MAX_RECORDS,
+        max_age_days: Optional[int] = SchedulerDefaults.HISTORY_RETENTION_DAYS,
+    ):
+        self.path = Path(path)
+        self.legacy_json = Path(legacy_json) if legacy_json else None
+        self.max_records = max_records
+        self.max_age_days = max_age_days
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._pending: List[tuple] = []
+        self._pending_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._inserted_since_retention = 0
+        _open_stores.add(self)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use, creating the schema and migrating JSON history."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS history (
+                    id INTEGER PRIMARY KEY,
+                    job_id TEXT NOT NULL,
+                    executed_at TEXT NOT NULL,
+                    status TEXT,
+                    record TEXT NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_history_job ON history (job_id, executed_at)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_history_time ON history (executed_at)")
+            conn.commit()
+            self._conn = conn
+            self._migrate_json(conn)
+        return self._conn
+
+    def _migrate_json(self, conn: sqlite3.Connection) -> None:
+        """Import records from the old job_history.json, then set it aside."""
+        if self.legacy_json is None or not self.legacy_json.exists():
+            return
+        try:
+            history = json.loads(self.legacy_json.read_text(encoding="utf-8")).get("history", [])
+        except (OSError, json.JSONDecodeError, AttributeError) as e:
+            logger.error(f"Cannot migrate job history from {self.legacy_json}: {e}")
+            return
+
+        rows = [_row(record) for record in history if isinstance(record, dict)]
+        rows.sort(key=lambda row: row[1])
+        try:
+            with conn:
+                conn.executemany(_INSERT_SQL, rows)
+            self.legacy_json.replace(
+                self.legacy_json.with_name(self.legacy_json.name + ".migrated")
+            )
+            logger.info(f"Migrated {len(rows)} job history records to {self.path}")
+        except (sqlite3.Error, OSError) as e:
+            logger.error(f"Failed to migrate job history from {self.legacy_json}: {e}")
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Buffer a record; it is inserted with others at most a flush interval later."""
+        with self._pending_lock:
+            self._pending.append(_row(record))
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        """Flush within the flush interval (caller holds the pending lock)."""
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(
+                SchedulerDefaults.HISTORY_FLUSH_INTERVAL, self.flush
+            )
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush(self) -> None:
+        with self._pending_lock:
+            rows, self._pending = self._pending, []
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        with self._db_lock:
+            conn = self._connect()
+            if rows:
+                try:
+                    with conn:
+                        conn.executemany(_INSERT_SQL, rows)
+                except sqlite3.Error as e:
+                    self._requeue(rows, e)
+                    return
+                self._inserted_since_retention += len(rows)
+            if self._inserted_since_retention >= RETENTION_CHECK_EVERY:
+                self._inserted_since_retention = 0
+                self._apply_retention(conn)
+
+    def _requeue(self, rows: List[tuple], error: sqlite3.Error) -> None:
+        """Put back rows whose insert failed, ahead of newer ones, for a retry."""
+        with self._pending_lock:
+            pending = rows + self._pending
+            dropped = max(len(pending) - SchedulerDefaults.HISTORY_MAX_PENDING, 0)
+            self._pending = pending[dropped:]
+            self._schedule_flush()
+        if dropped:
+            logger.error(f"Failed to record job history, dropped {dropped} runs: {error}")
+        else:
+            logger.warning(f"Failed to record {len(rows)} job runs, will retry: {error}")
+
+    def _apply_retention(self, conn: sqlite3.Connection) -> int:
+        """Delete records beyond the count and age limits (caller holds the db lock)."""
+        deleted = 0
+        with conn:
+            if self.max_age_days is not None:
+                cutoff = (datetime.now() - timedelta(days=self.max_age_days)).isoformat()
+                deleted += conn.execute(
+                    "DELETE FROM history WHERE executed_at < ?", (cutoff,)
+                ).rowcount
+            if self.max_records is not None:
+                deleted += conn.execute(
+                    "DELETE FROM history WHERE id <= "
+                    "(SELECT id FROM history ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                    (self.max_records,),
+                ).rowcount
+        return deleted
+
+    def enforce_retention(self) -> int:
+        """Apply the count and age limits now; returns the number of records deleted."""
+        self.flush()
+        with self._db_lock:
+            return self._apply_retention(self._connect())
+
+    def query(self, job_id: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        self.flush()
+        with self._db_lock:
+            conn = self._connect()
+            if job_id:
+                cursor = conn.execute(
+                    "SELECT record FROM history WHERE job_id = ? "
+                    "ORDER BY executed_at DESC, id DESC LIMIT ?",
+                    (job_id, limit),
+                )
+            else:
+                cursor = conn.execute(
+                    "SELECT record FROM history ORDER BY executed_at DESC, id DESC LIMIT ?",
+                    (limit,),
+                )
+            return [json.loads(row[0]) for row in cursor]
+
+    def delete_before(self, cutoff: datetime) -> int:
+        self.flush()
+        with self._db_lock:
+            conn = self._connect()
+            with conn:
+                return conn.execute(
+                    "DELETE FROM history WHERE executed_at < ?", (cutoff.isoformat(),)
+                ).rowcount
+
+    def count(self) -> int:
+        self.flush()
+        with self._db_lock:
+            return self._connect().execute("SELECT COUNT(*) FROM history").fetchone()[0]
+
+    def size_bytes(self) -> int:
+        wal = self.path.with_name(self.path.name + "-wal")
+        return sum(p.stat().st_size for p in (self.path, wal) if p.exists())
+
+    def close(self) -> None:
+        """Flush buffered records and close the database."""
+        self.flush()
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_INSERT_SQL = "INSERT INTO history (job_id, executed_at, status, record) VALUES (?, ?, ?, ?)"
+
+
+def _row(record: Dict[str, Any]) -> tuple:
+    return (
+        str(record.get("job_id", "")),
+        str(record.get("executed_at", "")),
+        record.get("status"),
+        json.dumps(record, ensure_ascii=False),
+    )
@@ -6,7 +6,7 @@ import json
 import uuid
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from mcli.lib.logger.logger import get_logger
 
@@ -54,6 +54,7 @@ class ScheduledJob:
         output_format: str = "json",
         notifications: Optional[Dict[str, Any]] = None,
         job_id: Optional[str] = None,
+        tags: Optional[List[str]] = None,
     ):
         self.id = job_id or str(uuid.uuid4())
         self.name = name
@@ -69,6 +70,7 @@ class ScheduledJob:
         self.working_directory = working_directory
         self.output_format = output_format
         self.notifications = notifications or {}
+        self.tags = list(tags or [])
 
         # Runtime tracking
         self.status = JobStatus.PENDING
@@ -100,6 +102,7 @@ class ScheduledJob:
             "working_directory": self.working_directory,
             "output_format": self.output_format,
             "notifications": self.notifications,
+            "tags": self.tags,
             "status": self.status.value,
             "created_at": self.created_at.isoformat(),
             "last_run": self.last_run.isoformat() if self.last_run else None,
@@ -131,6 +134,7 @@ class ScheduledJob:
             output_format=data.get("output_format", "json"),
             notifications=data.get("notifications", {}),
             job_id=data.get("id"),
+            tags=data.get("tags", []),
         )
 
         # Restore runtime state
@@ -3,7 +3,6 @@ Job monitoring and execution tracking for the MCLI scheduler
 """
 
 import threading
-import time
 from datetime import datetime
 from typing import Callable, Dict, List, Optional
 
@@ -24,6 +23,7 @@ class JobMonitor:
         self.monitor_thread: Optional[threading.Thread] = None
         self.monitoring = False
         self.lock = threading.Lock()
+        self._stop_event = threading.Event()
 
     def start_monitoring(self):
         """Start the monitoring thread."""
@@ -31,6 +31,7 @@ class JobMonitor:
             return
 
         self.monitoring = True
+        self._stop_event.clear()
         self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
         self.monitor_thread.start()
         logger.info("Job monitor started")
@@ -38,6 +39,7 @@ class JobMonitor:
     def stop_monitoring(self):
         """Stop the monitoring thread."""
         self.monitoring = False
+        self._stop_event.set()
         if self.monitor_thread:
             self.monitor_thread.join(timeout=5)
         logger.info("Job monitor stopped")
@@ -47,7 +49,7 @@ class JobMonitor:
         while self.monitoring:
             try:
                 self._check_running_jobs()
-                time.sleep(10)  # Check every 10 seconds
+                self._stop_event.wait(10)  # Check every 10 seconds
             except Exception as e:
                 logger.error(f"Error in monitor loop: {e}")
 
@@ -82,6 +84,11 @@ class JobMonitor:
             self.job_start_times[job.id] = datetime.now()
             logger.debug(f"Added job {job.id} to monitor")
 
+    def remove_job(self, job_id: str):
+        """Stop monitoring a job whose run finished."""
+        with self.lock:
+            self._remove_job(job_id)
+
     def _remove_job(self, job_id: str):
         """Remove a job from monitoring."""
         self.running_jobs.pop(job_id, None)
@@ -1,7 +1,9 @@
 """
 Job persistence and storage for the MCLI scheduler
 
-Handles saving/loading jobs to/from disk, ensuring persistence across power cycles
+Handles saving/loading jobs to/from disk, ensuring persistence across power cycles.
+Execution history goes to a pluggable HistoryStore (SQLite by default, see
+``history.py``).
 """
 
 import json
@@ -11,9 +13,11 @@ from pathlib import Path
 from typing import Optional
 
 from mcli.lib.constants.paths import DirNames
+from mcli.lib.logger.events import record_run
 from mcli.lib.logger.logger import get_logger
 
-from .job import ScheduledJob
+from .history import HistoryStore, JsonHistoryStore, SqliteHistoryStore
+from .job import JobStatus, ScheduledJob
 
 logger = get_logger(__name__)
 
@@ -21,10 +25,11 @@ logger = get_logger(__name__)
 class JobStorage:
     """Handles persistent storage of scheduled jobs."""
 
-    def __init__(self, storage_dir: Optional[str] = None):
+    def __init__(self, storage_dir: Optional[str] = None, history_backend: str = "sqlite"):
         self.storage_dir = Path(storage_dir) if storage_dir else self._get_default_storage_dir()
         self.jobs_file = self.storage_dir / "jobs.json"
         self.history_file = self.storage_dir / "job_history.json"
+        self.history_db = self.storage_dir / "job_history.db"
         self.lock = threading.Lock()
 
         # Ensure storage directory exists
@@ -33,6 +38,14 @@ class JobStorage:
         # Initialize files if they don't exist
         self._initialize_storage()
 
+        self.history: HistoryStore
+        if history_backend == "json":
+            self.history = JsonHistoryStore(self.history_file)
+        elif history_backend == "sqlite":
+            self.history = SqliteHistoryStore(self.history_db, legacy_json=self.history_file)
+        else:
+            raise ValueError(f"Unknown history backend: {history_backend}")
+
     def _get_default_storage_dir(self) -> Path:
         """Get default storage directory."""
         home = Path.home()
@@ -44,9 +57,6 @@ class JobStorage:
         if not self.jobs_file.exists():
             self._write_json_file(self.jobs_file, {"jobs": [], "version": "1.0"})
 
-        if not self.history_file.exists():
-            self._write_json_file(self.history_file, {"history": [], "version": "1.0"})
-
     def _read_json_file(self, file_path: Path) -> dict:
         """Safely read JSON file with error handling."""
         try:
@@ -156,88 +166,50 @@ class JobStorage:
 
     def record_job_execution(self, job: ScheduledJob, execution_data: dict):
         """Record job execution in history."""
-        with self.lock:
-            try:
-                history_data = self._read_json_file(self.history_file)
-                history = history_data.get("history", [])
-
-                # Create execution record
-                record = {
+        try:
+            self.history.append(
+                {
                     "job_id": job.id,
                     "job_name": job.name,
                     "executed_at": datetime.now().isoformat(),
                     "status": execution_data.get("status", "unknown"),
                     "runtime_seconds": execution_data.get("runtime_seconds", 0),
+                    "queue_wait_seconds": execution_data.get("queue_wait_seconds", 0),
                     "output": execution_data.get("output", "")[:1000],  # Limit output size
                     "error": execution_data.get("error", "")[:1000],  # Limit error size
                     "exit_code": execution_data.get("exit_code"),
                     "retries": execution_data.get("retries", 0),
                 }
-
-                history.append(record)
-
-                # Keep only last 1000 records
-                if len(history) > 1000:
-                    history = history[-1000:]
-
-                history_data = {
-                    "history": history,
-                    "version": "1.0",
-                    "updated_at": datetime.now().isoformat(),
-                }
-
-                self._write_json_file(self.history_file, history_data)
-
-            except Exception as e:
-                logger.error(f"Failed to record job execution: {e}")
+            )
+        except Exception as e:
+            logger.error(f"Failed to record job execution: {e}")
+
+        exit_code = execution_data.get("exit_code")
+        if not isinstance(exit_code, int):
+            exit_code = 0 if execution_data.get("status") == JobStatus.COMPLETED.value else 1
+        record_run(
+            job.name,
+            float(execution_data.get("runtime_seconds") or 0),
+            exit_code,
+            source="job",
+        )
 
     def get_job_history(self, job_id: Optional[str] = None, limit: int = 100) -> list[dict]:
-        """Get job execution history."""
+        """Get job execution history, most recent first."""
         try:
-            history_data = self._read_json_file(self.history_file)
-            history = history_data.get("history", [])
-
-            if job_id:
-                history = [record for record in history if record.get("job_id") == job_id]
-
-            # Return most recent records first
-            history = sorted(history, key=lambda x: x.get("executed_at", ""), reverse=True)
-
-            return history[:limit]
-
+            return self.history.query(job_id=job_id, limit=limit)
         except Exception as e:
             logger.error(f"Failed to get job history: {e}")
             return []
 
     def cleanup_old_history(self, days: int = 30):
         """Remove job history older than specified days."""
-        with self.lock:
-            try:
-                cutoff_date = datetime.now() - timedelta(days=days)
-                cutoff_str = cutoff_date.isoformat()
-
-                history_data = self._read_json_file(self.history_file)
-                history = history_data.get("history", [])
-
-                # Filter out old records
-                filtered_history = [
-                    record for record in history if record.get("executed_at", "") > cutoff_str
-                ]
-
-                removed_count = len(history) - len(filtered_history)
-
-                if removed_count > 0:
-                    history_data = {
-                        "history": filtered_history,
-                        "version": "1.0",
-                        "updated_at": datetime.now().isoformat(),
-                    }
-
-                    self._write_json_file(self.history_file, history_data)
-                    logger.info(f"Cleaned up {removed_count} old history records")
-
-            except Exception as e:
-                logger.error(f"Failed to cleanup old history: {e}")
+        try:
+            removed_count = self.history.delete_before(datetime.now() - timedelta(days=days))
+            if removed_count > 0:
+                logger.info(f"Cleaned up {removed_count} old history records")
+        except Exception as e:
+            logger.error(f"Failed to cleanup old history: {e}")
 
     def export_jobs(self, export_path: str) -> bool:
         """Export all jobs to a file."""
@@ -299,10 +271,10 @@ class JobStorage:
         """Get information about storage usage."""
         try:
             jobs_size = self.jobs_file.stat().st_size if self.jobs_file.exists() else 0
-            history_size = self.history_file.stat().st_size if self.history_file.exists() else 0
+            history_size = self.history.size_bytes()
 
             jobs_count = len(self.load_jobs())
-            history_count = len(self.get_job_history())
+            history_count = self.history.count()
 
             return {
                 "storage_dir": str(self.storage_dir),
@@ -312,7 +284,8 @@ class JobStorage:
                 "jobs_count": jobs_count,
                 "history_count": history_count,
                 "jobs_file": str(self.jobs_file),
-                "history_file": str(self.history_file),
+                "history_file": str(self.history.path),
+                "history_backend": type(self.history).__name__,
             }
 
         except Exception as e:
@@ -0,0 +1,195 @@
+"""
+Bounded execution pool for scheduled jobs
+
+JobScheduler hands every due job to a JobPool, which bounds how many runs
+(and the subprocesses they start) are active at once:
+
+- At most ``max_workers`` jobs run at once; the rest wait in a queue.
+- ``type_limits`` caps concurrent runs per JobType (by default Python jobs,
+  the CPU-heavy ones, are capped at the CPU count) and ``tag_limits`` caps
+  concurrent runs of jobs carrying a tag, e.g. ``{"db": 2}``.
+- Queued runs are kept in one FIFO lane per JobType and lanes are served
+  round-robin, so a burst of one type cannot starve the others.
+- A job is never queued twice, and the time each run waited in the queue is
+  reported to the run callback and summarised by ``stats()``.
+
+Every job type already runs its work in a subprocess or waits on I/O, so
+pool workers are threads; the limits are what keep the host from being
+saturated.
+
+Example:
+    pool = JobPool(run, max_workers=8, tag_limits={"db": 2})
+    pool.submit(job)  # run(job, wait_seconds) is called on a worker thread
+"""
+
+import os
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Optional
+
+from mcli.lib.constants import SchedulerDefaults
+from mcli.lib.logger.logger import get_logger
+
+from .job import JobType, ScheduledJob
+
+logger = get_logger(__name__)
+
+# Python jobs are the CPU-bound ones; keep them to one per core by default
+DEFAULT_TYPE_LIMITS: Dict[JobType, int] = {JobType.PYTHON: os.cpu_count() or 1}
+
+
+@dataclass
+class _Pending:
+    job: ScheduledJob
+    queued_at: float
+
+
+class JobPool:
+    """Run jobs on a bounded set of worker threads with concurrency limits."""
+
+    def __init__(
+        self,
+        run: Callable[[ScheduledJob, float], None],
+        max_workers: int = SchedulerDefaults.MAX_WORKERS,
+        type_limits: Optional[Dict[JobType, int]] = None,
+        tag_limits: Optional[Dict[str, int]] = None,
+    ):
+        self._run = run
+        self.max_workers = max(1, max_workers)
+        self.type_limits = dict(DEFAULT_TYPE_LIMITS if type_limits is None else type_limits)
+        self.tag_limits = dict(tag_limits or {})
+
+        self._cond = threading.Condition()
+        self._lanes: Dict[JobType, Deque[_Pending]] = {}
+        self._order: Deque[JobType] = deque()
+        self._queued_ids: set = set()
+        self._running_ids: set = set()
+        self._running_types: Counter = Counter()
+        self._running_tags: Counter = Counter()
+        self._workers = 0
+        self._idle = 0
+        self._open = True
+        self._waits: Deque[float] = deque(maxlen=SchedulerDefaults.WAIT_SAMPLES)
+
+    def submit(self, job: ScheduledJob) -> bool:
+        """Queue a run of ``job``; False if it is already queued or running."""
+        with self._cond:
+            if job.id in self._queued_ids or job.id in self._running_ids:
+                return False
+            self._open = True
+            lane = self._lanes.get(job.job_type)
+            if lane is None:
+                lane = self._lanes[job.job_type] = deque()
+                self._order.append(job.job_type)
+            lane.append(_Pending(job, time.monotonic()))
+            self._queued_ids.add(job.id)
+
+            # Idle workers take one queued run each; spawn for the rest. Notified
+            # workers still count as idle until they wake, so compare totals
+            if len(self._queued_ids) > self._idle and self._workers < self.max_workers:
+                self._workers += 1
+                threading.Thread(target=self._worker, name="mcli-job-worker", daemon=True).start()
+            else:
+                self._cond.notify()
+        return True
+
+    def shutdown(self):
+        """Drop queued runs and let idle workers exit; running jobs finish."""
+        with self._cond:
+            for lane in self._lanes.values():
+                for pending in lane:
+                    logger.info(f"Cancelled queued run of job {pending.job.name}")
+            self._lanes.clear()
+            self._order.clear()
+            self._queued_ids.clear()
+            self._open = False
+            self._cond.notify_all()
+
+    def is_queued(self, job_id: str) -> bool:
+        with self._cond:
+            return job_id in self._queued_ids
+
+    def is_running(self, job_id: str) -> bool:
+        with self._cond:
+            return job_id in self._running_ids
+
+    def _allowed(self, job: ScheduledJob) -> bool:
+        limit = self.type_limits.get(job.job_type)
+        if limit is not None and self._running_types[job.job_type] >= limit:
+            return False
+        return all(
+            self._running_tags[tag] < self.tag_limits[tag]
+            for tag in job.tags
+            if tag in self.tag_limits
+        )
+
+    def _pick(self) -> Optional[_Pending]:
+        """Next runnable job, taking lanes in turn (caller holds the lock)."""
+        for _ in range(len(self._order)):
+            job_type = self._order[0]
+            self._order.rotate(-1)
+            lane = self._lanes[job_type]
+            for index, pending in enumerate(lane):
+                if self._allowed(pending.job):
+                    del lane[index]
+                    if not lane:
+                        del self._lanes[job_type]
+                        self._order.remove(job_type)
+                    return pending
+        return None
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                pending = self._pick()
+                while pending is None:
+                    if not self._open:
+                        self._workers -= 1
+                        return
+                    self._idle += 1
+                    woken = self._cond.wait(SchedulerDefaults.WORKER_IDLE_SECONDS)
+                    self._idle -= 1
+                    pending = self._pick()
+                    if pending is None and not woken:
+                        self._workers -= 1
+                        return
+
+                job = pending.job
+                self._queued_ids.discard(job.id)
+                self._running_ids.add(job.id)
+                self._running_types[job.job_type] += 1
+                self._running_tags.update(job.tags)
+                wait = time.monotonic() - pending.queued_at
+                self._waits.append(wait)
+
+            try:
+                self._run(job, wait)
+            except Exception as e:
+                logger.error(f"Error running job {job.name}: {e}")
+            finally:
+                with self._cond:
+                    self._running_ids.discard(job.id)
+                    self._running_types[job.job_type] -= 1
+                    self._running_tags.subtract(job.tags)
+                    self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, running counts and recent queue-wait times."""
+        with self._cond:
+            waits = sorted(self._waits)
+            return {
+                "max_workers": self.max_workers,
+                "workers": self._workers,
+                "queued": len(self._queued_ids),
+                "running": len(self._running_ids),
+                "queued_by_type": {t.value: len(lane) for t, lane in self._lanes.items()},
+                "running_by_type": {t.value: n for t, n in self._running_types.items() if n > 0},
+                "wait_seconds": {
+                    "samples": len(waits),
+                    "avg": sum(waits) / len(waits) if waits else 0.0,
+                    "p95": waits[max(-(-95 * len(waits) // 100), 1) - 1] if waits else 0.0,
+                    "max": waits[-1] if waits else 0.0,
+                },
+            }
@@ -3,8 +3,17 @@ Main scheduler engine for MCLI cron functionality
 
 Coordinates job scheduling, execution, monitoring, and persistence.
 Provides the primary interface for the cron scheduling system.
+
+- Enabled jobs sit in a min-heap keyed by their next due time (cron run or
+  pending retry). The loop sleeps on a condition variable until the earliest
+  deadline and is woken early when a job is added, removed or updated.
+- Changed job state is marked dirty and written at most every
+  ``SchedulerDefaults.SAVE_INTERVAL_SECONDS``; an idle scheduler writes
+  nothing.
 """
 
+import heapq
+import itertools
 import json
 import os
 import signal
@@ -12,15 +21,17 @@ import subprocess
 import threading
 import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from mcli.lib.constants import SchedulerDefaults
 from mcli.lib.logger.logger import get_logger
 from mcli.lib.pyenv import PyEnvManager
 
-from .cron_parser import CronExpression
+from .cron_parser import parse_cron
 from .job import JobStatus, JobType, ScheduledJob
 from .monitor import JobMonitor
 from .persistence import JobStorage
+from .pool import JobPool
 
 logger = get_logger(__name__)
 
@@ -360,17 +371,38 @@ class JobExecutor:
 
 
 class JobScheduler:
-    """Main scheduler that coordinates all cron functionality."""
-
-    def __init__(self, storage_dir: Optional[str] = None):
+    """Main scheduler that coordinates all cron functionality.
+
+    ``max_workers``, ``type_limits`` and ``tag_limits`` bound how many jobs
+    run at once (see :class:`JobPool`).
+    """
+
+    def __init__(
+        self,
+        storage_dir: Optional[str] = None,
+        max_workers: int = SchedulerDefaults.MAX_WORKERS,
+        type_limits: Optional[Dict[JobType, int]] = None,
+        tag_limits: Optional[Dict[str, int]] = None,
+    ):
         self.storage = JobStorage(storage_dir)
         self.monitor = JobMonitor()
         self.executor = JobExecutor()
+        self.pool = JobPool(self._run_job, max_workers, type_limits, tag_limits)
 
         self.jobs: Dict[str, ScheduledJob] = {}
         self.running = False
         self.scheduler_thread: Optional[threading.Thread] = None
-        self.lock = threading.Lock()
+        self.lock = threading.RLock()
+        self._wakeup = threading.Condition(self.lock)
+
+        # (due, sequence, job_id) entries. Rescheduling a job pushes a new entry
+        # and makes the old one stale: only the sequence in _heap_seq is live.
+        self._heap: List[Tuple[datetime, int, str]] = []
+        self._heap_seq: Dict[str, int] = {}
+        self._sequence = itertools.count()
+        self._retry_at: Dict[str, datetime] = {}
+        self._dirty = False
+        self._last_save = 0.0
 
         # Load existing jobs
         self._load_jobs()
@@ -382,14 +414,29 @@ class JobScheduler:
     def _load_jobs(self):
         """Load jobs from persistent storage."""
         jobs = self.storage.load_jobs()
-        self.jobs = {job.id: job for job in jobs}
+        with self.lock:
+            self.jobs = {job.id: job for job in jobs}
+            for job in jobs:
+                self._schedule(job)
         logger.info(f"Loaded {len(self.jobs)} jobs from storage")
 
     def _save_jobs(self):
         """Save all jobs to persistent storage."""
-        jobs_list = list(self.jobs.values())
+        with self.lock:
+            self._dirty = False
+            self._last_save = time.monotonic()
+            jobs_list = list(self.jobs.values())
         self.storage.save_jobs(jobs_list)
 
+    def _save_jobs_if_dirty(self):
+        """Save jobs if any changed, at most once per save interval."""
+        with self.lock:
+            if not self._dirty:
+                return
+            if time.monotonic() - self._last_save < SchedulerDefaults.SAVE_INTERVAL_SECONDS:
+                return
+        self._save_jobs()
+
     def start(self):
         """Start the scheduler."""
         if self.running:
@@ -413,8 +460,11 @@ class JobScheduler:
         if not self.running:
             return
 
-        self.running = False
+        with self._wakeup:
+            self.running = False
+            self._wakeup.notify_all()
         self.monitor.stop_monitoring()
+        self.pool.shutdown()
 
         if self.scheduler_thread:
             self.scheduler_thread.join(timeout=10)
@@ -433,34 +483,79 @@ class JobScheduler:
         """Main scheduling loop."""
         while self.running:
             try:
-                current_time = datetime.now()
-
-                for job in list(self.jobs.values()):
-                    if not job.enabled:
-                        continue
-
-                    # Check if job should run
-                    if self._should_run_job(job, current_time):
-                        self._queue_job_execution(job)
+                for job in self._pop_due_jobs(datetime.now()):
+                    self._queue_job_execution(job)
 
-                    # Handle retries
-                    if job.should_retry():
-                        retry_time = job.get_next_retry_time()
-                        if current_time >= retry_time:
-                            job.current_retry += 1
-                            self._queue_job_execution(job)
-
-                # Update next run times
-                self._update_next_run_times()
-
-                # Save state periodically
-                self._save_jobs()
+                self._save_jobs_if_dirty()
 
-                time.sleep(30)  # Check every 30 seconds
+                with self._wakeup:
+                    if self.running:
+                        self._wakeup.wait(self._seconds_until_wakeup())
 
             except Exception as e:
                 logger.error(f"Error in scheduler loop: {e}")
-                time.sleep(60)  # Wait longer on error
+                with self._wakeup:
+                    if self.running:
+                        self._wakeup.wait(SchedulerDefaults.ERROR_BACKOFF_SECONDS)
+
+    def _seconds_until_wakeup(self) -> float:
+        """Time until the earliest deadline or pending save (caller holds the lock)."""
+        timeout = float(SchedulerDefaults.MAX_SLEEP_SECONDS)
+        if self._heap:
+            timeout = min(timeout, (self._heap[0][0] - datetime.now()).total_seconds())
+        if self._dirty:
+            next_save = self._last_save + SchedulerDefaults.SAVE_INTERVAL_SECONDS
+            timeout = min(timeout, next_save - time.monotonic())
+        return max(timeout, 0.0)
+
+    def _schedule(self, job: ScheduledJob):
+        """(Re)insert a job in the heap at its earliest deadline (caller holds the lock)."""
+        self._heap_seq.pop(job.id, None)
+        if not job.enabled or self.jobs.get(job.id) is not job:
+            return
+
+        if job.next_run is None:
+            self._update_job_next_run(job)
+        deadlines = [t for t in (job.next_run, self._retry_at.get(job.id)) if t is not None]
+        if not deadlines:
+            return  # @reboot job with no retry pending
+
+        # Drop stale entries once they outnumber the live ones
+        if len(self._heap) > 2 * len(self._heap_seq) + 64:
+            self._heap = [e for e in self._heap if self._heap_seq.get(e[2]) == e[1]]
+            heapq.heapify(self._heap)
+
+        sequence = next(self._sequence)
+        self._heap_seq[job.id] = sequence
+        heapq.heappush(self._heap, (min(deadlines), sequence, job.id))
+        self._wakeup.notify()
+
+    def _pop_due_jobs(self, current_time: datetime) -> List[ScheduledJob]:
+        """Remove due jobs from the heap, reschedule them and return those to run."""
+        due = []
+        with self.lock:
+            while self._heap and self._heap[0][0] <= current_time:
+                _, sequence, job_id = heapq.heappop(self._heap)
+                if self._heap_seq.get(job_id) != sequence:
+                    continue
+                del self._heap_seq[job_id]
+                job = self.jobs[job_id]
+
+                retry_at = self._retry_at.get(job_id)
+                if retry_at is not None and retry_at <= current_time:
+                    del self._retry_at[job_id]
+                    if job.should_retry():
+                        job.current_retry += 1
+                        due.append(job)
+                elif self._should_run_job(job, current_time):
+                    due.append(job)
+
+                # Advance past this run even if it was skipped (job still running)
+                if job.next_run is not None and job.next_run <= current_time:
+                    self._update_job_next_run(job, current_time)
+                self._dirty = True
+                self._schedule(job)
+        return due
 
     def _should_run_job(self, job: ScheduledJob, current_time: datetime) -> bool:
         """Check if a job should run at the current time."""
@@ -468,18 +563,14 @@ class JobScheduler:
             return False
 
         try:
-            cron = CronExpression(job.cron_expression)
+            cron = parse_cron(job.cron_expression)
 
             # For @reboot jobs, only run at startup
             if cron.is_reboot:
                 return False
 
             # Check if it's time to run
-            if job.next_run and current_time >= job.next_run:
-                return True
-
-            # Fallback: check if cron expression matches current time
-            return cron.matches_now()
+            return job.next_run is not None and current_time >= job.next_run
 
         except Exception as e:
             logger.error(f"Error checking job schedule for {job.name}: {e}")
@@ -487,46 +578,46 @@ class JobScheduler:
 
     def _queue_job_execution(self, job: ScheduledJob):
         """Queue a job for execution."""
+        if not self.pool.submit(job):
+            logger.debug(f"Job {job.name} is already queued or running, skipping")
 
-        def execute_job_thread():
-            try:
-                # Execute the job
-                result = self.executor.execute_job(job)
-
-                # Record execution history
-                self.storage.record_job_execution(job, result)
+    def _run_job(self, job: ScheduledJob, queue_wait: float):
+        """Run a job on a pool worker thread."""
+        self.monitor.add_job(job, threading.current_thread())
+        try:
+            # Execute the job
+            result = self.executor.execute_job(job)
+            result["queue_wait_seconds"] = round(queue_wait, 3)
 
-                # Update next run time
-                self._update_job_next_run(job)
+            # Record execution history
+            self.storage.record_job_execution(job, result)
 
-                logger.info(f"Job {job.name} completed with status: {result['status']}")
+            logger.info(f"Job {job.name} completed with status: {result['status']}")
 
-            except Exception as e:
-                logger.error(f"Error executing job {job.name}: {e}")
-                job.update_status(JobStatus.FAILED, "", str(e))
+        except Exception as e:
+            logger.error(f"Error executing job {job.name}: {e}")
+            job.update_status(JobStatus.FAILED, "", str(e))
 
-        # Execute in separate thread
-        thread = threading.Thread(target=execute_job_thread, daemon=True)
-        thread.start()
+        finally:
+            self.monitor.remove_job(job.id)
 
-        # Add to monitor
-        self.monitor.add_job(job, thread)
+        # Schedule a retry if the run failed, and persist the new state
+        with self.lock:
+            if job.should_retry():
+                self._retry_at[job.id] = job.get_next_retry_time()
+            self._dirty = True
+            self._schedule(job)
 
-    def _update_job_next_run(self, job: ScheduledJob):
+    def _update_job_next_run(self, job: ScheduledJob, from_time: Optional[datetime] = None):
         """Update job's next run time."""
         try:
-            cron = CronExpression(job.cron_expression)
+            cron = parse_cron(job.cron_expression)
             if not cron.is_reboot:
-                job.next_run = cron.get_next_run_time()
+                job.next_run = cron.get_next_run_time(from_time)
+                self._dirty = True
         except Exception as e:
             logger.error(f"Error updating next run time for {job.name}: {e}")
 
-    def _update_next_run_times(self):
-        """Update next run times for all jobs."""
-        for job in self.jobs.values():
-            if job.enabled and job.next_run is None:
-                self._update_job_next_run(job)
-
     def _execute_reboot_jobs(self):
         """Execute jobs marked with @reboot."""
         reboot_jobs = [
@@ -547,6 +638,7 @@ class JobScheduler:
             with self.lock:
                 self.jobs[job.id] = job
                 self._update_job_next_run(job)
+                self._schedule(job)
 
             self.storage.save_job(job)
             logger.info(f"Added job: {job.name}")
@@ -556,11 +648,32 @@ class JobScheduler:
             logger.error(f"Failed to add job {job.name}: {e}")
             return False
 
+    def update_job(self, job: ScheduledJob) -> bool:
+        """Replace an existing job (e.g. a new schedule or enabled flag) and reschedule it."""
+        try:
+            with self.lock:
+                if job.id not in self.jobs:
+                    return False
+                self.jobs[job.id] = job
+                self._retry_at.pop(job.id, None)
+                self._update_job_next_run(job)
+                self._schedule(job)
+
+            self.storage.save_job(job)
+            logger.info(f"Updated job: {job.name}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to update job {job.name}: {e}")
+            return False
+
     def remove_job(self, job_id: str) -> bool:
         """Remove a job from the scheduler."""
         try:
             with self.lock:
                 job = self.jobs.pop(job_id, None)
+                self._heap_seq.pop(job_id, None)
+                self._retry_at.pop(job_id, None)
 
             if job:
                 self.storage.delete_job(job_id)
@@ -607,6 +720,7 @@ class JobScheduler:
             "enabled_jobs": enabled_jobs,
             "running_jobs": running_jobs,
             "monitor_stats": self.monitor.get_monitor_stats(),
+            "executor_stats": self.pool.stats(),
             "storage_info": self.storage.get_storage_info(),
         }
 
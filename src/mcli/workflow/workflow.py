@@ -39,96 +39,94 @@ class ScopedWorkflowsGroup(click.Group):
         is_global = ctx.params.get("is_global", False)
         return get_custom_commands_dir(global_mode=is_global)
 
-    def list_commands(self, ctx):
-        """List available commands based on scope.
+    def _legacy_workflow_commands(self, ctx) -> list[dict]:
+        """Load legacy JSON command definitions that belong to the workflows group."""
+        from mcli.lib.custom_commands import get_command_manager
+
+        is_global = ctx.params.get("is_global", False)
+        manager = get_command_manager(global_mode=is_global)
+        # Accept both "workflow" and "workflows" for backward compatibility
+        return [
+            cmd_data
+            for cmd_data in manager.load_all_commands()
+            if cmd_data.get("group") in ["workflow", "workflows"] and cmd_data.get("name")
+        ]
+
+    def _command_catalog(self, ctx) -> dict[str, str]:
+        """Map every available workflow name to its description without loading any.
 
         When multiple scripts share a stem (e.g. backup.py and backup.sh),
-        emits suffixed names like backup:py and backup:sh so that tab completion
+        names are suffixed like backup:py and backup:sh so that tab completion
         offers distinct entries for each language variant.
-        """
-
-        from collections import Counter
 
+        Native scripts are resolved from the workflow index and legacy JSON
+        commands from their definitions; no script is imported or executed, so
+        help output and shell completion stay cheap for large workflow trees.
+        """
         from mcli.lib.logger.logger import get_logger
-        from mcli.lib.script_loader import LANGUAGE_TO_SUFFIX, ScriptLoader
+        from mcli.lib.script_loader import ScriptLoader
 
         logger = get_logger()
 
-        # Get scope from context
-        is_global = ctx.params.get("is_global", False)
-        workspace = ctx.params.get("workspace")
-
         # Get workflows directory
         workflows_dir = self._get_workflows_dir(ctx)
 
         if workflows_dir is None:
-            logger.warning(f"Workspace not found: {workspace}")
-            return []
+            logger.warning(f"Workspace not found: {ctx.params.get('workspace')}")
+            return {}
 
-        # Load native script commands
-        script_commands = []
+        # Native script commands
+        catalog: dict[str, str] = {}
         script_stems = set()
         if workflows_dir.exists():
             loader = ScriptLoader(workflows_dir)
-            scripts = loader.discover_scripts()
+            for name, entry in loader.command_catalog().items():
+                catalog[name] = entry.metadata.get("description", "")
+                script_stems.add(entry.path.stem)
 
-            # Count how many scripts share each stem
-            stem_counts = Counter(sp.stem for sp in scripts)
-
-            for script_path in scripts:
-                name = script_path.stem
-                try:
-                    command = loader.load_command(script_path)
-                    if command:
-                        if stem_counts[name] > 1:
-                            lang = loader.detect_language(script_path)
-                            suffix = LANGUAGE_TO_SUFFIX.get(lang, script_path.suffix.lstrip("."))
-                            script_commands.append(f"{name}:{suffix}")
-                        else:
-                            script_commands.append(name)
-                        script_stems.add(name)
-                    else:
-                        logger.debug(f"Script '{name}' could not be loaded as a command")
-                except Exception as e:
-                    logger.debug(f"Failed to load script '{name}': {e}")
-
-        # Load legacy JSON commands (for backward compatibility)
-        legacy_commands = []
+        # Legacy JSON commands (for backward compatibility)
         try:
-            from mcli.lib.custom_commands import get_command_manager
-
-            manager = get_command_manager(global_mode=is_global)
-            json_commands = manager.load_all_commands()
-
-            for cmd_data in json_commands:
-                # Accept both "workflow" and "workflows" for backward compatibility
-                if cmd_data.get("group") not in ["workflow", "workflows"]:
-                    continue
-
-                cmd_name = cmd_data.get("name")
-                # Skip if already loaded as native script
+            for cmd_data in self._legacy_workflow_commands(ctx):
+                cmd_name = cmd_data["name"]
+                # Skip if already provided by a native script
                 if cmd_name in script_stems:
                     continue
-
-                # Validate the command can be loaded
-                temp_group = click.Group()
-                language = cmd_data.get("language", "python")
-
-                try:
-                    if language == "shell":
-                        success = manager.register_shell_command_with_click(cmd_data, temp_group)
-                    else:
-                        success = manager.register_command_with_click(cmd_data, temp_group)
-
-                    if success and temp_group.commands.get(cmd_name):
-                        legacy_commands.append(cmd_name)
-                except Exception as e:
-                    logger.debug(f"Failed to load legacy workflow '{cmd_name}': {e}")
+                catalog.setdefault(cmd_name, cmd_data.get("description", ""))
         except Exception as e:
             logger.debug(f"Could not load legacy JSON commands: {e}")
 
         # Only return user-defined workflows (scripts + legacy JSON)
-        return sorted(set(script_commands + legacy_commands))
+        return dict(sorted(catalog.items()))
+
+    def list_commands(self, ctx):
+        """List available commands based on scope, from metadata only."""
+        return list(self._command_catalog(ctx))
+
+    def format_commands(self, ctx, formatter):
+        """Write the commands section of the help page without loading any workflow."""
+        catalog = self._command_catalog(ctx)
+        if not catalog:
+            return
+
+        limit = formatter.width - 6 - max(len(name) for name in catalog)
+        rows = [
+            (name, click.utils.make_default_short_help(description, limit))
+            for name, description in catalog.items()
+        ]
+        with formatter.section("Commands"):
+            formatter.write_dl(rows)
+
+    def shell_complete(self, ctx, incomplete):
+        """Complete workflow names from metadata only; options complete as usual."""
+        from click.shell_completion import CompletionItem
+
+        results = [
+            CompletionItem(name, help=description)
+            for name, description in self._command_catalog(ctx).items()
+            if name.startswith(incomplete)
+        ]
+        results.extend(click.Command.shell_complete(self, ctx, incomplete))
+        return results
 
     def get_command(self, ctx, cmd_name):
         """Get a command by name, loading from appropriate scope.
@@ -136,6 +134,7 @@ class ScopedWorkflowsGroup(click.Group):
         Supports language suffix disambiguation: 'backup:py' loads the Python
         version, 'backup:sh' loads the shell version. Bare names work when
         unambiguous; when ambiguous, a warning is shown and the first match runs.
+        Only the matching script is loaded.
         """
         from mcli.lib.constants.messages import WarningMessages
         from mcli.lib.logger.logger import get_logger
@@ -161,11 +160,7 @@ class ScopedWorkflowsGroup(click.Group):
         # Try to load as native script first
         if workflows_dir.exists():
             loader = ScriptLoader(workflows_dir)
-            matches = loader.find_scripts_by_stem(base_name)
-
-            if lang_filter:
-                # Filter to requested language
-                matches = [p for p in matches if loader.detect_language(p) == lang_filter]
+            matches = loader.resolve_command_name(cmd_name)
 
             if len(matches) == 1:
                 try:
@@ -179,7 +174,8 @@ class ScopedWorkflowsGroup(click.Group):
                 # Ambiguous — show hint, pick first
                 from mcli.lib.ui.styling import warning
 
-                suffixes = [LANGUAGE_TO_SUFFIX.get(loader.detect_language(p), "?") for p in matches]
+                indexed = loader.index.get_many(matches)
+                suffixes = [LANGUAGE_TO_SUFFIX.get(indexed[p].language, "?") for p in matches]
                 options = ", ".join(f"{base_name}:{s}" for s in suffixes)
                 warning(WarningMessages.AMBIGUOUS_COMMAND.format(name=base_name, options=options))
                 try:
@@ -196,28 +192,34 @@ class ScopedWorkflowsGroup(click.Group):
             from mcli.lib.custom_commands import get_command_manager
 
             manager = get_command_manager(global_mode=is_global)
-            commands = manager.load_all_commands()
-
-            # Find the workflow command
-            for command_data in commands:
-                # Accept both "workflow" and "workflows" for backward compatibility
-                if command_data.get("name") == lookup_name and command_data.get("group") in [
-                    "workflow",
-                    "workflows",
-                ]:
-                    # Create a temporary group to register the command
-                    temp_group = click.Group()
-                    language = command_data.get("language", "python")
-
-                    if language == "shell":
-                        manager.register_shell_command_with_click(command_data, temp_group)
-                    else:
-                        manager.register_command_with_click(command_data, temp_group)
-
-                    cmd = temp_group.commands.get(lookup_name)
-                    if cmd:
-                        logger.debug(f"Loaded legacy JSON command: {lookup_name}")
-                        return cmd
+
+            # Legacy commands are saved as <name>.json; try that file before
+            # scanning every definition in the directory.
+            command_data = None
+            candidate = manager.commands_dir / f"{lookup_name}.json"
+            if candidate.is_file():
+                command_data = manager.load_command(candidate)
+            if not command_data or command_data.get("name") != lookup_name:
+                command_data = next(
+                    (c for c in self._legacy_workflow_commands(ctx) if c["name"] == lookup_name),
+                    None,
+                )
+
+            # Accept both "workflow" and "workflows" for backward compatibility
+            if command_data and command_data.get("group") in ["workflow", "workflows"]:
+                # Create a temporary group to register the command
+                temp_group = click.Group()
+                language = command_data.get("language", "python")
+
+                if language == "shell":
+                    manager.register_shell_command_with_click(command_data, temp_group)
+                else:
+                    manager.register_command_with_click(command_data, temp_group)
+
+                cmd = temp_group.commands.get(lookup_name)
+                if cmd:
+                    logger.debug(f"Loaded legacy JSON command: {lookup_name}")
+                    return cmd
         except Exception as e:
             logger.debug(f"Could not load legacy command '{cmd_name}': {e}")
 
@@ -244,6 +244,15 @@ def test_logs_grep_basic(runner, temp_logs_dir):
             assert "Connection failed" in result.output
 
 
+def test_logs_grep_rejects_malformed_date(runner, temp_logs_dir):
+    """Test that grep reports a malformed --date instead of crashing."""
+    with patch("mcli.self.logs_cmd.get_logs_dir", return_value=temp_logs_dir):
+        result = runner.invoke(logs_group, ["grep", "x", "--date", "2025-01-01", "--days", "2"])
+        assert result.exit_code == 0
+        assert result.exception is None
+        assert "Invalid date" in result.output
+
+
 def test_logs_stream_help(runner):
     """Test that stream command has help."""
     result = runner.invoke(logs_group, ["stream", "--help"])
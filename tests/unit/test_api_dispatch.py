@@ -0,0 +1,206 @@
+"""Tests for off-loop command execution in the FastAPI layer."""
+
+import asyncio
+import inspect
+import json
+import os
+import threading
+import time
+
+import click
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from mcli.lib.api.api import ClickToAPIDecorator
+from mcli.lib.api.dispatch import EndpointDispatcher, JobStore, shutdown_executors
+
+
+@pytest.fixture(autouse=True)
+def _fresh_executors():
+    yield
+    shutdown_executors()
+
+
+def _register(app: FastAPI, path: str, func, **options) -> None:
+    decorator = ClickToAPIDecorator(endpoint_path=path, **options)
+    sig = inspect.signature(func)
+    decorator._register_endpoint(
+        app=app,
+        path=path,
+        method="POST",
+        func=func,
+        request_model=decorator._create_request_model(func, sig),
+        response_model=decorator._create_response_model(),
+        description="",
+        tags=[],
+    )
+
+
+def _client(app: FastAPI) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+async def test_slow_sync_command_does_not_block_other_endpoints():
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return "slow"
+
+    def fast(name: str):
+        return f"hello {name}"
+
+    app = FastAPI()
+    _register(app, "/slow", slow)
+    _register(app, "/fast", fast)
+
+    async with _client(app) as client:
+        slow_request = asyncio.create_task(client.post("/slow", json={}))
+        started = time.monotonic()
+        response = await client.post("/fast", json={"name": "world"})
+        assert time.monotonic() - started < 2
+        assert response.json()["result"] == "hello world"
+        assert not slow_request.done()
+
+        release.set()
+        assert (await slow_request).json()["result"] == "slow"
+
+
+async def test_async_command_is_awaited_on_the_loop():
+    loop_thread = threading.get_ident()
+
+    async def greet(name: str):
+        await asyncio.sleep(0)
+        return {"name": name, "thread": threading.get_ident()}
+
+    app = FastAPI()
+    _register(app, "/greet", greet)
+    async with _client(app) as client:
+        result = (await client.post("/greet", json={"name": "ada"})).json()
+
+    assert result["success"]
+    assert result["result"] == {"name": "ada", "thread": loop_thread}
+
+
+async def test_dedicated_pool_bounds_concurrency():
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def work():
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.pop()
+
+    dispatcher = EndpointDispatcher(work, max_workers=2)
+    await asyncio.gather(*(dispatcher({}) for _ in range(8)))
+    assert max(peak) == 2
+
+
+async def test_command_errors_are_reported_in_the_response():
+    def broken():
+        raise RuntimeError("boom")
+
+    app = FastAPI()
+    _register(app, "/broken", broken)
+    async with _client(app) as client:
+        result = (await client.post("/broken", json={})).json()
+
+    assert result["success"] is False
+    assert result["error"] == "boom"
+
+
+async def test_job_mode_answers_202_and_can_be_polled_and_streamed():
+    release = threading.Event()
+
+    def train(epochs: int = 1):
+        release.wait(5)
+        return {"epochs": epochs}
+
+    app = FastAPI()
+    _register(app, "/train", train, as_job=True)
+    async with _client(app) as client:
+        accepted = await client.post("/train", json={"epochs": 3})
+        assert accepted.status_code == 202
+        job = accepted.json()
+        assert accepted.headers["location"] == job["status_url"]
+
+        polled = (await client.get(job["status_url"])).json()
+        assert polled["status"] in ("pending", "running")
+
+        stream = asyncio.create_task(client.get(job["stream_url"]))
+        await asyncio.sleep(0.05)
+        release.set()
+        lines = [json.loads(line) for line in (await stream).text.splitlines()]
+        assert lines[-1]["status"] == "succeeded"
+        assert lines[-1]["result"] == {"epochs": 3}
+
+        polled = (await client.get(job["status_url"], params={"wait": 5})).json()
+        assert polled["status"] == "succeeded"
+        assert polled["result"] == {"epochs": 3}
+
+        assert (await client.get("/jobs/unknown")).status_code == 404
+
+
+async def test_failed_and_cancelled_jobs():
+    release = threading.Event()
+
+    def broken():
+        raise ValueError("bad input")
+
+    def stuck():
+        release.wait(5)
+
+    app = FastAPI()
+    _register(app, "/broken", broken, as_job=True)
+    _register(app, "/stuck", stuck, as_job=True)
+    async with _client(app) as client:
+        job = (await client.post("/broken", json={})).json()
+        failed = (await client.get(job["status_url"], params={"wait": 5})).json()
+        assert failed["status"] == "failed"
+        assert failed["error"] == "bad input"
+
+        job = (await client.post("/stuck", json={})).json()
+        assert (await client.delete(job["status_url"])).json()["cancelled"] is True
+        assert (await client.get(job["status_url"])).json()["status"] == "cancelled"
+        release.set()
+
+
+async def test_job_store_evicts_oldest_finished_jobs():
+    store = JobStore(max_finished=2)
+    dispatcher = EndpointDispatcher(lambda: None)
+    jobs = [store.submit("/noop", dispatcher, {}) for _ in range(3)]
+    for job in jobs:
+        await job.wait(5)
+
+    store.submit("/noop", dispatcher, {})
+    assert store.get(jobs[0].id) is None
+    assert store.get(jobs[2].id) is not None
+    assert len(store) == 3
+
+
+async def test_process_executor_runs_module_level_functions_in_another_process():
+    dispatcher = EndpointDispatcher(os.getpid, executor="process", max_workers=1)
+    assert await dispatcher({}) != os.getpid()
+
+    def local():
+        return 1
+
+    with pytest.raises(ValueError):
+        EndpointDispatcher(local, executor="process")
+    with pytest.raises(ValueError):
+        EndpointDispatcher(local, executor="fiber")
+
+
+async def test_process_executor_resolves_click_commands_by_their_callback():
+    command = click.Command("pid", callback=os.getpid)
+    dispatcher = EndpointDispatcher(command, executor="process", max_workers=1)
+    assert dispatcher._reference == (os.getpid.__module__, "getpid")
+    assert await dispatcher({}) != os.getpid()
+
+    with pytest.raises(ValueError):
+        EndpointDispatcher(click.Command("empty"), executor="process")
@@ -0,0 +1,116 @@
+"""Tests for vectorized top-k similarity in CachedTfIdfVectorizer."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+
+from mcli.lib.search.cached_vectorizer import CachedTfIdfVectorizer  # noqa: E402
+
+DOCUMENTS = [
+    "backup the production database nightly",
+    "deploy the web application to staging",
+    "restore database from backup archive",
+    "rotate application logs",
+    "deploy database migrations",
+]
+
+
+async def _vectorizer() -> CachedTfIdfVectorizer:
+    vectorizer = CachedTfIdfVectorizer(use_rust=False)
+    await vectorizer._init_vectorizer()  # No Redis: caching stays disabled
+    await vectorizer.fit_transform(DOCUMENTS)
+    return vectorizer
+
+
+def _expected(vectorizer, query: str, top_k: int) -> list[int]:
+    docs = vectorizer.vectorizer.transform(DOCUMENTS).toarray()
+    q = vectorizer.vectorizer.transform([query]).toarray()[0]
+    sims = [vectorizer._cosine_similarity(q, d) for d in docs]
+    return sorted(range(len(sims)), key=lambda i: sims[i], reverse=True)[:top_k]
+
+
+async def test_similarity_search_matches_cosine_ranking():
+    vectorizer = await _vectorizer()
+
+    results = await vectorizer.similarity_search("database backup", DOCUMENTS, top_k=3)
+
+    assert [i for i, _ in results] == _expected(vectorizer, "database backup", 3)
+    assert all(isinstance(i, int) and isinstance(s, float) for i, s in results)
+    assert results[0][1] == pytest.approx(max(s for _, s in results))
+
+
+async def test_batch_search_reuses_document_matrix(monkeypatch):
+    vectorizer = await _vectorizer()
+    transformed: list[int] = []
+    original = vectorizer.vectorizer.transform
+
+    def counting_transform(texts):
+        transformed.append(len(texts))
+        return original(texts)
+
+    monkeypatch.setattr(vectorizer.vectorizer, "transform", counting_transform)
+
+    queries = ["deploy", "database backup", "logs"]
+    results = await vectorizer.batch_similarity_search(queries, DOCUMENTS, top_k=2)
+
+    # One transform of the query batch; the fitted corpus matrix is reused.
+    assert transformed == [len(queries)]
+    assert [[i for i, _ in r] for r in results] == [_expected(vectorizer, q, 2) for q in queries]
+
+
+def test_top_k_breaks_ties_by_document_order():
+    similarities = np.array([0.1, 0.5, 0.5, 0.9, 0.5, 0.0])
+
+    assert CachedTfIdfVectorizer._top_k(similarities, 3) == [(3, 0.9), (1, 0.5), (2, 0.5)]
+    assert len(CachedTfIdfVectorizer._top_k(similarities, 10)) == 6
+    assert CachedTfIdfVectorizer._top_k(similarities, 0) == []
+
+
+async def test_cache_hits_do_not_rehash_the_corpus(monkeypatch):
+    vectorizer = await _vectorizer()
+    first = await vectorizer.similarity_search("deploy", DOCUMENTS, top_k=2)
+    fingerprint = vectorizer.corpus_fingerprint
+
+    digests: list[str] = []
+    original = CachedTfIdfVectorizer._digest
+    monkeypatch.setattr(
+        CachedTfIdfVectorizer, "_digest", staticmethod(lambda d: digests.append(d) or original(d))
+    )
+
+    # Served from the in-process tier without touching the corpus hashes.
+    assert await vectorizer.similarity_search("deploy", list(DOCUMENTS), top_k=2) == first
+    assert vectorizer.cache_hits == 1
+    assert digests == []
+
+    # A changed corpus only hashes the new document and changes the fingerprint.
+    await vectorizer.similarity_search("deploy", DOCUMENTS + ["deploy docs site"], top_k=2)
+    assert digests == ["deploy docs site"]
+    assert vectorizer.corpus_fingerprint != fingerprint
+
+
+async def test_add_and_remove_documents_update_fingerprint_and_matrix():
+    vectorizer = await _vectorizer()
+    original = vectorizer.corpus_fingerprint
+
+    vectorizer.add_documents(["nightly migrations"])
+    assert vectorizer.corpus == DOCUMENTS + ["nightly migrations"]
+    results = await vectorizer.similarity_search("nightly migrations", vectorizer.corpus, top_k=1)
+    assert results[0][0] == len(DOCUMENTS)
+
+    assert vectorizer.remove_documents([len(DOCUMENTS)]) == original
+    results = await vectorizer.similarity_search("rotate logs", vectorizer.corpus, top_k=1)
+    assert results[0][0] == 3
+
+
+async def test_local_cache_is_bounded_lru():
+    vectorizer = CachedTfIdfVectorizer(use_rust=False, local_cache_size=2)
+    await vectorizer._cache_result("tfidf:a", 1)
+    await vectorizer._cache_result("tfidf:b", 2)
+    assert await vectorizer._get_from_cache("tfidf:a") == 1
+    await vectorizer._cache_result("tfidf:c", 3)
+
+    assert await vectorizer._get_from_cache("tfidf:b") is None
+    assert await vectorizer._get_from_cache("tfidf:a") == 1
+    await vectorizer.clear_cache("c")
+    assert await vectorizer._get_from_cache("tfidf:c") is None
@@ -0,0 +1,123 @@
+"""Tests for the compiled-code cache used by in-process Python workflows."""
+
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from mcli.lib.code_cache import CodeCache
+from mcli.lib.constants import DirNames
+from mcli.lib.script_loader import ScriptLoader
+
+SCRIPT = """#!/usr/bin/env python3
+import click
+
+
+@click.command()
+def greet():
+    click.echo("{message}")
+"""
+
+
+@pytest.fixture(autouse=True)
+def write_bytecode(monkeypatch):
+    """Enable cache writes even when PYTHONDONTWRITEBYTECODE is set for the test run."""
+    monkeypatch.setattr(sys, "dont_write_bytecode", False)
+
+
+def _write(path, message):
+    path.write_text(SCRIPT.format(message=message))
+    # Outside the index's racy-timestamp window, as a real edit would be
+    past = time.time() - 60
+    os.utime(path, (past, past))
+
+
+def _run(loader, script):
+    cmd = loader.load_command(script)
+    return CliRunner().invoke(cmd, []).output.strip()
+
+
+def test_second_load_skips_compilation(tmp_path):
+    script = tmp_path / "greet.py"
+    _write(script, "hello")
+
+    assert _run(ScriptLoader(tmp_path), script) == "hello"
+    entries = list((tmp_path / DirNames.WORKFLOW_CODE_CACHE).glob("greet.py-*"))
+    assert len(entries) == 1
+
+    with patch("mcli.lib.script_loader.compile", create=True) as mock_compile:
+        assert _run(ScriptLoader(tmp_path), script) == "hello"
+    mock_compile.assert_not_called()
+
+
+def test_cache_records_command_signature(tmp_path):
+    script = tmp_path / "greet.py"
+    _write(script, "hello")
+    loader = ScriptLoader(tmp_path)
+    loader.load_command(script)
+
+    content_hash = loader.get_indexed_script(script).content_hash
+    _code, header = loader.code_cache.get("greet.py", content_hash)
+
+    assert header["signature"] == {"attr": "greet", "name": "greet"}
+
+
+def test_edit_invalidates_and_replaces_entry(tmp_path):
+    script = tmp_path / "greet.py"
+    _write(script, "hello")
+    _run(ScriptLoader(tmp_path), script)
+
+    _write(script, "goodbye")
+    assert _run(ScriptLoader(tmp_path), script) == "goodbye"
+
+    # Only the entry for the current content is kept
+    entries = list((tmp_path / DirNames.WORKFLOW_CODE_CACHE).glob("greet.py-*"))
+    assert len(entries) == 1
+
+
+def test_corrupt_entry_is_ignored(tmp_path):
+    script = tmp_path / "greet.py"
+    _write(script, "hello")
+    _run(ScriptLoader(tmp_path), script)
+
+    (entry,) = (tmp_path / DirNames.WORKFLOW_CODE_CACHE).glob("greet.py-*")
+    entry.write_bytes(b"garbage")
+
+    assert _run(ScriptLoader(tmp_path), script) == "hello"
+
+
+def test_dont_write_bytecode_is_honored(tmp_path, monkeypatch):
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+    script = tmp_path / "greet.py"
+    _write(script, "hello")
+
+    assert _run(ScriptLoader(tmp_path), script) == "hello"
+    assert not (tmp_path / DirNames.WORKFLOW_CODE_CACHE).exists()
+
+
+def test_similar_names_do_not_evict_each_other(tmp_path):
+    cache = CodeCache(tmp_path)
+    code = compile("x = 1", "<test>", "exec")
+
+    cache.put("a.py", "sha256:" + "1" * 64, code)
+    cache.put("a.py-b.py", "sha256:" + "2" * 64, code)
+    cache.put("a.py", "sha256:" + "3" * 64, code)
+
+    assert cache.get("a.py-b.py", "sha256:" + "2" * 64) is not None
+    assert cache.get("a.py", "sha256:" + "1" * 64) is None
+    assert cache.get("a.py", "sha256:" + "3" * 64) is not None
+
+
+def test_nested_and_flattened_paths_do_not_collide(tmp_path):
+    cache = CodeCache(tmp_path)
+    code = compile("x = 1", "<test>", "exec")
+
+    cache.put("a/b.py", "sha256:" + "1" * 64, code)
+    cache.put("a__b.py", "sha256:" + "2" * 64, code)
+    cache.put("a/b.py", "sha256:" + "3" * 64, code)
+
+    assert cache.get("a__b.py", "sha256:" + "2" * 64) is not None
+    assert cache.get("a/b.py", "sha256:" + "3" * 64) is not None
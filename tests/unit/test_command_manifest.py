@@ -0,0 +1,122 @@
+"""Tests for the persistent top-level command manifest."""
+
+import json
+import sys
+
+import pytest
+from click.testing import CliRunner
+
+from mcli.app.command_manifest import build_manifest, load_manifest
+from mcli.app.main import LazyCommand, LazyGroup, OrderedGroup
+
+MODULE = '''
+import click
+
+
+@click.command()
+@click.option("--name", default="World", help="Who to greet")
+def hello(name):
+    """Say hello."""
+    click.echo(f"Hello {name}")
+
+
+@click.group()
+def tools():
+    """Assorted tools."""
+
+
+@tools.command()
+def ping():
+    click.echo("pong")
+'''
+
+
+@pytest.fixture
+def command_module(tmp_path, monkeypatch):
+    """A throwaway command module importable as `manifest_fixture_cmds`."""
+    (tmp_path / "manifest_fixture_cmds.py").write_text(MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    sys.modules.pop("manifest_fixture_cmds", None)
+    yield "manifest_fixture_cmds"
+    sys.modules.pop("manifest_fixture_cmds", None)
+
+
+@pytest.fixture
+def commands(command_module):
+    return [
+        ("hello", f"{command_module}.hello"),
+        ("tools", f"{command_module}.tools"),
+        ("missing", "manifest_fixture_does_not_exist.cmd"),
+    ]
+
+
+def _app_from(manifest) -> OrderedGroup:
+    app = OrderedGroup(name="mcli")
+    for entry in manifest["commands"]:
+        stub_cls = LazyGroup if entry["is_group"] else LazyCommand
+        app.add_command(
+            stub_cls(
+                entry["name"],
+                entry["import_path"],
+                help=entry["help"],
+                short_help=entry["short_help"],
+            )
+        )
+    return app
+
+
+def test_build_manifest_describes_commands(commands):
+    manifest = build_manifest(commands)
+    entries = {e["name"]: e for e in manifest["commands"]}
+
+    # Unimportable commands are skipped, like with eager registration
+    assert set(entries) == {"hello", "tools"}
+    assert entries["hello"]["is_group"] is False
+    assert entries["hello"]["short_help"] == "Say hello."
+    assert entries["hello"]["params"][0]["opts"] == ["--name"]
+    assert entries["tools"]["is_group"] is True
+    assert entries["tools"]["subcommands"] == ["ping"]
+
+
+def test_load_manifest_reuses_cache_until_key_changes(commands, tmp_path):
+    path = tmp_path / "manifest.json"
+    first = load_manifest(commands, path)
+    assert json.loads(path.read_text()) == first
+
+    # A matching key is served from disk without rebuilding.
+    cached = dict(first, commands=[dict(first["commands"][0], help="from cache")])
+    path.write_text(json.dumps(cached))
+    assert load_manifest(commands, path)["commands"][0]["help"] == "from cache"
+
+    # A different key (e.g. a new package version) forces a rebuild.
+    stale = dict(cached, key=dict(cached["key"], version="0.0.0"))
+    path.write_text(json.dumps(stale))
+    assert load_manifest(commands, path)["commands"][0]["help"] != "from cache"
+
+
+def test_help_does_not_import_command_modules(commands, command_module):
+    manifest = build_manifest(commands)
+    sys.modules.pop(command_module)
+
+    result = CliRunner().invoke(_app_from(manifest), ["--help"])
+
+    assert result.exit_code == 0
+    assert "Say hello." in result.output
+    assert "Assorted tools." in result.output
+    assert command_module not in sys.modules
+
+
+def test_dispatch_loads_real_command(commands, command_module):
+    manifest = build_manifest(commands)
+    sys.modules.pop(command_module)
+    app = _app_from(manifest)
+
+    result = CliRunner().invoke(app, ["hello", "--name", "mcli"])
+    assert result.exit_code == 0
+    assert "Hello mcli" in result.output
+    assert command_module in sys.modules
+    assert not isinstance(app.commands["hello"], LazyCommand)
+
+    result = CliRunner().invoke(app, ["tools", "ping"])
+    assert result.exit_code == 0
+    assert "pong" in result.output
@@ -0,0 +1,197 @@
+"""Tests for the daemon's pooled SQLite CommandDatabase."""
+
+import sqlite3
+import threading
+
+from mcli.workflow.daemon import daemon
+from mcli.workflow.daemon.daemon import Command, CommandDatabase
+
+
+def _command(cid: str, name: str, description: str, language: str = "python", tags=None):
+    return Command(
+        id=cid,
+        name=name,
+        description=description,
+        code="print('hi')",
+        language=language,
+        tags=tags or [],
+    )
+
+
+def _db(tmp_path) -> CommandDatabase:
+    db = CommandDatabase(db_path=tmp_path / "commands.db")
+    db.add_command(_command("1", "backup", "snapshot the database", tags=["storage"]))
+    db.add_command(_command("2", "deploy", "ship a release", language="shell"))
+    db.add_command(_command("3", "cleanup", "remove old backup archives"))
+    return db
+
+
+def test_crud_round_trip(tmp_path):
+    db = _db(tmp_path)
+
+    cmd = db.get_command("2")
+    assert cmd.name == "deploy" and cmd.language == "shell"
+    assert [c.name for c in db.get_all_commands()] == ["backup", "cleanup", "deploy"]
+
+    cmd.description = "roll out a release"
+    assert db.update_command(cmd)
+    assert db.get_command("2").description == "roll out a release"
+
+    assert db.delete_command("3")
+    assert [c.name for c in db.get_all_commands()] == ["backup", "deploy"]
+    assert len(db.get_all_commands(include_inactive=True)) == 3
+    assert not db.update_command(_command("missing", "x", "y"))
+    db.close()
+
+
+def test_missed_update_releases_the_write_lock(tmp_path):
+    db = _db(tmp_path)
+    assert not db.update_command(_command("missing", "x", "y"))
+
+    other = sqlite3.connect(str(db.db_path), timeout=0.1)
+    other.execute("UPDATE commands SET description = 'changed' WHERE id = '1'")
+    other.commit()
+    other.close()
+    db.close()
+
+
+def test_search_uses_fts_with_prefixes(tmp_path):
+    db = _db(tmp_path)
+    assert db.has_fts
+
+    assert [c.name for c in db.search_commands("backup")] == ["backup", "cleanup"]
+    assert [c.name for c in db.search_commands("snap datab")] == ["backup"]
+    assert [c.name for c in db.search_commands("shell")] == ["deploy"]
+    assert [c.name for c in db.search_commands("storage")] == ["backup"]
+
+    # Updates and deletes keep the index in sync
+    cmd = db.get_command("2")
+    cmd.description = "publish artifacts"
+    db.update_command(cmd)
+    db.delete_command("3")
+    assert db.search_commands("release") == []
+    assert [c.name for c in db.search_commands("publish")] == ["deploy"]
+    assert [c.name for c in db.search_commands("backup")] == ["backup"]
+    db.close()
+
+
+def test_executions_are_batched_and_flushed_on_read(tmp_path):
+    db = _db(tmp_path)
+    for _ in range(3):
+        db.record_execution("1", "completed", output="ok", execution_time_ms=5)
+
+    with sqlite3.connect(tmp_path / "commands.db") as raw:
+        assert raw.execute("SELECT COUNT(*) FROM executions").fetchone()[0] == 0
+
+    cmd = db.get_command("1")
+    assert cmd.execution_count == 3
+    assert cmd.last_executed is not None
+    with sqlite3.connect(tmp_path / "commands.db") as raw:
+        assert raw.execute("SELECT COUNT(*) FROM executions").fetchone()[0] == 3
+    db.close()
+
+
+def test_failed_execution_writes_are_retried(tmp_path, monkeypatch):
+    db = _db(tmp_path)
+    db.record_execution("1", "completed")
+    monkeypatch.setattr(daemon, "_INSERT_EXECUTION_SQL", "INSERT INTO no_such_table VALUES (?)")
+    db.flush_executions()
+    db.record_execution("1", "failed")
+    monkeypatch.undo()
+
+    assert db.get_command("1").execution_count == 2
+    with sqlite3.connect(tmp_path / "commands.db") as raw:
+        assert raw.execute("SELECT COUNT(*) FROM executions").fetchone()[0] == 2
+    db.close()
+
+
+def test_retried_executions_are_bounded(tmp_path, monkeypatch):
+    db = _db(tmp_path)
+    monkeypatch.setattr(daemon, "MAX_PENDING_EXECUTIONS", 2)
+    monkeypatch.setattr(daemon, "_INSERT_EXECUTION_SQL", "INSERT INTO no_such_table VALUES (?)")
+    for status in ("a", "b", "c"):
+        db.record_execution("1", status)
+    db.flush_executions()
+
+    assert [record[3] for record in db._pending_executions] == ["b", "c"]
+    db._pending_executions.clear()
+    db.close()
+
+
+def test_connections_are_reused(tmp_path, monkeypatch):
+    db = CommandDatabase(db_path=tmp_path / "commands.db")
+    opened = []
+    original = db._connect
+    monkeypatch.setattr(db, "_connect", lambda: opened.append(1) or original())
+
+    db.add_command(_command("1", "backup", "snapshot"))
+    for _ in range(10):
+        db.get_command("1")
+        db.search_commands("backup")
+
+    assert len(opened) == 1
+    assert not (tmp_path / "unused.db").exists()
+    CommandDatabase(db_path=tmp_path / "unused.db")
+    assert not (tmp_path / "unused.db").exists()
+    db.close()
+
+
+def test_similar_commands_rank_by_cosine_similarity(tmp_path):
+    db = _db(tmp_path)
+
+    results = db.find_similar_commands("backup the database", limit=5)
+
+    assert [c.name for c, _ in results] == ["backup", "cleanup"]
+    assert 1.0 >= results[0][1] > results[1][1] > 0
+    assert db.find_similar_commands("zzz") == []
+    assert len(db.find_similar_commands("backup", limit=1)) == 1
+    db.close()
+
+
+def test_similarity_index_is_patched_and_persisted(tmp_path, monkeypatch):
+    db = _db(tmp_path)
+    db.find_similar_commands("backup")
+
+    db.add_command(_command("4", "archive", "compress logs nightly"))
+    cmd = db.get_command("2")
+    cmd.description = "backup before release"
+    db.update_command(cmd)
+    db.delete_command("3")
+    assert {c.name for c, _ in db.find_similar_commands("backup")} == {"backup", "deploy"}
+    assert [c.name for c, _ in db.find_similar_commands("compress logs")] == ["archive"]
+    db.close()
+
+    # A fresh database loads the stored matrix; only the query is tokenized.
+    import mcli.workflow.daemon.similarity_index as similarity_index
+
+    tokenized = []
+    original = similarity_index.term_counts
+    monkeypatch.setattr(
+        similarity_index, "term_counts", lambda *t: tokenized.append(t) or original(*t)
+    )
+    reopened = CommandDatabase(db_path=tmp_path / "commands.db")
+    assert {c.name for c, _ in reopened.find_similar_commands("backup")} == {"backup", "deploy"}
+    assert tokenized == [("backup",)]
+    reopened.close()
+
+
+def test_command_added_while_the_index_loads_is_indexed(tmp_path, monkeypatch):
+    db = _db(tmp_path)
+    writers = []
+    original = daemon.SimilarityIndex.add_many
+
+    def add_many(index, rows):
+        original(index, rows)
+        # Another thread commits a command after the terms were read
+        writer = threading.Thread(
+            target=db.add_command, args=(_command("4", "archive", "compress logs"),)
+        )
+        writer.start()
+        writer.join(0.2)
+        writers.append(writer)
+
+    monkeypatch.setattr(daemon.SimilarityIndex, "add_many", add_many)
+    db.find_similar_commands("backup")
+    writers[0].join(5)
+    assert [c.name for c, _ in db.find_similar_commands("compress")] == ["archive"]
+    db.close()
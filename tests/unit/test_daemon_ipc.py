@@ -0,0 +1,187 @@
+"""Tests for the daemon's Unix socket front-end."""
+
+import asyncio
+import socket
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from mcli.lib.api.daemon_client import APIDaemonClient, DaemonClientConfig
+from mcli.lib.api.daemon_client_local import LocalDaemonClient
+from mcli.lib.api.daemon_ipc import (
+    FALLBACK_LIMITS,
+    DaemonIPCClient,
+    DaemonIPCError,
+    DaemonIPCResponseError,
+    response_timeout_for,
+)
+from mcli.workflow.daemon import worker_pool
+from mcli.workflow.daemon.daemon import Command, CommandDatabase
+from mcli.workflow.daemon.ipc_server import (
+    DEFAULT_MAX_INFLIGHT,
+    DEFAULT_MAX_PENDING,
+    DaemonIPCServer,
+)
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+
+class _Executor:
+    """Runs commands instantly, except ``slow`` which waits for ``release``."""
+
+    timeout = 1.5
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.started: list = []
+
+    def execute_command(self, command, args):
+        self.started.append(command.name)
+        if command.name == "slow":
+            self.release.wait(10)
+        return {
+            "success": True,
+            "output": f"{command.name} {' '.join(args)}",
+            "status": "completed",
+        }
+
+
+class _Service:
+    def __init__(self, db, executor):
+        self.db = db
+        self.executor = executor
+
+    def status(self):
+        return {"running": True}
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    db = CommandDatabase(db_path=tmp_path / "commands.db")
+    for name in ("fast", "slow"):
+        db.add_command(Command(id=name, name=name, description="", code="", language="python"))
+    service = _Service(db, _Executor())
+
+    # Unix socket paths are limited to ~100 bytes, so keep it short
+    socket_path = Path(tempfile.mkdtemp(prefix="mcli")) / "d.sock"
+    server = DaemonIPCServer(service, socket_path, max_inflight=2, max_pending=4)
+    loop = asyncio.new_event_loop()
+    stop = asyncio.Event()
+    thread = threading.Thread(target=loop.run_until_complete, args=(server.serve_until(stop),))
+    thread.start()
+    while not socket_path.is_socket():
+        time.sleep(0.01)
+
+    yield service, socket_path
+
+    service.executor.release.set()
+    loop.call_soon_threadsafe(stop.set)
+    thread.join(5)
+    loop.close()
+    db.close()
+    assert not socket_path.exists()
+
+
+def test_requests_round_trip(daemon):
+    service, socket_path = daemon
+    with DaemonIPCClient(socket_path) as client:
+        assert client.request("ping") == "pong"
+        assert client.status() == {"running": True}
+        assert [c["name"] for c in client.list_commands()] == ["fast", "slow"]
+
+        result = client.execute_command(command_name="fast", args=["a", "b"])
+        assert result["output"] == "fast a b"
+        with pytest.raises(DaemonIPCError, match="not found"):
+            client.execute_command(command_name="missing")
+
+    assert service.db.get_command("fast").execution_count == 1
+
+
+def test_pipelined_responses_arrive_as_requests_finish(daemon):
+    service, socket_path = daemon
+    with DaemonIPCClient(socket_path) as client:
+        slow = client.submit("execute", command_name="slow")
+        fast = client.submit("execute", command_name="fast")
+
+        assert client.result(fast)["output"] == "fast "
+        assert client.cancel(slow)
+        assert [e["event"] for e in client.events(slow)] == ["cancelled"]
+        assert not client.cancel(slow)
+
+
+def test_requests_wait_for_a_running_slot_and_can_be_cancelled(daemon):
+    service, socket_path = daemon
+    with DaemonIPCClient(socket_path) as client:
+        slow = [client.submit("execute", command_name="slow") for _ in range(3)]
+        fast = client.submit("execute", command_name="fast")
+        time.sleep(0.2)
+
+        # Only two run at once; the others wait for a slot
+        assert service.executor.started == ["slow", "slow"]
+
+        # A queued request is cancelled before it ever runs
+        assert client.cancel(slow[2])
+        with pytest.raises(DaemonIPCError, match="cancelled"):
+            client.result(slow[2])
+
+        service.executor.release.set()
+        assert client.result(fast)["success"]
+        assert [client.result(i)["success"] for i in slow[:2]] == [True, True]
+    assert service.executor.started == ["slow", "slow", "fast"]
+
+
+def test_api_client_prefers_the_socket(daemon):
+    _, socket_path = daemon
+    config = DaemonClientConfig(port=1, retry_attempts=1, socket_path=str(socket_path))
+    client = APIDaemonClient(config)
+
+    assert client.is_running()
+    assert client.execute_command(command_name="fast")["success"]
+    assert client.execute_command(command_name="missing") == {
+        "success": False,
+        "error": "Command 'missing' not found.",
+    }
+
+
+def test_response_timeout_follows_the_daemon_limits(daemon, monkeypatch):
+    _, socket_path = daemon
+    with DaemonIPCClient(socket_path) as client:
+        assert client.request("ping") == "pong"
+        # 4 pending requests run 2 at a time: wait two rounds, then run
+        assert client._sock.gettimeout() == 1.5 * 3
+
+    monkeypatch.delattr(DaemonIPCServer, "_op_limits")
+    with DaemonIPCClient(socket_path) as client:
+        assert client.request("ping") == "pong"
+        assert client._sock.gettimeout() == response_timeout_for(FALLBACK_LIMITS)
+
+
+def test_fallback_limits_mirror_the_daemon_defaults():
+    assert FALLBACK_LIMITS == {
+        "execution_timeout": worker_pool.DEFAULT_TIMEOUT,
+        "max_inflight": DEFAULT_MAX_INFLIGHT,
+        "max_pending": DEFAULT_MAX_PENDING,
+    }
+
+
+def test_lost_response_is_not_retried_elsewhere(daemon, monkeypatch):
+    _, socket_path = daemon
+    with DaemonIPCClient(socket_path, response_timeout=0.2) as client:
+        with pytest.raises(DaemonIPCResponseError):
+            client.execute_command(command_name="slow")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("command was re-sent")
+
+    api = APIDaemonClient(DaemonClientConfig(port=1, socket_path=str(socket_path)))
+    api._ipc = DaemonIPCClient(socket_path, response_timeout=0.2)
+    monkeypatch.setattr(api, "_make_request", fail)
+    assert not api.execute_command(command_name="slow")["success"]
+
+    local = LocalDaemonClient(str(socket_path))
+    local._ipc = DaemonIPCClient(socket_path, response_timeout=0.2)
+    monkeypatch.setattr("mcli.lib.api.daemon_client_local.subprocess.run", fail)
+    assert not local.execute_command("slow")["success"]
@@ -0,0 +1,129 @@
+"""Tests for cached daemon routing in ``daemon_decorator``."""
+
+import socket
+
+import pytest
+
+from mcli.lib.api import daemon_client, daemon_decorator
+from mcli.lib.api.daemon_client import (
+    APIDaemonClient,
+    DaemonClientConfig,
+    DaemonUnavailableError,
+    get_daemon_client,
+)
+from mcli.lib.api.daemon_decorator import (
+    _is_daemon_routing_enabled,
+    daemon_command,
+    get_routing_stats,
+    reset_routing_stats,
+)
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    path = tmp_path / "config.toml"
+    monkeypatch.setattr(daemon_client, "CONFIG_PATHS", [path])
+    monkeypatch.setattr(daemon_client, "_config_signature", None)
+    monkeypatch.setattr(daemon_client, "_config_checked_at", float("-inf"))
+    monkeypatch.setattr(daemon_client, "_shared_client", None)
+    monkeypatch.delenv("MCLI_DAEMON_ROUTING", raising=False)
+    reset_routing_stats()
+    return path
+
+
+def _unused_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_routing_config_is_parsed_once_until_it_changes(config_file, monkeypatch):
+    config_file.write_text("[api_daemon]\nenabled = false\n")
+    reads = []
+    original = daemon_client.read_from_toml
+    monkeypatch.setattr(daemon_client, "read_from_toml", lambda *a: reads.append(a) or original(*a))
+
+    assert not any(_is_daemon_routing_enabled() for _ in range(1000))
+    assert len(reads) == 1
+    client = get_daemon_client()
+    assert get_daemon_client() is client
+
+    # Unchanged files are re-stat'ed after the interval but not re-parsed
+    daemon_client.invalidate_config_cache()
+    assert not _is_daemon_routing_enabled()
+    assert len(reads) == 1
+
+    config_file.write_text("[api_daemon]\nenabled = true\nport = 9123\n")
+    daemon_client.invalidate_config_cache()
+    assert _is_daemon_routing_enabled()
+    assert len(reads) == 2
+    assert get_daemon_client() is not client
+    assert get_daemon_client().config.port == 9123
+
+
+def test_circuit_breaker_skips_a_dead_daemon_until_healthy(monkeypatch):
+    config = DaemonClientConfig(
+        host="127.0.0.1", port=_unused_port(), retry_attempts=1, use_ipc=False
+    )
+    client = APIDaemonClient(config)
+    calls = []
+    original = client.session.request
+    monkeypatch.setattr(
+        client.session,
+        "request",
+        lambda *a, **k: calls.append(k.get("url") or a[1]) or original(*a, **k),
+    )
+
+    with pytest.raises(Exception, match="Failed to connect"):
+        client.execute_command(command_name="hello")
+    assert client.breaker.is_open
+    with pytest.raises(DaemonUnavailableError):
+        client.execute_command(command_name="hello")
+    assert not client.is_running()
+    assert len(calls) == 1
+
+    # After the cooldown a failed health check keeps it open without a request
+    client.breaker.cooldown = 0
+    with pytest.raises(DaemonUnavailableError, match="health check"):
+        client.execute_command(command_name="hello")
+    assert calls[1].endswith("/health") and len(calls) == 2
+
+    monkeypatch.setattr(client.session, "get", lambda *a, **k: object())
+    monkeypatch.setattr(client.session, "request", lambda *a, **k: _Response())
+    assert client.execute_command(command_name="hello") == {"success": True}
+    assert not client.breaker.is_open
+
+
+class _Response:
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"success": True}
+
+
+def test_decorator_counts_routed_local_and_fallback(config_file, monkeypatch):
+    @daemon_command(command_name="greet")
+    def greet(name):
+        return f"local {name}"
+
+    assert greet("a") == "local a"
+    assert get_routing_stats() == {"routed": 0, "local": 1, "fallback": 0}
+
+    monkeypatch.setenv("MCLI_DAEMON_ROUTING", "1")
+    config_file.write_text(f"[api_daemon]\nport = {_unused_port()}\nuse_ipc = false\n")
+    daemon_client.invalidate_config_cache()
+    sleeps = []
+    monkeypatch.setattr(daemon_client.time, "sleep", sleeps.append)
+    assert greet("b") == "local b"
+    assert greet("c") == "local c"
+    assert get_routing_stats() == {"routed": 0, "local": 1, "fallback": 2}
+    assert len(sleeps) == 2  # Retries of the first call only; the breaker skips the second
+
+    class _Client:
+        def execute_command(self, **kwargs):
+            return {"success": True, "result": f"daemon {kwargs['args'][0]}"}
+
+    monkeypatch.setattr(daemon_decorator, "get_daemon_client", lambda: _Client())
+    assert greet("d") == "daemon d"
+    assert get_routing_stats() == {"routed": 1, "local": 1, "fallback": 2}
@@ -0,0 +1,87 @@
+"""Tests for the daemon's warm Python worker pool."""
+
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from mcli.workflow.daemon.daemon import Command, CommandExecutor
+from mcli.workflow.daemon.worker_pool import WORKER_POOLS_SUPPORTED, WorkerError, WorkerPool
+
+pytestmark = pytest.mark.skipif(not WORKER_POOLS_SUPPORTED, reason="needs POSIX pipes")
+
+
+@pytest.fixture
+def pool():
+    pool = WorkerPool(sys.executable, size=1, max_jobs=3, timeout=10)
+    yield pool
+    pool.close()
+
+
+def test_jobs_run_like_scripts(pool, tmp_path):
+    code = (
+        "import os, sys\n"
+        "print(sys.argv, os.getcwd() == sys.path[0], __name__)\n"
+        "os.system('echo from-child')\n"
+        "sys.stderr.write('warn')\n"
+    )
+    result = pool.execute(code, ["a", "b"], cwd=tmp_path, filename="job.py")
+
+    assert result.output == "['job.py', 'a', 'b'] True __main__\nfrom-child\n"
+    assert result.error == "warn"
+    assert result.exit_code == 0
+
+    assert pool.execute("import sys; sys.exit(3)", cwd=tmp_path).exit_code == 3
+    failed = pool.execute("raise ValueError('boom')", cwd=tmp_path)
+    assert failed.exit_code == 1 and "ValueError: boom" in failed.error
+
+
+def test_workers_are_reused_isolated_and_recycled(pool, tmp_path):
+    pids = [pool.execute("import os; print(os.getpid())", cwd=tmp_path).output for _ in range(4)]
+    assert pids[0] == pids[1] == pids[2] != pids[3]
+
+    pool.execute("leaked = 1", cwd=tmp_path)
+    result = pool.execute("print('leaked' in globals())", cwd=tmp_path)
+    assert result.output == "False\n"
+
+
+def test_timeouts_and_crashes_replace_the_worker(pool, tmp_path):
+    with pytest.raises(subprocess.TimeoutExpired):
+        pool.execute("import time; time.sleep(10)", cwd=tmp_path, timeout=0.5)
+    with pytest.raises(WorkerError):
+        pool.execute("import os; os._exit(4)", cwd=tmp_path)
+
+    assert pool.execute("print('ok')", cwd=tmp_path).output == "ok\n"
+
+
+def test_executor_runs_python_commands_in_workers(tmp_path, monkeypatch):
+    monkeypatch.setenv("MCLI_USE_SYSTEM_PYTHON", "1")
+    executor = CommandExecutor(temp_dir=str(tmp_path), python_workers=1, timeout=10)
+
+    def command(code: str) -> Command:
+        return Command(id="c1", name="job", description="", code=code, language="python")
+
+    try:
+        result = executor.execute_command(command("print('hi')"))
+        assert result["success"] and result["output"] == "hi\n"
+        assert list(executor._worker_pools) == [sys.executable]
+
+        executor._worker_pools[sys.executable].timeout = 0.5
+
+        result = executor.execute_command(command("while True: pass"))
+        assert not result["success"] and "timed out" in result["error"]
+    finally:
+        executor.close()
+
+
+def test_concurrent_callers_share_the_warm_workers(pool, tmp_path):
+    pool.max_jobs = 100
+    with ThreadPoolExecutor(4) as threads:
+        pids = set(
+            threads.map(
+                lambda _: pool.execute("import os; print(os.getpid())", cwd=tmp_path).output,
+                range(8),
+            )
+        )
+    assert len(pids) == 1
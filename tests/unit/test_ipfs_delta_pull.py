@@ -0,0 +1,158 @@
+"""Tests for skip-unchanged, concurrent ``mcli sync pull --workflows-dir``."""
+
+import hashlib
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from mcli.lib.ipfs_cid_store import BlobStore
+from mcli.lib.ipfs_sync import IPFSSync
+
+
+def _hash(data: bytes) -> str:
+    return "sha256:" + hashlib.sha256(data).hexdigest()
+
+
+def _manifest(scripts):
+    commands = {
+        name: {"file": f"{name}.py", "content_hash": _hash(body), "script_cid": f"Qm{name}{i}"}
+        for i, (name, body) in enumerate(scripts.items())
+    }
+    return {"version": "1.0", "commands": {"version": "2.1", "commands": commands}}
+
+
+@pytest.fixture
+def sync(tmp_path, monkeypatch):
+    monkeypatch.setattr("mcli.lib.ipfs_sync.get_data_dir", lambda: tmp_path / "data")
+    return IPFSSync()
+
+
+def _serve(sync, manifests, bodies, fetched):
+    """Patch the network: manifests by CID and script bodies by CID."""
+    lock = threading.Lock()
+
+    def fetch(cid, timeout=30):
+        with lock:
+            fetched.append(cid)
+        time.sleep(0.01)
+        return bodies.get(cid)
+
+    return (
+        patch.object(sync, "retrieve_from_ipfs", side_effect=lambda cid: manifests.get(cid)),
+        patch.object(sync, "fetch_file_from_ipfs", side_effect=fetch),
+    )
+
+
+def _bodies(manifest, scripts):
+    entries = manifest["commands"]["commands"]
+    return {entries[name]["script_cid"]: body for name, body in scripts.items()}
+
+
+def test_only_missing_or_changed_scripts_are_fetched_and_written(sync, tmp_path):
+    scripts = {f"s{i}": f"print({i})\n".encode() for i in range(10)}
+    manifest = _manifest(scripts)
+    target = tmp_path / "workflows"
+    target.mkdir()
+    for name in ("s0", "s1", "s2"):
+        (target / f"{name}.py").write_bytes(scripts[name])
+    (target / "s3.py").write_bytes(b"print('local edit')\n")
+
+    fetched = []
+    retrieve, fetch = _serve(sync, {"QmV1": manifest}, _bodies(manifest, scripts), fetched)
+    with retrieve, fetch:
+        written = sync.pull_workflows("QmV1", target)
+
+    assert sorted(p.name for p in written) == [f"s{i}.py" for i in range(3, 10)]
+    assert len(fetched) == 7
+    assert sync.last_pull_counts == {"written": 7, "unchanged": 3, "fetched": 7, "failed": 0}
+    assert all((target / f"{n}.py").read_bytes() == body for n, body in scripts.items())
+    assert not [p for p in target.iterdir() if p.name.endswith(".tmp")]
+
+
+def test_rollback_to_a_previous_cid_needs_no_network(sync, tmp_path):
+    v1 = {"a": b"print('a1')\n", "b": b"print('b')\n"}
+    v2 = {"a": b"print('a2')\n", "b": b"print('b')\n"}
+    m1, m2 = _manifest(v1), _manifest(v2)
+    m2["commands"]["commands"]["a"]["script_cid"] = "QmA2"
+    target = tmp_path / "workflows"
+
+    fetched = []
+    bodies = {**_bodies(m1, v1), "QmA2": v2["a"]}
+    retrieve, fetch = _serve(sync, {"QmV1": m1, "QmV2": m2}, bodies, fetched)
+    with retrieve, fetch:
+        sync.pull_workflows("QmV1", target)
+        sync.pull_workflows("QmV2", target)
+    assert len(fetched) == 3
+
+    # A new process with no network: manifest and bodies come from the local store
+    offline = IPFSSync()
+    with (
+        patch.object(offline, "retrieve_from_ipfs", return_value=None) as retrieve,
+        patch.object(offline, "fetch_file_from_ipfs", return_value=None) as fetch,
+    ):
+        written = offline.pull_workflows("QmV1", target)
+    retrieve.assert_not_called()
+    fetch.assert_not_called()
+    assert [p.name for p in written] == ["a.py"]
+    assert (target / "a.py").read_bytes() == v1["a"]
+
+
+def test_full_pull_rewrites_everything_and_fetches_run_concurrently(sync, tmp_path):
+    scripts = {f"s{i}": f"print({i})\n".encode() for i in range(16)}
+    manifest = _manifest(scripts)
+    target = tmp_path / "workflows"
+
+    active, peak = [], []
+    lock = threading.Lock()
+    bodies = _bodies(manifest, scripts)
+
+    def fetch(cid, timeout=30):
+        with lock:
+            active.append(cid)
+            peak.append(len(active))
+        time.sleep(0.02)
+        with lock:
+            active.remove(cid)
+        return bodies[cid]
+
+    with (
+        patch.object(sync, "retrieve_from_ipfs", return_value=manifest),
+        patch.object(sync, "fetch_file_from_ipfs", side_effect=fetch),
+    ):
+        sync.pull_workflows("QmV1", target)
+        assert 1 < max(peak) <= 8
+        assert len(sync.pull_workflows("QmV1", target)) == 0
+        assert len(sync.pull_workflows("QmV1", target, full=True)) == 16
+
+
+def test_corrupt_blobs_are_refetched(tmp_path):
+    store = BlobStore(tmp_path)
+    content_hash = store.put(b"print('x')\n")
+    assert store.get(content_hash) == b"print('x')\n"
+
+    digest = content_hash.split(":")[1]
+    (tmp_path / digest[:2] / digest).write_bytes(b"tampered")
+    assert store.get(content_hash) is None
+    assert store.get("sha256:not-a-hash") is None
+    assert store.get_manifest("../../etc/passwd") is None
+
+
+def test_only_verified_manifests_are_stored(sync):
+    manifest = {"version": "1.0", "commands": {"a": {}}}
+    manifest["hash"] = hashlib.sha256(json.dumps(manifest, sort_keys=True).encode()).hexdigest()
+    tampered = {**manifest, "commands": {"evil": {}}}
+
+    with patch.object(sync, "retrieve_from_ipfs", return_value=tampered):
+        assert sync.pull("QmV1") is None
+    assert sync.blob_store.get_manifest("QmV1") is None
+
+    # A bad manifest already in the store is dropped and fetched again
+    sync.blob_store.put_manifest("QmV1", tampered)
+    with patch.object(sync, "retrieve_from_ipfs", return_value=manifest) as retrieve:
+        assert sync.pull("QmV1") == {"a": {}}
+        assert sync.pull("QmV1") == {"a": {}}
+    retrieve.assert_called_once()
+    assert sync.blob_store.get_manifest("QmV1") == manifest
@@ -0,0 +1,132 @@
+"""Tests for delta-aware, concurrent script uploads in ``mcli sync push``."""
+
+import hashlib
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from mcli.lib.ipfs_cid_store import CidStore
+from mcli.lib.ipfs_sync import IPFSSync
+
+
+@pytest.fixture
+def workflows(tmp_path, monkeypatch):
+    monkeypatch.setattr("mcli.lib.ipfs_sync.get_data_dir", lambda: tmp_path / "data")
+    workflows_dir = tmp_path / "workflows"
+    workflows_dir.mkdir()
+    commands = {}
+    for i in range(20):
+        (workflows_dir / f"cmd{i}.py").write_text(f"print({i})\n")
+        commands[f"cmd{i}"] = {"file": f"cmd{i}.py"}
+    lockfile = workflows_dir / "commands.lock.json"
+    lockfile.write_text(json.dumps({"version": "2.0", "commands": commands}))
+    return lockfile
+
+
+def _fake_add(calls):
+    lock = threading.Lock()
+
+    def add(path, max_retries=3):
+        with lock:
+            calls.append(path.name)
+        return "Qm" + hashlib.sha256(path.read_bytes()).hexdigest()[:10]
+
+    return add
+
+
+def _push(lockfile, calls, node="node-a", **kwargs):
+    sync = IPFSSync()
+    sync._local_ipfs_available = True
+    sync._local_node_id = node
+    with (
+        patch.object(sync, "add_file_to_ipfs", side_effect=_fake_add(calls)),
+        patch.object(sync, "upload_to_ipfs", return_value="QmManifest") as upload,
+        patch("mcli.lib.ipfs_sync.get_sync_key", return_value=None),
+    ):
+        assert sync.push(lockfile, **kwargs) == "QmManifest"
+    return sync, upload.call_args[0][0]["commands"]["commands"]
+
+
+def test_unchanged_scripts_reuse_recorded_cids(workflows):
+    calls = []
+    _, first = _push(workflows, calls)
+    assert len(calls) == 20
+
+    (workflows.parent / "cmd3.py").write_text("print('changed')\n")
+    calls.clear()
+    sync, second = _push(workflows, calls)
+
+    assert calls == ["cmd3.py"]
+    assert sync.last_script_counts == {"uploaded": 1, "reused": 19, "failed": 0}
+    assert second["cmd3"]["script_cid"] != first["cmd3"]["script_cid"]
+    assert {k: v["script_cid"] for k, v in second.items() if k != "cmd3"} == {
+        k: v["script_cid"] for k, v in first.items() if k != "cmd3"
+    }
+
+
+def test_full_push_and_other_nodes_upload_everything(workflows):
+    calls = []
+    _push(workflows, calls)
+    calls.clear()
+    _push(workflows, calls, full=True)
+    assert len(calls) == 20
+
+    calls.clear()
+    _push(workflows, calls, node="node-b")
+    assert len(calls) == 20
+
+
+def test_failed_uploads_are_not_recorded(workflows):
+    sync = IPFSSync()
+    sync._local_ipfs_available = True
+    sync._local_node_id = "node-a"
+    with (
+        patch.object(sync, "add_file_to_ipfs", return_value=None),
+        patch.object(sync, "upload_to_ipfs", return_value="QmManifest"),
+        patch("mcli.lib.ipfs_sync.get_sync_key", return_value=None),
+    ):
+        sync.push(workflows)
+    assert sync.last_script_counts["failed"] == 20
+
+    calls = []
+    _push(workflows, calls)
+    assert len(calls) == 20
+
+
+def test_uploads_run_concurrently(workflows):
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def slow_add(path, max_retries=3):
+        with lock:
+            active.append(path)
+            peak.append(len(active))
+        time.sleep(0.02)
+        with lock:
+            active.remove(path)
+        return "Qm" + path.stem
+
+    sync = IPFSSync()
+    sync._local_ipfs_available = True
+    with (
+        patch.object(sync, "add_file_to_ipfs", side_effect=slow_add),
+        patch.object(sync, "upload_to_ipfs", return_value="QmManifest"),
+        patch("mcli.lib.ipfs_sync.get_sync_key", return_value=None),
+    ):
+        sync.push(workflows)
+    assert 1 < max(peak) <= 8
+
+
+def test_cid_store_round_trips_and_ignores_corruption(tmp_path):
+    store = CidStore(tmp_path / "cids.json")
+    store.put("node", "sha256:aa", "QmA")
+    store.save()
+    assert CidStore(tmp_path / "cids.json").get("node", "sha256:aa") == "QmA"
+    assert CidStore(tmp_path / "cids.json").get("other", "sha256:aa") is None
+
+    (tmp_path / "cids.json").write_text("{not json")
+    assert CidStore(tmp_path / "cids.json").get("node", "sha256:aa") is None
@@ -29,6 +29,14 @@ SAMPLE_SCRIPT = (
 )
 
 
+@pytest.fixture(autouse=True)
+def isolated_data_dir(tmp_path, monkeypatch):
+    """Keep sync history and the CID store of a real data dir out of these tests."""
+    data_dir = tmp_path / "data"
+    monkeypatch.setattr("mcli.lib.ipfs_sync.get_data_dir", lambda: data_dir)
+    return data_dir
+
+
 def _sha256(text: str) -> str:
     return "sha256:" + hashlib.sha256(text.encode()).hexdigest()
 
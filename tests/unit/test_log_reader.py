@@ -0,0 +1,124 @@
+"""Tests for bounded-memory log tailing and searching."""
+
+import builtins
+import re
+
+import pytest
+
+from mcli.lib import log_reader
+from mcli.lib.log_reader import grep_file, grep_files, tail_lines
+
+
+def _write_lines(path, count):
+    path.write_text("".join(f"line {i}\n" for i in range(count)))
+    return path
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 64, 1 << 16])
+def test_tail_returns_last_lines_for_any_block_size(tmp_path, block_size):
+    log = _write_lines(tmp_path / "a.log", 100)
+    assert tail_lines(log, 3, block_size=block_size) == ["line 97", "line 98", "line 99"]
+    assert tail_lines(log, 500, block_size=block_size) == [f"line {i}" for i in range(100)]
+    assert tail_lines(log, 0, block_size=block_size) == []
+
+
+def test_tail_handles_missing_final_newline_and_empty_files(tmp_path):
+    log = tmp_path / "a.log"
+    log.write_bytes(b"first\r\nsecond\nthird")
+    assert tail_lines(log, 2) == ["second", "third"]
+    log.write_bytes(b"")
+    assert tail_lines(log, 5) == []
+    log.write_bytes(b"\xffbroken\n")
+    assert tail_lines(log, 1) == ["�broken"]
+
+
+class _CountingFile:
+    """Wraps a binary file, counting the bytes read through it."""
+
+    opened = []
+
+    def __init__(self, *args, **kwargs):
+        self._file = builtins.open(*args, **kwargs)
+        self.bytes_read = 0
+        self.opened.append(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._file.close()
+
+    def seek(self, *args):
+        return self._file.seek(*args)
+
+    def read(self, size=-1):
+        data = self._file.read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def test_tail_reads_only_the_end_of_a_large_file(tmp_path, monkeypatch):
+    log = _write_lines(tmp_path / "big.log", 200_000)
+    monkeypatch.setattr(log_reader, "open", _CountingFile, raising=False)
+
+    assert tail_lines(log, 10, block_size=4096) == [f"line {i}" for i in range(199_990, 200_000)]
+    assert _CountingFile.opened[-1].bytes_read == 4096
+
+
+def test_grep_reports_overlapping_context(tmp_path):
+    log = _write_lines(tmp_path / "a.log", 10)
+    matches = list(grep_file(log, re.compile(r"line [45]$"), context=2))
+
+    assert [m.line_number for m in matches] == [5, 6]
+    assert matches[0].before == ["line 2", "line 3"]
+    assert matches[0].after == ["line 5", "line 6"]
+    assert matches[1].before == ["line 3", "line 4"]
+    assert matches[1].after == ["line 6", "line 7"]
+    assert matches[0].format() == "    line 2\n    line 3\n>>> line 4\n    line 5\n    line 6\n"
+
+
+def test_grep_is_case_insensitive_literal_by_default(tmp_path):
+    log = tmp_path / "a.log"
+    log.write_text("ERROR: a.b failed\nerror: axb failed\ninfo\n")
+
+    assert [m.line for m in grep_file(log, "a.b")] == ["ERROR: a.b failed"]
+    assert len(list(grep_file(log, "error"))) == 2
+    assert len(list(grep_file(log, "a.b", regex=True))) == 2
+    assert list(grep_file(log, "error", ignore_case=False)) != []
+    assert len(list(grep_file(log, "ERROR", ignore_case=False))) == 1
+
+
+def test_grep_context_at_end_of_file(tmp_path):
+    log = _write_lines(tmp_path / "a.log", 3)
+    (match,) = grep_file(log, "line 2", context=3)
+    assert match.before == ["line 0", "line 1"]
+    assert match.after == []
+
+
+def test_grep_files_in_parallel_preserves_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_reader, "PARALLEL_GREP_MIN_BYTES", 0)
+    files = [_write_lines(tmp_path / f"mcli_2025010{i}.log", 50 + i) for i in range(3)]
+    missing = tmp_path / "mcli_20250109.log"
+
+    results = list(grep_files(files + [missing], "line 5", max_workers=2))
+
+    assert [r.path for r in results] == files + [missing]
+    assert [len(r.matches) for r in results[:3]] == [1, 2, 3]
+    assert results[3].error
+
+    with pytest.raises(re.error):
+        grep_files(files, "(", regex=True)
+
+
+def test_grep_files_streams_matches_in_process(tmp_path):
+    log = _write_lines(tmp_path / "mcli_20250101.log", 1000)
+    missing = tmp_path / "mcli_20250102.log"
+
+    results = grep_files([log, missing], "line")
+    first = next(results)
+    assert not isinstance(first.matches, list)
+    assert next(iter(first.matches)).line == "line 0"
+
+    second = next(results)
+    assert list(second.matches) == []
+    assert second.error
@@ -0,0 +1,121 @@
+"""Tests for the asynchronous, batched log file handlers."""
+
+import logging
+import threading
+
+import pytest
+
+from mcli.lib.logger.handlers import AsyncLogWriter, BufferedRotatingFileHandler
+
+
+@pytest.fixture
+def writer():
+    writer = AsyncLogWriter(flush_interval=0.05)
+    yield writer
+    writer.stop()
+
+
+def _logger(name, handler):
+    logger = logging.getLogger(f"mcli.test.{name}")
+    logger.handlers[:] = [handler]
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    return logger
+
+
+class _Recording(logging.Formatter):
+    """Formatter recording the thread that formats each record."""
+
+    def __init__(self):
+        super().__init__("%(levelname)s %(message)s")
+        self.threads = []
+
+    def format(self, record):
+        self.threads.append(threading.current_thread().name)
+        return super().format(record)
+
+
+def test_records_are_formatted_and_written_on_the_writer_thread(tmp_path, writer):
+    target = BufferedRotatingFileHandler(tmp_path / "mcli.log")
+    formatter = _Recording()
+    target.setFormatter(formatter)
+    logger = _logger("async", writer.handler_for(target))
+
+    for i in range(100):
+        logger.debug("item %d", i)
+    assert writer.drain()
+
+    lines = (tmp_path / "mcli.log").read_text().splitlines()
+    assert lines == [f"DEBUG item {i}" for i in range(100)]
+    assert set(formatter.threads) == {"mcli-log-writer"}
+
+
+def test_buffer_is_written_on_size_error_and_interval(tmp_path):
+    log = tmp_path / "mcli.log"
+    target = BufferedRotatingFileHandler(log, flush_bytes=50)
+    target.setFormatter(logging.Formatter("%(message)s"))
+    logger = _logger("buffered", target)
+
+    logger.info("short")
+    assert not log.exists()
+    logger.info("x" * 60)
+    assert log.read_text() == "short\n" + "x" * 60 + "\n"
+
+    logger.info("pending")
+    logger.error("failure")
+    assert log.read_text().endswith("pending\nfailure\n")
+
+
+def test_interval_flushes_without_explicit_drain(tmp_path, writer):
+    log = tmp_path / "mcli.log"
+    target = BufferedRotatingFileHandler(log)
+    logger = _logger("interval", writer.handler_for(target))
+    logger.info("eventually written")
+
+    event = threading.Event()
+    for _ in range(100):
+        if log.exists() and "eventually written" in log.read_text():
+            break
+        event.wait(0.02)
+    assert "eventually written" in log.read_text()
+
+
+def test_files_rotate_by_size(tmp_path):
+    log = tmp_path / "mcli.log"
+    target = BufferedRotatingFileHandler(log, max_bytes=100, backup_count=2, flush_bytes=1)
+    target.setFormatter(logging.Formatter("%(message)s"))
+    logger = _logger("rotate", target)
+
+    for i in range(30):
+        logger.info("line %02d %s", i, "y" * 20)
+    target.close()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["mcli.log", "mcli.log.1", "mcli.log.2"]
+    assert all(p.stat().st_size <= 100 for p in tmp_path.iterdir())
+    assert log.read_text().splitlines()[-1].startswith("line 29")
+
+
+def test_disabled_levels_never_create_records(tmp_path, writer):
+    target = BufferedRotatingFileHandler(tmp_path / "mcli.log")
+    logger = _logger("gated", writer.handler_for(target))
+    logger.setLevel(logging.WARNING)
+
+    class Expensive:
+        def __str__(self):
+            raise AssertionError("formatted a disabled record")
+
+    logger.debug("value %s", Expensive())
+    logger.warning("kept")
+    writer.drain()
+    assert (tmp_path / "mcli.log").read_text().strip().endswith("kept")
+
+
+def test_stop_writes_queued_records(tmp_path, writer):
+    target = BufferedRotatingFileHandler(tmp_path / "mcli.log")
+    target.setFormatter(logging.Formatter("%(message)s"))
+    logger = _logger("stop", writer.handler_for(target))
+    for i in range(1000):
+        logger.info("%d", i)
+
+    writer.stop()
+    assert len((tmp_path / "mcli.log").read_text().splitlines()) == 1000
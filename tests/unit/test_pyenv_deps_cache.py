@@ -0,0 +1,101 @@
+"""Tests for the dependency-satisfaction cache and metadata fast path."""
+
+import subprocess
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mcli.lib.pyenv.deps import DependencyChecker, SatisfactionCache
+
+
+def _install(site, name, version):
+    dist = site / f"{name.replace('-', '_')}-{version}.dist-info"
+    dist.mkdir()
+    (dist / "METADATA").write_text(
+        f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n\nSummary in body: Name: no\n"
+    )
+
+
+@pytest.fixture
+def venv(tmp_path):
+    root = tmp_path / "venv"
+    (root / "bin").mkdir(parents=True)
+    (root / "bin" / "python").touch()
+    (root / "pyvenv.cfg").write_text("home = /usr/bin\ninclude-system-site-packages = false\n")
+    site = root / "lib" / "python3.11" / "site-packages"
+    site.mkdir(parents=True)
+    _install(site, "requests", "2.31.0")
+    _install(site, "Typing-Extensions", "4.9.0")
+    (site / "legacy-1.0-py3.11.egg-info").write_text("Name: legacy\nVersion: 1.0\n")
+    return root, site
+
+
+@pytest.fixture
+def checker(venv, tmp_path):
+    return DependencyChecker(venv[0] / "bin" / "python", SatisfactionCache(tmp_path / "c.json"))
+
+
+def test_installed_packages_are_read_without_a_subprocess(checker):
+    with patch("subprocess.run", side_effect=AssertionError("no subprocess expected")):
+        packages = checker.get_installed_packages()
+    assert packages == {"requests": "2.31.0", "typing-extensions": "4.9.0", "legacy": "1.0"}
+    assert checker.check_installed(["requests==2.31.0", "typing_extensions", "numpy"]) == (
+        ["requests==2.31.0", "typing_extensions"],
+        ["numpy"],
+    )
+
+
+def test_satisfied_requirements_are_cached_until_site_packages_changes(checker, venv):
+    reads = MagicMock(wraps=checker.get_installed_packages)
+    checker.get_installed_packages = reads
+
+    assert checker.check_installed(["requests>=2", "typing-extensions"])[1] == []
+    assert checker.check_installed(["Typing_Extensions", "requests >= 2"])[1] == []
+    assert reads.call_count == 1
+
+    _install(venv[1], "numpy", "1.26.0")
+    assert checker.check_installed(["requests>=2", "typing-extensions"])[1] == []
+    assert reads.call_count == 2
+
+    # Unsatisfied sets are never cached
+    assert checker.check_installed(["scipy"])[1] == ["scipy"]
+    assert checker.check_installed(["scipy"])[1] == ["scipy"]
+    assert reads.call_count == 4
+
+
+def test_cache_is_per_interpreter(venv, tmp_path):
+    cache = SatisfactionCache(tmp_path / "c.json")
+    first = DependencyChecker(venv[0] / "bin" / "python", cache)
+    assert first.check_installed(["requests"])[1] == []
+
+    other = tmp_path / "other"
+    (other / "bin").mkdir(parents=True)
+    (other / "bin" / "python").touch()
+    (other / "pyvenv.cfg").write_text("include-system-site-packages = false\n")
+    (other / "lib" / "python3.11" / "site-packages").mkdir(parents=True)
+    assert DependencyChecker(other / "bin" / "python", cache).check_installed(["requests"]) == (
+        [],
+        ["requests"],
+    )
+
+
+def test_venvs_with_system_site_packages_fall_back_to_uv(checker, venv):
+    (venv[0] / "pyvenv.cfg").write_text("include-system-site-packages = true\n")
+    listing = subprocess.CompletedProcess([], 0, stdout="Requests==2.0\n", stderr="")
+    with patch("subprocess.run", return_value=listing) as run:
+        assert checker.check_installed(["requests"])[1] == []
+        assert checker.check_installed(["requests"])[1] == []
+    assert run.call_count == 2
+    assert not checker.cache.path.exists()
+
+
+def test_own_interpreter_without_site_packages_falls_back_to_uv(tmp_path, monkeypatch):
+    monkeypatch.setattr("sys.path", [str(tmp_path)])
+    checker = DependencyChecker(sys.executable, SatisfactionCache(tmp_path / "c.json"))
+    assert checker.site_packages_dirs() is None
+
+    listing = subprocess.CompletedProcess([], 0, stdout="Requests==2.0\n", stderr="")
+    with patch("subprocess.run", return_value=listing) as run:
+        assert checker.check_installed(["requests"])[1] == []
+    run.assert_called_once()
@@ -0,0 +1,147 @@
+"""Tests for the structured run-event log."""
+
+import os
+from datetime import datetime, timedelta
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from mcli.lib.logger import events
+from mcli.lib.logger.correlation import correlation_context
+from mcli.lib.logger.events import RunEvent, RunEventLog, track_run
+from mcli.lib.workflow_runtime import wrap_command_invoke
+from mcli.self.logs_cmd import logs_group
+
+
+@pytest.fixture
+def log(tmp_path, monkeypatch):
+    log = RunEventLog(tmp_path / "events")
+    monkeypatch.setattr(events, "_default_log", log)
+    return log
+
+
+def _at(days_ago, hour=12):
+    when = datetime.now().replace(hour=hour, minute=0, second=0, microsecond=0)
+    return (when - timedelta(days=days_ago)).timestamp()
+
+
+def test_events_round_trip_through_daily_segments(log):
+    log.append(RunEvent(_at(1), "backup", 2.5, 0, "workflow", "abcd1234"))
+    log.append(RunEvent(_at(0), "backup", 3.0, 1, "job", ""))
+    log.append(RunEvent(_at(0), "deploy", 0.2, 0))
+
+    assert len(log.segments()) == 2
+    assert [(e.command, e.duration, e.exit_status) for e in log.query()] == [
+        ("backup", 2.5, 0),
+        ("backup", 3.0, 1),
+        ("deploy", 0.2, 0),
+    ]
+    assert [e.correlation_id for e in log.query(command="backup")] == ["abcd1234", ""]
+    assert [e.source for e in log.query(failed_only=True)] == ["job"]
+
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    assert [e.command for e in log.query(since=today)] == ["backup", "deploy"]
+    assert len(log.segments(since=today)) == 1
+
+
+def test_stats_use_the_index_and_compute_percentiles(log, monkeypatch):
+    for i in range(1, 101):
+        log.append(RunEvent(_at(0), "build", i / 10, 0 if i % 10 else 2))
+    log.append(RunEvent(_at(0), "lint", 0.5, 0))
+
+    reads = []
+    real_read_at = RunEventLog._read_at
+    monkeypatch.setattr(
+        RunEventLog, "_read_at", staticmethod(lambda f, o: reads.append(o) or real_read_at(f, o))
+    )
+
+    build, lint = log.stats()
+    assert (build.command, build.count, build.failures) == ("build", 100, 10)
+    assert build.p50 == pytest.approx(5.0)
+    assert build.p95 == pytest.approx(9.5)
+    assert build.max == pytest.approx(10.0)
+    assert (lint.command, lint.count, lint.p95) == ("lint", 1, 0.5)
+    # One record read per command, to recover its name
+    assert len(reads) == 2
+
+
+def test_torn_writes_and_missing_indexes_are_tolerated(log):
+    log.append(RunEvent(_at(0), "a", 1.0, 0))
+    log.append(RunEvent(_at(0), "b", 2.0, 0))
+    segment = log.segments()[0]
+    with open(segment, "ab") as f:
+        f.write(events.encode_event(RunEvent(_at(0), "torn", 1.0, 0))[:10])
+    with open(log.index_for(segment), "ab") as f:
+        f.write(b"\x00" * 7)
+    assert [e.command for e in log.query()] == ["a", "b"]
+
+    os.remove(log.index_for(segment))
+    assert [s.command for s in log.stats()] == ["b", "a"]
+    assert log.index_for(segment).exists()
+
+
+def test_track_run_records_exit_status_and_correlation_id(log):
+    with correlation_context("feedc0de"):
+        with track_run("ok-run"):
+            pass
+    with pytest.raises(SystemExit):
+        with track_run("exit-run", source="job"):
+            raise SystemExit(3)
+    with pytest.raises(ValueError):
+        with track_run("crash-run"):
+            raise ValueError("boom")
+
+    recorded = {e.command: e for e in log.query()}
+    assert recorded["ok-run"].exit_status == 0
+    assert recorded["ok-run"].correlation_id == "feedc0de"
+    assert (recorded["exit-run"].exit_status, recorded["exit-run"].source) == (3, "job")
+    assert recorded["crash-run"].exit_status == 1
+    assert recorded["crash-run"].correlation_id
+
+
+def test_recording_can_be_disabled(log, monkeypatch):
+    monkeypatch.setenv("MCLI_RUN_EVENTS", "0")
+    with track_run("quiet"):
+        pass
+    assert list(log.query()) == []
+
+
+def test_wrapped_workflows_are_recorded(log, tmp_path):
+    @click.command(name="todos")
+    def cmd():
+        click.echo("done")
+
+    result = CliRunner().invoke(wrap_command_invoke(cmd, tmp_path / "todos.py"))
+    assert result.exit_code == 0
+    [event] = log.query()
+    assert (event.command, event.source, event.exit_status) == ("todos", "workflow", 0)
+
+
+def test_exit_status_of_click_exits():
+    assert events.exit_status_of(click.exceptions.Exit(0)) == 0
+    assert events.exit_status_of(click.exceptions.Exit(4)) == 4
+    assert events.exit_status_of(click.UsageError("bad")) == 2
+
+
+def test_runs_command_compares_with_previous_period(log, monkeypatch):
+    monkeypatch.setattr("mcli.self.logs_cmd.RunEventLog", lambda: log)
+    for _ in range(5):
+        log.append(RunEvent(_at(10), "etl", 1.0, 0))
+        log.append(RunEvent(_at(1), "etl", 2.0, 0))
+        log.append(RunEvent(_at(10), "report", 1.0, 0))
+        log.append(RunEvent(_at(1), "report", 0.5, 0))
+
+    runner = CliRunner()
+    result = runner.invoke(logs_group, ["runs", "--compare", "--days", "7"])
+    assert result.exit_code == 0, result.output
+    assert "+100%" in result.output and "-50%" in result.output
+    assert result.output.index("etl") < result.output.index("report")
+
+    result = runner.invoke(logs_group, ["runs", "--stats", "-c", "etl"])
+    assert result.exit_code == 0, result.output
+    assert "etl" in result.output and "report" not in result.output
+
+    result = runner.invoke(logs_group, ["runs", "-n", "3"])
+    assert result.exit_code == 0, result.output
+    assert result.output.count("etl") + result.output.count("report") == 3
@@ -0,0 +1,126 @@
+"""Tests for the sampling profiler used by ``MCLI_TRACE_MODE=sample``."""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from mcli.lib.logger.logger import McliLogger
+from mcli.lib.logger.profiler import SamplingProfiler
+
+
+@pytest.fixture(autouse=True)
+def no_runtime_tracing():
+    # Other logger tests leave settrace tracing on; it would be sampled too
+    McliLogger.disable_runtime_tracing()
+    yield
+
+
+def _busy_leaf(seconds):
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += sum(range(200))
+    return total
+
+
+def _busy_parent(seconds):
+    return _busy_leaf(seconds)
+
+
+def test_profiler_attributes_samples_to_the_running_function():
+    profiler = SamplingProfiler(interval=0.001).start()
+    try:
+        assert sys.gettrace() is None
+        _busy_parent(0.3)
+    finally:
+        profiler.stop()
+
+    leaf = f"{__name__}:_busy_leaf"
+    parent = f"{__name__}:_busy_parent"
+    assert profiler.samples > 20
+    stats = profiler.functions[leaf]
+    assert stats.self_samples > profiler.samples / 2
+    assert profiler.functions[parent].total_samples >= stats.self_samples
+    assert profiler.functions[parent].self_samples == 0
+    if profiler.cpu_available:
+        assert stats.self_cpu > 0.1
+
+    main = threading.main_thread().name
+    busy = [line for line in profiler.collapsed() if line.startswith(f"{main};")]
+    stack, count = busy[0].rsplit(" ", 1)
+    assert stack.endswith(f"{parent};{leaf}")
+    assert int(count) > 0
+
+
+def test_collapsed_output_and_summary(tmp_path):
+    profiler = SamplingProfiler(interval=0.001, lines=True).start()
+    _busy_leaf(0.1)
+    profiler.stop()
+
+    path = profiler.write_collapsed(tmp_path / "profile.folded")
+    lines = path.read_text().splitlines()
+    assert lines
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    # Line mode labels frames with their line number
+    assert any(f"{__name__}:_busy_leaf:" in line for line in lines)
+
+    summary = profiler.summary(limit=5)
+    assert f"{__name__}:_busy_leaf" in summary
+    assert "hot lines:" in summary
+    assert "while time.perf_counter() < end" in summary or "sum(range(200))" in summary
+
+
+def test_other_threads_are_sampled_under_their_names():
+    stop = threading.Event()
+    busy = threading.Thread(target=_busy_leaf, args=(0.1,), name="busy-worker")
+    parked = threading.Thread(target=stop.wait, name="parked-worker")
+    busy.start()
+    parked.start()
+    profiler = SamplingProfiler(interval=0.001).start()
+    try:
+        time.sleep(0.05)
+    finally:
+        profiler.stop()
+        stop.set()
+        busy.join()
+        parked.join()
+
+    threads = {stack[0] for stack in profiler.stacks}
+    assert "busy-worker" in threads
+    assert threading.main_thread().name in threads  # sampled even while sleeping
+    assert "mcli-sampling-profiler" not in threads
+    if profiler.cpu_available:
+        assert "parked-worker" not in threads
+
+
+def test_logger_writes_profile_to_logs_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr("mcli.lib.paths.get_logs_dir", lambda: tmp_path)
+    McliLogger.enable_sampling_profiler(interval=0.001)
+    _busy_leaf(0.05)
+    path = McliLogger.disable_sampling_profiler()
+
+    assert path is not None and path.startswith(str(tmp_path))
+    assert path.endswith(".folded")
+    assert McliLogger.disable_sampling_profiler() is None
+
+
+def test_invalid_profile_interval_falls_back_to_the_default(tmp_path):
+    env = dict(
+        os.environ,
+        HOME=str(tmp_path),
+        MCLI_TRACE_LEVEL="1",
+        MCLI_TRACE_MODE="sample",
+        MCLI_PROFILE_INTERVAL="fast",
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", "import mcli.app.main"],
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
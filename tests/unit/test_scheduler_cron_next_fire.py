@@ -0,0 +1,88 @@
+"""Tests for field-wise next-fire computation in CronExpression."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from mcli.workflow.scheduler.cron_parser import CronExpression, get_next_run_times, parse_cron
+
+
+def _brute_force_next(cron, from_time, limit_minutes=3 * 366 * 24 * 60):
+    current = from_time.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    for _ in range(limit_minutes):
+        if cron._matches_time(current):
+            return current
+        current += timedelta(minutes=1)
+    return None
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "* * * * *",
+        "*/15 * * * *",
+        "0 */6 * * *",
+        "30 9 * * 1-5",
+        "0 0 * * 0",
+        "@weekly",
+        "@monthly",
+        "45 23 31 * *",
+        "5,55 22-23 28-31 * *",
+        "0 12 1 1,7 *",
+        "0 0 13 * 5",
+    ],
+)
+@pytest.mark.parametrize(
+    "start",
+    [
+        datetime(2025, 1, 1, 0, 0),
+        datetime(2025, 2, 28, 23, 59, 30),
+        datetime(2025, 12, 31, 23, 45),
+        datetime(2024, 2, 29, 3, 0),
+    ],
+)
+def test_next_run_time_matches_minute_walk(expression, start):
+    cron = CronExpression(expression)
+    assert cron.get_next_run_time(start) == _brute_force_next(cron, start)
+
+
+def test_sparse_schedules_jump_across_years():
+    cron = CronExpression("0 3 29 2 *")
+    assert cron.get_next_run_time(datetime(2025, 3, 1)) == datetime(2028, 2, 29, 3, 0)
+    assert cron.get_next_run_time(datetime(2028, 2, 29, 3, 0)) == datetime(2032, 2, 29, 3, 0)
+
+    # Feb 29 that is also a Monday: next in 2044
+    monday = CronExpression("0 0 29 2 1")
+    assert monday.get_next_run_time(datetime(2025, 1, 1)) == datetime(2044, 2, 29, 0, 0)
+
+
+def test_impossible_dates_return_none():
+    assert CronExpression("0 0 30 2 *").get_next_run_time(datetime(2025, 1, 1)) is None
+    assert CronExpression("0 0 31 4,6 *").get_next_run_times(3, datetime(2025, 1, 1)) == []
+
+
+def test_sunday_is_weekday_zero():
+    cron = CronExpression("@weekly")
+    assert cron._matches_time(datetime(2025, 1, 5, 0, 0))  # a Sunday
+    assert not cron._matches_time(datetime(2025, 1, 6, 0, 0))
+    assert cron.get_next_run_time(datetime(2025, 1, 1)) == datetime(2025, 1, 5, 0, 0)
+
+
+def test_get_next_run_times_is_consecutive():
+    cron = CronExpression("0 9 * * 1-5")
+    times = cron.get_next_run_times(6, datetime(2025, 1, 3, 10, 0))  # a Friday
+    assert times == [
+        datetime(2025, 1, 6, 9, 0),
+        datetime(2025, 1, 7, 9, 0),
+        datetime(2025, 1, 8, 9, 0),
+        datetime(2025, 1, 9, 9, 0),
+        datetime(2025, 1, 10, 9, 0),
+        datetime(2025, 1, 13, 9, 0),
+    ]
+    assert CronExpression("@reboot").get_next_run_times(3) == []
+    assert len(get_next_run_times("*/5 * * * *", count=4)) == 4
+
+
+def test_parse_cron_caches_per_string():
+    assert parse_cron("*/7 * * * *") is parse_cron("*/7 * * * *")
+    assert parse_cron("*/7 * * * *") is not parse_cron("*/8 * * * *")
@@ -0,0 +1,143 @@
+"""Tests for deadline-driven job dispatch in JobScheduler."""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from mcli.lib.constants import SchedulerDefaults
+from mcli.workflow.scheduler.job import JobStatus, JobType, ScheduledJob
+from mcli.workflow.scheduler.scheduler import JobScheduler
+
+
+class _FakeCron:
+    """Cron stand-in whose next run is a fixed number of seconds away."""
+
+    is_reboot = False
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def get_next_run_time(self, from_time=None):
+        return datetime.now() + timedelta(seconds=self.seconds)
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    scheduler = JobScheduler(storage_dir=str(tmp_path))
+    yield scheduler
+    scheduler.stop()
+
+
+def _job(name="job", cron="* * * * *", **kwargs):
+    return ScheduledJob(
+        name=name, cron_expression=cron, job_type=JobType.COMMAND, command="true", **kwargs
+    )
+
+
+def _record_dispatches(scheduler):
+    dispatched = []
+    event = threading.Event()
+
+    def queue(job):
+        dispatched.append((job.name, time.monotonic()))
+        event.set()
+
+    scheduler._queue_job_execution = queue
+    return dispatched, event
+
+
+def test_pop_due_jobs_returns_only_due_jobs_and_reschedules_them(scheduler):
+    base = datetime(2030, 1, 1, 12, 0)
+    for minute in range(20):
+        job = _job(f"job{minute}", cron=f"{minute} * * * *")
+        scheduler.add_job(job)
+        with scheduler.lock:
+            job.next_run = base + timedelta(minutes=minute)
+            scheduler._schedule(job)
+
+    due = scheduler._pop_due_jobs(base + timedelta(minutes=4, seconds=30))
+    assert [job.name for job in due] == ["job0", "job1", "job2", "job3", "job4"]
+    assert due[0].next_run == datetime(2030, 1, 1, 13, 0)
+    assert scheduler._pop_due_jobs(base + timedelta(minutes=4, seconds=59)) == []
+    assert scheduler._heap[0][0] == base + timedelta(minutes=5)
+
+
+def test_running_jobs_are_skipped_but_advanced(scheduler):
+    job = _job()
+    scheduler.add_job(job)
+    job.status = JobStatus.RUNNING
+    now = job.next_run
+    assert scheduler._pop_due_jobs(now) == []
+    assert job.next_run == now + timedelta(minutes=1)
+
+
+def test_loop_sleeps_until_deadline_and_wakes_on_add(scheduler):
+    dispatched, event = _record_dispatches(scheduler)
+    scheduler.start()
+    time.sleep(0.1)  # loop is now waiting with nothing scheduled
+
+    with patch("mcli.workflow.scheduler.scheduler.parse_cron", return_value=_FakeCron(0.3)):
+        added = time.monotonic()
+        scheduler.add_job(_job("soon"))
+    assert event.wait(5)
+    assert dispatched[0][0] == "soon"
+    assert 0.25 <= dispatched[0][1] - added < 2
+
+
+def test_removed_and_disabled_jobs_do_not_fire(scheduler):
+    dispatched, _ = _record_dispatches(scheduler)
+    with patch("mcli.workflow.scheduler.scheduler.parse_cron", return_value=_FakeCron(0.2)):
+        removed, disabled = _job("removed"), _job("disabled")
+        scheduler.add_job(removed)
+        scheduler.add_job(disabled)
+        scheduler.remove_job(removed.id)
+        disabled.enabled = False
+        scheduler.update_job(disabled)
+
+    time.sleep(0.3)
+    assert scheduler._pop_due_jobs(datetime.now()) == []
+    assert dispatched == []
+
+
+def test_idle_scheduler_does_not_save(scheduler, monkeypatch):
+    monkeypatch.setattr(SchedulerDefaults, "SAVE_INTERVAL_SECONDS", 0)
+    scheduler.add_job(_job())
+    scheduler._save_jobs()
+    saves = []
+    monkeypatch.setattr(scheduler.storage, "save_jobs", lambda jobs: saves.append(len(jobs)))
+
+    scheduler._save_jobs_if_dirty()
+    assert saves == []
+
+    scheduler._pop_due_jobs(scheduler.get_all_jobs()[0].next_run)
+    scheduler._save_jobs_if_dirty()
+    scheduler._save_jobs_if_dirty()
+    assert saves == [1]
+
+
+def test_failed_jobs_are_retried(scheduler):
+    runs = []
+    done = threading.Event()
+
+    def execute(job):
+        runs.append(job.current_retry)
+        job.update_status(JobStatus.FAILED, "", "boom")
+        if len(runs) == 3:
+            done.set()
+        return {"status": JobStatus.FAILED.value, "exit_code": 1}
+
+    scheduler.executor.execute_job = execute
+    job = _job(retry_count=2, retry_delay=0)
+    scheduler.add_job(job)
+    scheduler.start()
+    with scheduler.lock:
+        job.next_run = datetime.now()
+        scheduler._schedule(job)
+
+    assert done.wait(5)
+    time.sleep(0.1)
+    assert runs == [0, 1, 2]
+    assert job.next_run > datetime.now()
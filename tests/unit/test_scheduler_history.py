@@ -0,0 +1,93 @@
+"""Tests for the SQLite job history store."""
+
+import json
+from datetime import datetime, timedelta
+
+from mcli.workflow.scheduler import history
+from mcli.workflow.scheduler.history import SqliteHistoryStore
+from mcli.workflow.scheduler.job import JobType, ScheduledJob
+from mcli.workflow.scheduler.persistence import JobStorage
+
+
+def _record(job_id, when, status="completed"):
+    return {"job_id": job_id, "executed_at": when.isoformat(), "status": status}
+
+
+def test_records_are_batched_and_queried_by_job(tmp_path):
+    store = SqliteHistoryStore(tmp_path / "history.db")
+    now = datetime.now()
+    for i in range(1500):
+        store.append(_record(f"job{i % 3}", now + timedelta(seconds=i)))
+    assert len(store._pending) == 1500
+
+    recent = store.query(job_id="job1", limit=3)
+    assert store._pending == []
+    assert [r["executed_at"] for r in recent] == [
+        (now + timedelta(seconds=s)).isoformat() for s in (1498, 1495, 1492)
+    ]
+    assert store.count() == 1500
+
+    plan = store._connect().execute(
+        "EXPLAIN QUERY PLAN SELECT record FROM history WHERE job_id = ? "
+        "ORDER BY executed_at DESC, id DESC LIMIT ?",
+        ("job1", 3),
+    )
+    assert "idx_history_job" in " ".join(str(row) for row in plan)
+    assert store._connect().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_buffer_is_flushed_by_timer(tmp_path, monkeypatch):
+    monkeypatch.setattr("mcli.lib.constants.SchedulerDefaults.HISTORY_FLUSH_INTERVAL", 0.05)
+    store = SqliteHistoryStore(tmp_path / "history.db")
+    store.append(_record("a", datetime.now()))
+    store._flush_timer.join(5)
+    assert store._pending == []
+
+
+def test_failed_inserts_are_retried_and_bounded(tmp_path, monkeypatch):
+    store = SqliteHistoryStore(tmp_path / "history.db")
+    now = datetime.now()
+    monkeypatch.setattr("mcli.lib.constants.SchedulerDefaults.HISTORY_MAX_PENDING", 2)
+    monkeypatch.setattr(history, "_INSERT_SQL", "INSERT INTO no_such_table VALUES (?, ?, ?, ?)")
+    for i in range(3):
+        store.append(_record(f"job{i}", now + timedelta(seconds=i)))
+    store.flush()
+    assert [row[0] for row in store._pending] == ["job1", "job2"]
+
+    monkeypatch.undo()
+    store.flush()
+    assert store._pending == []
+    assert store.count() == 2
+
+
+def test_retention_by_count_and_age(tmp_path):
+    store = SqliteHistoryStore(tmp_path / "history.db", max_records=50, max_age_days=30)
+    now = datetime.now()
+    store.append(_record("old", now - timedelta(days=40)))
+    for i in range(80):
+        store.append(_record("new", now + timedelta(seconds=i)))
+
+    assert store.enforce_retention() == 31
+    assert store.count() == 50
+    assert {r["job_id"] for r in store.query(limit=100)} == {"new"}
+
+    assert store.delete_before(now + timedelta(seconds=60)) == 30
+    assert store.count() == 20
+
+
+def test_json_history_is_migrated(tmp_path):
+    history = [_record(str(i), datetime.now() - timedelta(minutes=i)) for i in range(1100)]
+    (tmp_path / "job_history.json").write_text(json.dumps({"history": history}))
+
+    storage = JobStorage(storage_dir=str(tmp_path))
+    job = ScheduledJob(name="n", cron_expression="* * * * *", job_type=JobType.COMMAND, command="x")
+    storage.record_job_execution(job, {"status": "completed", "queue_wait_seconds": 0.5})
+
+    assert storage.history.count() == 1101
+    assert storage.get_job_history(limit=1)[0]["queue_wait_seconds"] == 0.5
+    assert storage.get_job_history(job_id="0")[0]["executed_at"] == history[0]["executed_at"]
+    assert not storage.history_file.exists()
+    assert (tmp_path / "job_history.json.migrated").exists()
+
+    info = storage.get_storage_info()
+    assert info["history_count"] == 1101 and info["history_backend"] == "SqliteHistoryStore"
@@ -41,7 +41,11 @@ class TestJobStorage:
             storage = JobStorage(storage_dir=tmpdir)
 
             assert storage.jobs_file.exists()
-            assert storage.history_file.exists()
+            assert storage.get_job_history() == []
+            assert storage.history_db.exists()
+
+            json_storage = JobStorage(storage_dir=tmpdir, history_backend="json")
+            assert json_storage.history_file.exists()
 
     def test_job_storage_default_directory(self):
         """Test that default storage directory is in ~/.mcli/scheduler."""
@@ -648,12 +652,12 @@ class TestJobStorage:
             assert hasattr(storage.lock, "release")
 
     def test_history_keeps_only_last_1000_records(self):
-        """Test that history is limited to 1000 records."""
+        """Test that JSON history is limited to 1000 records."""
         from mcli.workflow.scheduler.job import JobType, ScheduledJob
         from mcli.workflow.scheduler.persistence import JobStorage
 
         with tempfile.TemporaryDirectory() as tmpdir:
-            storage = JobStorage(storage_dir=tmpdir)
+            storage = JobStorage(storage_dir=tmpdir, history_backend="json")
 
             # Manually create history with > 1000 records
             history_data = {
@@ -0,0 +1,161 @@
+"""Tests for the bounded scheduler job pool."""
+
+import threading
+import time
+
+from mcli.workflow.scheduler.job import JobStatus, JobType, ScheduledJob
+from mcli.workflow.scheduler.pool import JobPool
+from mcli.workflow.scheduler.scheduler import JobScheduler
+
+
+def _job(name, job_type=JobType.COMMAND, tags=None):
+    return ScheduledJob(
+        name=name, cron_expression="* * * * *", job_type=job_type, command="true", tags=tags
+    )
+
+
+class _Recorder:
+    """Run callback that tracks concurrency and can hold jobs until released."""
+
+    def __init__(self, hold=()):
+        self.lock = threading.Lock()
+        self.order = []
+        self.active = set()
+        self.peak = {}
+        self.hold = set(hold)
+        self.release = threading.Event()
+        self.done = threading.Semaphore(0)
+
+    def __call__(self, job, wait):
+        with self.lock:
+            self.order.append(job.name)
+            self.active.add(job)
+            for key in ["all", job.job_type.value, *job.tags]:
+                count = sum(1 for j in self.active if key in ("all", j.job_type.value, *j.tags))
+                self.peak[key] = max(self.peak.get(key, 0), count)
+        if job.name in self.hold or "all" in self.hold:
+            self.release.wait(5)
+        else:
+            time.sleep(0.02)
+        with self.lock:
+            self.active.discard(job)
+        self.done.release()
+
+    def wait_for(self, count):
+        return all(self.done.acquire(timeout=5) for _ in range(count))
+
+
+def test_worker_cap_bounds_concurrency():
+    run = _Recorder(hold={"all"})
+    pool = JobPool(run, max_workers=3, type_limits={})
+    for i in range(10):
+        assert pool.submit(_job(f"j{i}"))
+
+    time.sleep(0.1)
+    assert pool.stats()["running"] == 3
+    assert pool.stats()["queued"] == 7
+    run.release.set()
+    assert run.wait_for(10)
+    assert run.peak["all"] == 3
+    assert pool.stats()["workers"] <= 3
+
+
+def test_burst_after_idle_period_runs_concurrently():
+    run = _Recorder(hold={"b0", "b1", "b2"})
+    pool = JobPool(run, max_workers=4, type_limits={})
+    pool.submit(_job("warmup"))
+    assert run.wait_for(1)
+    time.sleep(0.05)
+    assert pool.stats()["workers"] == 1
+
+    for i in range(3):
+        pool.submit(_job(f"b{i}"))
+    time.sleep(0.1)
+    assert pool.stats()["running"] == 3
+    run.release.set()
+    assert run.wait_for(3)
+
+
+def test_job_types_are_served_round_robin():
+    run = _Recorder(hold={"c0"})
+    pool = JobPool(run, max_workers=1, type_limits={})
+    pool.submit(_job("c0"))
+    time.sleep(0.05)
+    for i in range(1, 5):
+        pool.submit(_job(f"c{i}"))
+    pool.submit(_job("a0", JobType.API_CALL))
+
+    run.release.set()
+    assert run.wait_for(6)
+    assert run.order == ["c0", "c1", "a0", "c2", "c3", "c4"]
+
+
+def test_type_and_tag_limits():
+    run = _Recorder()
+    pool = JobPool(run, max_workers=8, type_limits={JobType.PYTHON: 2}, tag_limits={"db": 1})
+    for i in range(6):
+        pool.submit(_job(f"py{i}", JobType.PYTHON))
+    for i in range(4):
+        pool.submit(_job(f"db{i}", tags=["db"]))
+    for i in range(4):
+        pool.submit(_job(f"free{i}"))
+
+    assert run.wait_for(14)
+    assert run.peak["python"] == 2
+    assert run.peak["db"] == 1
+    assert run.peak["all"] <= 8
+
+
+def test_duplicates_are_rejected_and_waits_are_measured():
+    run = _Recorder(hold={"all"})
+    pool = JobPool(run, max_workers=1)
+    first, second = _job("first"), _job("second")
+    assert pool.submit(first)
+    assert pool.submit(second)
+    assert not pool.submit(second)
+    time.sleep(0.1)
+    assert not pool.submit(first)
+    assert pool.is_running(first.id) and pool.is_queued(second.id)
+
+    run.release.set()
+    assert run.wait_for(2)
+    waits = pool.stats()["wait_seconds"]
+    assert waits["samples"] == 2
+    assert waits["max"] >= 0.1
+
+
+def test_shutdown_drops_queued_runs():
+    run = _Recorder(hold={"all"})
+    pool = JobPool(run, max_workers=1)
+    for i in range(3):
+        pool.submit(_job(f"j{i}"))
+    time.sleep(0.05)
+    pool.shutdown()
+    run.release.set()
+    assert run.wait_for(1)
+    time.sleep(0.05)
+    assert run.order == ["j0"]
+    assert pool.stats()["queued"] == 0
+
+
+def test_scheduler_runs_jobs_through_the_pool(tmp_path):
+    scheduler = JobScheduler(storage_dir=str(tmp_path), max_workers=2)
+    finished = threading.Semaphore(0)
+
+    def execute(job):
+        job.update_status(JobStatus.COMPLETED)
+        finished.release()
+        return {"status": JobStatus.COMPLETED.value, "exit_code": 0}
+
+    scheduler.executor.execute_job = execute
+    jobs = [_job(f"j{i}") for i in range(5)]
+    for job in jobs:
+        scheduler.add_job(job)
+        scheduler._queue_job_execution(job)
+
+    assert all(finished.acquire(timeout=5) for _ in jobs)
+    time.sleep(0.1)
+    stats = scheduler.get_scheduler_stats()["executor_stats"]
+    assert stats["max_workers"] == 2 and stats["wait_seconds"]["samples"] == 5
+    assert "queue_wait_seconds" in scheduler.storage.get_job_history(jobs[0].id)[0]
+    assert scheduler.monitor.get_running_jobs() == []
@@ -0,0 +1,134 @@
+"""Tests for the persistent inverted index behind `mcli search`."""
+
+import sqlite3
+from pathlib import Path
+
+from mcli.app.search_cmd import _search_workflows
+from mcli.lib import search_index
+from mcli.lib.constants import FileNames
+from mcli.lib.performance.rust_bridge import PythonCommandMatcher
+from mcli.lib.script_loader import ScriptLoader
+from mcli.lib.search_index import SearchIndex, edit_distance, tokenize
+
+SCRIPT = "#!/usr/bin/env python3\n# @description: {desc}\n# @tags: {tags}\nprint('hi')\n"
+
+
+def _write(path: Path, desc: str, tags: str = "") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(SCRIPT.format(desc=desc, tags=tags))
+    return path
+
+
+def _names(results) -> list[str]:
+    return [path.stem for path, _ in results]
+
+
+def test_tokenize_splits_separators_and_camel_case():
+    assert tokenize("db-backup_toS3 now") == ["db", "backup", "to", "s3", "now"]
+    assert edit_distance("bakup", "backup", 1) == 1
+    assert edit_distance("deploy", "backup", 2) == 3
+
+
+def test_ranks_name_matches_above_description_matches(tmp_path):
+    wd = tmp_path / "workflows"
+    _write(wd / "cleanup.py", desc="remove old backup archives")
+    _write(wd / "backup.py", desc="snapshot the database")
+    _write(wd / "deploy.py", desc="ship it", tags="release")
+
+    results = ScriptLoader(wd).search("backup")
+
+    assert _names(results) == ["backup", "cleanup"]
+    assert results[0][1].matched_fields == ["name"]
+    assert results[1][1].matched_fields == ["description"]
+
+
+def test_prefix_substring_typo_and_multi_token_queries(tmp_path):
+    wd = tmp_path / "workflows"
+    _write(wd / "backup.py", desc="snapshot the database", tags="storage")
+    _write(wd / "ops" / "deploy.py", desc="ship a release")
+
+    loader = ScriptLoader(wd)
+
+    assert _names(loader.search("back")) == ["backup"]
+    assert _names(loader.search("ack")) == ["backup"]
+    assert _names(loader.search("bakup")) == ["backup"]
+    assert _names(loader.search("databse snapshot")) == ["backup"]
+    assert _names(loader.search("ops")) == ["deploy"]
+    assert _names(loader.search("deploy storage")) == []
+    assert loader.search("zzz") == []
+
+
+def test_index_persists_and_refreshes_incrementally(tmp_path):
+    wd = tmp_path / "workflows"
+    a = _write(wd / "alpha.py", desc="first")
+    _write(wd / "beta.py", desc="second")
+    ScriptLoader(wd).search("first")
+    assert (wd / FileNames.WORKFLOW_SEARCH_DB).exists()
+
+    # A new loader finds nothing to re-tokenize until a script changes.
+    loader = ScriptLoader(wd)
+    assert (
+        loader.search_index.refresh(
+            {str(p): loader.get_indexed_script(p).content_hash for p in loader.discover_scripts()},
+            lambda key: {},
+        )
+        == 0
+    )
+
+    _write(a, desc="edited")
+    (wd / "beta.py").unlink()
+    loader = ScriptLoader(wd)
+    assert _names(loader.search("edited")) == ["alpha"]
+    assert loader.search("first") == []
+    assert loader.search("second") == []
+    assert len(loader.search_index) == 1
+
+
+def test_memory_index_and_limit():
+    index = SearchIndex()
+    docs = {str(i): {"name": f"task{i}", "description": "nightly job"} for i in range(30)}
+    index.refresh({key: "v1" for key in docs}, docs.__getitem__)
+
+    assert len(index.search("nightly")) == 30
+    assert len(index.search("nightly", limit=5)) == 5
+    assert index.search("task7")[0].key == "7"
+
+
+def test_python_command_matcher_uses_ranked_index():
+    matcher = PythonCommandMatcher(fuzzy_threshold=0.0)
+    matcher.add_commands(
+        [
+            {"name": "status", "description": "show deploy status"},
+            {"name": "deploy", "description": "deploy the app"},
+        ]
+    )
+
+    results = matcher.search("deploy")
+    assert [r["command"]["name"] for r in results] == ["deploy", "status"]
+    assert results[0]["score"] == 1.0
+    assert matcher.search("deplyo")[0]["command"]["name"] == "deploy"
+
+
+def test_long_in_lists_are_split_to_fit_the_variable_limit(monkeypatch):
+    index = SearchIndex()
+    docs = {str(i): {"name": f"task{i}", "description": "nightly job"} for i in range(30)}
+    index.refresh({key: "v1" for key in docs}, docs.__getitem__)
+    expected = index.search("nightly")
+
+    monkeypatch.setattr(search_index, "MAX_SQL_VARIABLES", 8)
+    index._connect().setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 8)
+    assert index.search("nightly") == expected
+    assert len(index.search("nightl task")) == 30
+
+
+def test_all_workspace_scores_are_normalized_per_index(tmp_path):
+    small = tmp_path / "small"
+    _write(small / "backup.py", desc="snapshot the database")
+    large = tmp_path / "large"
+    for i in range(10):
+        _write(large / f"backup{i}.py", desc=f"backup variant {i}")
+
+    for wd in (small, large):
+        results = _search_workflows("backup", wd, normalize=True)
+        assert results[0]["score"] == 1.0
+        assert all(0 < wf["score"] <= 1.0 for wf in results)
@@ -0,0 +1,93 @@
+"""Tests for metadata-only listing and completion of `mcli run` workflows."""
+
+from unittest.mock import patch
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from mcli.lib.script_loader import ScriptLoader
+from mcli.workflow.workflow import ScopedWorkflowsGroup
+
+# Importing this script leaves a marker file behind, so tests can tell whether
+# it was executed.
+PY_TEMPLATE = """#!/usr/bin/env python3
+# @description: {desc}
+import click
+from pathlib import Path
+
+Path(__file__).with_suffix(".imported").touch()
+
+
+@click.command()
+def main():
+    click.echo("ran {stem}")
+"""
+
+
+@pytest.fixture
+def workflows_dir(tmp_path):
+    wd = tmp_path / "workflows"
+    wd.mkdir()
+    for stem, desc in [("alpha", "First workflow"), ("backup", "Python backup")]:
+        (wd / f"{stem}.py").write_text(PY_TEMPLATE.format(stem=stem, desc=desc))
+    (wd / "backup.sh").write_text("#!/usr/bin/env bash\n# @description: Shell backup\necho sh\n")
+    return wd
+
+
+@pytest.fixture
+def group(workflows_dir):
+    with patch.object(ScopedWorkflowsGroup, "_get_workflows_dir", return_value=workflows_dir):
+        yield ScopedWorkflowsGroup(name="run")
+
+
+def _ctx(group):
+    ctx = click.Context(group)
+    ctx.params = {"is_global": False, "workspace": None}
+    return ctx
+
+
+def test_command_catalog_names_and_descriptions(workflows_dir):
+    catalog = ScriptLoader(workflows_dir).command_catalog()
+
+    assert list(catalog) == ["alpha", "backup:py", "backup:sh"]
+    assert catalog["alpha"].metadata["description"] == "First workflow"
+    assert catalog["backup:sh"].path == workflows_dir / "backup.sh"
+
+
+def test_resolve_command_name_maps_to_single_file(workflows_dir):
+    loader = ScriptLoader(workflows_dir)
+
+    assert loader.resolve_command_name("alpha") == [workflows_dir / "alpha.py"]
+    assert loader.resolve_command_name("backup:sh") == [workflows_dir / "backup.sh"]
+    assert len(loader.resolve_command_name("backup")) == 2
+    assert loader.resolve_command_name("backup:js") == []
+
+
+def test_list_and_complete_do_not_execute_scripts(group, workflows_dir):
+    ctx = _ctx(group)
+
+    assert group.list_commands(ctx) == ["alpha", "backup:py", "backup:sh"]
+    completions = group.shell_complete(ctx, "ba")
+    assert [(c.value, c.help) for c in completions] == [
+        ("backup:py", "Python backup"),
+        ("backup:sh", "Shell backup"),
+    ]
+
+    assert list(workflows_dir.glob("*.imported")) == []
+
+
+def test_help_lists_descriptions_without_executing_scripts(group, workflows_dir):
+    result = CliRunner().invoke(group, ["--help"])
+
+    assert result.exit_code == 0
+    assert "First workflow" in result.output
+    assert "Shell backup" in result.output
+    assert list(workflows_dir.glob("*.imported")) == []
+
+
+def test_get_command_loads_only_the_requested_script(group, workflows_dir):
+    cmd = group.get_command(_ctx(group), "alpha")
+
+    assert cmd is not None
+    assert [p.name for p in workflows_dir.glob("*.imported")] == ["alpha.imported"]
@@ -0,0 +1,158 @@
+"""Tests for the persistent, stat-invalidated workflow index."""
+
+import hashlib
+import os
+import time
+from pathlib import Path
+
+from mcli.lib.constants import FileNames
+from mcli.lib.script_loader import ScriptLoader
+from mcli.lib.workflow_index import WorkflowIndex
+
+PY = "#!/usr/bin/env python3\n# @description: {desc}\n# @version: {version}\nprint('hi')\n"
+
+
+def _age(*paths: Path, seconds: int = 60) -> None:
+    """Backdate mtimes so entries fall outside the racy-timestamp window."""
+    past = time.time() - seconds
+    for path in paths:
+        os.utime(path, (past, past))
+
+
+def _write(path: Path, desc: str = "demo", version: str = "1.0.0") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(PY.format(desc=desc, version=version))
+    return path
+
+
+class CountingLoader(ScriptLoader):
+    """ScriptLoader that records which scripts were actually read."""
+
+    def __init__(self, workflows_dir: Path):
+        super().__init__(workflows_dir)
+        self.analyzed: list[str] = []
+
+    def analyze_script(self, script_path: Path):
+        self.analyzed.append(script_path.name)
+        return super().analyze_script(script_path)
+
+
+def test_unchanged_scripts_are_not_reread(tmp_path):
+    wd = tmp_path / "workflows"
+    a = _write(wd / "a.py")
+    b = _write(wd / "group" / "b.py")
+    _age(a, b, wd / "group", wd)
+
+    first = CountingLoader(wd)
+    first.generate_lockfile()
+    assert sorted(first.analyzed) == ["a.py", "b.py"]
+    assert (wd / FileNames.WORKFLOW_INDEX_DB).exists()
+
+    # A fresh loader (new process) serves everything from the persisted index.
+    second = CountingLoader(wd)
+    lockfile = second.generate_lockfile()
+    assert second.analyzed == []
+    assert lockfile["commands"]["a"]["description"] == "demo"
+    assert second.verify_lockfile()["hash_mismatch"] == []
+
+
+def test_changed_added_and_deleted_scripts_are_detected(tmp_path):
+    wd = tmp_path / "workflows"
+    a = _write(wd / "a.py")
+    b = _write(wd / "b.py")
+    _age(a, b, wd)
+    CountingLoader(wd).generate_lockfile()
+
+    _write(a, desc="edited", version="2.0.0")
+    b.unlink()
+    _write(wd / "c.py")
+    _age(a, wd / "c.py", wd, seconds=30)
+
+    loader = CountingLoader(wd)
+    assert [p.name for p in loader.discover_scripts()] == ["a.py", "c.py"]
+    info = loader.get_script_info(a)
+    assert info["description"] == "edited"
+    assert info["version"] == "2.0.0"
+    loader.get_script_info(wd / "c.py")
+    assert sorted(loader.analyzed) == ["a.py", "c.py"]
+
+
+def test_hidden_entries_and_index_file_are_not_discovered(tmp_path):
+    wd = tmp_path / "workflows"
+    _write(wd / "visible.py")
+    _write(wd / ".hidden" / "secret.py")
+    _write(wd / ".dotfile.py")
+
+    loader = ScriptLoader(wd)
+    loader.generate_lockfile()
+
+    assert [p.name for p in loader.discover_scripts()] == ["visible.py"]
+
+
+def test_recently_modified_entries_are_not_trusted(tmp_path):
+    wd = tmp_path / "workflows"
+    script = _write(wd / "fresh.py")
+    calls = []
+
+    def analyze(path):
+        calls.append(path)
+        return "python", {}, "sha256:x"
+
+    index = WorkflowIndex(wd, analyze=analyze)
+    index.get(script)
+    index.get(script)
+
+    # Modified within the racy window: re-read rather than risk a stale hit.
+    assert len(calls) == 2
+
+    _age(script)
+    index.get(script)
+    index.get(script)
+    assert len(calls) == 3
+
+
+def test_missing_workflows_dir_uses_memory_index(tmp_path):
+    wd = tmp_path / "does-not-exist"
+    index = WorkflowIndex(wd, analyze=lambda p: ("python", {}, ""))
+
+    assert index.list_files() == []
+    assert not wd.exists()
+
+
+def test_large_batches_are_analyzed_in_parallel(tmp_path):
+    wd = tmp_path / "workflows"
+    scripts = [_write(wd / f"s{i}.py", desc=f"script {i}") for i in range(12)]
+    _age(*scripts, wd)
+
+    loader = ScriptLoader(wd)
+    lockfile = loader.generate_lockfile()
+
+    stats = loader.lockfile_stats
+    assert stats.scripts == 12
+    assert stats.analyzed == 12
+    assert stats.bytes_read == sum(p.stat().st_size for p in scripts)
+    assert lockfile["commands"]["s7"]["description"] == "script 7"
+
+    loader.generate_lockfile()
+    assert loader.lockfile_stats.analyzed == 0
+
+
+def test_streamed_analysis_matches_whole_file_hash(tmp_path, monkeypatch):
+    import mcli.lib.script_loader as script_loader
+
+    # Tiny chunks force metadata lines and multi-byte characters across chunk edges.
+    monkeypatch.setattr(script_loader, "HASH_CHUNK_SIZE", 7)
+    wd = tmp_path / "workflows"
+    script = wd / "long.py"
+    script.parent.mkdir(parents=True)
+    body = "#!/usr/bin/env python3\n# @description: héllo wörld\n# @tags: a, b\n"
+    script.write_text(body + "x = 'ü'\n" * 200)
+
+    loader = ScriptLoader(wd)
+    language, metadata, content_hash = loader.analyze_script(script)
+
+    assert language == "python"
+    assert metadata["description"] == "héllo wörld"
+    assert metadata["tags"] == ["a", "b"]
+    assert content_hash == loader.calculate_hash(script)
+    assert content_hash == "sha256:" + hashlib.sha256(script.read_bytes()).hexdigest()